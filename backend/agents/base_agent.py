@@ -16,7 +16,7 @@ import logging
 import uuid
 from abc import ABC
 from datetime import UTC, datetime
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 from backend.models.agent_state import (
     Action,
@@ -30,6 +30,7 @@ from backend.models.agent_state import (
 from backend.services.loop_detector import LoopDetector
 from backend.services.openai_adapter import OpenAIAdapter
 from backend.services.rag_service import RAGService
+from backend.services.runtime_metrics import time_stage
 from backend.services.search_service import SearchService
 
 logger = logging.getLogger(__name__)
@@ -221,8 +222,17 @@ class BaseAgent(ABC):
     * Hybrid progress validation (tests → artifacts → LLM)
     * Confidence-based escalation to the orchestrator
     * Full audit trail for recovery and observability (Decision 76)
+
+    A plan may carry several ordered actions in one step. Independent
+    actions run concurrently through the orchestrator and the step is
+    validated once for the whole batch.
     """
 
+    # Upper bound on actions accepted from a single multi-action plan
+    max_batch_actions: int = 20
+    # Tools whose operations only touch the path named in their parameters
+    path_scoped_tools: Set[str] = {"file_system"}
+
     confidence_threshold: float
     confidence_check_interval: int
     max_retries: int
@@ -242,6 +252,7 @@ class BaseAgent(ABC):
         rag_service: Optional[RAGService] = None,
         search_service: Optional[SearchService] = None,
         system_prompt: Optional[str] = None,
+        checkpoint_store: Optional[Any] = None,
     ) -> None:
         self.agent_id = agent_id
         self.agent_type = agent_type
@@ -251,6 +262,7 @@ class BaseAgent(ABC):
         self.confidence_check_interval = confidence_check_interval
         self.max_retries = max_retries
         self.loop_detector = loop_detector or LoopDetector()
+        self.checkpoint_store = checkpoint_store
         self.logger = logging.getLogger(f"agents.{self.agent_type}")
         
         # MVP: New services for specialists
@@ -263,40 +275,58 @@ class BaseAgent(ABC):
         self.tas_client = TASClient(agent_id=agent_id, agent_type=agent_type)
 
     async def run_task(self, task: Any) -> TaskResult:
-        """Execute a task using the iterative execution loop."""
-        
-        self.logger.info(f"🚀 RUN_TASK CALLED for agent {self.agent_id}")
+        """Execute a task using the iterative execution loop.
 
+        With a checkpoint store every completed step is checkpointed, and a
+        task interrupted earlier resumes after its last checkpointed step.
+        """
+        
         state = self._initialize_state(task)
-        self.logger.info(
-            "Starting task %s for project %s", state.task_id, state.project_id
-        )
+        if await self._restore_checkpoint(state):
+            self.logger.info(
+                "Resuming task %s for project %s at step %s",
+                state.task_id, state.project_id, state.current_step,
+            )
+        else:
+            self.logger.info(
+                "Starting task %s for project %s", state.task_id, state.project_id
+            )
+
+        result = await self._run_steps(state)
+        if self.checkpoint_store is not None:
+            try:
+                await asyncio.to_thread(self.checkpoint_store.clear, state.task_id)
+            except Exception:
+                self.logger.warning("Failed to clear checkpoints | task=%s", state.task_id, exc_info=True)
+        return result
+
+    async def _run_steps(self, state: TaskState) -> TaskResult:
+        """Run loop iterations from ``state.current_step`` until termination."""
 
         while not self._should_terminate(state):
-            print(f"🔄 Loop iteration {state.current_step} starting")
-            action = await self._plan_next_step(state)
-            result = await self._execute_step_with_retry(action, state)
+            with time_stage("plan_llm", self.agent_type):
+                action = await self._plan_next_step(state)
+            with time_stage("tool_exec", self.agent_type):
+                result = await self._execute_step_with_retry(action, state)
             
             # Validate and update state BEFORE self-assessment
-            validation = await self._validate_step(result, state)
+            with time_stage("validation", self.agent_type):
+                validation = await self._validate_step(result, state)
             self._update_state(state, action, result, validation)
             
             # HARDCODED: Agent self-assesses if task is complete after key actions
-            print(f"🔬 Checking if self-assessment needed (tool: {getattr(action, 'tool_name', None)})")
             try:
-                is_complete = await self._self_assess_completion(state, action, result)
-                print(f"🔍 Self-assessment result: {is_complete} (tool: {action.tool_name})")
+                with time_stage("self_assessment", self.agent_type):
+                    is_complete = await self._self_assess_completion(state, action, result)
                 if is_complete:
-                    print("✅ Agent self-assessed: Task complete - exiting loop")
+                    self.logger.info("Task %s self-assessed complete at step %s", state.task_id, state.current_step)
                     # Mark as successful since self-assessment confirmed completion
                     state.record_success()
                     state.status = "completed"
                     state.progress_score = 1.0  # Mark as fully complete for success=True
                     return await self._finalize_result(state)
-            except Exception as e:
-                print(f"❌ Self-assessment failed: {e}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                self.logger.warning("Self-assessment failed | task=%s", state.task_id, exc_info=True)
 
             if validation.success:
                 state.record_success()
@@ -318,10 +348,44 @@ class BaseAgent(ABC):
 
             await self._log_step_progress(state)
             state.current_step += 1
+            await self._checkpoint_step(state)
 
-        print(f"🛑 Loop terminated - step:{state.current_step} max:{state.max_steps} timeout:{getattr(state, 'timeout_reached', False)}")
+        self.logger.info(
+            "Loop terminated | task=%s | step=%s | max=%s | timeout=%s",
+            state.task_id,
+            state.current_step,
+            state.max_steps,
+            getattr(state, 'timeout_reached', False),
+        )
         return await self._finalize_result(state)
 
+    async def _restore_checkpoint(self, state: TaskState) -> bool:
+        """Replay saved step checkpoints onto ``state``; True if any existed."""
+
+        if self.checkpoint_store is None:
+            return False
+        try:
+            loop_window = await asyncio.to_thread(self.checkpoint_store.restore, state)
+        except Exception:
+            self.logger.warning("Failed to restore checkpoints | task=%s", state.task_id, exc_info=True)
+            return False
+        if loop_window is None:
+            return False
+        self.loop_detector.restore(state.task_id, loop_window)
+        return True
+
+    async def _checkpoint_step(self, state: TaskState) -> None:
+        """Persist the step just completed; failures only cost resumability."""
+
+        if self.checkpoint_store is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.checkpoint_store.save_step, state, self.loop_detector.window(state.task_id)
+            )
+        except Exception:
+            self.logger.warning("Failed to checkpoint step | task=%s", state.task_id, exc_info=True)
+
     def _initialize_state(self, task: Any) -> TaskState:
         """Construct the initial state object for execution."""
 
@@ -372,9 +436,28 @@ class BaseAgent(ABC):
                 "llm_client must implement plan_next_action() or override _plan_next_step"
             )
 
-        state.decision_reasoning.append(action.reasoning)
+        # Streamed plans deliver reasoning after the action; recorded on resolve
+        if "pending_reasoning" not in action.metadata:
+            state.decision_reasoning.append(action.reasoning)
         return action
 
+    async def _resolve_pending_reasoning(self, action: Action, state: TaskState) -> None:
+        """Wait for streamed reasoning that was still generating at dispatch time."""
+
+        pending = action.metadata.pop("pending_reasoning", None)
+        if pending is None:
+            return
+
+        try:
+            reasoning = await pending
+        except Exception as exc:  # pragma: no cover - stream failures are non-fatal
+            self.logger.warning("Streamed reasoning unavailable | task=%s | error=%s", state.task_id, exc)
+            reasoning = ""
+
+        if reasoning:
+            action.reasoning = reasoning
+        state.decision_reasoning.append(action.reasoning)
+
     async def _execute_step_with_retry(
         self,
         action: Action,
@@ -386,7 +469,9 @@ class BaseAgent(ABC):
         current_action = action
 
         for attempt in range(1, self.max_retries + 1):
+            # Tool execution overlaps with any reasoning still streaming in
             result = await self._execute_action(current_action, state, attempt)
+            await self._resolve_pending_reasoning(current_action, state)
             result.attempt = attempt
 
             if result.success:
@@ -414,6 +499,9 @@ class BaseAgent(ABC):
     ) -> Result:
         """Execute a planned action via orchestrator or subclass override."""
 
+        if action.batch:
+            return await self._execute_batch(action, state, attempt)
+
         if action.tool_name:
             request_id = action.metadata.get("request_id") or str(uuid.uuid4())
             payload = {
@@ -449,6 +537,94 @@ class BaseAgent(ABC):
 
         return await self._execute_internal_action(action, state, attempt)
 
+    async def _execute_batch(
+        self,
+        action: Action,
+        state: TaskState,
+        attempt: int,
+    ) -> Result:
+        """Execute a multi-action step, running independent actions concurrently.
+
+        Groups run in plan order. Once a group has a failure the remaining
+        groups are not run, so a barrier such as marking a deliverable
+        complete never follows failed work; skipped actions are reported
+        as not run.
+        """
+
+        results: List[Result] = []
+        skipped: List[Action] = []
+        groups = self._group_independent_actions(action.batch)
+        for position, group in enumerate(groups):
+            group_results = await asyncio.gather(
+                *(self._execute_action(sub_action, state, attempt) for sub_action in group),
+                return_exceptions=True,
+            )
+            for sub_action, outcome in zip(group, group_results):
+                if isinstance(outcome, Exception):
+                    outcome = Result(success=False, error=f"{sub_action.description}: {outcome}")
+                results.append(outcome)
+            if not all(result.success for result in results[-len(group):]):
+                skipped = [sub_action for later in groups[position + 1:] for sub_action in later]
+                results.extend(
+                    Result(success=False, error="not run: an earlier action failed", attempt=attempt)
+                    for _ in skipped
+                )
+                break
+
+        failures = [
+            f"[{index}] {sub_action.tool_name}.{sub_action.operation}: {result.error or 'failed'}"
+            for index, (sub_action, result) in enumerate(zip(action.batch, results))
+            if not result.success
+        ]
+        outputs = [result.output for result in results]
+        return Result(
+            success=not failures,
+            output={"actions": outputs},
+            error="; ".join(failures) or None,
+            metadata={
+                "batch_size": len(results),
+                "batch_failed": len(failures) - len(skipped),
+                "batch_skipped": len(skipped),
+                "artifacts": [output for output in outputs if output is not None],
+            },
+            attempt=attempt,
+        )
+
+    def _group_independent_actions(self, actions: List[Action]) -> List[List[Action]]:
+        """Split ordered actions into groups that are safe to run concurrently.
+
+        Path-scoped tool calls join the current group unless an earlier
+        action in it touches the same path. Any other tool call (for example
+        marking a deliverable complete) acts as a barrier and runs alone,
+        after everything planned before it.
+        """
+
+        groups: List[List[Action]] = []
+        current: List[Action] = []
+        current_paths: Set[str] = set()
+
+        for sub_action in actions:
+            path = sub_action.parameters.get("path") if isinstance(sub_action.parameters, dict) else None
+            scoped = sub_action.tool_name in self.path_scoped_tools and isinstance(path, str)
+
+            if not scoped:
+                if current:
+                    groups.append(current)
+                groups.append([sub_action])
+                current, current_paths = [], set()
+                continue
+
+            if path in current_paths:
+                groups.append(current)
+                current, current_paths = [], set()
+
+            current.append(sub_action)
+            current_paths.add(path)
+
+        if current:
+            groups.append(current)
+        return groups
+
     async def _execute_internal_action(
         self,
         action: Action,
@@ -709,7 +885,7 @@ class BaseAgent(ABC):
         Uses <100 tokens per check.
         """
         # Only check after key operations to minimize LLM calls
-        if action.tool_name not in ["file_system", "deliverable"]:
+        if not {"file_system", "deliverable"} & set(action.tool_names()):
             return False
         
         # Ultra-minimal prompt - truncate to save tokens
@@ -744,7 +920,7 @@ Complete? YES/NO:"""
                 response = completion.choices[0].message.content
             
             is_complete = "YES" in response.upper()
-            self.logger.info(f"🤔 Self-assessment: {'COMPLETE ✅' if is_complete else 'INCOMPLETE ⏳'}")
+            self.logger.debug("Self-assessment | task=%s | complete=%s", state.task_id, is_complete)
             return is_complete
             
         except Exception as e:
@@ -808,7 +984,40 @@ Complete? YES/NO:"""
         )
 
     def _parse_llm_action(self, response: Dict[str, Any]) -> Action:
-        """Normalise an LLM planning response to an Action dataclass."""
+        """Normalise an LLM planning response to an Action dataclass.
+
+        Responses with an ``actions`` list become a batch Action; a
+        single-entry list collapses to a plain Action.
+        """
+
+        planned = response.get("actions")
+        if isinstance(planned, list) and planned:
+            batch = [
+                self._parse_llm_action(item)
+                for item in planned[: self.max_batch_actions]
+                if isinstance(item, dict)
+            ]
+            if len(planned) > self.max_batch_actions:
+                self.logger.warning(
+                    "Plan had %s actions; executing first %s",
+                    len(planned),
+                    self.max_batch_actions,
+                )
+            if len(batch) == 1:
+                single = batch[0]
+                single.reasoning = single.reasoning or response.get("reasoning", "")
+                single.metadata = {**response.get("metadata", {}), **single.metadata}
+                return single
+            if batch:
+                return Action(
+                    description=response.get("description")
+                    or "; ".join(sub_action.description for sub_action in batch),
+                    tool_name=None,
+                    operation=None,
+                    reasoning=response.get("reasoning", ""),
+                    metadata=response.get("metadata", {}),
+                    batch=batch,
+                )
 
         return Action(
             description=response.get("description", ""),
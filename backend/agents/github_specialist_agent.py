@@ -2,9 +2,11 @@
 import asyncio
 import logging
 from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 import httpx
 from backend.agents.base_agent import BaseAgent
 from backend.models.agent_state import Result
+from backend.services.git_object_pipeline import GitObjectPipeline, get_git_object_pipeline, resolve_workspace
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +47,23 @@ class GitHubSpecialistAgent(BaseAgent):
     - Exponential backoff retry (3 attempts: 1s, 2s, 4s)
     - Automatic gate triggering on failure
     - Token-based authentication via GitHubCredentialManager
+    - Real commits of the project workspace into a local bare repository
+      (GitObjectPipeline), optionally pushed to a remote in one pack
     """
     
     MAX_RETRIES = 3
     BASE_BACKOFF = 1  # seconds
     
-    def __init__(self, agent_id: str, orchestrator: Any, llm_client: Any, user_id: int = 1, **kwargs):
+    def __init__(
+        self,
+        agent_id: str,
+        orchestrator: Any,
+        llm_client: Any,
+        user_id: int = 1,
+        git_pipeline: Optional[GitObjectPipeline] = None,
+        db_session: Any = None,
+        **kwargs
+    ):
         # Accept agent_type from kwargs or use passed value
         final_agent_type = kwargs.pop('agent_type', 'github_specialist')
         super().__init__(
@@ -61,6 +74,8 @@ class GitHubSpecialistAgent(BaseAgent):
             **kwargs
         )
         self.user_id = user_id  # For credential lookup
+        self.git_pipeline = git_pipeline or get_git_object_pipeline()
+        self.db_session = db_session  # For credential lookup when pushing to a remote
     
     async def _get_access_token(self, db_session: Any) -> Optional[str]:
         """Get GitHub access token from credential manager."""
@@ -300,130 +315,104 @@ class GitHubSpecialistAgent(BaseAgent):
             return await self._generate_git_config(action, state)
     
     async def _create_repository_action(self, action: Any, state: Any):
-        """Create GitHub repository (simulated)."""
-        repo_name = getattr(state, 'project_id', "hello-world-app")
-        
-        # Simulate successful repo creation
+        """Create the project's local bare repository."""
+        repo_path = await asyncio.to_thread(self.git_pipeline.init, state.project_id)
         result = {
-            "name": repo_name,
-            "url": f"https://github.com/user/{repo_name}",
-            "clone_url": f"https://github.com/user/{repo_name}.git",
+            "name": state.project_id,
+            "path": repo_path,
+            "clone_url": f"file://{repo_path}",
             "created": True
         }
-        
-        report = f'''# GitHub Repository Created
-
-## Repository Details
-- **Name:** {repo_name}
-- **URL:** {result["url"]}
-- **Clone URL:** {result["clone_url"]}
-
-## Next Steps
-1. Code has been pushed to repository
-2. Initial commit includes all project files
-3. Repository is ready for collaboration
-
-## Status: SUCCESS ✓
-'''
-        
-        await self.orchestrator.execute_tool({
-            "agent_id": self.agent_id,
-            "agent_type": self.agent_type,
-            "tool": "file_system",
-            "operation": "write",
-            "parameters": {
-                "project_id": state.project_id,
-                "path": "github/repository_info.md",
-                "content": report
-            }
-        })
-        
-        return Result(success=True, output=result, metadata={"files_created": ["github/repository_info.md"]})
+        return Result(success=True, output=result, metadata={"repository": repo_path})
     
     async def _push_code_action(self, action: Any, state: Any):
-        """Push code to GitHub (simulated)."""
-        push_log = '''# Git Push Log
-
-## Files Pushed
-- backend/app.py
-- backend/services.py
-- backend/test_app.py
-- backend/requirements.txt
-- frontend/index.html
-- frontend/test_app.js
-- frontend/package.json
-- tests/ (all test files)
-- docs/ (all documentation)
-- README.md
-- docker-compose.yml
-- Dockerfile
-- deploy.sh
-- .github/workflows/ci.yml
-
-## Commit Details
-- **Commit:** initial commit
-- **Branch:** main
-- **Files:** 20+ files
-- **Status:** Pushed successfully
-
-## Repository Status
-All project files are now in version control.
-'''
-        
-        await self.orchestrator.execute_tool({
-            "agent_id": self.agent_id,
-            "agent_type": self.agent_type,
-            "tool": "file_system",
-            "operation": "write",
-            "parameters": {
-                "project_id": state.project_id,
-                "path": "github/push_log.md",
-                "content": push_log
-            }
-        })
-        
-        return Result(success=True, output="Code pushed to GitHub", metadata={"files_created": ["github/push_log.md"]})
+        """Commit the project workspace and push it if a remote is given."""
+        params = action.parameters or {}
+        return await self._commit_workspace(
+            state,
+            message=params.get("message") or action.description or "Update project files",
+            branch=params.get("branch", "main"),
+            remote_url=params.get("remote_url")
+        )
     
     async def _create_pr_action(self, action: Any, state: Any):
-        """Create pull request (simulated)."""
-        pr_info = '''# Pull Request Created
-
-## PR #1: Initial Implementation
-
-**Title:** Initial Hello World Implementation  
-**Status:** Open  
-**Reviewers:** Assigned  
-
-## Changes
-- Backend API implementation
-- Frontend UI components
-- Comprehensive test suite
-- Full documentation
-- Deployment configuration
-
-## Review Checklist
-- [x] All tests passing
-- [x] Code review complete
-- [x] Documentation updated
-- [x] Security audit passed
-- [x] Ready to merge
-
-## Status: READY FOR MERGE ✓
-'''
+        """Commit the workspace to a feature branch and describe it against its base."""
+        params = action.parameters or {}
+        base = params.get("base", "main")
+        head = params.get("branch") or f"agent/{state.task_id}"
+        result = await self._commit_workspace(
+            state,
+            message=params.get("title") or action.description or "Agent changes",
+            branch=head,
+            base=base,
+            remote_url=params.get("remote_url")
+        )
+        if not result.success:
+            return result
         
-        await self.orchestrator.execute_tool({
-            "agent_id": self.agent_id,
-            "agent_type": self.agent_type,
-            "tool": "file_system",
-            "operation": "write",
-            "parameters": {
-                "project_id": state.project_id,
-                "path": "github/pull_request.md",
-                "content": pr_info
-            }
-        })
+        files = await asyncio.to_thread(self.git_pipeline.changed_files, state.project_id, base, head)
+        pull_request = {
+            "title": params.get("title") or action.description,
+            "base": base,
+            "head": head,
+            "commit": result.output["commit"],
+            "files": files,
+            "additions": sum(f["additions"] for f in files),
+            "deletions": sum(f["deletions"] for f in files)
+        }
+        return Result(success=True, output=pull_request, metadata={"commit": result.output})
+    
+    async def _commit_workspace(
+        self,
+        state: Any,
+        message: str,
+        branch: str,
+        base: Optional[str] = None,
+        remote_url: Optional[str] = None
+    ) -> Result:
+        """Commit the workspace with the git object pipeline; push when a remote is set.
         
-        return Result(success=True, output="Pull request created", metadata={"files_created": ["github/pull_request.md"]})
+        HTTP(S) remotes need the user's GitHub token, looked up through
+        ``db_session``. Without one the action fails before committing
+        rather than attempting an unauthenticated push.
+        """
+        token = None
+        if remote_url and urlparse(remote_url).scheme in ("http", "https"):
+            token = await self._get_access_token(self.db_session) if self.db_session else None
+            if not token:
+                return Result(
+                    success=False,
+                    error=(
+                        f"Cannot push to {remote_url}: no GitHub credentials for user {self.user_id} "
+                        f"({'no token stored' if self.db_session else 'agent created without db_session'})"
+                    )
+                )
+        
+        workspace = await asyncio.to_thread(resolve_workspace, state.project_id)
+        if workspace is None:
+            return Result(
+                success=False,
+                error=f"Workspace for project {state.project_id} is not reachable from this host"
+            )
+        
+        commit = await asyncio.to_thread(
+            self.git_pipeline.commit, state.project_id, workspace, message, branch, base
+        )
+        output = commit.to_dict()
+        if remote_url and commit.commit:
+            pushed = await self._execute_with_retry(
+                "push",
+                asyncio.to_thread,
+                self.git_pipeline.push,
+                state.project_id,
+                remote_url,
+                branch,
+                token
+            )
+            if not pushed["success"]:
+                return Result(success=False, error=pushed["reason"], metadata={"commit": output})
+            output["push"] = pushed["result"]
+        return Result(success=True, output=output, metadata={"commit": commit.commit})
     
     async def _generate_git_config(self, action: Any, state: Any):
         """Generate Git configuration."""
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 
 from typing import Dict
@@ -11,6 +12,9 @@ import os
 
 from backend.api.routes import settings, specialists, projects, tasks, store, gates, prompts
 from backend.api.dependencies import initialize_engine
+from backend.services.qdrant_pool import close_qdrant_clients
+from backend.services.github_api_client import close_github_clients
+from backend.services.runtime_metrics import CONTENT_TYPE, get_event_loop_monitor, render_metrics
 
 
 @asynccontextmanager
@@ -24,9 +28,13 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Initializing database engine with URL: {database_url}")
     initialize_engine(database_url)
     print("✅ Database engine initialized successfully")
+    loop_monitor = get_event_loop_monitor()
+    loop_monitor.start()
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown
+    await loop_monitor.stop()
+    await close_qdrant_clients()
+    await close_github_clients()
 
 
 def create_app() -> FastAPI:
@@ -68,6 +76,28 @@ def create_app() -> FastAPI:
             "docs": "/docs"
         }
     
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics() -> PlainTextResponse:
+        """Prometheus metrics: stage latencies and event loop lag."""
+        return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+    
+    @app.get("/debug/event-loop")
+    def debug_event_loop():
+        """Recent event loop stalls with the stack that was blocking."""
+        monitor = get_event_loop_monitor()
+        return {
+            "running": monitor.running,
+            "stall_threshold": monitor.stall_threshold,
+            "stalls": [
+                {
+                    "started_at": report.started_at.isoformat(),
+                    "duration_ms": round(report.duration * 1000, 1),
+                    "stack": report.stack
+                }
+                for report in monitor.reports()
+            ]
+        }
+    
     @app.get("/debug/specialists")
     def debug_specialists():
         """Debug endpoint to check specialists in database."""
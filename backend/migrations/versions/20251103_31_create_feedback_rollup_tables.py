@@ -0,0 +1,98 @@
+"""create feedback rollup tables
+
+Revision ID: 20251103_31
+Revises: 20251103_30
+Create Date: 2025-11-03
+
+Migration 031: Create daily feedback rollup tables for FeedbackCollector
+Purpose: Keep per-day counts of feedback types, tags and rejection reasons so
+pattern analysis reads a few indexed rows instead of every feedback_logs row.
+Rollups are keyed by (day, agent_type); agent_type '' stands for NULL.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20251103_31'
+down_revision = '20251103_30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create feedback rollup tables and backfill them from feedback_logs."""
+    op.create_table(
+        'feedback_daily_type_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('agent_type', sa.String(50), nullable=False),
+        sa.Column('feedback_type', sa.String(50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'agent_type', 'feedback_type')
+    )
+    op.create_index('idx_feedback_type_rollup_agent_day', 'feedback_daily_type_rollup', ['agent_type', 'day'])
+
+    op.create_table(
+        'feedback_daily_tag_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('agent_type', sa.String(50), nullable=False),
+        sa.Column('tag', sa.String(200), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'agent_type', 'tag')
+    )
+    op.create_index('idx_feedback_tag_rollup_agent_day', 'feedback_daily_tag_rollup', ['agent_type', 'day'])
+
+    op.create_table(
+        'feedback_daily_reason_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('agent_type', sa.String(50), nullable=False),
+        sa.Column('reason', sa.String(500), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'agent_type', 'reason')
+    )
+    op.create_index('idx_feedback_reason_rollup_agent_day', 'feedback_daily_reason_rollup', ['agent_type', 'day'])
+
+    # Raw log reads (get_feedback_by_agent) filter on agent_type + created_at
+    op.create_index('idx_feedback_logs_agent_created', 'feedback_logs', ['agent_type', 'created_at'])
+    op.create_index('idx_feedback_logs_created_at', 'feedback_logs', ['created_at'])
+
+    # Backfill from existing feedback
+    op.execute("""
+        INSERT INTO feedback_daily_type_rollup (day, agent_type, feedback_type, count)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, COALESCE(agent_type, ''), feedback_type, COUNT(*)
+        FROM feedback_logs
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        INSERT INTO feedback_daily_tag_rollup (day, agent_type, tag, count)
+        SELECT (f.created_at AT TIME ZONE 'UTC')::date, COALESCE(f.agent_type, ''), left(t.tag, 200), COUNT(*)
+        FROM feedback_logs f
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(f.tags) = 'array' THEN f.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        INSERT INTO feedback_daily_reason_rollup (day, agent_type, reason, count)
+        SELECT day, agent_type, reason, COUNT(*)
+        FROM (
+            SELECT (created_at AT TIME ZONE 'UTC')::date AS day,
+                   COALESCE(agent_type, '') AS agent_type,
+                   left(btrim(split_part(feedback_text, '.', 1), E' \\t\\r\\n'), 500) AS reason
+            FROM feedback_logs
+            WHERE feedback_type = 'rejection' AND feedback_text IS NOT NULL
+        ) reasons
+        WHERE reason <> ''
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Drop feedback rollup tables."""
+    op.drop_index('idx_feedback_logs_created_at', table_name='feedback_logs')
+    op.drop_index('idx_feedback_logs_agent_created', table_name='feedback_logs')
+    op.drop_index('idx_feedback_reason_rollup_agent_day', table_name='feedback_daily_reason_rollup')
+    op.drop_table('feedback_daily_reason_rollup')
+    op.drop_index('idx_feedback_tag_rollup_agent_day', table_name='feedback_daily_tag_rollup')
+    op.drop_table('feedback_daily_tag_rollup')
+    op.drop_index('idx_feedback_type_rollup_agent_day', table_name='feedback_daily_type_rollup')
+    op.drop_table('feedback_daily_type_rollup')
@@ -0,0 +1,34 @@
+"""add collaboration pair index
+
+Revision ID: 20251103_32
+Revises: 20251103_31
+Create Date: 2025-11-03
+
+Migration 032: Index request exchanges by agent pair
+Purpose: Loop detection reads the latest questions between two agents in
+each direction; a partial (from_agent_id, to_agent_id, timestamp) index on
+request exchanges answers each direction with a short backward index scan.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20251103_32'
+down_revision = '20251103_31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create partial pair index on request exchanges."""
+    op.create_index(
+        'idx_collab_exchanges_pair_requests',
+        'collaboration_exchanges',
+        ['from_agent_id', 'to_agent_id', 'timestamp'],
+        postgresql_where=sa.text("message_type = 'request'")
+    )
+
+
+def downgrade() -> None:
+    """Drop partial pair index."""
+    op.drop_index('idx_collab_exchanges_pair_requests', table_name='collaboration_exchanges')
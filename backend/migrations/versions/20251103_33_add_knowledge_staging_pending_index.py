@@ -0,0 +1,34 @@
+"""add knowledge staging pending index
+
+Revision ID: 20251103_33
+Revises: 20251103_32
+Create Date: 2025-11-03
+
+Migration 033: Index pending knowledge_staging rows by age
+Purpose: Checkpoint workers claim the oldest unembedded rows with
+FOR UPDATE SKIP LOCKED; a partial created_at index over embedded = false
+keeps each claim proportional to the batch, not the embedded history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20251103_33'
+down_revision = '20251103_32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create partial index on pending knowledge entries."""
+    op.create_index(
+        'idx_knowledge_staging_pending',
+        'knowledge_staging',
+        ['created_at'],
+        postgresql_where=sa.text('embedded = false')
+    )
+
+
+def downgrade() -> None:
+    """Drop partial index on pending knowledge entries."""
+    op.drop_index('idx_knowledge_staging_pending', table_name='knowledge_staging')
@@ -0,0 +1,64 @@
+"""create task queue table
+
+Revision ID: 20251103_34
+Revises: 20251103_33
+Create Date: 2025-11-03
+
+Migration 034: Create durable task queue for DurableTaskQueue
+Purpose: Queued orchestrator tasks survive restarts and can be shared by
+several backend processes. Workers lease rows with FOR UPDATE SKIP LOCKED;
+a lease that is not renewed by heartbeat expires and the task becomes
+available to other workers again.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '20251103_34'
+down_revision = '20251103_33'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create task_queue table with ready and lease indexes."""
+    op.create_table(
+        'task_queue',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('task_id', sa.String(255), nullable=False, unique=True),
+        sa.Column('project_id', sa.String(255), nullable=False),
+        sa.Column('agent_type', sa.String(50), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('task', postgresql.JSONB(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),  # queued, leased, done, failed
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('available_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('lease_owner', sa.String(255), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('result', postgresql.JSONB(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.CheckConstraint("status IN ('queued', 'leased', 'done', 'failed')", name='ck_task_queue_status')
+    )
+    # Dequeue order: highest priority first, then FIFO
+    op.create_index(
+        'idx_task_queue_ready',
+        'task_queue',
+        ['project_id', sa.text('priority DESC'), 'id'],
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'idx_task_queue_lease_expiry',
+        'task_queue',
+        ['project_id', 'lease_expires_at'],
+        postgresql_where=sa.text("status = 'leased'")
+    )
+
+
+def downgrade() -> None:
+    """Drop task_queue table."""
+    op.drop_index('idx_task_queue_lease_expiry', table_name='task_queue')
+    op.drop_index('idx_task_queue_ready', table_name='task_queue')
+    op.drop_table('task_queue')
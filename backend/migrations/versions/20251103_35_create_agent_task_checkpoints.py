@@ -0,0 +1,37 @@
+"""create agent task checkpoints
+
+Revision ID: 20251103_35
+Revises: 20251103_34
+Create Date: 2025-11-03
+
+Migration 035: Create agent_task_checkpoints for TaskCheckpointStore
+Purpose: BaseAgent.run_task records one row per completed step holding the
+compressed change to its TaskState. A task restarted after a crash replays
+these rows and resumes at the next step instead of step zero.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20251103_35'
+down_revision = '20251103_34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create agent_task_checkpoints table."""
+    op.create_table(
+        'agent_task_checkpoints',
+        sa.Column('task_id', sa.String(255), nullable=False),
+        sa.Column('step_number', sa.Integer(), nullable=False),
+        sa.Column('agent_id', sa.String(255), nullable=False),
+        sa.Column('state_delta', sa.LargeBinary(), nullable=False),  # zlib-compressed JSON
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.PrimaryKeyConstraint('task_id', 'step_number')
+    )
+
+
+def downgrade() -> None:
+    """Drop agent_task_checkpoints table."""
+    op.drop_table('agent_task_checkpoints')
@@ -41,7 +41,11 @@ class ToolExecution:
 
 @dataclass
 class Action:
-    """Action plan produced for the next execution step."""
+    """Action plan produced for the next execution step.
+
+    A multi-action step carries its ordered sub-actions in ``batch``; the
+    parent itself has no tool and only describes the step as a whole.
+    """
 
     description: str
     tool_name: Optional[str]
@@ -49,10 +53,14 @@ class Action:
     parameters: Dict[str, Any] = field(default_factory=dict)
     reasoning: str = ""
     metadata: Dict[str, Any] = field(default_factory=dict)
+    batch: List["Action"] = field(default_factory=list)
 
     def signature(self) -> str:
         """Return a deterministic signature for loop comparison."""
 
+        if self.batch:
+            return "&".join(action.signature() for action in self.batch)
+
         return "|".join(
             [
                 self.description or "",
@@ -62,6 +70,13 @@ class Action:
             ]
         )
 
+    def tool_names(self) -> List[str]:
+        """Return every tool this action (or its batch) uses."""
+
+        if self.batch:
+            return [action.tool_name for action in self.batch if action.tool_name]
+        return [self.tool_name] if self.tool_name else []
+
 
 @dataclass
 class Result:
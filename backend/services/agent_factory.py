@@ -7,6 +7,7 @@ Built-in agents load from prompt versioning system, specialists load inline prom
 Reference: Section 1.2.5 - Built-In Agents vs Specialists Separation
 """
 import logging
+import uuid
 from typing import Optional, Any
 
 from sqlalchemy import text
@@ -177,7 +178,7 @@ class AgentFactory:
             openai_adapter = llm_client.openai
         
         agent = agent_class(
-            agent_id=f"{agent_type}-{id(self)}",
+            agent_id=f"{agent_type}-{uuid.uuid4().hex[:12]}",  # Unique per instance (agent pools)
             agent_type=agent_type,
             orchestrator=orchestrator,
             llm_client=llm_client,
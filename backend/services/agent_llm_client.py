@@ -6,15 +6,84 @@ Translates agent requests into OpenAI completion calls.
 
 Reference: MVP Demo Plan - Agent coordination
 """
+import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from backend.services.llm_request_scheduler import RequestPriority
+from backend.services.llm_trace import LLMTracer, get_llm_tracer
 from backend.services.openai_adapter import OpenAIAdapter
+from backend.services.prompt_assembler import PromptAssembler, PromptSection
+from backend.services.streaming_json_parser import IncrementalJSONObjectParser
 from backend.models.agent_state import LLMCall
 
 logger = logging.getLogger(__name__)
 
+# Advertised cap for multi-action plans (BaseAgent enforces its own limit)
+MAX_ACTIONS_PER_STEP = 20
+
+# Static prompt parts - kept byte-identical across calls for prefix caching
+PLANNING_INSTRUCTIONS = """You plan the next action for an autonomous software agent.
+Only use tool_name values from AVAILABLE TOOLS, or null for actions without tools."""
+
+TOOLS_SCHEMA = """AVAILABLE TOOLS (use ONLY these):
+file_system:
+  - write: Create or update a file
+    Parameters: {"project_id": "<project_id>", "task_id": "<task_id>", "path": "filename.ext", "content": "file content"}
+  - read: Read a file
+    Parameters: {"project_id": "<project_id>", "task_id": "<task_id>", "path": "filename.ext"}
+  - list: List files in directory
+    Parameters: {"project_id": "<project_id>", "task_id": "<task_id>", "path": "directory/"}
+  - delete: Delete a file
+    Parameters: {"project_id": "<project_id>", "task_id": "<task_id>", "path": "filename.ext"}
+
+web_search:
+  - search: Search the web
+    Parameters: {"query": "search terms", "num_results": 10}
+
+deliverable:
+  - mark_complete: Mark current deliverable as complete
+    Parameters: {"deliverable_id": "<deliverable_id>", "status": "completed"}
+  - get_status: Get deliverable status
+    Parameters: {"deliverable_id": "<deliverable_id>"}
+
+IMPORTANT: Always include project_id and task_id for file_system operations!
+Replace <project_id>, <task_id> and <deliverable_id> with the identifiers given in the task."""
+
+PLAN_RESPONSE_FORMAT = f"""Respond with a JSON object:
+{{
+    "description": "Brief description of action",
+    "tool_name": "tool to use from AVAILABLE TOOLS (or null)",
+    "operation": "specific operation (or null)",
+    "parameters": {{}},
+    "reasoning": "Why this action will progress toward the goal"
+}}
+
+When several independent operations are needed (e.g. writing multiple files), you may
+batch up to {MAX_ACTIONS_PER_STEP} of them in one step instead, in execution order:
+{{
+    "description": "Brief description of the whole step",
+    "actions": [
+        {{"description": "...", "tool_name": "...", "operation": "...", "parameters": {{}}}}
+    ],
+    "reasoning": "Why these actions will progress toward the goal"
+}}"""
+
+EVALUATION_INSTRUCTIONS = """Evaluate if an agent action made progress toward its goal.
+
+Respond with JSON:
+{
+    "success": true/false,
+    "issues": ["list", "of", "issues"],
+    "metrics": {"progress_score": 0.0 to 1.0}
+}"""
+
+# Per-section caps inside the planning prompt
+HISTORY_STEPS = 8
+ARTIFACT_PREVIEW_TOKENS = 200
+
 
 class AgentLLMClient:
     """
@@ -25,54 +94,59 @@ class AgentLLMClient:
     - evaluate_progress: Validate step completion
     
     Uses OpenAI Adapter for actual LLM calls.
+    
+    In streaming mode the plan is parsed while it streams in and returned as
+    soon as the action fields are complete; the trailing ``reasoning`` keeps
+    streaming in the background and is exposed through
+    ``metadata["pending_reasoning"]`` (an asyncio.Task resolving to the text).
     """
     
-    def __init__(self, openai_adapter: OpenAIAdapter, default_model: str = "gpt-4o-mini"):
+    # Fields that must be decoded before a streamed action can be dispatched
+    ACTION_FIELDS = ("description", "tool_name", "operation", "parameters")
+    BATCH_FIELDS = ("description", "actions")
+    
+    def __init__(
+        self,
+        openai_adapter: OpenAIAdapter,
+        default_model: str = "gpt-4o-mini",
+        streaming: bool = False,
+        json_mode: bool = True,
+        max_prompt_tokens: int = 6000,
+        tracer: Optional[LLMTracer] = None
+    ):
         """
         Initialize agent LLM client.
         
         Args:
             openai_adapter: OpenAI adapter instance
             default_model: Default model for completions
+            streaming: Stream plans and dispatch actions before reasoning finishes
+            json_mode: Request JSON-object output so plans always parse
+            max_prompt_tokens: Per-call prompt budget for planning/evaluation
+            tracer: LLM trace channel (defaults to the process-wide tracer)
         """
         self.openai = openai_adapter
         self.default_model = default_model
+        self.streaming = streaming
+        self.json_mode = json_mode
+        self.prompt_assembler = PromptAssembler(model=default_model, max_prompt_tokens=max_prompt_tokens)
+        self.tracer = tracer or get_llm_tracer()
         logger.info("Agent LLM client initialized")
     
-    def _get_available_tools(self, task_state: Any) -> str:
-        """
-        Get list of available tools with parameter schemas.
-        
-        Returns formatted string of tools, operations, and required parameters.
-        """
-        # Get project_id and task_id from state
+    def _response_format_kwargs(self) -> Dict[str, Any]:
+        """Provider kwargs enabling JSON mode when configured."""
+        if not self.json_mode:
+            return {}
+        return {"response_format": {"type": "json_object"}}
+    
+    def _build_identifiers(self, task_state: Any) -> str:
+        """Per-task values to substitute into the tool parameters."""
         project_id = getattr(task_state, 'project_id', 'PROJECT_ID')
         task_id = getattr(task_state, 'task_id', 'TASK_ID')
-        
-        tools_help = f"""
-file_system:
-  - write: Create or update a file
-    Parameters: {{"project_id": "{project_id}", "task_id": "{task_id}", "path": "filename.ext", "content": "file content"}}
-  - read: Read a file
-    Parameters: {{"project_id": "{project_id}", "task_id": "{task_id}", "path": "filename.ext"}}
-  - list: List files in directory
-    Parameters: {{"project_id": "{project_id}", "task_id": "{task_id}", "path": "directory/"}}
-  - delete: Delete a file
-    Parameters: {{"project_id": "{project_id}", "task_id": "{task_id}", "path": "filename.ext"}}
-
-web_search:
-  - search: Search the web
-    Parameters: {{"query": "search terms", "num_results": 10}}
-
-deliverable:
-  - mark_complete: Mark current deliverable as complete
-    Parameters: {{"deliverable_id": "{task_id}", "status": "completed"}}
-  - get_status: Get deliverable status
-    Parameters: {{"deliverable_id": "{task_id}"}}
-
-IMPORTANT: Always include project_id and task_id for file_system operations!
-"""
-        return tools_help.strip()
+        return (
+            f"Identifiers for this task: project_id=\"{project_id}\", task_id=\"{task_id}\", "
+            f"deliverable_id=\"{task_id}\""
+        )
     
     def _calculate_cost(self, tokens: int, model: str) -> float:
         """
@@ -123,68 +197,58 @@ IMPORTANT: Always include project_id and task_id for file_system operations!
             - operation: Specific operation
             - parameters: Operation parameters
             - reasoning: Why this action
+            or, for a multi-action step, description, actions (list of
+            tool_name/operation/parameters dicts) and reasoning
         """
-        # Build context
-        context = self._build_planning_context(task_state, previous_action, previous_result, attempt)
+        sections = [
+            PromptSection(
+                "goal",
+                f"Plan the next action for this task.\n\nGoal: {task_state.goal}",
+                priority=10,
+                min_tokens=256,
+            ),
+            PromptSection("identifiers", self._build_identifiers(task_state), priority=100),
+            PromptSection(
+                "progress",
+                "Current Progress:\n"
+                f"- Step: {task_state.current_step}/{task_state.max_steps}\n"
+                f"- Progress Score: {task_state.progress_score:.2f}",
+                priority=100,
+            ),
+            PromptSection(
+                "context",
+                self._build_planning_context(task_state, previous_action, previous_result, attempt),
+                priority=8,
+                min_tokens=128,
+            ),
+            PromptSection("history", self._build_history(task_state), priority=2, keep="tail"),
+            PromptSection("artifacts", self._build_artifacts(task_state), priority=1),
+        ]
         
-        # Build messages
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        # Stable parts first so consecutive steps share a cacheable prefix
+        prompt = self.prompt_assembler.assemble(
+            prefix_parts=[system_prompt, PLANNING_INSTRUCTIONS, TOOLS_SCHEMA, PLAN_RESPONSE_FORMAT],
+            sections=sections,
+        )
+        messages = prompt.messages
+        if prompt.truncated_sections:
+            logger.debug(
+                "Planning prompt trimmed %s tokens from %s",
+                prompt.tokens_trimmed,
+                prompt.truncated_sections,
+            )
         
-        # Get available tools for this agent
-        available_tools = self._get_available_tools(task_state)
+        agent_id = getattr(task_state, 'agent_id', None) or "unknown"
         
-        messages.append({
-            "role": "user",
-            "content": f"""Plan the next action for this task.
-
-Goal: {task_state.goal}
-
-Current Progress:
-- Step: {task_state.current_step}/{task_state.max_steps}
-- Progress Score: {task_state.progress_score:.2f}
-
-{context}
-
-AVAILABLE TOOLS (use ONLY these):
-{available_tools}
-
-IMPORTANT: Only use tool_name from the list above, or set to null for actions without tools.
-
-Respond with a JSON object:
-{{
-    "description": "Brief description of action",
-    "tool_name": "tool to use from AVAILABLE TOOLS (or null)",
-    "operation": "specific operation (or null)", 
-    "parameters": {{}},
-    "reasoning": "Why this action will progress toward the goal"
-}}"""
-        })
-        
-        # Get agent info from task_state for logging
-        agent_name = "Unknown Agent"
-        if hasattr(task_state, 'agent_id'):
-            agent_name = task_state.agent_id.split('-')[0].title() if task_state.agent_id else "Unknown Agent"
-        
-        # Log only USER prompts (skip system - we know those from config)
-        user_messages = [msg for msg in messages if msg.get("role") == "user"]
-        if user_messages:
-            prompt_output = "=" * 80 + "\n"
-            prompt_output += f"🔵 ORCHESTRATOR → {agent_name.upper()}\n"
-            prompt_output += "=" * 80 + "\n"
-            for msg in user_messages:
-                prompt_output += msg.get("content", "") + "\n"
-            prompt_output += "=" * 80 + "\n"
-            
-            logger.info(prompt_output)
-            print(prompt_output)  # Also print to console
+        if self.streaming:
+            return await self._plan_streaming(task_state, messages, agent_id)
         
         # Call OpenAI
         response = await self.openai.chat_completion(
             model=self.default_model,
             messages=messages,
-            temperature=0.7
+            temperature=0.7,
+            **self._response_format_kwargs()
         )
         
         # Parse response
@@ -192,11 +256,26 @@ Respond with a JSON object:
         
         # Collect metadata for cost tracking
         tokens_used = getattr(response.usage, 'total_tokens', 0) if hasattr(response, 'usage') else 0
+        self.prompt_assembler.record_usage(getattr(response, 'usage', None))
+        self._record_llm_call(task_state, messages, content, tokens_used, agent_id)
+        
+        return self._parse_action(content)
+    
+    def _record_llm_call(
+        self,
+        task_state: Any,
+        messages: List[Dict[str, str]],
+        content: str,
+        tokens_used: int,
+        agent_id: str
+    ) -> None:
+        """Attach an LLMCall record to the task state and trace the exchange."""
         cost_usd = self._calculate_cost(tokens_used, self.default_model)
         
-        # Create LLMCall record for tracking
+        # Keep a reference to the user prompt rather than re-serializing it
+        user_prompts = [msg["content"] for msg in messages if msg.get("role") == "user"]
         llm_call = LLMCall(
-            prompt=str([msg for msg in messages if msg.get("role") == "user"]),
+            prompt=user_prompts[0] if len(user_prompts) == 1 else "\n\n".join(user_prompts),
             response=content,
             tokens_used=tokens_used,
             cost_usd=cost_usd
@@ -206,21 +285,24 @@ Respond with a JSON object:
         if hasattr(task_state, 'llm_calls'):
             task_state.llm_calls.append(llm_call)
         
-        # Log the actual response (to logger AND console)
-        response_output = "=" * 80 + "\n"
-        response_output += f"🤖 {agent_name.upper()} → ORCHESTRATOR\n"
-        response_output += "=" * 80 + "\n"
-        response_output += content + "\n"
-        response_output += "-" * 80 + "\n"
-        response_output += f"💰 Tokens: {tokens_used} | Cost: ${cost_usd:.6f}\n"
-        response_output += "=" * 80 + "\n"
-        
-        logger.info(response_output)
-        print(response_output)  # Also print to console
-        
+        logger.debug("LLM call for %s: tokens=%s cost=$%.6f", agent_id, tokens_used, cost_usd)
+        if self.tracer.sample():
+            self.tracer.record(
+                "agent.plan",
+                messages=messages,
+                response=content,
+                agent_id=agent_id,
+                task_id=getattr(task_state, 'task_id', None),
+                model=self.default_model,
+                tokens=tokens_used,
+                cost_usd=cost_usd,
+            )
+    
+    def _parse_action(self, content: str) -> Dict[str, Any]:
+        """Parse a complete plan response, falling back to a text action."""
         try:
             action = json.loads(content)
-            logger.info(f"✅ Parsed action: {action.get('description', 'Unknown')}")
+            logger.debug("Parsed action: %s", action.get('description', 'Unknown'))
             return action
         except json.JSONDecodeError:
             # Fallback if not valid JSON
@@ -233,6 +315,103 @@ Respond with a JSON object:
                 "reasoning": content
             }
     
+    async def _plan_streaming(
+        self,
+        task_state: Any,
+        messages: List[Dict[str, str]],
+        agent_id: str
+    ) -> Dict[str, Any]:
+        """
+        Stream the plan and return as soon as the action fields are decoded.
+        
+        The remainder of the stream is drained by a background task that
+        records the LLMCall and resolves to the final reasoning text.
+        """
+        started = time.monotonic()
+        parser = IncrementalJSONObjectParser()
+        usage: Dict[str, Any] = {}
+        chunks = self.openai.stream_chat_completion(
+            model=self.default_model,
+            messages=messages,
+            temperature=0.7,
+            **self._response_format_kwargs()
+        )
+        
+        texts = self._iter_stream_text(chunks, usage)
+        
+        async for text in texts:
+            parser.feed(text)
+            ready_fields = self._ready_action_fields(parser)
+            if ready_fields:
+                break
+        else:
+            # Stream ended before the action was complete - parse as a whole
+            self.prompt_assembler.record_usage(usage.get("raw"))
+            self._record_llm_call(task_state, messages, parser.buffer, usage.get("total_tokens", 0), agent_id)
+            return self._parse_action(parser.buffer)
+        
+        time_to_action_ms = int((time.monotonic() - started) * 1000)
+        logger.debug("Streamed action ready after %sms", time_to_action_ms)
+        
+        action = {name: parser.fields[name] for name in ready_fields}
+        action["reasoning"] = parser.fields.get("reasoning", "")
+        
+        pending = asyncio.create_task(
+            self._drain_stream(texts, chunks, usage, parser, task_state, messages, agent_id)
+        )
+        pending.add_done_callback(_log_task_failure)
+        action["metadata"] = {
+            "pending_reasoning": pending,
+            "time_to_action_ms": time_to_action_ms,
+        }
+        return action
+    
+    def _ready_action_fields(self, parser: IncrementalJSONObjectParser) -> Tuple[str, ...]:
+        """Return the decoded field set (single or batch) once dispatchable."""
+        if parser.has_fields(self.BATCH_FIELDS):
+            return self.BATCH_FIELDS
+        if parser.has_fields(self.ACTION_FIELDS):
+            return self.ACTION_FIELDS
+        return ()
+    
+    async def _drain_stream(
+        self,
+        texts: AsyncIterator[str],
+        chunks: AsyncIterator[Any],
+        usage: Dict[str, Any],
+        parser: IncrementalJSONObjectParser,
+        task_state: Any,
+        messages: List[Dict[str, str]],
+        agent_id: str
+    ) -> str:
+        """Consume the rest of a plan stream and return its reasoning."""
+        try:
+            async for text in texts:
+                parser.feed(text)
+        finally:
+            await texts.aclose()
+            await chunks.aclose()
+        
+        self.prompt_assembler.record_usage(usage.get("raw"))
+        self._record_llm_call(task_state, messages, parser.buffer, usage.get("total_tokens", 0), agent_id)
+        reasoning = parser.fields.get("reasoning")
+        return reasoning if isinstance(reasoning, str) else ""
+    
+    @staticmethod
+    async def _iter_stream_text(
+        chunks: AsyncIterator[Any],
+        usage: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Yield content deltas from chunks, capturing usage from the last one."""
+        async for chunk in chunks:
+            if getattr(chunk, "usage", None) is not None:
+                usage["total_tokens"] = chunk.usage.total_tokens
+                usage["raw"] = chunk.usage
+            for choice in chunk.choices or []:
+                text = getattr(choice.delta, "content", None)
+                if text:
+                    yield text
+    
     async def evaluate_progress(
         self,
         task_state: Any,
@@ -253,33 +432,26 @@ Respond with a JSON object:
             - issues: List[str]
             - metrics: Dict[str, Any]
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        messages.append({
-            "role": "user",
-            "content": f"""Evaluate if this action made progress toward the goal.
-
-Goal: {task_state.goal}
-
-Result:
-Success: {result.success}
-Output: {result.output}
-Error: {result.error}
-
-Respond with JSON:
-{{
-    "success": true/false,
-    "issues": ["list", "of", "issues"],
-    "metrics": {{"progress_score": 0.0 to 1.0}}
-}}"""
-        })
+        prompt = self.prompt_assembler.assemble(
+            prefix_parts=[system_prompt, EVALUATION_INSTRUCTIONS],
+            sections=[
+                PromptSection("goal", f"Goal: {task_state.goal}", priority=10, min_tokens=256),
+                PromptSection(
+                    "result",
+                    f"Result:\nSuccess: {result.success}\nError: {result.error}",
+                    priority=100,
+                ),
+                PromptSection("output", f"Output: {result.output}", priority=1, min_tokens=64),
+            ],
+        )
+        messages = prompt.messages
         
         response = await self.openai.chat_completion(
             model=self.default_model,
             messages=messages,
-            temperature=0.3  # Lower temp for evaluation
+            temperature=0.3,  # Lower temp for evaluation
+            priority=RequestPriority.BACKGROUND,
+            **self._response_format_kwargs()
         )
         
         content = response.choices[0].message.content
@@ -294,6 +466,34 @@ Respond with JSON:
                 "metrics": {"progress_score": 0.5 if result.success else 0.0}
             }
     
+    async def simple_completion(
+        self,
+        prompt: str,
+        max_tokens: int = 16,
+        priority: RequestPriority = RequestPriority.BACKGROUND
+    ) -> str:
+        """
+        Single-prompt completion for short checks (e.g. self-assessment).
+
+        Routed through the adapter so it shares the scheduler's rate budget.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token cap
+            priority: Scheduling priority
+
+        Returns:
+            Completion text
+        """
+        response = await self.openai.chat_completion(
+            model=self.default_model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            priority=priority,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content or ""
+
     def _build_planning_context(
         self,
         task_state: Any,
@@ -323,3 +523,33 @@ Respond with JSON:
                 context_parts.append(f"Last step: {last_step.reasoning}")
         
         return "\n".join(context_parts) if context_parts else "No prior context"
+    
+    def _build_history(self, task_state: Any) -> str:
+        """Summarize recent steps (most recent last; trimmed from the front)."""
+        steps = getattr(task_state, 'steps_history', None) or []
+        if not steps:
+            return ""
+        
+        lines = ["Recent steps:"]
+        for step in steps[-HISTORY_STEPS:]:
+            outcome = "ok" if step.validation.success else f"failed: {step.result.error or 'no progress'}"
+            lines.append(f"  {step.step_number}. {step.action.description} -> {outcome}")
+        return "\n".join(lines)
+    
+    def _build_artifacts(self, task_state: Any) -> str:
+        """List produced artifacts with short previews."""
+        artifacts = getattr(task_state, 'artifacts', None) or {}
+        if not artifacts:
+            return ""
+        
+        lines = ["Artifacts so far:"]
+        for name, value in artifacts.items():
+            preview = self.prompt_assembler.fit(str(value), ARTIFACT_PREVIEW_TOKENS)
+            lines.append(f"  {name}: {preview}")
+        return "\n".join(lines)
+
+
+def _log_task_failure(task: "asyncio.Task[Any]") -> None:
+    """Surface errors from background stream drains instead of dropping them."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background plan stream failed: {task.exception()}")
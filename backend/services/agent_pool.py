@@ -0,0 +1,154 @@
+"""
+Agent Pool
+
+Per-agent-type pools of agent instances for TaskExecutor. Tasks go to the
+member with the fewest outstanding tasks (least recently used on ties),
+so concurrent workers spread across instances instead of sharing one.
+
+Pools grow toward ``ceil(demand / tasks_per_agent)`` members, where demand
+is queued plus running tasks of that type, bounded by ``min_size`` and
+``max_size``. New members come from a factory. Members idle longer than
+``idle_timeout`` are reaped down to ``min_size``.
+
+Example:
+    pool = AgentPool("backend_developer", factory=create_backend_agent)
+    pool.add(agent)
+    await pool.scale(queued=3)
+    agent = pool.acquire()
+    try:
+        await agent.run_task(task)
+    finally:
+        pool.release(agent)
+
+Reference: Phase 3.5 - Backend Integration
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from backend.agents.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+AgentFactoryFn = Callable[[str], Awaitable[BaseAgent]]
+
+
+@dataclass
+class PoolConfig:
+    """Sizing limits shared by all agent pools of an executor."""
+    min_size: int = 1
+    max_size: int = 4
+    tasks_per_agent: int = 1  # Target outstanding tasks per member when scaling
+    idle_timeout: float = 300.0  # Seconds before an idle member above min_size is reaped
+
+
+@dataclass
+class _Member:
+    agent: BaseAgent
+    outstanding: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class AgentPool:
+    """Instances of one agent type with least-outstanding-work dispatch."""
+
+    def __init__(
+        self,
+        agent_type: str,
+        factory: Optional[AgentFactoryFn] = None,
+        config: Optional[PoolConfig] = None
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            agent_type: Agent type served by this pool
+            factory: Coroutine creating a new agent of ``agent_type``
+                (without it the pool only holds added instances)
+            config: Sizing limits
+        """
+        self.agent_type = agent_type
+        self.factory = factory
+        self.config = config or PoolConfig()
+        self._members: Dict[str, _Member] = {}
+        self._scale_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def outstanding(self) -> int:
+        return sum(member.outstanding for member in self._members.values())
+
+    def agents(self) -> List[BaseAgent]:
+        return [member.agent for member in self._members.values()]
+
+    def add(self, agent: BaseAgent) -> None:
+        self._members.setdefault(agent.agent_id, _Member(agent))
+
+    def acquire(self) -> Optional[BaseAgent]:
+        """Least loaded member, marked busy until release(); None if empty."""
+        if not self._members:
+            return None
+        member = min(self._members.values(), key=lambda m: (m.outstanding, m.last_used))
+        member.outstanding += 1
+        member.last_used = time.monotonic()
+        return member.agent
+
+    def release(self, agent: BaseAgent) -> None:
+        member = self._members.get(agent.agent_id)
+        if member is not None:
+            member.outstanding = max(0, member.outstanding - 1)
+            member.last_used = time.monotonic()
+
+    def desired_size(self, queued: int) -> int:
+        demand = queued + self.outstanding
+        wanted = math.ceil(demand / max(self.config.tasks_per_agent, 1))
+        return min(self.config.max_size, max(self.config.min_size, wanted))
+
+    async def scale(self, queued: int) -> List[BaseAgent]:
+        """
+        Grow toward the size needed for ``queued`` waiting tasks.
+
+        Returns:
+            Newly created agents
+        """
+        created: List[BaseAgent] = []
+        if self.factory is None:
+            return created
+        async with self._scale_lock:
+            while len(self._members) < self.desired_size(queued):
+                try:
+                    agent = await self.factory(self.agent_type)
+                except Exception as e:
+                    logger.error(f"Failed to grow {self.agent_type} pool: {e}", exc_info=True)
+                    break
+                self.add(agent)
+                created.append(agent)
+        if created:
+            logger.info(f"Scaled {self.agent_type} pool to {len(self._members)} agents")
+        return created
+
+    def reap_idle(self, now: Optional[float] = None) -> List[BaseAgent]:
+        """
+        Remove members idle longer than idle_timeout, keeping min_size.
+
+        Returns:
+            Removed agents
+        """
+        now = time.monotonic() if now is None else now
+        idle = sorted(
+            (m for m in self._members.values()
+             if m.outstanding == 0 and now - m.last_used >= self.config.idle_timeout),
+            key=lambda m: m.last_used,
+        )
+        removable = max(0, len(self._members) - self.config.min_size)
+        reaped = [member.agent for member in idle[:removable]]
+        for agent in reaped:
+            del self._members[agent.agent_id]
+        if reaped:
+            logger.info(f"Reaped {len(reaped)} idle {self.agent_type} agents")
+        return reaped
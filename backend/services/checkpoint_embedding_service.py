@@ -4,16 +4,63 @@ Checkpoint Embedding Service
 Processes knowledge_staging entries at checkpoints and generates embeddings.
 Triggered at phase/project completion, not real-time.
 
+Each worker runs a two-stage pipeline: while one batch is being upserted to
+Qdrant and marked embedded, the next batch is already claimed and embedded.
+Batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED and the row locks
+are held until the batch is marked, so concurrent workers (in this process or
+others) never embed the same entry twice, and a failed batch is simply
+released for a later checkpoint.
+
 Reference: Section 1.5.1 - RAG System Architecture
 """
+import asyncio
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from typing import List, Dict, Any, Optional
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from qdrant_client.models import PointStruct
+
+from backend.services.llm_request_scheduler import (
+    LLMRequestScheduler,
+    RequestPriority,
+    get_llm_request_scheduler,
+)
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+KNOWLEDGE_COLLECTION = "helix_knowledge"
+
+
+@dataclass
+class _ClaimedBatch:
+    """Entries locked by one open transaction, with their embeddings."""
+    conn: Connection
+    entries: List[Dict[str, Any]]
+    embeddings: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class _CheckpointRun:
+    """Counters shared by the workers of one checkpoint."""
+    max_batches: Optional[int]
+    batches_claimed: int = 0
+    processed: int = 0
+    embedded: int = 0
+    failed: int = 0
+    # Set on the first failed batch; released entries wait for the next checkpoint
+    halted: bool = False
+
+    def take_batch(self) -> bool:
+        if self.halted:
+            return False
+        if self.max_batches is not None and self.batches_claimed >= self.max_batches:
+            return False
+        self.batches_claimed += 1
+        return True
+
 
 class CheckpointEmbeddingService:
     """
@@ -25,11 +72,11 @@ class CheckpointEmbeddingService:
     - Project cancellation
     - Manual trigger
     
-    Process:
-    1. Query knowledge_staging WHERE embedded=false
-    2. Generate embeddings via OpenAI (batch of 50)
-    3. Store in Qdrant
-    4. Mark as embedded
+    Process (per batch of 50):
+    1. Claim knowledge_staging rows WHERE embedded=false (FOR UPDATE SKIP LOCKED)
+    2. Generate all embeddings in one OpenAI request
+    3. Upsert the batch to Qdrant in one request
+    4. Mark the batch embedded in one UPDATE and commit (releasing the locks)
     
     Example:
         service = CheckpointEmbeddingService(engine, qdrant_client, openai_client)
@@ -44,7 +91,9 @@ class CheckpointEmbeddingService:
         self,
         engine: Engine,
         qdrant_client=None,
-        openai_client=None
+        openai_client=None,
+        collection_name: str = KNOWLEDGE_COLLECTION,
+        scheduler: Optional[LLMRequestScheduler] = None
     ):
         """
         Initialize checkpoint embedding service.
@@ -52,11 +101,15 @@ class CheckpointEmbeddingService:
         Args:
             engine: SQLAlchemy engine
             qdrant_client: Qdrant client (for vector storage)
-            openai_client: OpenAI client (for embeddings)
+            openai_client: Async OpenAI client (for embeddings)
+            collection_name: Qdrant collection receiving the vectors
+            scheduler: Request scheduler (defaults to the process-wide instance)
         """
         self.engine = engine
         self.qdrant_client = qdrant_client
         self.openai_client = openai_client
+        self.collection_name = collection_name
+        self.scheduler = scheduler or get_llm_request_scheduler()
         logger.info("CheckpointEmbeddingService initialized")
     
     async def process_checkpoint(
@@ -64,7 +117,8 @@ class CheckpointEmbeddingService:
         checkpoint_type: str,
         *,
         project_id: Optional[str] = None,
-        batch_limit: Optional[int] = None
+        batch_limit: Optional[int] = None,
+        workers: int = 1
     ) -> Dict[str, Any]:
         """
         Process a checkpoint and generate embeddings.
@@ -72,220 +126,205 @@ class CheckpointEmbeddingService:
         Args:
             checkpoint_type: Type of checkpoint (phase_completion, project_completion, etc.)
             project_id: Optional project filter
-            batch_limit: Optional limit on batches to process
+            batch_limit: Optional limit on batches to process (default: drain all pending)
+            workers: Concurrent claim/embed/store pipelines
         
         Returns:
             Dict with processing results
         """
         logger.info(
-            "Processing checkpoint | type=%s | project=%s",
+            "Processing checkpoint | type=%s | project=%s | workers=%d",
             checkpoint_type,
-            project_id or "all"
+            project_id or "all",
+            workers
         )
         
-        # Get pending knowledge entries
-        pending_entries = await self._get_pending_entries(
-            project_id=project_id,
-            limit=batch_limit or self.BATCH_SIZE
-        )
+        run = _CheckpointRun(max_batches=batch_limit)
         
-        if not pending_entries:
-            logger.info("No pending knowledge entries to process")
-            return {
-                "checkpoint_type": checkpoint_type,
-                "processed_count": 0,
-                "embedded_count": 0,
-                "failed_count": 0
-            }
+        if not self.openai_client or not self.qdrant_client:
+            logger.warning("Embedding or vector client unavailable, skipping checkpoint")
+        else:
+            await asyncio.gather(*(
+                self._run_pipeline(run, project_id) for _ in range(max(1, workers))
+            ))
         
-        logger.info(
-            "Found %d pending entries for embedding",
-            len(pending_entries)
-        )
-        
-        # Process in batches
-        embedded_count = 0
-        failed_count = 0
-        
-        for i in range(0, len(pending_entries), self.BATCH_SIZE):
-            batch = pending_entries[i:i + self.BATCH_SIZE]
-            
+        if run.processed == 0:
+            logger.info("No pending knowledge entries to process")
+        else:
             logger.info(
-                "Processing batch %d/%d (%d items)",
-                (i // self.BATCH_SIZE) + 1,
-                (len(pending_entries) + self.BATCH_SIZE - 1) // self.BATCH_SIZE,
-                len(batch)
+                "Checkpoint processing complete | batches=%d | embedded=%d | failed=%d",
+                run.batches_claimed,
+                run.embedded,
+                run.failed
             )
-            
-            # Generate embeddings for batch
-            results = await self._process_batch(batch, checkpoint_type)
-            
-            embedded_count += results["embedded"]
-            failed_count += results["failed"]
-        
-        logger.info(
-            "Checkpoint processing complete | embedded=%d | failed=%d",
-            embedded_count,
-            failed_count
-        )
         
         return {
             "checkpoint_type": checkpoint_type,
-            "processed_count": len(pending_entries),
-            "embedded_count": embedded_count,
-            "failed_count": failed_count
+            "processed_count": run.processed,
+            "embedded_count": run.embedded,
+            "failed_count": run.failed
         }
     
-    async def _get_pending_entries(
+    async def _run_pipeline(self, run: _CheckpointRun, project_id: Optional[str]) -> None:
+        """Claim and embed the next batch while the previous one is being stored."""
+        storing: Optional[asyncio.Task] = None
+        try:
+            while True:
+                batch = await self._claim_and_embed(run, project_id) if run.take_batch() else None
+                if storing is not None:
+                    await storing
+                    storing = None
+                if batch is None:
+                    return
+                storing = asyncio.create_task(self._store_batch(run, batch))
+        finally:
+            if storing is not None:
+                await storing
+    
+    async def _claim_and_embed(
         self,
+        run: _CheckpointRun,
+        project_id: Optional[str]
+    ) -> Optional[_ClaimedBatch]:
+        """Lock the next pending batch and generate its embeddings."""
+        conn = self.engine.connect()
+        try:
+            entries = self._claim_pending_entries(conn, project_id, self.BATCH_SIZE)
+        except Exception:
+            conn.close()
+            raise
+        
+        if not entries:
+            conn.close()
+            return None
+        
+        run.processed += len(entries)
+        batch = _ClaimedBatch(conn=conn, entries=entries)
+        try:
+            batch.embeddings = await self._generate_embeddings([e["content"] for e in entries])
+        except Exception as e:
+            logger.error("Failed to generate embeddings | batch_size=%d | error=%s", len(entries), e)
+            run.failed += len(entries)
+            run.halted = True
+            self._release(batch)
+            return None
+        return batch
+    
+    async def _store_batch(self, run: _CheckpointRun, batch: _ClaimedBatch) -> None:
+        """Upsert a batch to Qdrant, then mark it embedded and release its locks."""
+        try:
+            await self._store_in_qdrant(batch.entries, batch.embeddings)
+            self._mark_as_embedded(batch.conn, [e["id"] for e in batch.entries])
+            batch.conn.commit()
+        except Exception as e:
+            logger.error("Failed to store batch | batch_size=%d | error=%s", len(batch.entries), e)
+            run.failed += len(batch.entries)
+            run.halted = True
+            self._release(batch)
+            return
+        batch.conn.close()
+        run.embedded += len(batch.entries)
+    
+    def _release(self, batch: _ClaimedBatch) -> None:
+        """Roll back a claim so its entries are retried at the next checkpoint."""
+        try:
+            batch.conn.rollback()
+        finally:
+            batch.conn.close()
+    
+    def _claim_pending_entries(
+        self,
+        conn: Connection,
         project_id: Optional[str],
         limit: int
     ) -> List[Dict[str, Any]]:
-        """Query pending knowledge entries from staging."""
+        """Lock up to ``limit`` pending entries not already claimed by another worker."""
         query_str = """
             SELECT id, knowledge_type, content, metadata
             FROM knowledge_staging
             WHERE embedded = false
         """
+        params: Dict[str, Any] = {"limit": limit}
         
         if project_id:
             query_str += " AND metadata->>'project_id' = :project_id"
+            params["project_id"] = project_id
         
-        query_str += " ORDER BY created_at ASC LIMIT :limit"
-        
-        query = text(query_str)
-        
-        with self.engine.connect() as conn:
-            if project_id:
-                result = conn.execute(query, {"project_id": project_id, "limit": limit})
-            else:
-                result = conn.execute(query, {"limit": limit})
-            
-            entries = []
-            for row in result.fetchall():
-                entries.append({
-                    "id": row[0],
-                    "knowledge_type": row[1],
-                    "content": row[2],
-                    "metadata": row[3]  # Already parsed as dict
-                })
-            
-            return entries
-    
-    async def _process_batch(
-        self,
-        batch: List[Dict[str, Any]],
-        checkpoint_type: str
-    ) -> Dict[str, int]:
-        """Process a batch of entries."""
-        embedded = 0
-        failed = 0
+        query_str += " ORDER BY created_at ASC LIMIT :limit FOR UPDATE SKIP LOCKED"
         
-        for entry in batch:
-            try:
-                # Generate embedding
-                embedding = await self._generate_embedding(entry["content"])
-                
-                if not embedding:
-                    logger.warning("Failed to generate embedding | id=%s", entry["id"])
-                    failed += 1
-                    continue
-                
-                # Store in Qdrant
-                await self._store_in_qdrant(
-                    entry_id=entry["id"],
-                    embedding=embedding,
-                    content=entry["content"],
-                    metadata=entry["metadata"]
-                )
-                
-                # Mark as embedded
-                await self._mark_as_embedded(entry["id"])
-                
-                embedded += 1
-                
-            except Exception as e:
-                logger.error(
-                    "Error processing entry | id=%s | error=%s",
-                    entry["id"],
-                    str(e)
-                )
-                failed += 1
-        
-        return {"embedded": embedded, "failed": failed}
+        result = conn.execute(text(query_str), params)
+        return [
+            {
+                "id": row[0],
+                "knowledge_type": row[1],
+                "content": row[2],
+                "metadata": row[3] or {}  # Already parsed as dict
+            }
+            for row in result.fetchall()
+        ]
     
-    async def _generate_embedding(self, text: str) -> Optional[List[float]]:
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Generate embedding for text using OpenAI.
+        Generate embeddings for a batch of texts in one OpenAI request.
         
-        Uses text-embedding-3-small (1536 dimensions).
+        Uses text-embedding-3-small (1536 dimensions). The request is
+        admitted by the shared scheduler at background priority, so
+        checkpoint backfills queue behind interactive agent traffic.
         """
-        if not self.openai_client:
-            logger.warning("No OpenAI client available, skipping embedding")
-            return None
-        
-        try:
-            # Call OpenAI embeddings API
-            # response = await self.openai_client.embeddings.create(
-            #     model="text-embedding-3-small",
-            #     input=text
-            # )
-            # return response.data[0].embedding
-            
-            # Placeholder for now
-            logger.debug("Would generate embedding for text (length=%d)", len(text))
-            return [0.0] * 1536  # Dummy embedding
-            
-        except Exception as e:
-            logger.error("Failed to generate embedding: %s", e)
-            return None
+        estimated_tokens = sum(len(text) // 4 + 1 for text in texts)
+        async with self.scheduler.slot(
+            EMBEDDING_MODEL, estimated_tokens, RequestPriority.BACKGROUND
+        ):
+            response = await self.openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=texts
+            )
+        # The API returns one item per input, tagged with its input index
+        data = sorted(response.data, key=lambda item: item.index)
+        if len(data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(data)}")
+        return [item.embedding for item in data]
     
     async def _store_in_qdrant(
         self,
-        entry_id: str,
-        embedding: List[float],
-        content: str,
-        metadata: Dict[str, Any]
+        entries: List[Dict[str, Any]],
+        embeddings: List[List[float]]
     ) -> None:
-        """Store vector and metadata in Qdrant."""
-        if not self.qdrant_client:
-            logger.warning("No Qdrant client available, skipping storage")
-            return
+        """Upsert a batch of vectors and payloads to Qdrant in one request."""
+        points = [
+            PointStruct(
+                id=str(entry["id"]),
+                vector=embedding,
+                payload={
+                    **entry["metadata"],
+                    "content": entry["content"][:1000],  # Truncate for storage
+                    "knowledge_type": entry["knowledge_type"]
+                }
+            )
+            for entry, embedding in zip(entries, embeddings)
+        ]
         
-        try:
-            # self.qdrant_client.upsert(
-            #     collection_name="helix_knowledge",
-            #     points=[{
-            #         "id": entry_id,
-            #         "vector": embedding,
-            #         "payload": {
-            #             "content": content[:1000],  # Truncate for storage
-            #             **metadata
-            #         }
-            #     }]
-            # )
-            
-            # Placeholder for now
-            logger.debug("Would store in Qdrant | id=%s", entry_id)
-            
-        except Exception as e:
-            logger.error("Failed to store in Qdrant: %s", e)
-            raise
+        # Qdrant client is synchronous; wait=True so rows are only marked
+        # embedded once the points are durable
+        await asyncio.to_thread(
+            self.qdrant_client.upsert,
+            collection_name=self.collection_name,
+            points=points,
+            wait=True
+        )
     
-    async def _mark_as_embedded(self, entry_id: str) -> None:
-        """Mark knowledge entry as embedded."""
+    def _mark_as_embedded(self, conn: Connection, entry_ids: List[Any]) -> None:
+        """Mark a batch of knowledge entries as embedded (caller commits)."""
         query = text("""
             UPDATE knowledge_staging
             SET embedded = true, embedded_at = :embedded_at
-            WHERE id = :id
+            WHERE id = ANY(:ids)
         """)
         
-        with self.engine.connect() as conn:
-            conn.execute(query, {
-                "id": entry_id,
-                "embedded_at": datetime.now(UTC)
-            })
-            conn.commit()
+        conn.execute(query, {
+            "ids": list(entry_ids),
+            "embedded_at": datetime.now(UTC)
+        })
     
     async def get_pending_count(self, project_id: Optional[str] = None) -> int:
         """Get count of pending knowledge entries."""
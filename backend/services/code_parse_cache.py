@@ -0,0 +1,184 @@
+"""
+Code Parse Cache
+
+Shared, content-hash-keyed cache of Python ASTs and function symbol tables
+for the test tooling services (TestMaintainer, TestGenerator,
+EdgeCaseFinder, TestQualityScorer). Each distinct source text is parsed
+once; every service reads the same ParsedModule.
+
+Functions carry a structural hash (of the AST dump without positions), so
+formatting- or comment-only edits do not count as changes and change
+detection reduces to a dict diff by qualified name.
+
+Reference: Phase 3.2 - Testing Framework Integration
+"""
+import ast
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass
+class FunctionSymbol:
+    """One function or method definition."""
+    name: str
+    qualname: str
+    node: ast.AST
+    lineno: int
+    args: List[str]
+    is_async: bool
+    structural_hash: str
+
+
+@dataclass
+class ParsedModule:
+    """Parse result for one source version."""
+    source: str
+    content_hash: str
+    tree: Optional[ast.Module]
+    syntax_error: Optional[str] = None
+    # All definitions in ast.walk (breadth-first) order
+    function_list: List[FunctionSymbol] = field(default_factory=list)
+    # qualname -> first definition with that qualname
+    functions: Dict[str, FunctionSymbol] = field(default_factory=dict)
+    _lines: Optional[List[str]] = field(default=None, repr=False)
+
+    def source_segment(self, symbol: FunctionSymbol) -> str:
+        """
+        Source text of a definition (same result as ast.get_source_segment,
+        but the source is split into lines once per module, not per call).
+        """
+        node = symbol.node
+        if self._lines is None:
+            self._lines = _split_lines(self.source)
+        lines = self._lines
+        first, last = node.lineno - 1, node.end_lineno - 1
+        if first == last:
+            return lines[first].encode()[node.col_offset:node.end_col_offset].decode()
+        head = lines[first].encode()[node.col_offset:].decode()
+        tail = lines[last].encode()[:node.end_col_offset].decode()
+        return "".join([head, *lines[first + 1:last], tail])
+
+
+def _split_lines(source: str) -> List[str]:
+    """Split on \\r\\n, \\r and \\n only, keeping line endings (as ast does)."""
+    lines = []
+    start = 0
+    for match in _NEWLINE_RE.finditer(source):
+        lines.append(source[start:match.end()])
+        start = match.end()
+    if start < len(source):
+        lines.append(source[start:])
+    return lines
+
+
+def structural_hash(node: ast.AST) -> str:
+    """Hash of a node's structure, ignoring positions, comments and formatting."""
+    dump = ast.dump(node, annotate_fields=False, include_attributes=False)
+    return hashlib.sha256(dump.encode("utf-8")).hexdigest()
+
+
+class CodeParseCache:
+    """
+    LRU cache of ParsedModule keyed by source content hash.
+
+    Example:
+        module = get_code_parse_cache().parse(source)
+        if module.tree is not None:
+            for symbol in module.function_list:
+                ...
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize parse cache.
+
+        Args:
+            max_entries: Parsed source versions kept before evicting the oldest
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ParsedModule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, source: str) -> ParsedModule:
+        """
+        Parse ``source`` (or return the cached parse of identical text).
+
+        Syntax errors are cached too: the result has ``tree=None`` and
+        ``syntax_error`` set.
+        """
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        with self._lock:
+            module = self._entries.get(key)
+            if module is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return module
+            self.misses += 1
+
+        module = self._build(source, key)
+
+        with self._lock:
+            self._entries[key] = module
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return module
+
+    def clear(self) -> None:
+        """Drop all cached parses."""
+        with self._lock:
+            self._entries.clear()
+
+    def _build(self, source: str, key: str) -> ParsedModule:
+        try:
+            tree = ast.parse(source)
+        except SyntaxError as e:
+            return ParsedModule(source=source, content_hash=key, tree=None, syntax_error=str(e))
+
+        module = ParsedModule(source=source, content_hash=key, tree=tree)
+        # Same breadth-first order as ast.walk, tracking the enclosing scope
+        queue = deque([(tree, "")])
+        while queue:
+            node, scope = queue.popleft()
+            child_scope = scope
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = f"{scope}.{node.name}" if scope else node.name
+                symbol = FunctionSymbol(
+                    name=node.name,
+                    qualname=qualname,
+                    node=node,
+                    lineno=node.lineno,
+                    args=[arg.arg for arg in node.args.args],
+                    is_async=isinstance(node, ast.AsyncFunctionDef),
+                    structural_hash=structural_hash(node),
+                )
+                module.function_list.append(symbol)
+                module.functions.setdefault(qualname, symbol)
+                child_scope = qualname
+            elif isinstance(node, ast.ClassDef):
+                child_scope = f"{scope}.{node.name}" if scope else node.name
+            queue.extend((child, child_scope) for child in ast.iter_child_nodes(node))
+        return module
+
+
+_code_parse_cache: Optional[CodeParseCache] = None
+
+
+def get_code_parse_cache() -> CodeParseCache:
+    """Get global code parse cache instance."""
+    global _code_parse_cache
+    if _code_parse_cache is None:
+        _code_parse_cache = CodeParseCache()
+    return _code_parse_cache
@@ -7,9 +7,10 @@ Enhances the basic routing in Orchestrator with persistence and metrics.
 Reference: Decision 70 - Agent Collaboration Protocol
 """
 import logging
+import time
 import uuid
-from datetime import datetime, UTC
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, UTC
+from typing import Optional, Dict, Any, List, Tuple
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
@@ -21,9 +22,24 @@ from backend.models.collaboration import (
     CollaborationRequestType,
     CollaborationUrgency
 )
+from backend.services.question_similarity import EmbedFn, QuestionSimilarityIndex, pair_key
 
 logger = logging.getLogger(__name__)
 
+# Questions per agent pair considered by loop detection
+LOOP_HISTORY_LIMIT = 10
+
+# Latest requests in one direction of an agent pair; served by the partial
+# (from_agent_id, to_agent_id, timestamp) index on request exchanges
+PAIR_REQUESTS_SQL = """
+    SELECT content, timestamp
+    FROM collaboration_exchanges
+    WHERE from_agent_id = :{src} AND to_agent_id = :{dst}
+      AND message_type = 'request' {since_filter}
+    ORDER BY timestamp DESC
+    LIMIT :limit
+"""
+
 
 class CollaborationOrchestrator:
     """
@@ -49,9 +65,18 @@ class CollaborationOrchestrator:
         )
     """
     
-    def __init__(self, engine: Engine):
-        """Initialize collaboration orchestrator."""
+    def __init__(self, engine: Engine, embedder: Optional[EmbedFn] = None):
+        """
+        Initialize collaboration orchestrator.
+        
+        Args:
+            engine: Database engine
+            embedder: Optional async text -> embedding function (e.g.
+                OpenAIAdapter.embed_text). Enables embedding-based loop
+                detection; keyword overlap is used without it.
+        """
         self.engine = engine
+        self.question_index = QuestionSimilarityIndex(embedder, window=LOOP_HISTORY_LIMIT) if embedder else None
         logger.info("CollaborationOrchestrator initialized")
     
     async def handle_help_request(
@@ -371,6 +396,9 @@ class CollaborationOrchestrator:
                 "timestamp": datetime.now(UTC)
             })
             conn.commit()
+        
+        if message_type == "request":
+            await self._remember_question(from_agent, to_agent, content)
     
     async def _update_status(self, collaboration_id: str, status: CollaborationStatus) -> None:
         """Update collaboration status."""
@@ -476,39 +504,15 @@ class CollaborationOrchestrator:
         Returns:
             Loop details if detected, None otherwise
         """
-        # Query recent collaborations between these agents
-        query = text("""
-            SELECT cr.question, cr.created_at
-            FROM collaboration_requests cr
-            WHERE (cr.requesting_agent_id = :agent_a AND :agent_b IN (
-                SELECT specialist_id FROM collaboration_responses 
-                WHERE collaboration_id = cr.id
-            ))
-            OR (cr.requesting_agent_id = :agent_b AND :agent_a IN (
-                SELECT specialist_id FROM collaboration_responses
-                WHERE collaboration_id = cr.id
-            ))
-            ORDER BY cr.created_at DESC
-            LIMIT 10
-        """)
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(query, {
-                "agent_a": agent_a_id,
-                "agent_b": agent_b_id
-            })
-            recent_questions = [row[0] for row in result.fetchall()]
+        history_size, similar_questions = await self._find_similar_questions(
+            agent_a_id, agent_b_id, current_question, threshold=0.85
+        )
         
-        if len(recent_questions) < 3:
+        if history_size < 3:
             # Not enough history to detect loop
             return None
         
-        # Simple similarity check (keyword-based for now)
-        # In production, use embeddings for semantic similarity
-        similar_count = sum(
-            1 for q in recent_questions 
-            if self._calculate_similarity(current_question, q) > 0.85
-        )
+        similar_count = len(similar_questions)
         
         if similar_count >= 2:
             # Loop detected! 3rd occurrence of similar question
@@ -527,7 +531,7 @@ class CollaborationOrchestrator:
                 loop_id=loop_id,
                 agent_a_id=agent_a_id,
                 agent_b_id=agent_b_id,
-                questions=[current_question] + recent_questions[:similar_count],
+                questions=[current_question] + similar_questions,
                 cycle_count=similar_count + 1,
                 similarity=0.85  # From threshold
             )
@@ -537,12 +541,97 @@ class CollaborationOrchestrator:
                 "loop_id": loop_id,
                 "cycle_count": similar_count + 1,
                 "agents": [agent_a_id, agent_b_id],
-                "similar_questions": recent_questions[:similar_count],
+                "similar_questions": similar_questions,
                 "action_required": "create_gate"
             }
         
         return None
     
+    async def _fetch_pair_questions(
+        self,
+        agent_a_id: str,
+        agent_b_id: str,
+        since: Optional[datetime] = None,
+        limit: int = LOOP_HISTORY_LIMIT
+    ) -> List[Tuple[str, Optional[datetime]]]:
+        """Most recent questions exchanged between two agents (either direction), newest first."""
+        since_filter = "AND timestamp > :since" if since else ""
+        query = text(f"""
+            SELECT content, timestamp FROM (
+                ({PAIR_REQUESTS_SQL.format(src="agent_a", dst="agent_b", since_filter=since_filter)})
+                UNION ALL
+                ({PAIR_REQUESTS_SQL.format(src="agent_b", dst="agent_a", since_filter=since_filter)})
+            ) pair_requests
+            ORDER BY timestamp DESC
+            LIMIT :limit
+        """)
+        params: Dict[str, Any] = {"agent_a": agent_a_id, "agent_b": agent_b_id, "limit": limit}
+        if since:
+            params["since"] = since
+        
+        with self.engine.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [(row[0], row[1] if len(row) > 1 else None) for row in rows]
+    
+    async def _find_similar_questions(
+        self,
+        agent_a_id: str,
+        agent_b_id: str,
+        question: str,
+        *,
+        threshold: float,
+        max_age: Optional[timedelta] = None
+    ) -> Tuple[int, List[str]]:
+        """
+        Compare a question with the pair's recent questions.
+        
+        With an embedder, the pair's history is loaded once and then kept in
+        memory, so later checks are a single vectorized comparison. Without
+        one (or if embedding fails) keyword overlap over stored history is used.
+        
+        Returns:
+            (history size, similar questions newest first)
+        """
+        if self.question_index is not None:
+            try:
+                pair = pair_key(agent_a_id, agent_b_id)
+                vector = await self.question_index.embed(question)
+                if not self.question_index.is_warm(pair):
+                    rows = await self._fetch_pair_questions(agent_a_id, agent_b_id)
+                    await self.question_index.warm(
+                        pair,
+                        [(q, created.timestamp() if created else time.time()) for q, created in rows],
+                    )
+                matches = self.question_index.find_similar(
+                    pair,
+                    vector,
+                    threshold,
+                    max_age_seconds=max_age.total_seconds() if max_age else None,
+                )
+                return self.question_index.history_size(pair), [q for q, _ in matches]
+            except Exception as e:
+                logger.warning("Embedding similarity unavailable, using keyword overlap | error=%s", e)
+        
+        since = datetime.now(UTC) - max_age if max_age else None
+        rows = await self._fetch_pair_questions(agent_a_id, agent_b_id, since=since)
+        similar = [q for q, _ in rows if self._calculate_similarity(question, q) >= threshold]
+        return len(rows), similar
+    
+    async def _remember_question(self, from_agent: str, to_agent: str, question: str) -> None:
+        """Add a routed question to the pair's in-memory history (if loaded)."""
+        if self.question_index is None:
+            return
+        pair = pair_key(from_agent, to_agent)
+        if not self.question_index.is_warm(pair):
+            # Loaded from the database on the pair's first loop check
+            return
+        try:
+            vector = await self.question_index.embed(question)
+        except Exception as e:
+            logger.warning("Failed to embed collaboration question | error=%s", e)
+            return
+        self.question_index.add(pair, question, vector)
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
         Calculate similarity between two texts.
@@ -677,39 +766,19 @@ class CollaborationOrchestrator:
                 current_question="How do I handle CORS?"
             )
         """
-        # Query recent collaborations between these agents
-        query = text("""
-            SELECT cr.question, cr.created_at
-            FROM collaboration_requests cr
-            WHERE (cr.requesting_agent_id = :agent_a OR cr.requesting_agent_id = :agent_b)
-            AND cr.created_at > NOW() - INTERVAL '24 hours'
-            ORDER BY cr.created_at DESC
-            LIMIT 10
-        """)
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(query, {
-                "agent_a": agent_a_id,
-                "agent_b": agent_b_id
-            })
-            recent_questions = [row[0] for row in result.fetchall()]
+        history_size, similar_questions = await self._find_similar_questions(
+            agent_a_id,
+            agent_b_id,
+            current_question,
+            threshold=similarity_threshold,
+            max_age=timedelta(hours=24),
+        )
         
-        if len(recent_questions) < 2:
+        if history_size < 2:
             # Not enough history
             return None
         
-        # Calculate semantic similarity with recent questions
-        # For now, use simple text similarity (Jaccard)
-        # In production, replace with embeddings (OpenAI, sentence-transformers, etc.)
-        similar_count = 0
-        similar_questions = []
-        
-        for past_question in recent_questions:
-            similarity = self._calculate_text_similarity(current_question, past_question)
-            
-            if similarity >= similarity_threshold:
-                similar_count += 1
-                similar_questions.append(past_question)
+        similar_count = len(similar_questions)
         
         # Loop detected if 2+ similar questions
         if similar_count >= 2:
@@ -775,23 +844,14 @@ class CollaborationOrchestrator:
         """
         Calculate cosine similarity using embeddings.
         
-        This is the production-ready version that should be used
-        when OpenAI adapter is available.
-        
-        TODO: Implement when needed:
-        1. Generate embeddings for both texts
-        2. Calculate cosine similarity
-        3. Return score 0-1
+        Falls back to keyword overlap when no embedder is configured.
         """
-        # Placeholder for embedding-based similarity
-        # Would use OpenAI adapter or sentence-transformers
-        
-        # import numpy as np
-        # embedding1 = await self.get_embedding(text1)
-        # embedding2 = await self.get_embedding(text2)
-        # similarity = np.dot(embedding1, embedding2)
+        if self.question_index is None:
+            return self._calculate_text_similarity(text1, text2)
         
-        return 0.0  # Placeholder
+        embedding1 = await self.question_index.embed(text1)
+        embedding2 = await self.question_index.embed(text2)
+        return float(embedding1 @ embedding2)
     
     async def _record_semantic_loop(
         self,
@@ -0,0 +1,125 @@
+"""
+Consultation Fan-out
+
+Runs several specialist consultations concurrently under one deadline.
+Consultations start together, so the wait is the slowest *needed* answer
+rather than the sum of all of them.
+
+- ``quorum``: stop once this many consultations answered (default: all)
+- ``sufficient``: stop as soon as one answer satisfies this predicate
+- Consultations still running at the deadline or after an early exit are
+  cancelled and reported as such.
+
+Outcomes are returned in the order the consultations were given, whatever
+order they finished in, so merged feedback is deterministic.
+
+Example:
+    outcomes = await fan_out(
+        [("security_expert", lambda: consult(SECURITY_EXPERT)),
+         ("devops_engineer", lambda: consult(DEVOPS_ENGINEER))],
+        timeout=30.0,
+    )
+    feedback = [o.response for o in outcomes if o.answered]
+
+Reference: Section 1.3 - Agent Collaboration
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ConsultFn = Callable[[], Any]  # Returns a value or an awaitable
+
+
+@dataclass
+class ConsultOutcome:
+    """Result of one consultation in a fan-out."""
+    key: str
+    status: str  # answered, empty, error, timed_out, cancelled
+    response: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def answered(self) -> bool:
+        return self.status == "answered"
+
+
+async def _call(consult: ConsultFn) -> Any:
+    value = consult()
+    if isinstance(value, Awaitable):
+        return await value
+    return value
+
+
+async def fan_out(
+    consults: Sequence[Tuple[str, ConsultFn]],
+    *,
+    timeout: Optional[float] = None,
+    quorum: Optional[int] = None,
+    sufficient: Optional[Callable[[Any], bool]] = None
+) -> List[ConsultOutcome]:
+    """
+    Run consultations concurrently and collect their outcomes.
+
+    Args:
+        consults: (key, consult) pairs; consult returns the answer (None for
+            no answer) or an awaitable of it
+        timeout: Seconds before unfinished consultations are cancelled
+        quorum: Answers after which the rest are cancelled (default: all)
+        sufficient: Predicate on an answer that ends the fan-out early
+
+    Returns:
+        One outcome per consultation, in input order
+    """
+    started = time.monotonic()
+    deadline = None if timeout is None else started + timeout
+    quorum = len(consults) if quorum is None else quorum
+    pending: Dict[asyncio.Task, int] = {
+        asyncio.ensure_future(_call(consult)): index for index, (_, consult) in enumerate(consults)
+    }
+    outcomes: List[Optional[ConsultOutcome]] = [None] * len(consults)
+    answers = 0
+    stop_reason = "timed_out"
+
+    try:
+        while pending:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=pending.get):
+                index = pending.pop(task)
+                key = consults[index][0]
+                elapsed = time.monotonic() - started
+                if task.exception() is not None:
+                    logger.warning(f"Consultation with {key} failed: {task.exception()}")
+                    outcomes[index] = ConsultOutcome(key, "error", error=str(task.exception()), elapsed=elapsed)
+                    continue
+                response = task.result()
+                if not response:
+                    outcomes[index] = ConsultOutcome(key, "empty", elapsed=elapsed)
+                    continue
+                outcomes[index] = ConsultOutcome(key, "answered", response=response, elapsed=elapsed)
+                answers += 1
+                if sufficient is not None and sufficient(response):
+                    stop_reason = "cancelled"
+            if answers >= quorum:
+                stop_reason = "cancelled"
+            if stop_reason == "cancelled":
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.monotonic() - started
+    for index in pending.values():
+        outcomes[index] = ConsultOutcome(consults[index][0], stop_reason, elapsed=elapsed)
+    if pending:
+        logger.info(f"Consultation fan-out {stop_reason} {len(pending)} of {len(consults)} after {elapsed:.2f}s")
+    return outcomes
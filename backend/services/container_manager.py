@@ -6,15 +6,25 @@ Manages Docker containers for safe code execution by AI agents.
 - Supports 8 languages: Python, Node.js, Java, Go, Ruby, PHP, .NET, PowerShell
 - Persistent volume mounting for project files
 - Automatic cleanup and resource management
+- Streaming command output with bounded retention and early cancellation
 """
 import asyncio
+import codecs
+import concurrent.futures
 import logging
-from typing import Dict, Any, Optional, List
+import re
+import shlex
+import threading
+import uuid
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Pattern, Union
 from datetime import datetime
 import docker
 from docker.models.containers import Container
 from docker.errors import DockerException, NotFound, APIError
 
+from backend.services.event_bus import Event, EventType, get_event_bus
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,25 +46,97 @@ LANGUAGE_IMAGES = {
     "powershell": "theappapp-powershell:latest",
 }
 
+# Output kept per stream of one exec (first and last halves when exceeded)
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+# Chunks buffered between the Docker reader thread and the event loop
+EXEC_QUEUE_SIZE = 64
+# Text kept from the previous chunk so stop patterns match across chunk boundaries
+PATTERN_OVERLAP_CHARS = 1024
+# Seconds to wait for the output stream to end after a stop before closing it
+EXEC_STOP_GRACE = 2.0
+
 
 class ContainerExecutionResult:
     """Result of a container command execution."""
     
-    def __init__(self, exit_code: int, stdout: str, stderr: str):
+    def __init__(
+        self,
+        exit_code: int,
+        stdout: str,
+        stderr: str,
+        truncated: bool = False,
+        cancelled: Optional[str] = None
+    ):
         self.exit_code = exit_code
         self.stdout = stdout
         self.stderr = stderr
-        self.success = exit_code == 0
+        self.truncated = truncated  # Middle of stdout or stderr dropped
+        self.cancelled = cancelled  # Why the command was stopped early, if it was
+        self.success = exit_code == 0 and cancelled is None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "exit_code": self.exit_code,
             "stdout": self.stdout,
             "stderr": self.stderr,
-            "success": self.success
+            "success": self.success,
+            "truncated": self.truncated,
+            "cancelled": self.cancelled
         }
 
 
+class BoundedOutput:
+    """
+    Keeps the head and tail of a byte stream under a byte cap.
+    
+    The first half of the budget holds the start of the output, the second
+    half a rolling window of its end; everything between is counted, not kept.
+    """
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_OUTPUT_BYTES):
+        self.head_limit = max_bytes // 2
+        self.tail_limit = max_bytes - self.head_limit
+        self.head = bytearray()
+        self.tail: deque = deque()
+        self.tail_bytes = 0
+        self.total_bytes = 0
+    
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > len(self.head) + self.tail_bytes
+    
+    def append(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self.tail.append(data)
+        self.tail_bytes += len(data)
+        while self.tail_bytes > self.tail_limit:
+            excess = self.tail_bytes - self.tail_limit
+            first = self.tail[0]
+            if len(first) <= excess:
+                self.tail.popleft()
+                self.tail_bytes -= len(first)
+            else:
+                self.tail[0] = first[excess:]
+                self.tail_bytes -= excess
+    
+    def text(self) -> str:
+        tail = b"".join(self.tail)
+        if not self.truncated:
+            return (bytes(self.head) + tail).decode("utf-8", errors="replace")
+        omitted = self.total_bytes - len(self.head) - len(tail)
+        return (
+            self.head.decode("utf-8", errors="replace")
+            + f"\n... [{omitted} bytes omitted] ...\n"
+            + tail.decode("utf-8", errors="replace")
+        )
+
+
 class ContainerManager:
     """
     Manages Docker containers for code execution.
@@ -169,6 +251,28 @@ class ContainerManager:
         """
         return f"theappapp-{project_id}-{task_id}"
     
+    def get_workspace_path(self, project_id: str) -> Optional[str]:
+        """
+        Get the host path of a project's workspace volume.
+        
+        Readable only when the backend runs on the Docker host with access
+        to the volume directory.
+        
+        Args:
+            project_id: Project ID
+        
+        Returns:
+            Volume mountpoint, or None if Docker or the volume is unavailable
+        """
+        if not self.client:
+            return None
+        try:
+            volume = self.client.volumes.get(self._get_volume_name(project_id))
+        except DockerException as e:
+            logger.debug(f"No workspace volume for project {project_id}: {e}")
+            return None
+        return volume.attrs.get("Mountpoint")
+    
     async def create_container(
         self,
         task_id: str,
@@ -341,21 +445,39 @@ class ContainerManager:
     async def exec_command(
         self,
         task_id: str,
-        command: str
+        command: Union[str, List[str]],
+        *,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        stream_events: bool = False,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        stop_pattern: Optional[Union[str, Pattern]] = None,
+        max_stream_bytes: Optional[int] = None,
+        timeout: Optional[float] = None
     ) -> ContainerExecutionResult:
         """
-        Execute command in a container.
+        Execute command in a container, streaming its output.
+        
+        Output is read incrementally on a worker thread. Each stream keeps at
+        most ``max_output_bytes`` (head and tail), so memory per exec stays
+        bounded however noisy the command is.
         
         Args:
             task_id: Task identifier
             command: Command to execute (string or list)
+            on_output: Called with (stream, text) for every chunk as it
+                arrives; may be async. Returning True stops the command.
+            stream_events: Publish chunks to the EventBus as COMMAND_OUTPUT
+            max_output_bytes: Output retained per stream
+            stop_pattern: Stop the command once its output matches this regex
+            max_stream_bytes: Stop the command once it produced this much output
+            timeout: Stop the command after this many seconds
         
         Returns:
-            ContainerExecutionResult with exit_code, stdout, stderr
+            ContainerExecutionResult with exit_code, stdout, stderr and, when
+            stopped early, ``cancelled`` set to the reason
         
         Raises:
             ValueError: If container doesn't exist for task
-            DockerException: If execution fails
         """
         if not self.client:
             return ContainerExecutionResult(
@@ -369,36 +491,23 @@ class ContainerManager:
             raise ValueError(f"No container found for task {task_id}")
         
         container = self.active_containers[task_id]
+        pattern = re.compile(stop_pattern) if isinstance(stop_pattern, str) else stop_pattern
+        cancellable = bool(on_output or pattern or max_stream_bytes or timeout)
+        # Cancellable commands record their PID so they can be killed
+        marker = uuid.uuid4().hex if cancellable else None
         
         try:
-            logger.info(f"Executing command in task {task_id}: {command[:100]}")
-            
-            # Execute command
-            result = container.exec_run(
-                cmd=command,
-                workdir="/workspace",
-                demux=True,  # Separate stdout and stderr
-                tty=False
+            logger.info(f"Executing command in task {task_id}: {str(command)[:100]}")
+            exec_id = await asyncio.to_thread(
+                self.client.api.exec_create,
+                container.id,
+                self._wrap_command(command, marker) if marker else command,
+                stdout=True,
+                stderr=True,
+                tty=False,
+                workdir="/workspace"
             )
-            
-            exit_code = result.exit_code
-            stdout_bytes, stderr_bytes = result.output
-            
-            # Decode output
-            stdout = stdout_bytes.decode("utf-8") if stdout_bytes else ""
-            stderr = stderr_bytes.decode("utf-8") if stderr_bytes else ""
-            
-            logger.info(
-                f"Command completed with exit code {exit_code} "
-                f"(stdout: {len(stdout)} bytes, stderr: {len(stderr)} bytes)"
-            )
-            
-            return ContainerExecutionResult(
-                exit_code=exit_code,
-                stdout=stdout,
-                stderr=stderr
-            )
-        
+            output_stream = await asyncio.to_thread(self.client.api.exec_start, exec_id, stream=True, demux=True)
         except DockerException as e:
             logger.error(f"Failed to execute command in task {task_id}: {e}")
             return ContainerExecutionResult(
@@ -406,6 +515,190 @@ class ContainerManager:
                 stdout="",
                 stderr=f"Docker execution error: {str(e)}"
             )
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EXEC_QUEUE_SIZE)
+        stop = threading.Event()
+        reader = loop.run_in_executor(None, self._pump_exec_output, output_stream, queue, loop, stop)
+        
+        outputs = {"stdout": BoundedOutput(max_output_bytes), "stderr": BoundedOutput(max_output_bytes)}
+        decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in outputs}
+        recent = {name: "" for name in outputs}
+        project_id = (getattr(container, "labels", None) or {}).get("project_id", "")
+        deadline = None if timeout is None else loop.time() + timeout
+        cancelled = None
+        error = None
+        
+        while True:
+            try:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                item = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                cancelled = "timeout"
+                break
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                error = item
+                break
+            
+            stream, data = item
+            outputs[stream].append(data)
+            text = decoders[stream].decode(data)
+            if not text:
+                continue
+            
+            if on_output is not None:
+                verdict = on_output(stream, text)
+                if asyncio.iscoroutine(verdict):
+                    verdict = await verdict
+                if verdict is True:
+                    cancelled = "callback"
+            if stream_events:
+                await get_event_bus().publish(Event(
+                    event_type=EventType.COMMAND_OUTPUT,
+                    project_id=project_id,
+                    task_id=task_id,
+                    data={"stream": stream, "text": text}
+                ))
+            if pattern is not None and pattern.search(recent[stream] + text):
+                cancelled = "pattern"
+            recent[stream] = (recent[stream] + text)[-PATTERN_OVERLAP_CHARS:]
+            if max_stream_bytes and outputs["stdout"].total_bytes + outputs["stderr"].total_bytes > max_stream_bytes:
+                cancelled = "output_limit"
+            if cancelled:
+                break
+        
+        if cancelled or error:
+            stop.set()
+            if marker:
+                await self._kill_exec(container, marker)
+            # Processes that escaped the kill keep the stream open: close it
+            # rather than wait for them
+            if not await self._drain_until_done(reader, queue, EXEC_STOP_GRACE):
+                await asyncio.to_thread(self._close_exec_stream, output_stream)
+                if not await self._drain_until_done(reader, queue, EXEC_STOP_GRACE):
+                    logger.warning(f"Output reader for task {task_id} did not stop; detaching it")
+        else:
+            await reader
+        
+        if error is not None:
+            logger.error(f"Failed to execute command in task {task_id}: {error}")
+            return ContainerExecutionResult(
+                exit_code=1,
+                stdout=outputs["stdout"].text(),
+                stderr=f"Docker execution error: {str(error)}"
+            )
+        
+        try:
+            exit_code = (await asyncio.to_thread(self.client.api.exec_inspect, exec_id)).get("ExitCode")
+        except DockerException:
+            exit_code = None
+        if exit_code is None:
+            exit_code = -1  # Still running (cancelled) or unknown
+        
+        stdout, stderr = outputs["stdout"], outputs["stderr"]
+        logger.info(
+            f"Command completed with exit code {exit_code} "
+            f"(stdout: {stdout.total_bytes} bytes, stderr: {stderr.total_bytes} bytes"
+            f"{', cancelled: ' + cancelled if cancelled else ''})"
+        )
+        
+        return ContainerExecutionResult(
+            exit_code=exit_code,
+            stdout=stdout.text(),
+            stderr=stderr.text(),
+            truncated=stdout.truncated or stderr.truncated,
+            cancelled=cancelled
+        )
+    
+    async def _drain_until_done(self, reader: asyncio.Future, queue: asyncio.Queue, timeout: float) -> bool:
+        """Discard queued output until the reader thread exits; False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not reader.done():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({reader, getter}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+        return True
+    
+    def _close_exec_stream(self, output_stream: Any) -> None:
+        """Shut down an exec output stream so a blocked reader returns."""
+        try:
+            output_stream.close()
+        except Exception as e:
+            logger.warning(f"Failed to close exec output stream: {e}")
+    
+    def _pump_exec_output(
+        self,
+        output_stream: Any,
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        stop: threading.Event
+    ) -> None:
+        """Forward demuxed exec output to ``queue`` (runs on a worker thread)."""
+        def put(item: Any) -> None:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while True:
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except concurrent.futures.TimeoutError:
+                    if stop.is_set():
+                        future.cancel()  # The caller stopped reading
+                        return
+        
+        try:
+            for stdout_chunk, stderr_chunk in output_stream:
+                if stop.is_set():
+                    break
+                if stdout_chunk:
+                    put(("stdout", stdout_chunk))
+                if stderr_chunk:
+                    put(("stderr", stderr_chunk))
+        except Exception as e:
+            if not stop.is_set():
+                put(e)
+        finally:
+            put(None)
+    
+    def _wrap_command(self, command: Union[str, List[str]], marker: str) -> List[str]:
+        """
+        Run ``command`` (same argv as exec_run) under sh in its own process
+        group, recording the group leader's PID.
+        """
+        argv = shlex.split(command) if isinstance(command, str) else list(command)
+        pid_file = f"/tmp/.theappapp-exec-{marker}.pid"
+        # setsid ships with every language image (util-linux or busybox); without
+        # it the command shares sh's group and only its own PID can be killed
+        script = (
+            'if command -v setsid >/dev/null 2>&1; then setsid "$@" & else "$@" & fi; '
+            f'pid=$!; echo $pid > {pid_file}; wait $pid; rc=$?; rm -f {pid_file}; exit $rc'
+        )
+        return ["sh", "-c", script, "sh", *argv]
+    
+    async def _kill_exec(self, container: Container, marker: str) -> None:
+        """
+        Terminate a cancellable exec started with ``marker``.
+        
+        TERM goes to the command's whole process group (pipelines, ``sh -c``
+        children); a detached follow-up sends KILL to the group two seconds
+        later, so this returns without waiting for the group to exit.
+        """
+        pid_file = f"/tmp/.theappapp-exec-{marker}.pid"
+        script = (
+            f'[ -f {pid_file} ] || exit 0; pid=$(cat {pid_file}); '
+            'kill -TERM -$pid 2>/dev/null || kill -TERM $pid 2>/dev/null; '
+            '(sleep 2; kill -KILL -$pid) >/dev/null 2>&1 &'
+        )
+        try:
+            await asyncio.to_thread(container.exec_run, ["sh", "-c", script], tty=False)
+        except DockerException as e:
+            logger.warning(f"Failed to stop command: {e}")
     
     async def cleanup_orphaned_containers(self) -> Dict[str, Any]:
         """
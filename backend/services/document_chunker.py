@@ -0,0 +1,359 @@
+"""
+Document Chunker
+
+Streaming, structure-aware chunking for RAG indexing. Text is read line by
+line and split into blocks at markdown headings, blank lines (paragraphs)
+and code fences. Blocks are then packed into chunks up to a token budget.
+A new heading always starts a new chunk, and a code block is only split
+(at line boundaries, re-fenced) when it is larger than the budget on its
+own. Oversized paragraphs fall back to sentence boundaries, then word
+gaps, and text with no boundary at all (minified code, base64, lockfile
+lines) is cut at token boundaries, so no chunk exceeds the budget.
+
+Near-duplicate chunks (repeated boilerplate, license headers, copied
+sections) are dropped using MinHash signatures with LSH banding, so
+each new chunk is compared only against candidates sharing a band.
+
+Everything is a generator: callers can pass an iterable of text pieces
+(e.g. a file read in blocks) and consume chunks as they are produced.
+
+Reference: MVP Demo Plan - Specialist knowledge base
+"""
+import logging
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.services.prompt_assembler import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TOKENS = 400
+DEFAULT_DEDUP_THRESHOLD = 0.9
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=\S)")
+_WORD_RE = re.compile(r"\w+")
+
+# MinHash over 32-bit shingle hashes: a * x + b stays below 2**63
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+@dataclass
+class Chunk:
+    """One indexed piece of a document."""
+    text: str
+    index: int
+    token_count: int
+    kind: str  # "text" or "code"
+    section: str  # Heading path, e.g. "Setup > Database"
+
+
+@dataclass
+class _Block:
+    text: str
+    kind: str  # "heading", "text" or "code"
+    section: str
+    fence: str = ""
+
+
+class MinHashDeduplicator:
+    """
+    Near-duplicate detector for chunk text.
+
+    Signatures use ``num_perm`` hash permutations over word shingles;
+    candidates are found by LSH banding and confirmed by estimated Jaccard
+    similarity >= ``threshold``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the text's word shingles."""
+        words = _WORD_RE.findall(text.lower())
+        size = min(self.shingle_size, max(len(words), 1))
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MINHASH_PRIME
+        return permuted.min(axis=1)
+
+    def is_duplicate(self, text: str) -> bool:
+        """True if a near-duplicate was seen; otherwise remember ``text``."""
+        signature = self.signature(text)
+        band_keys = [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+        candidates = {idx for key in band_keys for idx in self._buckets.get(key, ())}
+        for idx in candidates:
+            if float(np.mean(self._signatures[idx] == signature)) >= self.threshold:
+                return True
+
+        idx = len(self._signatures)
+        self._signatures.append(signature)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(idx)
+        return False
+
+
+class DocumentChunker:
+    """
+    Token-budgeted, structure-aware chunker.
+
+    Example:
+        chunker = DocumentChunker(max_tokens=400)
+        for chunk in chunker.iter_chunks(open("guide.md", encoding="utf-8")):
+            ...
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        *,
+        dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Initialize chunker.
+
+        Args:
+            max_tokens: Token budget per chunk
+            dedup_threshold: Estimated Jaccard similarity at which a chunk
+                counts as a duplicate (None disables deduplication)
+            count_tokens: Token counter (default: embedding model tokenizer)
+        """
+        self.max_tokens = max_tokens
+        self.dedup_threshold = dedup_threshold
+        if count_tokens is None:
+            counter = TokenCounter("text-embedding-3-small")
+            self.count_tokens = counter.count
+            self.split_tokens: Callable[[str, int], Iterable[str]] = counter.split
+        else:
+            self.count_tokens = count_tokens
+            self.split_tokens = lambda text, budget: _split_by_count(text, budget, count_tokens)
+
+    def iter_chunks(self, source: Union[str, Iterable[str]]) -> Iterator[Chunk]:
+        """
+        Yield chunks of ``source``.
+
+        Args:
+            source: Whole text, or an iterable of text pieces (lines or
+                arbitrary blocks, e.g. a file object)
+        """
+        dedup = MinHashDeduplicator(self.dedup_threshold) if self.dedup_threshold is not None else None
+        index = 0
+        skipped = 0
+        for text, kind, section in self._pack(self._iter_blocks(_iter_lines(source))):
+            if dedup is not None and dedup.is_duplicate(text):
+                skipped += 1
+                continue
+            yield Chunk(text=text, index=index, token_count=self.count_tokens(text), kind=kind, section=section)
+            index += 1
+        if skipped:
+            logger.debug("Dropped %d near-duplicate chunks", skipped)
+
+    def _iter_blocks(self, lines: Iterable[str]) -> Iterator[_Block]:
+        """Group lines into heading, paragraph and fenced code blocks."""
+        headings: List[Tuple[int, str]] = []
+        section = ""
+        paragraph: List[str] = []
+        code: List[str] = []
+        fence = ""
+
+        for line in lines:
+            if fence:
+                code.append(line)
+                if line.strip().startswith(fence) and len(code) > 1:
+                    yield _Block("".join(code).rstrip("\n"), "code", section, fence)
+                    code, fence = [], ""
+                continue
+
+            fence_match = _FENCE_RE.match(line)
+            heading_match = _HEADING_RE.match(line) if not fence_match else None
+            if fence_match or heading_match or not line.strip():
+                if paragraph:
+                    yield _Block("".join(paragraph).strip("\n"), "text", section)
+                    paragraph = []
+
+            if fence_match:
+                fence = fence_match.group(1)
+                code = [line]
+            elif heading_match:
+                level = len(heading_match.group(1))
+                headings = [h for h in headings if h[0] < level] + [(level, heading_match.group(2))]
+                section = " > ".join(title for _, title in headings)
+                yield _Block(line.rstrip("\n"), "heading", section)
+            elif line.strip():
+                paragraph.append(line)
+
+        if paragraph:
+            yield _Block("".join(paragraph).strip("\n"), "text", section)
+        if code:
+            # Unterminated fence: keep what was read
+            yield _Block("".join(code).rstrip("\n"), "code", section, fence)
+
+    def _pack(self, blocks: Iterable[_Block]) -> Iterator[Tuple[str, str, str]]:
+        """Pack blocks into (text, kind, section) chunks within the token budget."""
+        parts: List[str] = []
+        tokens = 0
+        kind = "text"
+        section = ""
+        has_body = False
+
+        for block in blocks:
+            if block.kind == "heading":
+                # A heading starts a new chunk; consecutive headings stay together
+                if has_body:
+                    yield "\n\n".join(parts), kind, section
+                    parts, tokens, kind, has_body = [], 0, "text", False
+                parts.append(block.text)
+                tokens += self.count_tokens(block.text)
+                section = block.section
+                continue
+
+            section = block.section
+            for piece in self._split_block(block):
+                piece_tokens = self.count_tokens(piece)
+                if has_body and tokens + piece_tokens > self.max_tokens:
+                    yield "\n\n".join(parts), kind, section
+                    parts, tokens, kind = [], 0, "text"
+                parts.append(piece)
+                tokens += piece_tokens
+                has_body = True
+                if block.kind == "code":
+                    kind = "code"
+
+        if parts:
+            yield "\n\n".join(parts), kind, section
+
+    def _split_block(self, block: _Block) -> List[str]:
+        """Split a block larger than the budget at line or sentence boundaries."""
+        if self.count_tokens(block.text) <= self.max_tokens:
+            return [block.text]
+
+        if block.kind == "code":
+            lines = block.text.split("\n")
+            opening = lines[0]
+            body = lines[1:-1] if len(lines) > 1 and lines[-1].strip().startswith(block.fence) else lines[1:]
+            closing = block.fence
+            budget = self.max_tokens - self.count_tokens(opening) - self.count_tokens(closing) - 2
+            return [f"{opening}\n{group}\n{closing}" for group in self._group(body, budget, "\n")]
+
+        sentences = _SENTENCE_RE.split(block.text)
+        return list(self._group(sentences, self.max_tokens, " "))
+
+    def _group(self, units: List[str], budget: int, joiner: str) -> Iterator[str]:
+        """Greedily join units up to ``budget`` tokens; hard-split oversized units."""
+        budget = max(budget, 1)
+        current: List[str] = []
+        tokens = 0
+        for unit in units:
+            unit_tokens = self.count_tokens(unit)
+            if unit_tokens > budget:
+                if current:
+                    yield joiner.join(current)
+                    current, tokens = [], 0
+                yield from _hard_split(unit, budget, self.count_tokens, self.split_tokens)
+                continue
+            if current and tokens + unit_tokens > budget:
+                yield joiner.join(current)
+                current, tokens = [], 0
+            current.append(unit)
+            tokens += unit_tokens
+        if current:
+            yield joiner.join(current)
+
+
+def _iter_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield lines (with endings) from text or an iterable of text pieces."""
+    if isinstance(source, str):
+        start = 0
+        while start < len(source):
+            end = source.find("\n", start)
+            if end == -1:
+                yield source[start:]
+                return
+            yield source[start:end + 1]
+            start = end + 1
+        return
+
+    pending = ""
+    for piece in source:
+        pending += piece
+        if "\n" not in piece:
+            continue
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def _hard_split(
+    text: str,
+    budget: int,
+    count_tokens: Callable[[str], int],
+    split_tokens: Callable[[str, int], Iterable[str]]
+) -> Iterator[str]:
+    """Split text with no usable boundary at word gaps, else at token boundaries."""
+    current: List[str] = []
+    tokens = 0
+    for word in text.split(" "):
+        word_tokens = count_tokens(" " + word)
+        if current and tokens + word_tokens > budget:
+            yield " ".join(current)
+            current, tokens = [], 0
+        if word_tokens > budget:
+            yield from split_tokens(word, budget)
+            continue
+        current.append(word)
+        tokens += word_tokens
+    if current:
+        yield " ".join(current)
+
+
+def _split_by_count(text: str, budget: int, count_tokens: Callable[[str], int]) -> Iterator[str]:
+    """Cut text into the longest prefixes within ``budget`` for any token counter."""
+    start = 0
+    while start < len(text):
+        # Grow the window geometrically, then binary search the cut
+        fits, step = start + 1, 1
+        while fits < len(text) and count_tokens(text[start:min(fits + step, len(text))]) <= budget:
+            fits = min(fits + step, len(text))
+            step *= 2
+        low, high = fits, min(fits + step, len(text))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(text[start:middle]) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        yield text[start:low]
+        start = low
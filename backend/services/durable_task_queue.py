@@ -0,0 +1,417 @@
+"""
+Durable Task Queue
+
+Postgres-backed orchestrator task queue (``task_queue`` table). Queued
+tasks survive restarts, and several backend processes can work on one
+project's tasks.
+
+- Dequeue leases the highest priority ready row with
+  ``FOR UPDATE SKIP LOCKED``, so concurrent workers never block on or
+  receive the same task.
+- A lease lasts ``visibility_timeout`` seconds and is renewed by a
+  heartbeat while this process holds the task. When a process dies its
+  leases expire and the tasks are queued again (or failed after
+  ``max_attempts`` leases).
+- Enqueue sends ``NOTIFY task_queue, '<project_id>'``; idle workers LISTEN
+  and wake immediately instead of polling.
+
+Orchestrator delegates enqueue_task / dequeue_task / peek_task /
+get_pending_count to this queue when constructed with ``durable_queue``;
+TaskExecutor acks and fails leased tasks and runs the heartbeat. The
+methods are synchronous; async callers run them with asyncio.to_thread.
+
+Dequeued tasks are copies rebuilt from the row, so whoever queued a task
+follows its progress through ``status()`` rather than the Task object.
+
+Example:
+    queue = DurableTaskQueue(engine, project_id)
+    orchestrator = Orchestrator(project_id, durable_queue=queue)
+    await queue.start()
+    task = queue.dequeue()
+    ...
+    queue.ack(task.task_id, {"success": True})
+
+Reference: Phase 3.5 - Backend Integration
+"""
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from backend.services.orchestrator import AgentType, Task
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "task_queue"
+
+
+def _agent_type_value(agent_type: Any) -> str:
+    return agent_type.value if hasattr(agent_type, "value") else str(agent_type)
+
+
+def task_to_json(task: Task) -> str:
+    """Serialize the queued fields of a task."""
+    return json.dumps({
+        "task_type": task.task_type,
+        "agent_type": _agent_type_value(task.agent_type),
+        "description": task.description,
+        "priority": task.priority,
+        "payload": task.payload,
+        "project_id": task.project_id,
+        "created_at": task.created_at.isoformat(),
+        "metadata": task.metadata,
+        "deliverable_id": task.deliverable_id,
+    }, default=str)
+
+
+def task_from_json(task_id: str, data: Any) -> Task:
+    """Rebuild a Task from its serialized queue row."""
+    if isinstance(data, str):
+        data = json.loads(data)
+    return Task(
+        task_id=task_id,
+        task_type=data["task_type"],
+        agent_type=AgentType(data["agent_type"]),
+        description=data.get("description", ""),
+        priority=data.get("priority", 0),
+        payload=data.get("payload") or {},
+        project_id=data.get("project_id"),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        metadata=data.get("metadata") or {},
+        deliverable_id=data.get("deliverable_id"),
+    )
+
+
+class DurableTaskQueue:
+    """Leased, priority-ordered task queue for one project in Postgres."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        project_id: str,
+        *,
+        visibility_timeout: float = 60.0,
+        heartbeat_interval: Optional[float] = None,
+        max_attempts: int = 3,
+        poll_interval: float = 5.0,
+        owner: Optional[str] = None
+    ):
+        """
+        Initialize queue.
+
+        Args:
+            engine: SQLAlchemy engine for the database with the task_queue table
+            project_id: Project whose tasks this queue serves
+            visibility_timeout: Seconds a lease lasts without a heartbeat
+            heartbeat_interval: Seconds between lease renewals (default: a third of visibility_timeout)
+            max_attempts: Leases before a task whose holder keeps dying is failed
+            poll_interval: Longest idle wait when no notification arrives
+            owner: Lease owner id (default: unique per process and queue)
+        """
+        self.engine = engine
+        self.project_id = project_id
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = heartbeat_interval or visibility_timeout / 3
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.owner = owner or f"{project_id}-{uuid.uuid4().hex[:12]}"
+        self._held: Set[str] = set()
+        self._held_lock = threading.Lock()
+        self._work_available: Optional[asyncio.Event] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Queue operations (Orchestrator interface)
+    # ------------------------------------------------------------------
+
+    def enqueue(self, task: Task, delay: float = 0.0) -> None:
+        """
+        Queue a task, or re-queue it if the task_id is already known.
+
+        Args:
+            task: Task to queue
+            delay: Seconds before the task becomes available
+        """
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("""
+                    INSERT INTO task_queue (task_id, project_id, agent_type, priority, task, available_at)
+                    VALUES (:task_id, :project_id, :agent_type, :priority, CAST(:task AS JSONB),
+                            NOW() + make_interval(secs => :delay))
+                    ON CONFLICT (task_id) DO UPDATE SET
+                        agent_type = EXCLUDED.agent_type,
+                        priority = EXCLUDED.priority,
+                        task = EXCLUDED.task,
+                        status = 'queued',
+                        available_at = EXCLUDED.available_at,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                """),
+                {
+                    "task_id": task.task_id,
+                    "project_id": self.project_id,
+                    "agent_type": _agent_type_value(task.agent_type),
+                    "priority": task.priority,
+                    "task": task_to_json(task),
+                    "delay": delay,
+                },
+            )
+            # Delivered to listeners when the transaction commits
+            conn.execute(text("SELECT pg_notify(:channel, :project_id)"),
+                         {"channel": NOTIFY_CHANNEL, "project_id": self.project_id})
+        with self._held_lock:
+            self._held.discard(task.task_id)
+
+    def dequeue(self) -> Optional[Task]:
+        """Lease the next ready task; None if there is none."""
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                text("""
+                    WITH next AS (
+                        SELECT id FROM task_queue
+                        WHERE project_id = :project_id
+                          AND status = 'queued'
+                          AND available_at <= NOW()
+                        ORDER BY priority DESC, id
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE task_queue AS q
+                    SET status = 'leased',
+                        lease_owner = :owner,
+                        lease_expires_at = NOW() + make_interval(secs => :visibility),
+                        attempts = q.attempts + 1,
+                        updated_at = NOW()
+                    FROM next
+                    WHERE q.id = next.id
+                    RETURNING q.task_id, q.task
+                """),
+                {"project_id": self.project_id, "owner": self.owner, "visibility": self.visibility_timeout},
+            ).first()
+        if row is None:
+            return None
+        with self._held_lock:
+            self._held.add(row.task_id)
+        return task_from_json(row.task_id, row.task)
+
+    def peek(self) -> Optional[Task]:
+        """Next ready task without leasing it."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("""
+                    SELECT task_id, task FROM task_queue
+                    WHERE project_id = :project_id AND status = 'queued' AND available_at <= NOW()
+                    ORDER BY priority DESC, id
+                    LIMIT 1
+                """),
+                {"project_id": self.project_id},
+            ).first()
+        return task_from_json(row.task_id, row.task) if row else None
+
+    def get_pending_count(self) -> int:
+        return sum(self.pending_by_agent_type().values())
+
+    def status(self, task_id: str) -> Optional[str]:
+        """Row status of a task ('queued', 'leased', 'done' or 'failed'); None if unknown."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text("SELECT status FROM task_queue WHERE task_id = :task_id"),
+                {"task_id": task_id},
+            ).scalar()
+
+    def pending_by_agent_type(self) -> Dict[str, int]:
+        """Number of queued tasks per agent type."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("""
+                    SELECT agent_type, COUNT(*) AS queued FROM task_queue
+                    WHERE project_id = :project_id AND status = 'queued'
+                    GROUP BY agent_type
+                """),
+                {"project_id": self.project_id},
+            ).all()
+        return {row.agent_type: row.queued for row in rows}
+
+    # ------------------------------------------------------------------
+    # Lease management
+    # ------------------------------------------------------------------
+
+    def ack(self, task_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a leased task done.
+
+        Returns:
+            False if this process no longer held the lease
+        """
+        return self._finish(task_id, "done", result=result)
+
+    def fail(self, task_id: str, error: str) -> bool:
+        """
+        Mark a leased task permanently failed.
+
+        Returns:
+            False if this process no longer held the lease
+        """
+        return self._finish(task_id, "failed", error=error)
+
+    def _finish(self, task_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        with self._held_lock:
+            self._held.discard(task_id)
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text("""
+                    UPDATE task_queue
+                    SET status = :status,
+                        result = CAST(:result AS JSONB),
+                        last_error = :error,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE task_id = :task_id AND status = 'leased' AND lease_owner = :owner
+                """),
+                {
+                    "status": status,
+                    "result": json.dumps(result, default=str) if result is not None else None,
+                    "error": error,
+                    "task_id": task_id,
+                    "owner": self.owner,
+                },
+            ).rowcount
+        if not updated:
+            logger.warning(f"Lease on task {task_id} was lost before it was marked {status}")
+        return bool(updated)
+
+    def heartbeat(self) -> int:
+        """
+        Renew the leases of every task this process holds.
+
+        Returns:
+            Number of leases renewed
+        """
+        with self._held_lock:
+            held = list(self._held)
+        if not held:
+            return 0
+        with self.engine.begin() as conn:
+            renewed = {
+                row.task_id for row in conn.execute(
+                    text("""
+                        UPDATE task_queue
+                        SET lease_expires_at = NOW() + make_interval(secs => :visibility), updated_at = NOW()
+                        WHERE task_id = ANY(:task_ids) AND status = 'leased' AND lease_owner = :owner
+                        RETURNING task_id
+                    """),
+                    {"visibility": self.visibility_timeout, "task_ids": held, "owner": self.owner},
+                )
+            }
+        lost = set(held) - renewed
+        if lost:
+            with self._held_lock:
+                self._held -= lost
+            logger.warning(f"Lost leases on {len(lost)} tasks: {sorted(lost)}")
+        return len(renewed)
+
+    def reclaim_expired(self) -> int:
+        """
+        Re-queue tasks whose leases expired, failing those out of attempts.
+
+        Returns:
+            Number of tasks reclaimed
+        """
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                text("""
+                    UPDATE task_queue
+                    SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'queued' END,
+                        last_error = CASE WHEN attempts >= :max_attempts
+                                          THEN 'Lease expired after ' || attempts || ' attempts'
+                                          ELSE last_error END,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE project_id = :project_id AND status = 'leased' AND lease_expires_at < NOW()
+                    RETURNING task_id, status
+                """),
+                {"project_id": self.project_id, "max_attempts": self.max_attempts},
+            ).all()
+            if any(row.status == "queued" for row in rows):
+                conn.execute(text("SELECT pg_notify(:channel, :project_id)"),
+                             {"channel": NOTIFY_CHANNEL, "project_id": self.project_id})
+        for row in rows:
+            logger.warning(f"Lease on task {row.task_id} expired; task is now {row.status}")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Background heartbeat and wakeups
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start lease renewal and (on Postgres) the LISTEN thread."""
+        if self._heartbeat_task is not None:
+            return
+        self._stopping.clear()
+        self._work_available = asyncio.Event()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        if self.engine.dialect.name == "postgresql":
+            loop = asyncio.get_running_loop()
+            self._listener = threading.Thread(
+                target=self._listen, args=(loop,), name=f"task-queue-listen-{self.project_id}", daemon=True
+            )
+            self._listener.start()
+
+    async def stop(self) -> None:
+        """Stop background work. Held leases are left to expire."""
+        self._stopping.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        if self._listener:
+            await asyncio.to_thread(self._listener.join, 2.0)
+            self._listener = None
+
+    async def wait_for_task(self, timeout: Optional[float] = None) -> None:
+        """Wait until a task is enqueued for this project or the timeout passes."""
+        timeout = self.poll_interval if timeout is None else timeout
+        if self._work_available is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(self._work_available.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._work_available.clear()
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await asyncio.to_thread(self.heartbeat)
+                await asyncio.to_thread(self.reclaim_expired)
+            except Exception as e:
+                logger.error(f"Task queue heartbeat failed: {e}", exc_info=True)
+
+    def _listen(self, loop: asyncio.AbstractEventLoop) -> None:
+        import psycopg
+
+        url = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while not self._stopping.is_set():
+            try:
+                with psycopg.connect(url, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    while not self._stopping.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            if notify.payload == self.project_id:
+                                loop.call_soon_threadsafe(self._work_available.set)
+            except psycopg.Error as e:
+                logger.warning(f"Task queue listener reconnecting after error: {e}")
+                self._stopping.wait(self.poll_interval)
@@ -12,6 +12,8 @@ from typing import List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from backend.services.code_parse_cache import CodeParseCache, get_code_parse_cache
+
 
 logger = logging.getLogger(__name__)
 
@@ -59,14 +61,20 @@ class EdgeCaseFinder:
             print(f"{case.type}: {case.description}")
     """
     
-    def __init__(self, llm_client: Optional[Any] = None):
+    def __init__(
+        self,
+        llm_client: Optional[Any] = None,
+        parse_cache: Optional[CodeParseCache] = None
+    ):
         """
         Initialize edge case finder.
         
         Args:
             llm_client: Optional LLM client for intelligent analysis
+            parse_cache: Shared AST cache (defaults to the process-wide instance)
         """
         self.llm_client = llm_client
+        self.parse_cache = parse_cache or get_code_parse_cache()
         logger.info("EdgeCaseFinder initialized")
     
     async def find_edge_cases(
@@ -107,25 +115,25 @@ class EdgeCaseFinder:
     
     def _parse_function(self, function_def: str) -> Optional[dict]:
         """Parse function definition."""
-        try:
-            tree = ast.parse(function_def)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    return {
-                        'name': node.name,
-                        'args': [arg.arg for arg in node.args.args],
-                        'arg_types': self._extract_types(node),
-                        'return_type': self._get_return_type(node),
-                        'is_async': isinstance(node, ast.AsyncFunctionDef),
-                        'has_loops': self._has_loops(node),
-                        'has_recursion': self._has_recursion(node),
-                        'body': ast.unparse(node) if hasattr(ast, 'unparse') else function_def
-                    }
-        except SyntaxError:
+        module = self.parse_cache.parse(function_def)
+        if module.syntax_error:
             logger.error("Syntax error parsing function")
+            return None
+        if not module.function_list:
+            return None
         
-        return None
+        symbol = module.function_list[0]
+        node = symbol.node
+        return {
+            'name': symbol.name,
+            'args': symbol.args,
+            'arg_types': self._extract_types(node),
+            'return_type': self._get_return_type(node),
+            'is_async': symbol.is_async,
+            'has_loops': self._has_loops(node),
+            'has_recursion': self._has_recursion(node),
+            'body': ast.unparse(node) if hasattr(ast, 'unparse') else function_def
+        }
     
     def _extract_types(self, node: ast.FunctionDef) -> dict:
         """Extract type hints from function."""
@@ -13,6 +13,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from backend.services.runtime_metrics import time_stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +40,7 @@ class EventType(str, Enum):
     FILE_CREATED = "file_created"
     FILE_UPDATED = "file_updated"
     FILE_DELETED = "file_deleted"
+    COMMAND_OUTPUT = "command_output"
     
     # Testing events
     TEST_GENERATED = "test_generated"
@@ -240,7 +243,9 @@ class EventBus:
             tasks.append(self._safe_callback(callback, event))
         
         if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+            event_type = getattr(event.event_type, "value", str(event.event_type))
+            with time_stage("event_publish", event_type):
+                await asyncio.gather(*tasks, return_exceptions=True)
     
     async def _safe_callback(
         self,
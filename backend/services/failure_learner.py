@@ -11,7 +11,7 @@ from typing import List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
-from backend.services.rag_service import RAGService, SearchResult
+from backend.services.rag_service import RAGService, SearchMode, SearchResult
 from backend.services.feedback_collector import FeedbackCollector
 
 logger = logging.getLogger(__name__)
@@ -175,15 +175,25 @@ class FailureLearner:
         # Search RAG for similar error messages
         search_query = f"{error_message}\\n{stack_trace[:500]}"
         
+        # Hybrid search: exception names, error codes and frame names match
+        # lexically even when the embedding call is slow or unavailable
         results: List[SearchResult] = await self.rag.search(
             query=search_query,
             specialist_id="failure_patterns",  # Special collection for failures
-            top_k=5
+            limit=5,
+            mode=SearchMode.HYBRID
         )
         
+        error_type = self._classify_error(error_message)
         patterns = []
         for result in results:
-            if result.score > 0.7:  # High similarity threshold
+            # Close embedding match, or a lexical match on the same error type
+            dense_match = result.score is not None and result.score > 0.7
+            lexical_match = (
+                result.lexical_score is not None
+                and result.metadata.get("error_type") == error_type
+            )
+            if dense_match or lexical_match:
                 patterns.append(FailurePattern(
                     pattern_id=result.metadata.get("pattern_id", "unknown"),
                     error_type=result.metadata.get("error_type", "unknown"),
@@ -3,17 +3,69 @@ Feedback Collector Service
 
 Collects and analyzes human feedback from gate resolutions for prompt optimization.
 Identifies patterns in rejections and approvals to improve agent prompts over time.
+
+Pattern analysis reads daily rollup tables (feedback_daily_*_rollup, migration
+031) that collect_feedback updates in the same statement as the insert, so
+analysis cost depends on the number of days, not the amount of feedback.
 """
 import logging
 from typing import List, Dict, Any, Optional
 from collections import Counter
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
 logger = logging.getLogger(__name__)
 
+# Rollup tables key rows by agent_type; NULL agent_type is stored as ''
+NO_AGENT_TYPE = ""
+MAX_TAG_LENGTH = 200
+MAX_REASON_LENGTH = 500
+
+# Insert the log row and bump all three daily rollups in one statement
+INSERT_FEEDBACK_SQL = f"""
+    WITH inserted AS (
+        INSERT INTO feedback_logs
+        (gate_id, feedback_type, feedback_text, agent_type, tags, metadata, created_at)
+        VALUES (:gate_id, :feedback_type, :feedback_text, :agent_type, :tags, :metadata, NOW())
+        RETURNING id, feedback_type, feedback_text, tags,
+                  COALESCE(agent_type, '') AS rollup_agent_type,
+                  (created_at AT TIME ZONE 'UTC')::date AS day
+    ),
+    type_rollup AS (
+        INSERT INTO feedback_daily_type_rollup AS r (day, agent_type, feedback_type, count)
+        SELECT day, rollup_agent_type, feedback_type, 1 FROM inserted
+        ON CONFLICT (day, agent_type, feedback_type)
+        DO UPDATE SET count = r.count + 1
+    ),
+    tag_rollup AS (
+        INSERT INTO feedback_daily_tag_rollup AS r (day, agent_type, tag, count)
+        SELECT i.day, i.rollup_agent_type, left(t.tag, {MAX_TAG_LENGTH}), COUNT(*)
+        FROM inserted i
+        CROSS JOIN LATERAL jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(i.tags) = 'array' THEN i.tags ELSE '[]'::jsonb END
+        ) AS t(tag)
+        GROUP BY 1, 2, 3
+        ON CONFLICT (day, agent_type, tag)
+        DO UPDATE SET count = r.count + EXCLUDED.count
+    ),
+    reason_rollup AS (
+        INSERT INTO feedback_daily_reason_rollup AS r (day, agent_type, reason, count)
+        SELECT day, rollup_agent_type, reason, 1
+        FROM (
+            SELECT day, rollup_agent_type,
+                   left(btrim(split_part(feedback_text, '.', 1), E' \\t\\r\\n'), {MAX_REASON_LENGTH}) AS reason
+            FROM inserted
+            WHERE feedback_type = 'rejection' AND feedback_text IS NOT NULL
+        ) reasons
+        WHERE reason <> ''
+        ON CONFLICT (day, agent_type, reason)
+        DO UPDATE SET count = r.count + 1
+    )
+    SELECT id FROM inserted
+"""
+
 
 class FeedbackCollector:
     """
@@ -67,12 +119,7 @@ class FeedbackCollector:
         logger.info(f"Collecting feedback for gate: {gate_id}, type={feedback_type}")
         import json
         
-        query = text("""
-            INSERT INTO feedback_logs 
-            (gate_id, feedback_type, feedback_text, agent_type, tags, metadata, created_at)
-            VALUES (:gate_id, :feedback_type, :feedback_text, :agent_type, :tags, :metadata, NOW())
-            RETURNING id
-        """)
+        query = text(INSERT_FEEDBACK_SQL)
         
         with self.engine.connect() as conn:
             result = conn.execute(query, {
@@ -180,65 +227,47 @@ class FeedbackCollector:
         """
         logger.info(f"Analyzing feedback patterns: agent_type={agent_type}, days={days}")
         
-        # Get feedback data
+        # Rollups are per UTC day, so the window covers whole days
+        cutoff_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        params: Dict[str, Any] = {"cutoff_day": cutoff_day}
+        agent_filter = ""
         if agent_type:
-            feedback_data = await self.get_feedback_by_agent(agent_type, days=days)
-        else:
-            # Get all feedback
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            query = text("""
-                SELECT id, gate_id, feedback_type, feedback_text, agent_type,
-                       tags, metadata, created_at
-                FROM feedback_logs
-                WHERE created_at >= :cutoff_date
-                ORDER BY created_at DESC
-            """)
-            
-            with self.engine.connect() as conn:
-                result = conn.execute(query, {"cutoff_date": cutoff_date})
-                rows = result.fetchall()
-                
-                feedback_data = [
-                    {
-                        "id": str(row[0]),
-                        "gate_id": str(row[1]),
-                        "feedback_type": row[2],
-                        "feedback_text": row[3],
-                        "agent_type": row[4],
-                        "tags": row[5],
-                        "metadata": row[6],
-                        "created_at": row[7].isoformat() if row[7] else None
-                    }
-                    for row in rows
-                ]
-        
-        if not feedback_data:
-            return {
-                "total_feedback": 0,
-                "message": "No feedback data available for analysis"
-            }
-        
-        # Count feedback types
-        feedback_types = Counter(f["feedback_type"] for f in feedback_data)
-        total = len(feedback_data)
-        
-        # Aggregate tags
-        all_tags = []
-        for f in feedback_data:
-            if f["tags"]:
-                all_tags.extend(f["tags"])
-        tag_counts = Counter(all_tags)
+            agent_filter = "AND agent_type = :agent_type"
+            params["agent_type"] = agent_type
         
-        # Extract rejection reasons (first sentence of rejection feedback)
-        rejection_reasons = []
-        for f in feedback_data:
-            if f["feedback_type"] == "rejection" and f["feedback_text"]:
-                # Get first sentence
-                first_sentence = f["feedback_text"].split('.')[0].strip()
-                if first_sentence:
-                    rejection_reasons.append(first_sentence)
+        type_query = text(f"""
+            SELECT feedback_type, SUM(count) AS total
+            FROM feedback_daily_type_rollup
+            WHERE day >= :cutoff_day {agent_filter}
+            GROUP BY feedback_type
+        """)
+        tag_query = text(f"""
+            SELECT tag, SUM(count) AS total
+            FROM feedback_daily_tag_rollup
+            WHERE day >= :cutoff_day {agent_filter}
+            GROUP BY tag
+            ORDER BY total DESC, tag
+            LIMIT 10
+        """)
+        reason_query = text(f"""
+            SELECT reason, SUM(count) AS total
+            FROM feedback_daily_reason_rollup
+            WHERE day >= :cutoff_day {agent_filter}
+            GROUP BY reason
+            ORDER BY total DESC, reason
+            LIMIT 5
+        """)
         
-        reason_counts = Counter(rejection_reasons)
+        with self.engine.connect() as conn:
+            feedback_types = Counter({row[0]: int(row[1]) for row in conn.execute(type_query, params)})
+            total = sum(feedback_types.values())
+            if not total:
+                return {
+                    "total_feedback": 0,
+                    "message": "No feedback data available for analysis"
+                }
+            tag_counts = Counter({row[0]: int(row[1]) for row in conn.execute(tag_query, params)})
+            reason_counts = Counter({row[0]: int(row[1]) for row in conn.execute(reason_query, params)})
         
         # Calculate rates
         approval_rate = (feedback_types.get("approval", 0) / total * 100) if total > 0 else 0
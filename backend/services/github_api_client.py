@@ -0,0 +1,201 @@
+"""
+GitHub API Client
+
+Pooled async client for the GitHub REST API with conditional-request caching.
+
+- One httpx.AsyncClient per (API URL, token) for the whole process, so
+  concurrent fetches share keep-alive connections.
+- GET responses carrying an ETag (or Last-Modified) are cached in a
+  size-bounded LRU. Repeat requests send If-None-Match / If-Modified-Since,
+  and a 304 is answered from the cache. GitHub does not count 304s against
+  the rate limit, and no body is transferred.
+- paginate() follows Link rel="next" and yields items page by page, so
+  long lists (PR files, commits) are never held whole.
+
+Configuration:
+    GITHUB_API_URL: API base URL (default https://api.github.com); point it
+        at a local fake server in tests
+    GITHUB_POOL_SIZE: Max pooled connections per client (default 10)
+    GITHUB_CACHE_MB: Response cache size per client (default 32)
+
+Example:
+    client = get_github_client(token)
+    pr = (await client.get("/repos/o/r/pulls/1")).json()
+    async for f in client.paginate("/repos/o/r/pulls/1/files"):
+        print(f["filename"])
+
+Reference: Phase 2.4 - GitHub Integration
+"""
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CACHE_MB = 32
+PAGE_SIZE = 100  # GitHub maximum per_page
+
+_clients: Dict[Tuple[str, Optional[str]], "GitHubAPIClient"] = {}
+
+
+@dataclass
+class _CachedResponse:
+    """Validators and body of a cached 200 response."""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    content: bytes
+
+
+class GitHubAPIClient:
+    """Async GitHub REST client with ETag revalidation and pagination."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: str = DEFAULT_API_URL,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        cache_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize client.
+
+        Args:
+            token: GitHub token (anonymous if None)
+            base_url: API base URL
+            pool_size: Max pooled connections
+            cache_bytes: Max total body bytes kept in the response cache
+            timeout: Request timeout in seconds
+            transport: Optional httpx transport (e.g. ASGITransport for a fake server)
+        """
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=transport
+        )
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[Tuple[str, str], _CachedResponse]" = OrderedDict()
+        self._cached_size = 0
+        self.stats = {"requests": 0, "not_modified": 0, "bytes_received": 0}
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        GET ``url``, revalidating a cached response when there is one.
+
+        Accepts the httpx.AsyncClient.get arguments. A 304 is returned as the
+        cached 200 response. Non-2xx responses are returned as-is.
+        """
+        request = self.http.build_request("GET", url, **kwargs)
+        key = (str(request.url), request.headers.get("Accept", ""))
+        cached = self._cache.get(key)
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self.http.send(request)
+        self.stats["requests"] += 1
+
+        if response.status_code == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            self._cache.move_to_end(key)
+            return httpx.Response(200, headers=cached.headers, content=cached.content, request=request)
+
+        self.stats["bytes_received"] += len(response.content)
+        if response.status_code == 200:
+            self._store(key, response)
+        return response
+
+    async def paginate(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Yield the items of a paginated list endpoint, one page at a time.
+
+        Raises:
+            httpx.HTTPStatusError: If a page request fails
+        """
+        params = {"per_page": PAGE_SIZE, **(params or {})}
+        next_url: Optional[str] = url
+        while next_url:
+            response = await self.get(next_url, params=params, **kwargs)
+            response.raise_for_status()
+            for item in response.json():
+                yield item
+            next_url = response.links.get("next", {}).get("url")
+            params = None  # The next link carries the query string
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """POST through the pooled connection (never cached)."""
+        return await self.http.post(url, **kwargs)
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        await self.http.aclose()
+
+    def _store(self, key: Tuple[str, str], response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        size = len(response.content)
+        if not (etag or last_modified) or size > self.cache_bytes:
+            return
+
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cached_size -= len(previous.content)
+        self._cache[key] = _CachedResponse(
+            etag=etag,
+            last_modified=last_modified,
+            headers={
+                name: value for name, value in response.headers.items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            },
+            content=response.content
+        )
+        self._cached_size += size
+        while self._cached_size > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_size -= len(evicted.content)
+
+
+def get_github_client(token: Optional[str] = None, base_url: Optional[str] = None) -> GitHubAPIClient:
+    """Get the shared GitHub client for ``token`` and ``base_url`` (default from env)."""
+    base_url = (base_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+    client = _clients.get((base_url, token))
+    if client is None:
+        pool_size = int(os.getenv("GITHUB_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        cache_mb = int(os.getenv("GITHUB_CACHE_MB", str(DEFAULT_CACHE_MB)))
+        client = GitHubAPIClient(
+            token=token,
+            base_url=base_url,
+            pool_size=pool_size,
+            cache_bytes=cache_mb * 1024 * 1024
+        )
+        _clients[(base_url, token)] = client
+        logger.info("GitHub client created | url=%s | pool_size=%d", base_url, pool_size)
+    return client
+
+
+async def close_github_clients() -> None:
+    """Close all shared clients (application shutdown)."""
+    while _clients:
+        (url, _), client = _clients.popitem()
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning("Failed to close GitHub client | url=%s | error=%s", url, e)
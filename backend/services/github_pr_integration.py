@@ -4,10 +4,16 @@ GitHub PR Integration Service
 Integrates CodeReviewer with GitHub pull requests.
 Posts AI-generated code reviews as PR comments.
 
+PR data (details, diff, commits, files) is fetched concurrently. With a
+GitHubAPIClient (see github_api_client.get_github_client) the requests share
+pooled connections, repeat fetches are revalidated by ETag, and paginated
+commit and file lists are streamed page by page.
+
 Reference: Phase 2.4 - GitHub Integration (deferred from Phase 3+)
 """
+import asyncio
 import logging
-from typing import Optional, Any, List
+from typing import Optional, Any, AsyncIterator, List
 from dataclasses import dataclass
 
 from backend.services.code_reviewer import CodeReviewer
@@ -42,7 +48,7 @@ class GitHubPRIntegration:
             code_reviewer, 
             pr_generator, 
             commit_generator,
-            github_client
+            get_github_client(token)
         )
         
         # Review PR
@@ -98,11 +104,11 @@ class GitHubPRIntegration:
                 quality_score=0.0
             )
         
-        # Get PR details
-        pr_data = await self._get_pr_details(owner, repo, pr_number)
-        
-        # Get diff
-        diff = await self._get_pr_diff(owner, repo, pr_number)
+        # Get PR details and diff concurrently
+        pr_data, diff = await asyncio.gather(
+            self._get_pr_details(owner, repo, pr_number),
+            self._get_pr_diff(owner, repo, pr_number)
+        )
         
         # Review code
         review_result = await self.code_reviewer.review_code(diff)
@@ -145,19 +151,20 @@ class GitHubPRIntegration:
         if not self.github_client:
             return "PR description generation requires GitHub client"
         
-        # Get PR details
-        pr_data = await self._get_pr_details(owner, repo, pr_number)
-        
-        # Get commits
-        commits = await self._get_pr_commits(owner, repo, pr_number)
-        commit_messages = [c.get("commit", {}).get("message", "") for c in commits]
-        
-        # Get files
-        files = await self._get_pr_files(owner, repo, pr_number)
-        files_changed = [f.get("filename") for f in files]
-        
-        # Get diff
-        diff = await self._get_pr_diff(owner, repo, pr_number)
+        # Get details, commits, files and diff concurrently; only the
+        # messages and filenames of the streamed lists are kept
+        pr_data, commit_messages, files_changed, diff = await asyncio.gather(
+            self._get_pr_details(owner, repo, pr_number),
+            self._collect(
+                self._iter_pr_list(owner, repo, pr_number, "commits"),
+                lambda c: c.get("commit", {}).get("message", "")
+            ),
+            self._collect(
+                self._iter_pr_list(owner, repo, pr_number, "files"),
+                lambda f: f.get("filename")
+            ),
+            self._get_pr_diff(owner, repo, pr_number)
+        )
         
         # Generate description
         pr_desc = await self.pr_generator.generate(
@@ -239,17 +246,7 @@ class GitHubPRIntegration:
         pr_number: int
     ) -> List[dict]:
         """Get PR commits."""
-        if not self.github_client:
-            return []
-        
-        try:
-            response = await self.github_client.get(
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/commits"
-            )
-            return response.json() if hasattr(response, 'json') else []
-        except Exception as e:
-            logger.error(f"Failed to get PR commits: {e}")
-            return []
+        return [c async for c in self._iter_pr_list(owner, repo, pr_number, "commits")]
     
     async def _get_pr_files(
         self,
@@ -258,17 +255,35 @@ class GitHubPRIntegration:
         pr_number: int
     ) -> List[dict]:
         """Get PR files."""
+        return [f async for f in self._iter_pr_list(owner, repo, pr_number, "files")]
+    
+    async def _iter_pr_list(
+        self,
+        owner: str,
+        repo: str,
+        pr_number: int,
+        kind: str
+    ) -> AsyncIterator[dict]:
+        """Stream a paginated PR list ("commits" or "files")."""
         if not self.github_client:
-            return []
+            return
         
+        path = f"/repos/{owner}/{repo}/pulls/{pr_number}/{kind}"
         try:
-            response = await self.github_client.get(
-                f"/repos/{owner}/{repo}/pulls/{pr_number}/files"
-            )
-            return response.json() if hasattr(response, 'json') else []
+            if hasattr(self.github_client, "paginate"):
+                async for item in self.github_client.paginate(path):
+                    yield item
+            else:
+                response = await self.github_client.get(path)
+                for item in (response.json() if hasattr(response, 'json') else []):
+                    yield item
         except Exception as e:
-            logger.error(f"Failed to get PR files: {e}")
-            return []
+            logger.error(f"Failed to get PR {kind}: {e}")
+    
+    @staticmethod
+    async def _collect(items: AsyncIterator[dict], field: Any) -> list:
+        """Keep one field of each streamed item."""
+        return [field(item) async for item in items]
     
     async def _post_review_comment(
         self,
@@ -0,0 +1,215 @@
+"""
+Lexical Index
+
+In-memory BM25 inverted index over chunk payloads, kept next to each
+Qdrant collection and updated as points are upserted. Dense retrieval
+handles paraphrase. This index handles exact terms that embeddings match
+poorly: error codes, exception and function names, file paths.
+
+Tokenization keeps whole identifiers ("ConnectionResetError",
+"get_user_by_id", "E1102") and also their camelCase / snake_case parts,
+so both exact and partial identifier queries match.
+
+Results from several retrievers are combined with reciprocal rank fusion
+(RRF), which needs only ranks, so BM25 and cosine scores never have to be
+put on one scale.
+
+Reference: Section 1.5.1 - RAG System Architecture
+"""
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+(?:[.:/-][A-Za-z0-9_]+)*")
+_PART_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its of on or "
+    "so that the their then there these this to was were what when where which while why "
+    "will with you your do does can not no".split()
+)
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Lowercased terms: whole identifiers plus their word parts."""
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group(0)
+        lowered = token.lower()
+        if lowered not in _STOPWORDS:
+            yield lowered
+        parts = [p.lower() for p in _PART_RE.findall(token)]
+        if len(parts) > 1:
+            for part in parts:
+                if len(part) > 1 and part not in _STOPWORDS:
+                    yield part
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = RRF_K
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked id lists: score(id) = sum of 1 / (k + rank).
+
+    Returns:
+        (id, score) sorted by score, best first
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+@dataclass
+class LexicalHit:
+    """One BM25 match."""
+    doc_id: str
+    score: float
+    payload: Dict[str, Any]
+
+
+@dataclass
+class _Document:
+    terms: Counter
+    length: int
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+class BM25Index:
+    """
+    Incremental BM25 index with payload equality filters.
+
+    Example:
+        index = get_lexical_index("specialist_documents")
+        index.add(point_id, chunk_text, payload)
+        hits = index.search("psycopg OperationalError", limit=10, filters={"specialist_id": "db-1"})
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        # Set by owners that bulk-load existing points (e.g. from Qdrant)
+        self.loaded = False
+        self._documents: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: Any, text: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        """Index (or re-index) a document."""
+        doc_id = str(doc_id)
+        terms = Counter(tokenize(text))
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._documents[doc_id] = _Document(terms, sum(terms.values()), dict(payload or {}))
+            self._total_length += sum(terms.values())
+            for term, count in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id: Any) -> None:
+        """Drop a document if present."""
+        with self._lock:
+            self._remove_locked(str(doc_id))
+
+    def remove_where(self, **filters: Any) -> int:
+        """Drop all documents whose payload matches ``filters``; returns count."""
+        with self._lock:
+            doomed = [
+                doc_id for doc_id, doc in self._documents.items()
+                if _matches(doc.payload, filters)
+            ]
+            for doc_id in doomed:
+                self._remove_locked(doc_id)
+        return len(doomed)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[LexicalHit]:
+        """
+        Rank documents containing any query term.
+
+        Args:
+            query: Free text (identifiers are matched whole and by parts)
+            limit: Maximum hits
+            filters: Payload field -> required value
+        """
+        query_terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._documents)
+            if not count or not query_terms:
+                return []
+            average_length = self._total_length / count or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    doc = self._documents[doc_id]
+                    if filters and not _matches(doc.payload, filters):
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * doc.length / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [LexicalHit(doc_id, score, self._documents[doc_id].payload) for doc_id, score in best]
+
+    def _remove_locked(self, doc_id: str) -> None:
+        doc = self._documents.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+def _matches(payload: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    return all(payload.get(key) == value for key, value in filters.items())
+
+
+_lexical_indexes: Dict[str, BM25Index] = {}
+
+
+def get_lexical_index(collection_name: str) -> BM25Index:
+    """Get the process-wide lexical index for a Qdrant collection."""
+    index = _lexical_indexes.get(collection_name)
+    if index is None:
+        index = _lexical_indexes.setdefault(collection_name, BM25Index())
+    return index
+
+
+def index_points(index: BM25Index, points: Iterable[Any], *text_fields: str) -> None:
+    """Add Qdrant points (anything with ``id`` and ``payload``) to ``index``."""
+    for point in points:
+        payload = point.payload or {}
+        text = "\n".join(str(payload[name]) for name in text_fields if payload.get(name))
+        if text:
+            index.add(point.id, text, payload)
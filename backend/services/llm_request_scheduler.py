@@ -0,0 +1,427 @@
+"""
+LLM Request Scheduler
+
+Central admission control for every outbound LLM request in the process.
+Enforces per-model requests-per-minute (RPM) and tokens-per-minute (TPM)
+budgets with token buckets, caps global in-flight concurrency, and admits
+waiting requests in priority order so orchestrator reasoning is never stuck
+behind background evaluation traffic.
+
+Provider ``Retry-After`` hints are applied to the whole model, so one 429
+pauses every caller of that model instead of each worker discovering the
+limit independently.
+
+Reference: Section 1.2.1 - OpenAI Integration Foundation
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Admission priority for LLM requests (lower value wins)."""
+    ORCHESTRATOR = 0
+    AGENT = 1
+    BACKGROUND = 2
+
+
+@dataclass(frozen=True)
+class ModelRateLimit:
+    """Provider budget for a single model."""
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+# Conservative defaults; override per deployment tier via constructor
+DEFAULT_MODEL_LIMITS: Dict[str, ModelRateLimit] = {
+    "gpt-4o-mini": ModelRateLimit(requests_per_minute=500, tokens_per_minute=200_000),
+    "gpt-4o": ModelRateLimit(requests_per_minute=500, tokens_per_minute=30_000),
+    "gpt-4": ModelRateLimit(requests_per_minute=500, tokens_per_minute=10_000),
+    "gpt-3.5-turbo": ModelRateLimit(requests_per_minute=500, tokens_per_minute=200_000),
+    "text-embedding-3-small": ModelRateLimit(requests_per_minute=500, tokens_per_minute=1_000_000),
+    "text-embedding-3-large": ModelRateLimit(requests_per_minute=500, tokens_per_minute=1_000_000),
+}
+FALLBACK_MODEL_LIMIT = ModelRateLimit(requests_per_minute=500, tokens_per_minute=30_000)
+
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 512
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(
+    messages: Sequence[Dict[str, Any]],
+    max_tokens: Optional[int] = None
+) -> int:
+    """
+    Estimate the total tokens a chat request will consume.
+
+    Uses a ~4 characters per token heuristic for the prompt plus the
+    requested completion budget. Actual usage is reconciled on release.
+
+    Args:
+        messages: Chat messages with "content"
+        max_tokens: Completion token cap, if the caller set one
+
+    Returns:
+        Estimated prompt + completion tokens
+    """
+    prompt_chars = sum(len(str(msg.get("content") or "")) for msg in messages)
+    prompt_tokens = prompt_chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS * len(messages)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket.
+
+    ``capacity`` units refill evenly over ``period`` seconds. Requests larger
+    than the capacity are clamped so they can still be admitted once the
+    bucket is full, and reconciliation may drive the level negative (debt).
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self.level = min(self.capacity, self.level + elapsed * self.rate)
+            self._updated = now
+
+    def delay(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until ``amount`` units are available (0.0 if available now)."""
+        self._refill(time.monotonic() if now is None else now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Return (positive) or charge (negative) units after the fact."""
+        self.level = min(self.capacity, self.level + delta)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    model: str = field(compare=False)
+    tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+@dataclass
+class SchedulerLease:
+    """Admission grant returned by :meth:`LLMRequestScheduler.acquire`."""
+    model: str
+    priority: RequestPriority
+    estimated_tokens: int
+    wait_seconds: float
+    released: bool = False
+
+
+class _ModelState:
+    """Buckets, backoff window and waiter queue for one model."""
+
+    def __init__(self, limit: ModelRateLimit):
+        self.requests = TokenBucket(limit.requests_per_minute)
+        self.tokens = TokenBucket(limit.tokens_per_minute)
+        self.blocked_until = 0.0
+        self.waiters: List[_Waiter] = []
+
+    def delay(self, tokens: int, now: float) -> float:
+        return max(
+            self.blocked_until - now,
+            self.requests.delay(1, now),
+            self.tokens.delay(tokens, now),
+            0.0,
+        )
+
+
+class LLMRequestScheduler:
+    """
+    Process-wide concurrency and rate limiter for LLM calls.
+
+    A waiter is admitted when a concurrency slot is free, its model's RPM and
+    TPM buckets cover the estimate, it is the oldest highest-priority waiter
+    for its model, and no higher-priority waiter for another model is
+    admissible at the same moment.
+
+    Example:
+        scheduler = get_llm_request_scheduler()
+        async with scheduler.slot("gpt-4o-mini", 1200, RequestPriority.AGENT) as lease:
+            response = await client.chat.completions.create(...)
+            scheduler.record_usage(lease, response.usage.total_tokens)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        model_limits: Optional[Dict[str, ModelRateLimit]] = None
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrency: Global in-flight request cap
+                (default: LLM_MAX_CONCURRENCY env var or 16)
+            model_limits: Per-model budgets merged over DEFAULT_MODEL_LIMITS
+        """
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+        self.model_limits = {**DEFAULT_MODEL_LIMITS, **(model_limits or {})}
+        self._models: Dict[str, _ModelState] = {}
+        self._sequence = itertools.count()
+        self._changed: Optional[asyncio.Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._active = 0
+
+        # Metrics
+        self._requests_total = 0
+        self._rate_limited_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._wait_seconds_by_priority: Dict[str, float] = {p.name.lower(): 0.0 for p in RequestPriority}
+
+    def _wake_signal(self) -> asyncio.Future:
+        """Future resolved on the next state change that may admit a waiter."""
+        # Bound lazily to the running loop so the global instance survives
+        # being built at import time or reused across loops (tests, scripts)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._changed = loop.create_future()
+            self._active = 0
+            for state in self._models.values():
+                state.waiters.clear()
+        return self._changed
+
+    def _notify(self) -> None:
+        """Wake every waiter so it re-evaluates admission."""
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(None)
+        if self._loop is not None:
+            self._changed = self._loop.create_future()
+
+    def _model_state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelState(self.model_limits.get(model, FALLBACK_MODEL_LIMIT))
+            self._models[model] = state
+        return state
+
+    def _admission_delay(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """
+        Return 0.0 if ``waiter`` may run now, seconds to wait for its model's
+        budget, or None if it must wait for another event (slot or queue).
+        """
+        if self._active >= self.max_concurrency:
+            return None
+
+        state = self._models[waiter.model]
+        if state.waiters[0] is not waiter:
+            return None
+
+        delay = state.delay(waiter.tokens, now)
+        if delay > 0:
+            return delay
+
+        for other_model, other in self._models.items():
+            if other_model == waiter.model or not other.waiters:
+                continue
+            head = other.waiters[0]
+            if head < waiter and other.delay(head.tokens, now) == 0:
+                return None
+        return 0.0
+
+    async def acquire(
+        self,
+        model: str,
+        estimated_tokens: int,
+        priority: RequestPriority = RequestPriority.AGENT
+    ) -> SchedulerLease:
+        """
+        Wait until the request may be sent and reserve its budget.
+
+        Args:
+            model: Model the request targets
+            estimated_tokens: Prompt + completion estimate (see estimate_tokens)
+            priority: Admission priority
+
+        Returns:
+            Lease that must be passed to release()
+        """
+        self._wake_signal()
+        state = self._model_state(model)
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            model=model,
+            tokens=estimated_tokens,
+            enqueued_at=time.monotonic(),
+        )
+
+        # Admission checks run synchronously between awaits, so the event
+        # loop itself serializes them and no lock is needed
+        heapq.heappush(state.waiters, waiter)
+        try:
+            while True:
+                delay = self._admission_delay(waiter, time.monotonic())
+                if delay == 0.0:
+                    break
+                await asyncio.wait({self._wake_signal()}, timeout=delay)
+        except BaseException:
+            state.waiters.remove(waiter)
+            heapq.heapify(state.waiters)
+            self._notify()
+            raise
+
+        heapq.heappop(state.waiters)
+        state.requests.consume(1)
+        state.tokens.consume(estimated_tokens)
+        self._active += 1
+        # Next waiter for this model may now be the head
+        self._notify()
+
+        wait_seconds = time.monotonic() - waiter.enqueued_at
+        self._record_wait(priority, wait_seconds)
+        if wait_seconds > 1.0:
+            logger.info(f"LLM request for {model} waited {wait_seconds:.2f}s (priority={priority.name})")
+
+        return SchedulerLease(
+            model=model,
+            priority=priority,
+            estimated_tokens=estimated_tokens,
+            wait_seconds=wait_seconds,
+        )
+
+    async def release(self, lease: SchedulerLease) -> None:
+        """Free the concurrency slot held by ``lease``."""
+        if lease.released:
+            return
+        lease.released = True
+
+        self._active = max(0, self._active - 1)
+        self._notify()
+
+    def record_usage(self, lease: SchedulerLease, actual_tokens: Optional[int]) -> None:
+        """Reconcile the TPM bucket with the provider-reported token usage."""
+        if actual_tokens is None:
+            return
+        state = self._model_state(lease.model)
+        state.tokens.adjust(lease.estimated_tokens - actual_tokens)
+
+    def penalize(self, model: str, retry_after: float) -> None:
+        """
+        Pause all admissions for ``model`` for ``retry_after`` seconds.
+
+        Called when the provider answers 429 so every queued caller backs off
+        together instead of each one burning its own retry.
+        """
+        self._rate_limited_total += 1
+        state = self._model_state(model)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Rate limited on {model}; pausing admissions for {retry_after:.2f}s")
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        estimated_tokens: int,
+        priority: RequestPriority = RequestPriority.AGENT
+    ) -> AsyncIterator[SchedulerLease]:
+        """Context manager wrapper around acquire()/release()."""
+        lease = await self.acquire(model, estimated_tokens, priority)
+        try:
+            yield lease
+        finally:
+            await self.release(lease)
+
+    def _record_wait(self, priority: RequestPriority, wait_seconds: float) -> None:
+        self._requests_total += 1
+        self._wait_seconds_total += wait_seconds
+        self._wait_seconds_max = max(self._wait_seconds_max, wait_seconds)
+        self._wait_seconds_by_priority[priority.name.lower()] += wait_seconds
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of scheduler state for monitoring.
+
+        Returns:
+            Dict with queue depth (total and per model), in-flight count,
+            admitted request count, 429 count and wait-time statistics
+        """
+        queue_depth_by_model = {
+            model: len(state.waiters) for model, state in self._models.items() if state.waiters
+        }
+        return {
+            "queue_depth": sum(queue_depth_by_model.values()),
+            "queue_depth_by_model": queue_depth_by_model,
+            "in_flight": self._active,
+            "max_concurrency": self.max_concurrency,
+            "requests_total": self._requests_total,
+            "rate_limited_total": self._rate_limited_total,
+            "wait_seconds_total": round(self._wait_seconds_total, 4),
+            "wait_seconds_max": round(self._wait_seconds_max, 4),
+            "wait_seconds_avg": round(self._wait_seconds_total / self._requests_total, 4)
+            if self._requests_total else 0.0,
+            "wait_seconds_by_priority": {
+                name: round(value, 4) for name, value in self._wait_seconds_by_priority.items()
+            },
+        }
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    Extract a provider Retry-After hint (seconds) from an API error.
+
+    Understands OpenAI's ``retry-after-ms`` and the standard ``retry-after``
+    header. Returns None when the error is not a rate limit or carries no hint.
+    """
+    if getattr(error, "status_code", None) != 429:
+        return None
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return None
+
+
+# Global scheduler instance
+_llm_request_scheduler: Optional[LLMRequestScheduler] = None
+
+
+def get_llm_request_scheduler() -> LLMRequestScheduler:
+    """Get global LLM request scheduler instance."""
+    global _llm_request_scheduler
+    if _llm_request_scheduler is None:
+        _llm_request_scheduler = LLMRequestScheduler()
+    return _llm_request_scheduler
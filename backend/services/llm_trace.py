@@ -0,0 +1,211 @@
+"""
+LLM Trace Channel
+
+Structured, sampled trace of LLM calls kept off the request hot path.
+Callers hand over plain dicts; JSON encoding, hashing and file I/O happen
+on a background listener thread that appends to a rotating JSONL file.
+
+Prompt and response bodies are never inlined in trace lines. Each record
+carries content references (``sha256:<digest>``); at the ``full`` level the
+bodies themselves are written once to a content-addressed blob directory,
+so the static system prefix shared by every call is stored a single time.
+
+Configuration (environment):
+    LLM_TRACE_LEVEL: off | summary | full (default: off)
+    LLM_TRACE_SAMPLE_RATE: Fraction of calls traced, 0.0-1.0 (default: 1.0)
+    LLM_TRACE_PATH: Trace file (default: logs/llm_trace.jsonl)
+    LLM_TRACE_MAX_BYTES: Rotate after this size (default: 10 MB)
+    LLM_TRACE_BACKUPS: Rotated files to keep (default: 5)
+
+Example:
+    tracer = get_llm_tracer()
+    if tracer.sample():
+        tracer.record("agent.plan", agent_id=agent_id, messages=messages, response=content)
+
+Reference: MVP Demo Plan - Agent coordination
+"""
+import atexit
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_LEVELS = ("off", "summary", "full")
+TRACE_LOGGER_NAME = "theappapp.llm_trace"
+DEFAULT_TRACE_PATH = "logs/llm_trace.jsonl"
+
+
+@dataclass(frozen=True)
+class LLMTraceConfig:
+    """Trace verbosity, sampling and file rotation settings."""
+    level: str = "off"
+    sample_rate: float = 1.0
+    path: str = DEFAULT_TRACE_PATH
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+
+    @classmethod
+    def from_env(cls) -> "LLMTraceConfig":
+        level = os.getenv("LLM_TRACE_LEVEL", "off").strip().lower()
+        if level not in TRACE_LEVELS:
+            logger.warning(f"Unknown LLM_TRACE_LEVEL {level!r}, tracing disabled")
+            level = "off"
+        return cls(
+            level=level,
+            sample_rate=min(1.0, max(0.0, float(os.getenv("LLM_TRACE_SAMPLE_RATE", "1.0")))),
+            path=os.getenv("LLM_TRACE_PATH", DEFAULT_TRACE_PATH),
+            max_bytes=int(os.getenv("LLM_TRACE_MAX_BYTES", str(10 * 1024 * 1024))),
+            backup_count=int(os.getenv("LLM_TRACE_BACKUPS", "5")),
+        )
+
+
+def content_ref(text: str) -> str:
+    """Stable reference for a prompt or response body."""
+    return "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _TraceFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Writes trace events as JSON lines, replacing bodies with references.
+
+    Runs on the QueueListener thread only.
+    """
+
+    def __init__(self, config: LLMTraceConfig):
+        path = Path(config.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(
+            path, maxBytes=config.max_bytes, backupCount=config.backup_count, encoding="utf-8"
+        )
+        self.full = config.level == "full"
+        self.blob_dir = path.parent / f"{path.stem}_blobs"
+        if self.full:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = dict(record.msg)
+        messages = event.pop("messages", None)
+        response = event.pop("response", None)
+        if messages is not None:
+            event["prompt_refs"] = [
+                {"role": msg.get("role"), "ref": self._store(msg.get("content") or "")}
+                for msg in messages
+            ]
+        if response is not None:
+            event["response_ref"] = self._store(response)
+            event["response_chars"] = len(response)
+        return json.dumps(event, default=str)
+
+    def _store(self, text: str) -> str:
+        ref = content_ref(text)
+        if self.full:
+            blob = self.blob_dir / f"{ref.split(':', 1)[1]}.txt"
+            if not blob.exists():
+                blob.write_text(text, encoding="utf-8")
+        return ref
+
+
+class LLMTracer:
+    """
+    Sampled, asynchronous LLM trace writer.
+
+    ``sample()`` is a cheap check callers make before assembling any trace
+    data, so a disabled tracer costs one attribute read per call.
+    """
+
+    def __init__(self, config: Optional[LLMTraceConfig] = None):
+        """
+        Initialize tracer.
+
+        Args:
+            config: Trace settings (defaults to LLMTraceConfig.from_env())
+        """
+        self.config = config or LLMTraceConfig.from_env()
+        self.enabled = self.config.level != "off" and self.config.sample_rate > 0
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(_PassthroughQueueHandler(self._queue))
+
+    def sample(self) -> bool:
+        """Decide whether the current call should be traced."""
+        if not self.enabled:
+            return False
+        return self.config.sample_rate >= 1.0 or random.random() < self.config.sample_rate
+
+    def record(
+        self,
+        event: str,
+        messages: Optional[List[Dict[str, str]]] = None,
+        response: Optional[str] = None,
+        **fields: Any
+    ) -> None:
+        """
+        Queue a trace event. Call only after ``sample()`` returned True.
+
+        Args:
+            event: Event name (e.g. "agent.plan")
+            messages: Prompt messages; written as per-message references
+            response: Response text; written as a reference
+            **fields: Small scalar metadata (agent_id, tokens, latency_ms, ...)
+        """
+        if not self.enabled:
+            return
+        self._ensure_started()
+        payload: Dict[str, Any] = {"ts": time.time(), "event": event, **fields}
+        if messages is not None:
+            payload["messages"] = messages
+        if response is not None:
+            payload["response"] = response
+        self._logger.info(payload)
+
+    def flush(self) -> None:
+        """Stop the listener after writing everything queued so far."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+    def _ensure_started(self) -> None:
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                listener = logging.handlers.QueueListener(self._queue, _TraceFileHandler(self.config))
+                listener.start()
+                self._listener = listener
+
+
+_llm_tracer: Optional[LLMTracer] = None
+
+
+def get_llm_tracer() -> LLMTracer:
+    """Get global LLM tracer instance."""
+    global _llm_tracer
+    if _llm_tracer is None:
+        _llm_tracer = LLMTracer()
+        if _llm_tracer.enabled:
+            atexit.register(_llm_tracer.flush)
+    return _llm_tracer
@@ -59,6 +59,17 @@ class LoopDetector:
 
         self._failures.pop(task_id, None)
 
+    def window(self, task_id: str) -> List[str]:
+        """Return the recorded failure signatures for a task (for checkpoints)."""
+
+        return list(self._failures.get(task_id, []))
+
+    def restore(self, task_id: str, signatures: List[str]) -> None:
+        """Reinstate failure signatures saved by window()."""
+
+        if signatures:
+            self._failures[task_id] = deque(signatures, maxlen=self.window_size)
+
     def is_looping(self, state: TaskState) -> bool:
         """Return True if the task state indicates a loop condition."""
 
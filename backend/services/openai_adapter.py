@@ -8,10 +8,18 @@ Reference: Section 1.2.1 - OpenAI Integration Foundation
 """
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletion
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from backend.services.llm_request_scheduler import (
+    LLMRequestScheduler,
+    RequestPriority,
+    estimate_tokens,
+    get_llm_request_scheduler,
+    parse_retry_after,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -22,10 +30,11 @@ class OpenAIAdapter:
     Adapter for OpenAI API with token logging and error handling.
     
     Features:
-    - Async chat completions
+    - Async chat completions (buffered or streamed)
     - Text embeddings
     - Token usage logging
-    - Automatic retry with exponential backoff
+    - Shared per-model RPM/TPM scheduling with request priorities
+    - Automatic retry with exponential backoff (or provider Retry-After)
     - Error handling and timeout management
     
     Example:
@@ -40,17 +49,26 @@ class OpenAIAdapter:
     MAX_RETRIES = 3
     BASE_DELAY = 1.0  # seconds
     
-    def __init__(self, api_key: str, token_logger: Optional[Any] = None):
+    def __init__(
+        self,
+        api_key: str,
+        token_logger: Optional[Any] = None,
+        scheduler: Optional[LLMRequestScheduler] = None
+    ):
         """
         Initialize OpenAI adapter.
         
         Args:
             api_key: OpenAI API key
             token_logger: Optional token logger instance with log_tokens() method
+            scheduler: Request scheduler (defaults to the process-wide instance
+                so every adapter shares one rate-limit budget)
         """
         self.api_key = api_key
         self.token_logger = token_logger
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.scheduler = scheduler or get_llm_request_scheduler()
+        # Retries are owned by chat_completion so they pass through the scheduler
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=0)
         logger.info("OpenAI adapter initialized")
     
     async def chat_completion(
@@ -58,15 +76,20 @@ class OpenAIAdapter:
         model: str,
         messages: List[Dict[str, str]],
         temperature: float,
+        priority: RequestPriority = RequestPriority.AGENT,
         **kwargs
     ) -> ChatCompletion:
         """
         Call OpenAI chat completion API with retry logic.
         
+        Each attempt is admitted by the shared scheduler, which enforces the
+        model's RPM/TPM budget and orders queued requests by priority.
+        
         Args:
             model: Model name (e.g., "gpt-4o-mini", "gpt-4o")
             messages: List of message dicts with "role" and "content"
             temperature: Sampling temperature (0.0-1.0)
+            priority: Scheduling priority (ORCHESTRATOR > AGENT > BACKGROUND)
             **kwargs: Additional parameters (max_tokens, top_p, etc.)
         
         Returns:
@@ -75,16 +98,30 @@ class OpenAIAdapter:
         Raises:
             Exception: After MAX_RETRIES failed attempts
         """
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        
         for attempt in range(self.MAX_RETRIES):
+            retry_after = None
             try:
                 logger.debug(f"Chat completion attempt {attempt + 1}/{self.MAX_RETRIES}")
                 
-                response = await self.client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    temperature=temperature,
-                    **kwargs
-                )
+                async with self.scheduler.slot(model, estimated, priority) as lease:
+                    try:
+                        response = await self.client.chat.completions.create(
+                            model=model,
+                            messages=messages,
+                            temperature=temperature,
+                            **kwargs
+                        )
+                    except Exception as e:
+                        retry_after = parse_retry_after(e)
+                        if retry_after is not None:
+                            self.scheduler.penalize(model, retry_after)
+                        raise
+                    
+                    self.scheduler.record_usage(
+                        lease, response.usage.total_tokens if response.usage else None
+                    )
                 
                 # Log tokens if logger provided
                 self._log_tokens(response, kwargs)
@@ -100,6 +137,11 @@ class OpenAIAdapter:
                 logger.error(f"Chat completion attempt {attempt + 1} failed: {e}")
                 
                 if attempt < self.MAX_RETRIES - 1:
+                    if retry_after is not None:
+                        # Scheduler already holds this model until the provider's
+                        # Retry-After elapses; the next acquire waits for it
+                        logger.info(f"Rate limited, retrying after {retry_after}s...")
+                        continue
                     # Exponential backoff: 1s, 2s, 4s
                     delay = self.BASE_DELAY * (2 ** attempt)
                     logger.info(f"Retrying in {delay}s...")
@@ -108,6 +150,66 @@ class OpenAIAdapter:
                     logger.error(f"Chat completion failed after {self.MAX_RETRIES} attempts")
                     raise
     
+    async def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        priority: RequestPriority = RequestPriority.AGENT,
+        **kwargs
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        """
+        Stream a chat completion chunk by chunk.
+        
+        Holds a scheduler slot for the lifetime of the stream. Connection
+        failures before the first chunk are retried like chat_completion();
+        once chunks have been yielded, errors propagate to the caller.
+        The final chunk carries token usage and is passed to the token logger.
+        
+        Args:
+            model: Model name (e.g., "gpt-4o-mini", "gpt-4o")
+            messages: List of message dicts with "role" and "content"
+            temperature: Sampling temperature (0.0-1.0)
+            priority: Scheduling priority (ORCHESTRATOR > AGENT > BACKGROUND)
+            **kwargs: Additional parameters (max_tokens, response_format, etc.)
+        
+        Yields:
+            ChatCompletionChunk objects as they arrive
+        """
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        
+        for attempt in range(self.MAX_RETRIES):
+            retry_after = None
+            async with self.scheduler.slot(model, estimated, priority) as lease:
+                try:
+                    stream = await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        stream=True,
+                        stream_options={"include_usage": True},
+                        **kwargs
+                    )
+                except Exception as e:
+                    logger.error(f"Stream attempt {attempt + 1} failed: {e}")
+                    if attempt == self.MAX_RETRIES - 1:
+                        raise
+                    retry_after = parse_retry_after(e)
+                    if retry_after is not None:
+                        self.scheduler.penalize(model, retry_after)
+                    stream = None
+                
+                if stream is not None:
+                    async for chunk in stream:
+                        if chunk.usage is not None:
+                            self.scheduler.record_usage(lease, chunk.usage.total_tokens)
+                            self._log_tokens(chunk, kwargs)
+                        yield chunk
+                    return
+            
+            if retry_after is None:
+                await asyncio.sleep(self.BASE_DELAY * (2 ** attempt))
+    
     async def embed_text(
         self,
         text: str,
@@ -125,10 +227,13 @@ class OpenAIAdapter:
         """
         logger.debug(f"Generating embedding for text (length={len(text)})")
         
-        response = await self.client.embeddings.create(
-            model=model,
-            input=text
-        )
+        async with self.scheduler.slot(
+            model, len(text) // 4 + 1, RequestPriority.BACKGROUND
+        ):
+            response = await self.client.embeddings.create(
+                model=model,
+                input=text
+            )
         
         embedding = response.data[0].embedding
         
@@ -136,6 +241,39 @@ class OpenAIAdapter:
         
         return embedding
     
+    async def embed_texts(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small"
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for several texts in one API request.
+        
+        Args:
+            texts: Texts to embed
+            model: Embedding model name (default: text-embedding-3-small)
+        
+        Returns:
+            One embedding per text, in input order
+        """
+        if not texts:
+            return []
+        
+        estimated_tokens = sum(len(text) // 4 + 1 for text in texts)
+        async with self.scheduler.slot(
+            model, estimated_tokens, RequestPriority.BACKGROUND
+        ):
+            response = await self.client.embeddings.create(
+                model=model,
+                input=texts
+            )
+        
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        
+        logger.info(f"Embeddings generated: model={model}, count={len(embeddings)}")
+        
+        return embeddings
+    
     def _log_tokens(self, response: ChatCompletion, metadata: Dict[str, Any]) -> None:
         """
         Log token usage to token logger if configured.
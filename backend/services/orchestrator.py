@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import uuid
 from dataclasses import dataclass, field
@@ -13,6 +14,7 @@ from typing import Any, Awaitable, Dict, List, Optional
 
 from backend.models import AutonomyLevel
 from backend.services.autonomy_policy import should_escalate as autonomy_should_escalate
+from backend.services.consultation_fanout import fan_out
 from backend.agents.base_agent import TaskResult
 
 
@@ -128,6 +130,8 @@ class Orchestrator:
     - Update project state
     """
     
+    SPECIALIST_CONSULT_TIMEOUT = 60.0  # Seconds before an unanswered consultation is cancelled
+    
     def __init__(
         self,
         project_id: str,
@@ -138,12 +142,14 @@ class Orchestrator:
         rag_service: Optional[Any] = None,
         decision_logger: Optional[Any] = None,
         autonomy_level: AutonomyLevel = AutonomyLevel.MEDIUM,
+        durable_queue: Optional[Any] = None,
     ):
         """
         Initialize the Orchestrator.
         
         Args:
             project_id: Unique identifier for the project being orchestrated
+            durable_queue: DurableTaskQueue replacing the in-process task queue
         """
         self.orchestrator_id = str(uuid.uuid4())
         self.project_id = project_id
@@ -154,6 +160,7 @@ class Orchestrator:
         # Task queue - FIFO with priority support
         # Using PriorityQueue: (priority, task_id, task)
         self.task_queue: PriorityQueue = PriorityQueue()
+        self.durable_queue = durable_queue
         
         # Project state tracking
         self.project_state: ProjectState = ProjectState(
@@ -307,6 +314,10 @@ class Orchestrator:
                 f"Orchestrator assigned agent_type={task.agent_type.value} for task {task.task_id}"
             )
         
+        if self.durable_queue is not None:
+            self.durable_queue.enqueue(task)
+            return
+        
         # Negate priority so higher numbers = higher priority
         self.task_queue.put((-task.priority, task.created_at.timestamp(), task))
     
@@ -385,7 +396,7 @@ class Orchestrator:
             ] if hasattr(self.project_state, 'task_history') else [],
             
             # Current state
-            "active_task_count": self.task_queue.qsize(),
+            "active_task_count": self.get_pending_count(),
         }
         
         return context
@@ -671,7 +682,10 @@ Think like a project manager - be strategic, consider dependencies, and keep the
         )
         
         # Enqueue it
-        self.enqueue_task(next_task)
+        if self.durable_queue is not None:
+            await asyncio.to_thread(self.enqueue_task, next_task)
+        else:
+            self.enqueue_task(next_task)
         
         self.logger.info(
             f"Orchestrator created next task: {next_task.task_id} for {agent_type.value}"
@@ -684,6 +698,9 @@ Think like a project manager - be strategic, consider dependencies, and keep the
         Returns:
             Next task in queue, or None if queue is empty
         """
+        if self.durable_queue is not None:
+            return self.durable_queue.dequeue()
+        
         if self.task_queue.empty():
             return None
         
@@ -697,6 +714,9 @@ Think like a project manager - be strategic, consider dependencies, and keep the
         Returns:
             Next task in queue, or None if queue is empty
         """
+        if self.durable_queue is not None:
+            return self.durable_queue.peek()
+        
         if self.task_queue.empty():
             return None
         
@@ -712,8 +732,28 @@ Think like a project manager - be strategic, consider dependencies, and keep the
         Returns:
             Number of tasks waiting to be assigned
         """
+        if self.durable_queue is not None:
+            return self.durable_queue.get_pending_count()
         return self.task_queue.qsize()
     
+    def get_pending_counts_by_agent_type(self) -> Dict[str, int]:
+        """
+        Get the number of pending tasks per agent type.
+        
+        Returns:
+            Mapping of agent type value to queued task count
+        """
+        if self.durable_queue is not None:
+            return self.durable_queue.pending_by_agent_type()
+        
+        with self.task_queue.mutex:
+            tasks = [item[-1] for item in self.task_queue.queue]
+        counts: Dict[str, int] = {}
+        for task in tasks:
+            key = task.agent_type.value if hasattr(task.agent_type, 'value') else str(task.agent_type)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+    
     def prioritize_task(self, task_id: str, new_priority: int) -> bool:
         """
         Change the priority of a task in the queue.
@@ -968,8 +1008,21 @@ Think like a project manager - be strategic, consider dependencies, and keep the
 
         return formatted
 
-    async def vet_pm_decision(self, project_plan: Dict[str, Any]) -> Dict[str, Any]:
-        """Review a PM proposal with specialists and log the orchestrator decision."""
+    async def vet_pm_decision(
+        self,
+        project_plan: Dict[str, Any],
+        *,
+        consult_timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Review a PM proposal with specialists and log the orchestrator decision.
+
+        Specialists are consulted concurrently; consultations still running
+        after ``consult_timeout`` seconds are cancelled and reported in
+        ``timed_out``, and consultations that raised are reported in
+        ``failed``. Either blocks approval. Feedback keeps the order
+        specialists were required in.
+        """
 
         self.logger.info("Vetting PM decision for project %s", self.project_id)
         required_specialists: List[AgentType] = []
@@ -981,28 +1034,39 @@ Think like a project manager - be strategic, consider dependencies, and keep the
         if project_plan.get("requires_backend_changes"):
             required_specialists.append(AgentType.BACKEND_DEVELOPER)
 
-        feedback: List[Dict[str, Any]] = []
-        for specialist_type in required_specialists:
-            consultation = await _awaitable(
-                self.consult_specialist(
-                    requesting_agent_id=project_plan.get("pm_agent_id", "project_manager"),
-                    specialist_type=specialist_type,
-                    question=f"Review project plan section for {specialist_type.value}",
-                    context={"project_plan": project_plan},
+        outcomes = await fan_out(
+            [
+                (
+                    specialist_type.value,
+                    functools.partial(
+                        self.consult_specialist,
+                        requesting_agent_id=project_plan.get("pm_agent_id", "project_manager"),
+                        specialist_type=specialist_type,
+                        question=f"Review project plan section for {specialist_type.value}",
+                        context={"project_plan": project_plan},
+                    ),
                 )
-            )
-            if consultation:
-                feedback.append(consultation)
+                for specialist_type in required_specialists
+            ],
+            timeout=self.SPECIALIST_CONSULT_TIMEOUT if consult_timeout is None else consult_timeout,
+        )
+        feedback: List[Dict[str, Any]] = [outcome.response for outcome in outcomes if outcome.answered]
+        timed_out = [outcome.key for outcome in outcomes if outcome.status == "timed_out"]
+        failed = {outcome.key: outcome.error for outcome in outcomes if outcome.status == "error"}
 
-        approved = not feedback
+        approved = not feedback and not timed_out and not failed
         decision_summary = {
             "approved": approved,
             "feedback": feedback,
         }
+        if timed_out:
+            decision_summary["timed_out"] = timed_out
+        if failed:
+            decision_summary["failed"] = failed
 
         await self.log_decision(
             decision_type="pm_vetting",
-            reasoning="Specialist feedback gathered" if feedback else "No concerns identified",
+            reasoning="Specialist feedback gathered" if feedback or timed_out or failed else "No concerns identified",
             decision=decision_summary,
             confidence=1.0 if approved else 0.6,
             rag_context=None,
@@ -15,6 +15,12 @@ from typing import Any, Dict, Mapping, Optional, Protocol, Sequence
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
+from backend.services.llm_request_scheduler import (
+    LLMRequestScheduler,
+    RequestPriority,
+    estimate_tokens,
+    get_llm_request_scheduler,
+)
 from backend.prompts.orchestrator_prompts import (
     BASE_SYSTEM_PROMPT,
     CollaborationRecord,
@@ -60,12 +66,14 @@ class OrchestratorLLMClient:
         openai_client: Optional[AsyncOpenAI] = None,
         token_logger: Optional[TokenLogger] = None,
         project_id: Optional[str] = None,
+        scheduler: Optional[LLMRequestScheduler] = None,
     ) -> None:
         self.model = model
         self.temperature = temperature
         self._client = openai_client or AsyncOpenAI()
         self._token_logger = token_logger
         self._project_id = project_id
+        self._scheduler = scheduler or get_llm_request_scheduler()
 
         validate_prompt_requirements(BASE_SYSTEM_PROMPT)
 
@@ -153,17 +161,28 @@ class OrchestratorLLMClient:
         return max(0.0, min(1.0, decision.confidence))
 
     async def _create_chat_completion(self, user_prompt: str) -> ChatCompletion:
-        """Call the OpenAI chat completions endpoint."""
-
-        return await self._client.chat.completions.create(
-            model=self.model,
-            temperature=self.temperature,
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": BASE_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
+        """Call the OpenAI chat completions endpoint.
+
+        Orchestrator reasoning is admitted ahead of agent and background
+        traffic by the shared request scheduler.
+        """
+
+        messages = [
+            {"role": "system", "content": BASE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+        async with self._scheduler.slot(
+            self.model, estimate_tokens(messages), RequestPriority.ORCHESTRATOR
+        ) as lease:
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                response_format={"type": "json_object"},
+                messages=messages,
+            )
+            usage = getattr(response, "usage", None)
+            self._scheduler.record_usage(lease, getattr(usage, "total_tokens", None))
+        return response
 
     async def _log_tokens(self, response: ChatCompletion, decision_type: str) -> None:
         if not self._token_logger or not response.usage:
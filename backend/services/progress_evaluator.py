@@ -8,11 +8,12 @@ Reference: Section 1.4.1 - Loop Detection Algorithm
 """
 import logging
 import os
-import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, UTC
 
+from backend.services.workspace_scanner import WorkspaceScanner, WorkspaceSnapshot, get_workspace_scanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +30,7 @@ class ProgressMetrics:
     progress_detected: bool
     confidence: float
     reasoning: str
+    files_deleted: int = 0
 
 
 class ProgressEvaluator:
@@ -52,9 +54,16 @@ class ProgressEvaluator:
             print("Agent is making progress!")
     """
     
-    def __init__(self):
-        """Initialize progress evaluator."""
+    def __init__(self, scanner: Optional[WorkspaceScanner] = None):
+        """
+        Initialize progress evaluator.
+        
+        Args:
+            scanner: Workspace scanner (defaults to the shared instance)
+        """
+        self.scanner = scanner or get_workspace_scanner()
         self._baseline_metrics: Dict[str, Dict[str, Any]] = {}
+        self._baseline_snapshots: Dict[str, WorkspaceSnapshot] = {}
         self._last_evaluations: Dict[str, Dict[str, Any]] = {}
         logger.info("ProgressEvaluator initialized")
     
@@ -86,7 +95,7 @@ class ProgressEvaluator:
         self._last_evaluations[task_id] = {
             "files_added": metrics.files_created,
             "files_modified": metrics.files_modified,
-            "files_deleted": 0,  # Not currently tracked
+            "files_deleted": metrics.files_deleted,
             "progress_detected": metrics.progress_detected,
             "confidence": metrics.confidence,
             "reasoning": metrics.reasoning
@@ -112,22 +121,28 @@ class ProgressEvaluator:
         Returns:
             ProgressMetrics with detailed evaluation
         """
-        # Get or compute current metrics
+        # Get or compute current metrics (one workspace scan covers everything)
+        snapshot = None
         if current_metrics is None:
-            current_metrics = self._collect_metrics(project_path)
+            snapshot = self.scanner.scan(project_path)
+            current_metrics = self._collect_metrics(project_path, snapshot)
         
         # Get baseline metrics (from task start)
         baseline = self._baseline_metrics.get(task_id, {})
+        changes = self._diff_against_baseline(task_id, snapshot)
         
         # Check if tests exist
-        has_tests = self._has_tests(project_path)
+        has_tests = current_metrics.get("has_tests")
+        if has_tests is None:
+            has_tests = self.scanner.scan(project_path).has_tests
         
         if has_tests:
             # Test-based evaluation
             return self._evaluate_with_tests(
                 task_id=task_id,
                 current_metrics=current_metrics,
-                baseline=baseline
+                baseline=baseline,
+                changes=changes
             )
         else:
             # File-based evaluation (no tests)
@@ -135,7 +150,8 @@ class ProgressEvaluator:
                 task_id=task_id,
                 current_metrics=current_metrics,
                 baseline=baseline,
-                project_path=project_path
+                project_path=project_path,
+                changes=changes
             )
     
     def set_baseline(self, task_id: str, project_path: str) -> None:
@@ -146,8 +162,10 @@ class ProgressEvaluator:
             task_id: Task starting
             project_path: Project directory
         """
-        metrics = self._collect_metrics(project_path)
+        snapshot = self.scanner.scan(project_path)
+        metrics = self._collect_metrics(project_path, snapshot)
         self._baseline_metrics[task_id] = metrics
+        self._baseline_snapshots[task_id] = snapshot
         
         logger.info(
             "Baseline set | task_id=%s | tests=%s | files=%d",
@@ -156,12 +174,19 @@ class ProgressEvaluator:
             metrics.get("file_count", 0)
         )
     
-    def _collect_metrics(self, project_path: str) -> Dict[str, Any]:
+    def _collect_metrics(
+        self,
+        project_path: str,
+        snapshot: Optional[WorkspaceSnapshot] = None
+    ) -> Dict[str, Any]:
         """Collect current metrics from project."""
+        if snapshot is None:
+            snapshot = self.scanner.scan(project_path)
         metrics = {
-            "has_tests": self._has_tests(project_path),
-            "file_count": self._count_files(project_path),
-            "test_count": self._count_test_files(project_path),
+            "has_tests": snapshot.has_tests,
+            "file_count": snapshot.source_file_count,
+            "test_count": snapshot.test_file_count,
+            "total_lines": snapshot.total_lines,
             "dependency_count": self._count_dependencies(project_path),
             "timestamp": datetime.now(UTC)
         }
@@ -178,11 +203,24 @@ class ProgressEvaluator:
         
         return metrics
     
+    def _diff_against_baseline(
+        self,
+        task_id: str,
+        snapshot: Optional[WorkspaceSnapshot]
+    ) -> Tuple[int, int]:
+        """Return (files_modified, files_deleted) since the task baseline."""
+        baseline_snapshot = self._baseline_snapshots.get(task_id)
+        if snapshot is None or baseline_snapshot is None:
+            return 0, 0
+        _, modified, deleted = snapshot.diff(baseline_snapshot)
+        return len(modified), len(deleted)
+    
     def _evaluate_with_tests(
         self,
         task_id: str,
         current_metrics: Dict[str, Any],
-        baseline: Dict[str, Any]
+        baseline: Dict[str, Any],
+        changes: Tuple[int, int] = (0, 0)
     ) -> ProgressMetrics:
         """Evaluate progress using test metrics."""
         # Calculate coverage change
@@ -198,6 +236,8 @@ class ProgressEvaluator:
         # File changes
         files_created = max(0, current_metrics.get("file_count", 0) - baseline.get("file_count", 0))
         
+        files_modified, files_deleted = changes
+        
         # Dependencies added
         deps_added = max(0, current_metrics.get("dependency_count", 0) - baseline.get("dependency_count", 0))
         
@@ -213,6 +253,12 @@ class ProgressEvaluator:
         if files_created > 0:
             progress_indicators.append(f"{files_created} files created")
         
+        if files_modified > 0:
+            progress_indicators.append(f"{files_modified} files modified")
+        
+        if files_deleted > 0:
+            progress_indicators.append(f"{files_deleted} files deleted")
+        
         if deps_added > 0:
             progress_indicators.append(f"{deps_added} dependencies added")
         
@@ -227,12 +273,13 @@ class ProgressEvaluator:
             test_coverage_change=coverage_change,
             test_failure_rate_change=failure_rate_change,
             files_created=files_created,
-            files_modified=0,  # Not tracked in this simple version
+            files_modified=files_modified,
             dependencies_added=deps_added,
             commits_made=0,  # Not tracked
             progress_detected=progress_detected,
             confidence=confidence,
-            reasoning=reasoning
+            reasoning=reasoning,
+            files_deleted=files_deleted
         )
     
     def _evaluate_without_tests(
@@ -240,11 +287,13 @@ class ProgressEvaluator:
         task_id: str,
         current_metrics: Dict[str, Any],
         baseline: Dict[str, Any],
-        project_path: str
+        project_path: str,
+        changes: Tuple[int, int] = (0, 0)
     ) -> ProgressMetrics:
         """Evaluate progress without test metrics."""
         # File changes
         files_created = max(0, current_metrics.get("file_count", 0) - baseline.get("file_count", 0))
+        files_modified, files_deleted = changes
         
         # Dependencies added
         deps_added = max(0, current_metrics.get("dependency_count", 0) - baseline.get("dependency_count", 0))
@@ -258,6 +307,12 @@ class ProgressEvaluator:
         if files_created > 0:
             progress_indicators.append(f"{files_created} files created")
         
+        if files_modified > 0:
+            progress_indicators.append(f"{files_modified} files modified")
+        
+        if files_deleted > 0:
+            progress_indicators.append(f"{files_deleted} files deleted")
+        
         if deps_added > 0:
             progress_indicators.append(f"{deps_added} dependencies")
         
@@ -275,59 +330,15 @@ class ProgressEvaluator:
             test_coverage_change=None,
             test_failure_rate_change=None,
             files_created=files_created,
-            files_modified=0,
+            files_modified=files_modified,
             dependencies_added=deps_added,
             commits_made=0,
             progress_detected=progress_detected,
             confidence=confidence,
-            reasoning=reasoning
+            reasoning=reasoning,
+            files_deleted=files_deleted
         )
     
-    def _has_tests(self, project_path: str) -> bool:
-        """Check if project has tests."""
-        test_dirs = ["tests", "test", "__tests__", "spec"]
-        test_patterns = ["*test*.py", "*test*.ts", "*test*.tsx", "*spec*.ts", "*spec*.js"]
-        
-        for root, dirs, files in os.walk(project_path):
-            # Check for test directories
-            if any(test_dir in dirs for test_dir in test_dirs):
-                return True
-            
-            # Check for test files
-            for file in files:
-                if any(re.match(pattern.replace("*", ".*"), file) for pattern in test_patterns):
-                    return True
-        
-        return False
-    
-    def _count_files(self, project_path: str) -> int:
-        """Count source files in project."""
-        count = 0
-        exclude_dirs = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build"}
-        
-        for root, dirs, files in os.walk(project_path):
-            # Filter out excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            # Count source files
-            for file in files:
-                if file.endswith((".py", ".ts", ".tsx", ".js", ".jsx")):
-                    count += 1
-        
-        return count
-    
-    def _count_test_files(self, project_path: str) -> int:
-        """Count test files."""
-        count = 0
-        test_patterns = [r".*test.*\.py", r".*test.*\.ts", r".*spec.*\.ts"]
-        
-        for root, dirs, files in os.walk(project_path):
-            for file in files:
-                if any(re.match(pattern, file) for pattern in test_patterns):
-                    count += 1
-        
-        return count
-    
     def _count_dependencies(self, project_path: str) -> int:
         """Count dependencies from package files."""
         dep_count = 0
@@ -379,11 +390,7 @@ class ProgressEvaluator:
     
     def get_baseline(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get baseline metrics for a task."""
-        baseline = self._baseline_metrics.get(task_id)
-        if baseline:
-            # Add computed fields for test compatibility
-            baseline["total_lines"] = baseline.get("file_count", 0) * 50  # Estimate
-        return baseline
+        return self._baseline_metrics.get(task_id)
     
     def has_baseline(self, task_id: str) -> bool:
         """Check if baseline exists for task."""
@@ -398,7 +405,7 @@ class ProgressEvaluator:
         baseline = self._baseline_metrics.get(task_id, {})
         return {
             "file_count": baseline.get("file_count", 0),
-            "total_lines": baseline.get("file_count", 0) * 50,  # Estimate
+            "total_lines": baseline.get("total_lines", 0),
             "test_count": baseline.get("test_count", 0),
             "dependency_count": baseline.get("dependency_count", 0)
         }
@@ -8,6 +8,7 @@ Reference: Phase 3.5 - Backend Integration
 """
 import logging
 import asyncio
+import os
 from typing import Optional, Any, Dict, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -16,9 +17,11 @@ from datetime import datetime
 from backend.services.event_bus import EventBus, Event, EventType, get_event_bus
 from backend.services.milestone_generator import MilestoneGenerator
 from backend.services.phase_manager import PhaseManager
-from backend.services.orchestrator import Orchestrator
+from backend.services.orchestrator import Orchestrator, Task, TaskStatus
 from backend.services.agent_factory import AgentFactory
 from backend.services.task_executor import TaskExecutor
+from backend.services.durable_task_queue import DurableTaskQueue
+from backend.services.task_checkpoint_store import TaskCheckpointStore
 
 logger = logging.getLogger(__name__)
 
@@ -82,11 +85,19 @@ class ProjectBuildService:
         await service.pause_build(project_id)
     """
     
+    # Build loop pacing (seconds)
+    TASK_POLL_INTERVAL = 0.5  # While waiting for a deliverable task to finish
+    COMMIT_SETTLE_DELAY = 1.0  # For mark_completed() to commit
+    LOOP_INTERVAL = 0.5  # Between deliverables
+    PHASE_WAIT_INTERVAL = 5.0  # No deliverables and no transition possible
+    
     def __init__(
         self,
         db_engine: Any,
         llm_client: Any,
-        event_bus: Optional[EventBus] = None
+        event_bus: Optional[EventBus] = None,
+        startup_checker: Optional[Any] = None,
+        durable_task_queue: Optional[bool] = None
     ):
         """
         Initialize project build service.
@@ -95,13 +106,20 @@ class ProjectBuildService:
             db_engine: SQLAlchemy engine
             llm_client: LLM client for agents
             event_bus: Optional event bus (uses global if not provided)
+            startup_checker: Optional checker with run_all_checks() and
+                results (a new StartupChecker per build if not provided)
+            durable_task_queue: Queue tasks in the Postgres task_queue table
+                (default: DURABLE_TASK_QUEUE environment flag)
         """
         self.db_engine = db_engine
         self.event_bus = event_bus or get_event_bus()
+        self.startup_checker = startup_checker
+        if durable_task_queue is None:
+            durable_task_queue = os.getenv("DURABLE_TASK_QUEUE", "false").lower() in ("1", "true", "yes")
+        self.durable_task_queue = durable_task_queue
         
         # Create AgentLLMClient if none provided
         if llm_client is None:
-            import os
             from backend.services.agent_llm_client import AgentLLMClient
             from backend.services.openai_adapter import OpenAIAdapter
             
@@ -117,7 +135,7 @@ class ProjectBuildService:
             
             # Create OpenAI adapter with API key
             openai_adapter = OpenAIAdapter(api_key=api_key)
-            self.llm_client = AgentLLMClient(openai_adapter)
+            self.llm_client = AgentLLMClient(openai_adapter, streaming=True)
             logger.info("Created default AgentLLMClient with OpenAI adapter")
         else:
             self.llm_client = llm_client
@@ -125,6 +143,7 @@ class ProjectBuildService:
         # Service dependencies
         self.milestone_generator = MilestoneGenerator(db_engine, self.llm_client)
         self.agent_factory = AgentFactory(db_engine)
+        self.checkpoint_store = TaskCheckpointStore(db_engine)
         
         # Active builds: {project_id: (orchestrator, phase_manager, task_executor)}
         self.active_builds: Dict[str, Tuple[Orchestrator, PhaseManager, TaskExecutor]] = {}
@@ -159,7 +178,7 @@ class ProjectBuildService:
         logger.info("RUNNING BUILD SAFETY CHECKS")
         logger.info("=" * 80)
         
-        checker = StartupChecker()
+        checker = self.startup_checker or StartupChecker()
         checks_passed = await checker.run_all_checks()
         
         # Generate project_id first (needed for events)
@@ -277,13 +296,15 @@ class ProjectBuildService:
         orchestrator = Orchestrator(
             project_id=project_id,
             llm_client=self.llm_client,
-            tas_client=tas_client
+            tas_client=tas_client,
+            durable_queue=DurableTaskQueue(self.db_engine, project_id) if self.durable_task_queue else None
         )
         
         # 6. Register all agents
         agents = await self.agent_factory.create_and_register_all_agents(
             orchestrator=orchestrator,
-            llm_client=self.llm_client
+            llm_client=self.llm_client,
+            checkpoint_store=self.checkpoint_store
         )
         
         # 7. Create task executor for running agents (single worker for synchronous execution)
@@ -291,7 +312,13 @@ class ProjectBuildService:
             orchestrator=orchestrator,
             event_bus=self.event_bus,
             max_workers=1,  # Single worker for sequential execution
-            phase_manager=phase_manager  # Pass phase_manager for deliverable tracking
+            phase_manager=phase_manager,  # Pass phase_manager for deliverable tracking
+            agent_factory=lambda agent_type: self.agent_factory.create_agent(
+                agent_type=agent_type,
+                orchestrator=orchestrator,
+                llm_client=self.llm_client,
+                checkpoint_store=self.checkpoint_store
+            )
         )
         
         # Register agent instances with executor
@@ -351,29 +378,28 @@ class ProjectBuildService:
                         continue
                     else:
                         # No deliverables and can't transition - wait
-                        await asyncio.sleep(5)
+                        await asyncio.sleep(self.PHASE_WAIT_INTERVAL)
                         continue
                 
                 # Create ONE task at a time and wait for it to complete
                 if deliverables:
                     deliverable = deliverables[0]  # Take only the first one
-                    await self._create_task_from_deliverable(
+                    task = await self._create_task_from_deliverable(
                         orchestrator, deliverable, project_id
                     )
                     
-                    # Wait for this task to complete before processing next
-                    await asyncio.sleep(2)  # Give it time to start
-                    
-                    # Wait for queue to be empty (task completed)
-                    while not orchestrator.task_queue.empty():
-                        await asyncio.sleep(0.5)
+                    # Wait for this task to finish (retries re-queue it) before
+                    # processing next. Waiting only for the queue to drain would
+                    # dispatch a still-running deliverable again.
+                    while not await self._task_finished(orchestrator, task):
+                        await asyncio.sleep(self.TASK_POLL_INTERVAL)
                     
                     # CRITICAL: Wait for database commit from mark_completed() to finish
                     # The agent's mark_completed() happens AFTER task is removed from queue
-                    await asyncio.sleep(1)
+                    await asyncio.sleep(self.COMMIT_SETTLE_DELAY)
                 
                 # Brief pause between iterations
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(self.LOOP_INTERVAL)
         
         except Exception as e:
             logger.error(f"Build loop error: {e}", exc_info=True)
@@ -384,7 +410,7 @@ class ProjectBuildService:
         orchestrator: Orchestrator,
         deliverable: Dict[str, Any],
         project_id: str
-    ) -> None:
+    ) -> Task:
         """
         Create and queue a task from a deliverable.
         
@@ -395,9 +421,10 @@ class ProjectBuildService:
             orchestrator: Orchestrator to queue task with
             deliverable: Deliverable dict with id, title, description, type
             project_id: Project ID
-        """
-        from backend.services.orchestrator import Task, TaskPriority, TaskStatus
         
+        Returns:
+            The queued task
+        """
         # Let orchestrator analyze and decide which agent is best suited
         # Build a rich task description for intelligent agent selection
         task_description = self._build_task_description_for_orchestrator(deliverable)
@@ -405,12 +432,20 @@ class ProjectBuildService:
         # Create task WITHOUT agent_type - orchestrator will assign
         task = Task(
             task_id=deliverable["id"],
+            task_type="deliverable",
             description=task_description,
             deliverable_id=deliverable["id"],
             agent_type=None,  # Orchestrator will decide
-            priority=TaskPriority.NORMAL,
+            priority=5,  # Orchestrator's "normal" urgency
             status=TaskStatus.PENDING,
             project_id=project_id,
+            # Agents read their goal from the payload; TaskExecutor marks the
+            # deliverable complete from payload["id"]
+            payload={
+                "id": deliverable["id"],
+                "title": deliverable.get("title"),
+                "goal": task_description
+            },
             metadata={
                 "deliverable": deliverable,
                 "phase": "workshopping",  # TODO: Get from phase manager
@@ -420,7 +455,24 @@ class ProjectBuildService:
         )
         
         # Add to orchestrator queue - orchestrator will intelligently assign agent
-        orchestrator.enqueue_task(task)
+        if orchestrator.durable_queue is not None:
+            await asyncio.to_thread(orchestrator.enqueue_task, task)
+        else:
+            orchestrator.enqueue_task(task)
+        return task
+    
+    async def _task_finished(self, orchestrator: Orchestrator, task: Task) -> bool:
+        """
+        Whether a queued deliverable task has completed or failed.
+        
+        A durable queue hands the executor a copy of the task rebuilt from
+        its row (possibly in another process), so the row is checked instead
+        of the queued Task object.
+        """
+        queue = orchestrator.durable_queue
+        if queue is None:
+            return task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+        return await asyncio.to_thread(queue.status, task.task_id) in ("done", "failed")
     
     def _build_task_description_for_orchestrator(self, deliverable: Dict[str, Any]) -> str:
         """
@@ -0,0 +1,291 @@
+"""
+Prompt Assembler
+
+Builds chat messages so that the parts that rarely change (agent system
+prompt, tool schema, response format) form an identical leading prefix on
+every call, which lets the provider serve them from its prompt cache.
+Per-step content follows in the user message and is fitted into a token
+budget by trimming the lowest-priority sections first.
+
+Token counts use tiktoken when the encoding is available and fall back to
+the scheduler's ~4 characters per token estimate otherwise.
+
+Reference: Section 1.2.1 - OpenAI Integration Foundation
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.services.llm_request_scheduler import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "\n[...truncated...]\n"
+MAX_CACHED_PREFIXES = 256
+
+
+@dataclass
+class PromptSection:
+    """
+    One block of per-call prompt content.
+
+    Attributes:
+        name: Section identifier (reported when truncated)
+        content: Section text
+        priority: Higher priority sections are trimmed last
+        min_tokens: Never trim below this many tokens
+        keep: Which end survives truncation ("head" or "tail")
+    """
+    name: str
+    content: str
+    priority: int = 0
+    min_tokens: int = 0
+    keep: str = "head"
+
+
+@dataclass
+class AssembledPrompt:
+    """Messages ready for the provider plus accounting for the call."""
+    messages: List[Dict[str, str]]
+    prompt_tokens: int
+    prefix_tokens: int
+    prefix_reused: bool
+    tokens_trimmed: int = 0
+    truncated_sections: List[str] = field(default_factory=list)
+
+
+class TokenCounter:
+    """Tokenizer wrapper with a character-based fallback."""
+
+    def __init__(self, model: str):
+        self._encoding = None
+        try:
+            import tiktoken
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # Missing package or encoding file unavailable offline
+            logger.debug(f"tiktoken unavailable, estimating tokens from characters: {e}")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // CHARS_PER_TOKEN + 1
+
+    def truncate(self, text: str, max_tokens: int, keep: str) -> str:
+        """Cut ``text`` to at most ``max_tokens`` keeping the head or tail."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            kept = tokens[-max_tokens:] if keep == "tail" else tokens[:max_tokens]
+            return self._encoding.decode(kept)
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        return text[-max_chars:] if keep == "tail" else text[:max_chars]
+
+    def split(self, text: str, max_tokens: int) -> Iterator[str]:
+        """Cut ``text`` into consecutive pieces of at most ``max_tokens`` each."""
+        max_tokens = max(max_tokens, 1)
+        if self._encoding is None:
+            # count() adds one to the character estimate
+            step = max((max_tokens - 1) * CHARS_PER_TOKEN, 1)
+            for start in range(0, len(text), step):
+                yield text[start:start + step]
+            return
+
+        tokens = self._encoding.encode(text, disallowed_special=())
+        start = 0
+        while start < len(tokens):
+            end = min(start + max_tokens, len(tokens))
+            piece = self._decode_whole(tokens[start:end])
+            # Never end inside a multi-byte character; re-encoding a piece
+            # can also merge differently, so check the count it will get
+            while end - start > 1 and (piece is None or self.count(piece) > max_tokens):
+                end -= 1
+                piece = self._decode_whole(tokens[start:end])
+            while piece is None and end < len(tokens):
+                end += 1  # A lone token holding part of a character
+                piece = self._decode_whole(tokens[start:end])
+            if piece is None:
+                piece = self._encoding.decode(tokens[start:end])
+            yield piece
+            start = end
+
+    def _decode_whole(self, tokens: List[int]) -> Optional[str]:
+        """Decode tokens, or None if they end or start inside a character."""
+        try:
+            return self._encoding.decode_bytes(tokens).decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+
+class PromptAssembler:
+    """
+    Cache-friendly, token-budgeted message builder.
+
+    Example:
+        assembler = PromptAssembler(model="gpt-4o-mini", max_prompt_tokens=6000)
+        prompt = assembler.assemble(
+            prefix_parts=[system_prompt, TOOL_SCHEMA],
+            sections=[
+                PromptSection("goal", goal, priority=10, min_tokens=200),
+                PromptSection("history", history, priority=1, keep="tail"),
+            ],
+        )
+        response = await adapter.chat_completion(messages=prompt.messages, ...)
+        assembler.record_usage(response.usage)
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", max_prompt_tokens: int = 6000):
+        """
+        Initialize prompt assembler.
+
+        Args:
+            model: Model whose tokenizer to use
+            max_prompt_tokens: Default per-call prompt budget
+        """
+        self.model = model
+        self.max_prompt_tokens = max_prompt_tokens
+        self._counter = TokenCounter(model)
+        # prefix hash -> (prefix text, token count)
+        self._prefixes: Dict[str, Tuple[str, int]] = {}
+        self._stats = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "prefix_tokens": 0,
+            "prefix_reuses": 0,
+            "prefix_reused_tokens": 0,
+            "tokens_trimmed": 0,
+            "provider_cached_tokens": 0,
+        }
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in ``text`` for the configured model."""
+        return self._counter.count(text)
+
+    def assemble(
+        self,
+        prefix_parts: Sequence[Optional[str]],
+        sections: Sequence[PromptSection],
+        budget: Optional[int] = None,
+        section_separator: str = "\n\n"
+    ) -> AssembledPrompt:
+        """
+        Build messages: a stable system prefix followed by budgeted sections.
+
+        Args:
+            prefix_parts: Static text joined into the system message (None skipped)
+            sections: Per-call content in display order
+            budget: Prompt token budget (default: max_prompt_tokens)
+            section_separator: Text placed between sections
+
+        Returns:
+            AssembledPrompt with messages and token accounting
+        """
+        budget = budget or self.max_prompt_tokens
+        prefix, prefix_tokens, reused = self._get_prefix(prefix_parts)
+
+        contents = [section.content or "" for section in sections]
+        counts = [self.count_tokens(text) for text in contents]
+        available = budget - prefix_tokens
+        overflow = sum(counts) - available
+
+        truncated: List[str] = []
+        trimmed = 0
+        if overflow > 0:
+            # Trim lowest priority first; later sections first within a priority
+            order = sorted(range(len(sections)), key=lambda i: (sections[i].priority, -i))
+            for index in order:
+                if overflow <= 0:
+                    break
+                section = sections[index]
+                spare = counts[index] - section.min_tokens
+                if spare <= 0:
+                    continue
+                target = counts[index] - min(spare, overflow)
+                contents[index] = self.fit(contents[index], target, section.keep)
+                new_count = self.count_tokens(contents[index])
+                overflow -= counts[index] - new_count
+                trimmed += counts[index] - new_count
+                counts[index] = new_count
+                truncated.append(section.name)
+            if overflow > 0:
+                logger.warning(f"Prompt exceeds budget by {overflow} tokens after truncation")
+
+        body = section_separator.join(text for text in contents if text)
+        messages = []
+        if prefix:
+            messages.append({"role": "system", "content": prefix})
+        messages.append({"role": "user", "content": body})
+
+        prompt_tokens = prefix_tokens + sum(counts)
+        self._stats["calls"] += 1
+        self._stats["prompt_tokens"] += prompt_tokens
+        self._stats["prefix_tokens"] += prefix_tokens
+        self._stats["tokens_trimmed"] += trimmed
+        if reused:
+            self._stats["prefix_reuses"] += 1
+            self._stats["prefix_reused_tokens"] += prefix_tokens
+
+        return AssembledPrompt(
+            messages=messages,
+            prompt_tokens=prompt_tokens,
+            prefix_tokens=prefix_tokens,
+            prefix_reused=reused,
+            tokens_trimmed=trimmed,
+            truncated_sections=truncated,
+        )
+
+    def fit(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """Truncate a single value (e.g. a tool output) to ``max_tokens``."""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        room = max_tokens - self.count_tokens(TRUNCATION_MARKER)
+        kept = self._counter.truncate(text, room, keep)
+        if not kept:
+            return ""
+        if keep == "tail":
+            return TRUNCATION_MARKER.lstrip() + kept
+        return kept + TRUNCATION_MARKER.rstrip()
+
+    def record_usage(self, usage: Any) -> None:
+        """Accumulate provider-reported cached prompt tokens from a response."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details is not None else None
+        if cached:
+            self._stats["provider_cached_tokens"] += int(cached)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Prompt-token accounting across all assembled prompts.
+
+        Returns:
+            Dict with totals plus savings: tokens removed by budgeting
+            (tokens_trimmed), identical prefix tokens re-sent and eligible for
+            the provider cache (prefix_reused_tokens), and tokens the provider
+            reported as served from cache (provider_cached_tokens)
+        """
+        return dict(self._stats)
+    
+    def _get_prefix(self, parts: Sequence[Optional[str]]) -> Tuple[str, int, bool]:
+        """Return (prefix text, token count, reused) with memoized counting."""
+        text = "\n\n".join(part for part in parts if part)
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        cached = self._prefixes.get(key)
+        if cached is not None:
+            return cached[0], cached[1], True
+
+        tokens = self.count_tokens(text)
+        if len(self._prefixes) >= MAX_CACHED_PREFIXES:
+            self._prefixes.clear()
+        self._prefixes[key] = (text, tokens)
+        return text, tokens, False
@@ -0,0 +1,64 @@
+"""
+Shared Qdrant Client
+
+One AsyncQdrantClient per Qdrant URL for the whole process, so services
+share a pooled HTTP connection set instead of opening a client (and its
+connections) per request or per service instance.
+
+Configuration:
+    QDRANT_URL: Server URL or host (default http://localhost:6333)
+    QDRANT_PORT: Port used when QDRANT_URL has none (default 6333)
+    QDRANT_API_KEY: Optional API key
+    QDRANT_POOL_SIZE: Max pooled connections per client (default 16)
+
+Reference: Section 1.5.1 - RAG System Architecture
+"""
+import logging
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from qdrant_client import AsyncQdrantClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QDRANT_URL = "http://localhost:6333"
+DEFAULT_POOL_SIZE = 16
+
+_clients: Dict[str, AsyncQdrantClient] = {}
+
+
+def resolve_qdrant_url(url: Optional[str] = None) -> str:
+    """Normalize a Qdrant URL or bare host (as accepted by QDRANT_URL)."""
+    url = url or os.getenv("QDRANT_URL") or DEFAULT_QDRANT_URL
+    if "://" not in url:
+        url = f"http://{url}"
+    if urlsplit(url).port is None:
+        url = f"{url.rstrip('/')}:{os.getenv('QDRANT_PORT', '6333')}"
+    return url
+
+
+def get_qdrant_client(url: Optional[str] = None) -> AsyncQdrantClient:
+    """Get the shared async Qdrant client for ``url`` (default from env)."""
+    resolved = resolve_qdrant_url(url)
+    client = _clients.get(resolved)
+    if client is None:
+        pool_size = int(os.getenv("QDRANT_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        client = AsyncQdrantClient(
+            url=resolved,
+            api_key=os.getenv("QDRANT_API_KEY") or None,
+            pool_size=pool_size
+        )
+        _clients[resolved] = client
+        logger.info("Qdrant client created | url=%s | pool_size=%d", resolved, pool_size)
+    return client
+
+
+async def close_qdrant_clients() -> None:
+    """Close all shared clients (application shutdown)."""
+    while _clients:
+        url, client = _clients.popitem()
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning("Failed to close Qdrant client | url=%s | error=%s", url, e)
@@ -13,7 +13,9 @@ from qdrant_client.models import (
     VectorParams,
     ScalarQuantizationConfig,
     ScalarType,
-    PayloadSchemaType
+    PayloadSchemaType,
+    KeywordIndexParams,
+    KeywordIndexType
 )
 
 logger = logging.getLogger(__name__)
@@ -27,7 +29,7 @@ class QdrantSetup:
     - Vector size: 1536 (text-embedding-3-small)
     - Distance: Cosine
     - Quantization: Scalar (for performance)
-    - Indexes: agent_type, task_type, technology, success_verified
+    - Indexes: specialist_id (tenant), agent_type, task_type, technology, success_verified
     
     Example:
         setup = QdrantSetup(qdrant_client)
@@ -105,6 +107,7 @@ class QdrantSetup:
     async def _create_payload_indexes(self) -> None:
         """Create indexes on payload fields for faster filtering."""
         indexes = [
+            ("specialist_id", KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)),
             ("agent_type", PayloadSchemaType.KEYWORD),
             ("task_type", PayloadSchemaType.KEYWORD),
             ("technology", PayloadSchemaType.KEYWORD),
@@ -0,0 +1,185 @@
+"""
+Question Similarity Index
+
+Rolling, per-agent-pair matrices of question embeddings for collaboration
+loop detection. Each pair keeps its most recent questions as L2-normalized
+float32 rows, so comparing a new question against the whole window is one
+matrix-vector product. Embeddings are cached by question text, so a question
+checked for loops and then recorded is only embedded once.
+
+Reference: Decision 70 - Agent Collaboration Protocol
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[Sequence[float]]]
+
+DEFAULT_WINDOW = 10
+DEFAULT_CACHE_SIZE = 2048
+
+
+def pair_key(agent_a_id: str, agent_b_id: str) -> Tuple[str, str]:
+    """Order-independent key for an agent pair."""
+    return (agent_a_id, agent_b_id) if agent_a_id <= agent_b_id else (agent_b_id, agent_a_id)
+
+
+@dataclass
+class _PairWindow:
+    """Ring buffer of the pair's most recent question embeddings."""
+    vectors: np.ndarray
+    timestamps: np.ndarray
+    texts: List[Optional[str]] = field(default_factory=list)
+    next_slot: int = 0
+    count: int = 0
+
+    @classmethod
+    def create(cls, window: int, dim: int) -> "_PairWindow":
+        return cls(
+            vectors=np.zeros((window, dim), dtype=np.float32),
+            timestamps=np.zeros(window, dtype=np.float64),
+            texts=[None] * window,
+        )
+
+    def add(self, text: str, vector: np.ndarray, timestamp: float) -> None:
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.timestamps[slot] = timestamp
+        self.texts[slot] = text
+        self.next_slot = (slot + 1) % len(self.texts)
+        self.count = min(self.count + 1, len(self.texts))
+
+
+class QuestionSimilarityIndex:
+    """
+    Embedding cache plus rolling per-pair question windows.
+
+    Example:
+        index = QuestionSimilarityIndex(openai_adapter.embed_text)
+        vector = await index.embed(question)
+        if not index.is_warm(pair):
+            await index.warm(pair, recent_questions)
+        matches = index.find_similar(pair, vector, threshold=0.85)
+        index.add(pair, question, vector)
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        window: int = DEFAULT_WINDOW,
+        cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        """
+        Initialize similarity index.
+
+        Args:
+            embed_fn: Async text -> embedding function (e.g. OpenAIAdapter.embed_text)
+            window: Questions kept per agent pair
+            cache_size: Embeddings kept in the text-keyed LRU cache
+        """
+        self.embed_fn = embed_fn
+        self.window = window
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._pairs: Dict[Tuple[str, str], _PairWindow] = {}
+        self._warm: Set[Tuple[str, str]] = set()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Return the normalized float32 embedding for ``text`` (cached)."""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            return vector
+
+        vector = np.array(await self.embed_fn(text), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        vector.setflags(write=False)
+
+        self._cache[key] = vector
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return vector
+
+    def is_warm(self, pair: Tuple[str, str]) -> bool:
+        """True once the pair's window has been loaded."""
+        return pair in self._warm
+
+    def history_size(self, pair: Tuple[str, str]) -> int:
+        """Questions currently held in the pair's window."""
+        pair_window = self._pairs.get(pair)
+        return pair_window.count if pair_window else 0
+
+    async def warm(
+        self,
+        pair: Tuple[str, str],
+        questions: Sequence[Tuple[str, float]]
+    ) -> None:
+        """
+        Load a pair's window from stored history.
+
+        Args:
+            pair: Key from pair_key()
+            questions: (text, unix timestamp) pairs, newest first
+        """
+        recent = list(questions[:self.window])
+        vectors = await asyncio.gather(*(self.embed(text) for text, _ in recent))
+        self._pairs.pop(pair, None)
+        self._warm.add(pair)
+        # Oldest first so the ring ends with the newest question
+        for (text, timestamp), vector in reversed(list(zip(recent, vectors))):
+            self.add(pair, text, vector, timestamp)
+
+    def add(
+        self,
+        pair: Tuple[str, str],
+        text: str,
+        vector: np.ndarray,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Append a question to a warm pair's window (evicting the oldest)."""
+        if pair not in self._warm:
+            return
+        pair_window = self._pairs.get(pair)
+        if pair_window is None:
+            pair_window = _PairWindow.create(self.window, vector.shape[0])
+            self._pairs[pair] = pair_window
+        pair_window.add(text, vector, time.time() if timestamp is None else timestamp)
+
+    def find_similar(
+        self,
+        pair: Tuple[str, str],
+        vector: np.ndarray,
+        threshold: float,
+        max_age_seconds: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Compare ``vector`` against the pair's window in one matmul.
+
+        Returns:
+            (question, cosine similarity) at or above threshold, newest first
+        """
+        pair_window = self._pairs.get(pair)
+        if pair_window is None or pair_window.count == 0:
+            return []
+
+        count = pair_window.count
+        similarities = pair_window.vectors[:count] @ vector
+        mask = similarities >= threshold
+        if max_age_seconds is not None:
+            mask &= pair_window.timestamps[:count] >= time.time() - max_age_seconds
+
+        # Newest first: distance behind the most recently written slot
+        newest, size = pair_window.next_slot - 1, len(pair_window.texts)
+        slots = sorted(np.flatnonzero(mask), key=lambda slot: (newest - slot) % size)
+        return [(pair_window.texts[slot], float(similarities[slot])) for slot in slots]
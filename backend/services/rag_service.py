@@ -6,18 +6,56 @@ Integrates with OpenAI for embeddings.
 
 Reference: MVP Demo Plan - Specialist knowledge base
 """
+import asyncio
 import logging
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Sequence, Union
 from dataclasses import dataclass
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    MatchValue,
+    PayloadSchemaType,
+    PointStruct,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 
+from backend.services.document_chunker import Chunk, DocumentChunker
+from backend.services.lexical_index import (
+    RRF_K,
+    BM25Index,
+    LexicalHit,
+    get_lexical_index,
+    index_points,
+    reciprocal_rank_fusion,
+)
 from backend.services.openai_adapter import OpenAIAdapter
+from backend.services.qdrant_pool import get_qdrant_client
 
 logger = logging.getLogger(__name__)
 
+# Payload fields used in search filters. specialist_id is the tenant key:
+# every specialist search filters on it, so Qdrant co-locates each
+# specialist's points and builds per-value HNSW links (payload_m) for it.
+PAYLOAD_INDEXES = {
+    "specialist_id": KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+    "agent_type": PayloadSchemaType.KEYWORD,
+    "task_type": PayloadSchemaType.KEYWORD,
+}
+
 
 @dataclass
 class DocumentChunk:
@@ -30,10 +68,37 @@ class DocumentChunk:
 
 @dataclass
 class SearchResult:
-    """Search result with relevance score."""
+    """
+    Search result with relevance score.
+    
+    ``score`` is the cosine similarity of a dense match, or None when only
+    the lexical retriever found the chunk. ``fused_score`` is the reciprocal
+    rank fusion score that orders the results, scaled to [0, 1]: 1.0 means
+    ranked first by every retriever used for the query.
+    """
     text: str
-    score: float
+    score: Optional[float]  # Cosine similarity (None for lexical-only matches)
     metadata: Dict[str, Any]
+    lexical_score: Optional[float] = None  # BM25 score (lexical match)
+    fused_score: Optional[float] = None  # Scaled RRF score (result order)
+
+
+@dataclass
+class SearchQuery:
+    """One query in a batch search."""
+    query: str
+    specialist_id: Optional[str] = None
+    agent_type: Optional[str] = None
+    task_type: Optional[str] = None
+    limit: int = 5
+    score_threshold: float = 0.7
+
+
+class SearchMode:
+    """Retrievers used by a search."""
+    DENSE = "dense"
+    HYBRID = "hybrid"  # Dense + lexical, lexical only if embedding is slow or fails
+    LEXICAL = "lexical"  # No embedding call
 
 
 class RAGService:
@@ -41,10 +106,26 @@ class RAGService:
     Service for document indexing and semantic search.
     
     Features:
-    - Document chunking
+    - Structure-aware, token-bounded chunking with near-duplicate removal
     - Embedding generation via OpenAI
-    - Vector storage in Qdrant
-    - Semantic search
+    - Vector storage in Qdrant (shared async client)
+    - Filtered semantic search on indexed payload fields
+    - Hybrid dense + BM25 retrieval
+    - Batch search (one Qdrant request for several queries)
+    
+    Retrieval:
+    - Dense (default): Qdrant vectors (needs a query embedding)
+    - Lexical: local BM25 index over chunk text, updated on every upsert
+      and loaded from Qdrant payloads in the background; hits scoring
+      below min_lexical_score are dropped
+    - Hybrid (opt-in): both, fused with reciprocal rank fusion; dense only
+      until the lexical index has loaded, lexical only when the embedding
+      call fails or exceeds embedding_timeout
+    
+    Search tuning:
+    - hnsw_ef: HNSW search breadth (higher = better recall, slower)
+    - quantization: int8 scalar quantization kept in RAM; searches run on
+      the quantized vectors, oversample, then rescore with the originals
     
     Example:
         rag = RAGService(openai_adapter, qdrant_url="http://localhost:6333")
@@ -56,51 +137,154 @@ class RAGService:
         results = await rag.search("How to optimize queries?", specialist_id="specialist-123")
     """
     
-    CHUNK_SIZE = 500  # Characters per chunk
-    CHUNK_OVERLAP = 50  # Overlap between chunks
+    CHUNK_MAX_TOKENS = 400  # Token budget per chunk
+    INDEX_PAGE_SIZE = 64  # Chunks per embedding request / upsert
     EMBEDDING_DIM = 1536  # OpenAI text-embedding-3-small dimension
+    DEFAULT_HNSW_EF = 128
+    DEFAULT_OVERSAMPLING = 2.0
+    DEFAULT_EMBEDDING_TIMEOUT = 2.0  # Seconds before hybrid search goes lexical-only
+    CANDIDATE_MULTIPLIER = 4  # Candidates per retriever, per requested result
+    DEFAULT_MIN_LEXICAL_SCORE = 0.5  # BM25 floor for lexical hits
+    LEXICAL_LOAD_PAGE = 1000
     
     def __init__(
         self,
         openai_adapter: OpenAIAdapter,
-        qdrant_url: str = "http://localhost:6333",
-        collection_name: str = "specialist_documents"
+        qdrant_url: Optional[str] = None,
+        collection_name: str = "specialist_documents",
+        *,
+        qdrant_client: Optional[AsyncQdrantClient] = None,
+        hnsw_ef: int = DEFAULT_HNSW_EF,
+        quantization: bool = True,
+        oversampling: float = DEFAULT_OVERSAMPLING,
+        embedding_timeout: float = DEFAULT_EMBEDDING_TIMEOUT,
+        lexical_index: Optional[BM25Index] = None,
+        min_lexical_score: float = DEFAULT_MIN_LEXICAL_SCORE
     ):
         """
         Initialize RAG service.
         
         Args:
             openai_adapter: OpenAI adapter for embeddings
-            qdrant_url: Qdrant server URL
+            qdrant_url: Qdrant server URL (default from QDRANT_URL)
             collection_name: Name of Qdrant collection
+            qdrant_client: Client to use instead of the shared one for qdrant_url
+            hnsw_ef: Default HNSW ef for searches
+            quantization: Create the collection with int8 scalar quantization
+                and search through it (with rescoring)
+            oversampling: Candidates fetched per result before rescoring
+            embedding_timeout: Query embedding time budget for hybrid search
+            lexical_index: BM25 index to use instead of the shared one for
+                collection_name
+            min_lexical_score: Minimum BM25 score for lexical matches
         """
         self.openai = openai_adapter
-        self.qdrant = QdrantClient(url=qdrant_url)
+        self.qdrant = qdrant_client or get_qdrant_client(qdrant_url)
         self.collection_name = collection_name
-        
-        # Create collection if it doesn't exist
-        self._ensure_collection()
+        self.hnsw_ef = hnsw_ef
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.embedding_timeout = embedding_timeout
+        self.lexical_index = lexical_index if lexical_index is not None else get_lexical_index(collection_name)
+        self.min_lexical_score = min_lexical_score
+        self.chunker = DocumentChunker(max_tokens=self.CHUNK_MAX_TOKENS)
+        self._collection_ready = False
+        self._collection_lock = asyncio.Lock()
+        self._lexical_load: Optional[asyncio.Task] = None
         
         logger.info(f"RAG service initialized with collection: {collection_name}")
     
-    def _ensure_collection(self) -> None:
-        """Create Qdrant collection if it doesn't exist."""
-        try:
-            self.qdrant.get_collection(self.collection_name)
-            logger.debug(f"Collection {self.collection_name} already exists")
-        except Exception:
-            logger.info(f"Creating collection: {self.collection_name}")
-            self.qdrant.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=self.EMBEDDING_DIM,
-                    distance=Distance.COSINE
+    async def _ensure_collection(self) -> None:
+        """Create the Qdrant collection and its payload indexes if missing."""
+        if self._collection_ready:
+            return
+        
+        async with self._collection_lock:
+            if self._collection_ready:
+                return
+            
+            if not await self.qdrant.collection_exists(self.collection_name):
+                logger.info(f"Creating collection: {self.collection_name}")
+                await self.qdrant.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config=VectorParams(
+                        size=self.EMBEDDING_DIM,
+                        distance=Distance.COSINE
+                    ),
+                    # payload_m adds per-tenant graph links so filtered
+                    # searches stay on the HNSW path as the collection grows
+                    hnsw_config=HnswConfigDiff(m=16, ef_construct=128, payload_m=16),
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True
+                        )
+                    ) if self.quantization else None
                 )
+            
+            # Also covers collections created before the indexes existed
+            info = await self.qdrant.get_collection(self.collection_name)
+            existing = info.payload_schema or {}
+            for field_name, field_schema in PAYLOAD_INDEXES.items():
+                if field_name not in existing:
+                    logger.info(f"Creating payload index: {self.collection_name}.{field_name}")
+                    await self.qdrant.create_payload_index(
+                        collection_name=self.collection_name,
+                        field_name=field_name,
+                        field_schema=field_schema,
+                        wait=True
+                    )
+            
+            self._collection_ready = True
+    
+    def _warm_lexical_index(self) -> asyncio.Task:
+        """Start loading existing chunk payloads into the lexical index, once."""
+        task = self._lexical_load
+        if task is None or (task.done() and not self.lexical_index.loaded):
+            task = self._lexical_load = asyncio.create_task(self._load_lexical_index())
+            task.add_done_callback(self._log_lexical_load_failure)
+        return task
+    
+    async def _ensure_lexical_index(self) -> None:
+        """Wait until the lexical index holds the collection's existing chunks."""
+        if not self.lexical_index.loaded:
+            # Shielded: a cancelled search must not abort the shared load
+            await asyncio.shield(self._warm_lexical_index())
+    
+    async def _load_lexical_index(self) -> None:
+        """
+        Scroll existing chunk payloads into the lexical index.
+        
+        Runs as a background task without holding the collection lock.
+        Each page is tokenized and indexed in a worker thread, so searches
+        and upserts keep running while it loads.
+        """
+        await self._ensure_collection()
+        
+        offset = None
+        while True:
+            points, offset = await self.qdrant.scroll(
+                collection_name=self.collection_name,
+                limit=self.LEXICAL_LOAD_PAGE,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
             )
+            await asyncio.to_thread(index_points, self.lexical_index, points, "text")
+            if offset is None:
+                break
+        
+        self.lexical_index.loaded = True
+        logger.info(f"Lexical index loaded: {self.collection_name} ({len(self.lexical_index)} chunks)")
+    
+    def _log_lexical_load_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Lexical index load failed for {self.collection_name}: {task.exception()!r}")
     
     def chunk_text(self, text: str) -> List[str]:
         """
-        Split text into overlapping chunks.
+        Split text into structure-aware, token-bounded chunks.
         
         Args:
             text: Text to chunk
@@ -108,32 +292,25 @@ class RAGService:
         Returns:
             List of text chunks
         """
-        if len(text) <= self.CHUNK_SIZE:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + self.CHUNK_SIZE
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start = end - self.CHUNK_OVERLAP
-        
+        chunks = [chunk.text for chunk in self.chunker.iter_chunks(text)]
         logger.debug(f"Chunked text into {len(chunks)} chunks")
         return chunks
     
     async def index_document(
         self,
-        text: str,
+        text: Union[str, Iterable[str]],
         specialist_id: str,
         metadata: Optional[Dict[str, Any]] = None
     ) -> int:
         """
         Index a document for a specialist.
         
+        Chunks are embedded and upserted a page at a time as the chunker
+        produces them, so large documents are never held as a whole list of
+        chunks or vectors.
+        
         Args:
-            text: Document text
+            text: Document text, or an iterable of text pieces (e.g. a file)
             specialist_id: ID of specialist this document belongs to
             metadata: Optional metadata (filename, source, etc.)
         
@@ -141,45 +318,63 @@ class RAGService:
             Number of chunks indexed
         """
         logger.info(f"Indexing document for specialist {specialist_id}")
+        await self._ensure_collection()
         
-        # Chunk the text
-        chunks = self.chunk_text(text)
+        indexed = 0
+        page: List[Chunk] = []
+        for chunk in self.chunker.iter_chunks(text):
+            page.append(chunk)
+            if len(page) >= self.INDEX_PAGE_SIZE:
+                indexed += await self._index_page(page, specialist_id, metadata)
+                page = []
+        if page:
+            indexed += await self._index_page(page, specialist_id, metadata)
         
-        # Generate embeddings and create points
-        points = []
-        for i, chunk_text in enumerate(chunks):
-            # Generate embedding
-            embedding = await self.openai.embed_text(chunk_text)
-            
-            # Create point
-            point_id = str(uuid.uuid4())
-            point = PointStruct(
-                id=point_id,
+        logger.info(f"Indexed {indexed} chunks for specialist {specialist_id}")
+        return indexed
+    
+    async def _index_page(
+        self,
+        chunks: List[Chunk],
+        specialist_id: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> int:
+        """Embed a page of chunks in one request and upsert them."""
+        embeddings = await self.openai.embed_texts([chunk.text for chunk in chunks])
+        points = [
+            PointStruct(
+                id=str(uuid.uuid4()),
                 vector=embedding,
                 payload={
-                    "text": chunk_text,
+                    "text": chunk.text,
                     "specialist_id": specialist_id,
-                    "chunk_index": i,
+                    "chunk_index": chunk.index,
+                    "section": chunk.section,
+                    "content_kind": chunk.kind,
+                    "token_count": chunk.token_count,
                     **(metadata or {})
                 }
             )
-            points.append(point)
-        
-        # Upsert to Qdrant
-        self.qdrant.upsert(
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+        await self.qdrant.upsert(
             collection_name=self.collection_name,
             points=points
         )
-        
-        logger.info(f"Indexed {len(chunks)} chunks for specialist {specialist_id}")
-        return len(chunks)
+        index_points(self.lexical_index, points, "text")
+        return len(points)
     
     async def search(
         self,
         query: str,
-        specialist_id: str,
+        specialist_id: Optional[str] = None,
         limit: int = 5,
-        score_threshold: float = 0.7
+        score_threshold: float = 0.7,
+        *,
+        agent_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        hnsw_ef: Optional[int] = None,
+        mode: str = SearchMode.DENSE
     ) -> List[SearchResult]:
         """
         Search for relevant document chunks.
@@ -188,41 +383,191 @@ class RAGService:
             query: Search query
             specialist_id: Filter by specialist ID
             limit: Maximum number of results
-            score_threshold: Minimum similarity score (0-1)
+            score_threshold: Minimum cosine similarity for dense matches (0-1)
+            agent_type: Filter by agent type
+            task_type: Filter by task type
+            hnsw_ef: Override HNSW ef for this search
+            mode: SearchMode.DENSE, HYBRID or LEXICAL
         
         Returns:
-            List of search results with relevance scores
+            List of search results, best first
+        """
+        results = await self.search_batch(
+            [SearchQuery(query, specialist_id, agent_type, task_type, limit, score_threshold)],
+            hnsw_ef=hnsw_ef,
+            mode=mode
+        )
+        logger.info(f"Found {len(results[0])} results for query")
+        return results[0]
+    
+    async def search_batch(
+        self,
+        queries: Sequence[SearchQuery],
+        *,
+        hnsw_ef: Optional[int] = None,
+        mode: str = SearchMode.DENSE
+    ) -> List[List[SearchResult]]:
         """
-        logger.debug(f"Searching for: {query} (specialist: {specialist_id})")
+        Run several searches with one Qdrant request.
+        
+        Query embeddings are generated concurrently.
         
-        # Generate query embedding
-        query_embedding = await self.openai.embed_text(query)
+        Args:
+            queries: Queries with their own filters and limits
+            hnsw_ef: Override HNSW ef for these searches
+            mode: SearchMode.DENSE, HYBRID or LEXICAL
         
-        # Search Qdrant
-        search_results = self.qdrant.search(
+        Returns:
+            One result list per query, in the same order
+        """
+        if not queries:
+            return []
+        
+        use_lexical = mode != SearchMode.DENSE
+        if mode == SearchMode.HYBRID and not self.lexical_index.loaded:
+            # Dense search does not wait for the warm-up
+            self._warm_lexical_index()
+            use_lexical = False
+        
+        dense: List[List[Any]] = [[] for _ in queries]
+        if mode != SearchMode.LEXICAL:
+            try:
+                timeout = None if mode == SearchMode.DENSE else self.embedding_timeout
+                dense = await self._dense_search(queries, hnsw_ef, timeout)
+            except Exception as e:
+                if mode == SearchMode.DENSE:
+                    raise
+                logger.warning(f"Dense search unavailable, using lexical results only: {e!r}")
+                mode = SearchMode.LEXICAL
+                use_lexical = True
+        
+        lexical: List[List[LexicalHit]] = [[] for _ in queries]
+        if use_lexical:
+            await self._ensure_lexical_index()
+            lexical = [self._lexical_search(q) for q in queries]
+        
+        retrievers = 2 if mode == SearchMode.HYBRID and use_lexical else 1
+        return [
+            self._fuse(dense_points, lexical_hits, q.limit, retrievers)
+            for q, dense_points, lexical_hits in zip(queries, dense, lexical)
+        ]
+    
+    async def _dense_search(
+        self,
+        queries: Sequence[SearchQuery],
+        hnsw_ef: Optional[int],
+        timeout: Optional[float]
+    ) -> List[List[Any]]:
+        """Embed queries and run them as one batched Qdrant request."""
+        embeddings = await asyncio.wait_for(
+            asyncio.gather(*(self.openai.embed_text(q.query) for q in queries)),
+            timeout=timeout
+        )
+        search_params = self._search_params(hnsw_ef)
+        requests = [
+            QueryRequest(
+                query=embedding,
+                filter=self._build_filter(q.specialist_id, q.agent_type, q.task_type),
+                params=search_params,
+                limit=self._candidates(q.limit),
+                score_threshold=q.score_threshold,
+                with_payload=True
+            )
+            for q, embedding in zip(queries, embeddings)
+        ]
+        
+        await self._ensure_collection()
+        responses = await self.qdrant.query_batch_points(
             collection_name=self.collection_name,
-            query_vector=query_embedding,
-            query_filter={
-                "must": [
-                    {"key": "specialist_id", "match": {"value": specialist_id}}
-                ]
-            },
-            limit=limit,
-            score_threshold=score_threshold
+            requests=requests
         )
+        return [response.points for response in responses]
+    
+    def _lexical_search(self, query: SearchQuery) -> List[LexicalHit]:
+        """BM25 candidates for a query, without matches below the floor."""
+        hits = self.lexical_index.search(
+            query.query,
+            limit=self._candidates(query.limit),
+            filters=self._payload_filters(query)
+        )
+        return [hit for hit in hits if hit.score >= self.min_lexical_score]
+    
+    def _candidates(self, limit: int) -> int:
+        return max(limit * self.CANDIDATE_MULTIPLIER, 20)
+    
+    @staticmethod
+    def _payload_filters(query: SearchQuery) -> Dict[str, Any]:
+        return {
+            key: value
+            for key, value in (
+                ("specialist_id", query.specialist_id),
+                ("agent_type", query.agent_type),
+                ("task_type", query.task_type),
+            )
+            if value is not None
+        }
+    
+    @staticmethod
+    def _fuse(
+        dense_points: List[Any],
+        lexical_hits: List[LexicalHit],
+        limit: int,
+        retrievers: int
+    ) -> List[SearchResult]:
+        """Merge dense and lexical rankings with reciprocal rank fusion."""
+        payloads: Dict[str, Dict[str, Any]] = {}
+        similarity: Dict[str, float] = {}
+        for point in dense_points:
+            payloads[str(point.id)] = point.payload
+            similarity[str(point.id)] = point.score
+        lexical_score: Dict[str, float] = {}
+        for hit in lexical_hits:
+            payloads.setdefault(hit.doc_id, hit.payload)
+            lexical_score[hit.doc_id] = hit.score
         
-        # Convert to SearchResult objects
-        results = [
+        fused = reciprocal_rank_fusion([
+            [str(point.id) for point in dense_points],
+            [hit.doc_id for hit in lexical_hits],
+        ])
+        best_possible = retrievers / (RRF_K + 1)
+        return [
             SearchResult(
-                text=hit.payload["text"],
-                score=hit.score,
-                metadata={k: v for k, v in hit.payload.items() if k != "text"}
+                text=payloads[doc_id]["text"],
+                score=similarity.get(doc_id),
+                metadata={k: v for k, v in payloads[doc_id].items() if k != "text"},
+                lexical_score=lexical_score.get(doc_id),
+                fused_score=min(score / best_possible, 1.0)
             )
-            for hit in search_results
+            for doc_id, score in fused[:limit]
         ]
-        
-        logger.info(f"Found {len(results)} results for query")
-        return results
+    
+    def _build_filter(
+        self,
+        specialist_id: Optional[str],
+        agent_type: Optional[str],
+        task_type: Optional[str]
+    ) -> Optional[Filter]:
+        """Exact-match filter on indexed payload fields."""
+        conditions = [
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in (
+                ("specialist_id", specialist_id),
+                ("agent_type", agent_type),
+                ("task_type", task_type),
+            )
+            if value is not None
+        ]
+        return Filter(must=conditions) if conditions else None
+    
+    def _search_params(self, hnsw_ef: Optional[int]) -> SearchParams:
+        """HNSW and quantization parameters for a search."""
+        return SearchParams(
+            hnsw_ef=hnsw_ef or self.hnsw_ef,
+            quantization=QuantizationSearchParams(
+                rescore=True,
+                oversampling=self.oversampling
+            ) if self.quantization else None
+        )
     
     async def delete_specialist_documents(self, specialist_id: str) -> None:
         """
@@ -233,13 +578,11 @@ class RAGService:
         """
         logger.info(f"Deleting all documents for specialist {specialist_id}")
         
-        self.qdrant.delete(
+        await self._ensure_collection()
+        await self.qdrant.delete(
             collection_name=self.collection_name,
-            points_selector={
-                "filter": {
-                    "must": [
-                        {"key": "specialist_id", "match": {"value": specialist_id}}
-                    ]
-                }
-            }
+            points_selector=FilterSelector(
+                filter=self._build_filter(specialist_id, None, None)
+            )
         )
+        self.lexical_index.remove_where(specialist_id=specialist_id)
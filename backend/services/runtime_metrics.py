@@ -0,0 +1,351 @@
+"""
+Runtime Metrics
+
+In-process latency instrumentation, exported in the Prometheus text
+format at ``/metrics``.
+
+- Stage timers: ``time_stage(stage, component)`` wraps each part of a
+  BaseAgent step (plan LLM, tool exec, validation, self-assessment) and
+  EventBus.publish, recorded in ``theappapp_stage_duration_seconds``.
+- Event loop monitor: a heartbeat task measures loop lag into
+  ``theappapp_event_loop_lag_seconds``. A watchdog thread captures the loop
+  thread's stack when the heartbeat stalls, so blocking calls in async code
+  (sync SQLAlchemy, docker-py) are reported together with where they ran.
+
+The exposition format is written directly, so prometheus_client is not
+required.
+
+Configuration (environment):
+    LOOP_MONITOR_INTERVAL: Heartbeat period in seconds (default: 0.1)
+    LOOP_STALL_THRESHOLD: Lag in seconds reported as a stall (default: 0.25)
+
+Example:
+    with time_stage("tool_exec", "backend_developer"):
+        result = await execute(action)
+
+Reference: Phase 3.5 - Backend Integration
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_METRIC = "theappapp_stage_duration_seconds"
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+class Counter:
+    """Monotonic counter, optionally labelled."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally labelled."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        lines = []
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics and their Prometheus text rendering."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, documentation, label_names, buckets))
+
+    def _get_or_create(self, name, factory):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, factory())
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def stage_histogram(registry: Optional[MetricsRegistry] = None) -> Histogram:
+    return (registry or get_metrics_registry()).histogram(
+        STAGE_METRIC,
+        "Time spent per pipeline stage",
+        ("stage", "component"),
+    )
+
+
+@contextmanager
+def time_stage(stage: str, component: str = "", registry: Optional[MetricsRegistry] = None) -> Iterator[None]:
+    """
+    Record the wall time of the enclosed block (including awaits).
+
+    Args:
+        stage: plan_llm, tool_exec, validation, self_assessment, event_publish
+        component: Agent type or event type
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_histogram(registry).observe(time.perf_counter() - started, stage, component)
+
+
+@dataclass
+class StallReport:
+    """An event loop stall and the loop thread's stack while it was stuck."""
+    started_at: datetime
+    stack: str
+    duration: Optional[float] = None  # Seconds; None while still stalled
+
+
+class EventLoopMonitor:
+    """
+    Event loop lag sampler with stack capture for stalls.
+
+    The heartbeat task sleeps ``interval`` and records how late it woke up.
+    The watchdog thread checks the heartbeat; when it is overdue by
+    ``stall_threshold`` it snapshots the loop thread's current stack, which
+    is the code blocking the loop.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        stall_threshold: float = 0.25,
+        registry: Optional[MetricsRegistry] = None,
+        max_reports: int = 20
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            interval: Heartbeat period in seconds
+            stall_threshold: Lag in seconds reported as a stall
+            registry: Metrics registry (default: process-wide)
+            max_reports: Recent stall reports kept
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        registry = registry or get_metrics_registry()
+        self._lag = registry.histogram(
+            "theappapp_event_loop_lag_seconds",
+            "Event loop wake-up delay of the monitor heartbeat",
+            buckets=LOOP_LAG_BUCKETS,
+        )
+        self._stalls = registry.counter(
+            "theappapp_event_loop_stalls_total", "Event loop stalls above the threshold"
+        )
+        self._blocked = registry.counter(
+            "theappapp_event_loop_blocked_seconds_total", "Event loop time lost to stalls"
+        )
+        self._reports: Deque[StallReport] = deque(maxlen=max_reports)
+        self._pending: Optional[StallReport] = None
+        self._lock = threading.Lock()
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval={self.interval}s, stall={self.stall_threshold}s)")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    def reports(self) -> List[StallReport]:
+        """Recent completed stalls, oldest first."""
+        with self._lock:
+            return list(self._reports)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - started - self.interval)
+            self._lag.observe(lag)
+            if lag >= self.stall_threshold:
+                self._stalls.inc()
+                self._blocked.inc(lag)
+            self._finish_stall(lag)
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval / 2):
+            overdue = time.perf_counter() - self._last_beat - self.interval
+            if overdue < self.stall_threshold or self._pending is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            with self._lock:
+                self._pending = StallReport(started_at=datetime.now(UTC), stack=stack)
+
+    def _finish_stall(self, lag: float) -> None:
+        with self._lock:
+            report, self._pending = self._pending, None
+            if report is None:
+                return
+            report.duration = lag
+            self._reports.append(report)
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms at:\n{report.stack}")
+
+
+_loop_monitor: Optional[EventLoopMonitor] = None
+
+
+def get_event_loop_monitor() -> EventLoopMonitor:
+    """Get the process-wide event loop monitor (configured from environment)."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = EventLoopMonitor(
+            interval=float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1")),
+            stall_threshold=float(os.getenv("LOOP_STALL_THRESHOLD", "0.25")),
+        )
+    return _loop_monitor
+
+
+def render_metrics() -> str:
+    """Process-wide metrics in the Prometheus text format."""
+    return get_metrics_registry().render()
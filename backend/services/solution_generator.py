@@ -112,7 +112,7 @@ class SolutionGenerator:
             results = await self.rag_service.search(
                 query=problem_desc,
                 specialist_id="failure_patterns",
-                top_k=3
+                limit=3
             )
             return [r.text[:200] for r in results]
         except Exception as e:
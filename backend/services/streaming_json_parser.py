@@ -0,0 +1,144 @@
+"""
+Incremental JSON Object Parser
+
+Parses the top-level fields of a JSON object while it is still streaming in
+from the LLM. Each field becomes available as soon as its value is complete,
+so callers can act on early fields (e.g. ``tool_name``/``parameters``) before
+later ones (e.g. ``reasoning``) have finished generating.
+
+Reference: MVP Demo Plan - Agent coordination
+"""
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONObjectParser:
+    """
+    Single-pass scanner over a streamed JSON object.
+
+    Only top-level members are decoded; nested objects and arrays are
+    captured whole and decoded once they close. Any leading text before the
+    first ``{`` (such as a markdown code fence) is skipped.
+
+    Example:
+        parser = IncrementalJSONObjectParser()
+        for chunk in ['{"tool_name": "file_sys', 'tem", "reasoning": "...']:
+            parser.feed(chunk)
+        parser.fields  # {"tool_name": "file_system"}
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        # Top-level member state: "key" -> "colon" -> "value" -> "comma"
+        self._expect = "key"
+        self._key: Optional[str] = None
+        self._value_start = -1
+
+    def feed(self, text: str) -> None:
+        """Append streamed text and decode any members it completes."""
+        if self.complete or not text:
+            return
+        self.buffer += text
+        self._scan()
+
+    def has_fields(self, names: Iterable[str]) -> bool:
+        """True once every field in ``names`` has been fully decoded."""
+        return all(name in self.fields for name in names)
+
+    def _scan(self) -> None:
+        buffer = self.buffer
+        end = len(buffer)
+        pos = self._pos
+
+        if not self._started:
+            brace = buffer.find("{", pos)
+            if brace == -1:
+                self._pos = end
+                return
+            self._started = True
+            self._depth = 1
+            pos = brace + 1
+
+        while pos < end and not self.complete:
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._close_top_level_string(pos)
+                pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+                if self._depth == 1 and self._expect == "value" and self._value_start < 0:
+                    self._value_start = pos
+            elif char in "{[":
+                if self._depth == 1 and self._expect == "value" and self._value_start < 0:
+                    self._value_start = pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._value_start >= 0:
+                    # Nested object/array member just closed
+                    self._emit(buffer[self._value_start:pos + 1])
+                elif self._depth == 0:
+                    if self._value_start >= 0:
+                        self._emit(buffer[self._value_start:pos])
+                    self.complete = True
+            elif self._depth == 1:
+                if char == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif char == ",":
+                    if self._value_start >= 0:
+                        self._emit(buffer[self._value_start:pos])
+                    self._expect = "key"
+                elif char not in _WHITESPACE and self._expect == "value" and self._value_start < 0:
+                    # Scalar literal (number, true/false/null) - ends at delimiter
+                    self._value_start = pos
+            pos += 1
+
+        self._pos = pos
+
+    def _close_top_level_string(self, pos: int) -> None:
+        raw = self.buffer[self._string_start:pos + 1]
+        if self._expect == "key":
+            try:
+                self._key = json.loads(raw)
+            except json.JSONDecodeError:
+                self._key = raw.strip('"')
+            self._expect = "colon"
+        elif self._expect == "value" and self._value_start == self._string_start:
+            self._emit(raw)
+
+    def _emit(self, raw: str) -> None:
+        """Decode a finished member value and reset for the next member."""
+        key = self._key
+        self._key = None
+        self._value_start = -1
+        self._expect = "comma"
+        if key is None:
+            return
+        try:
+            self.fields[key] = json.loads(raw.strip())
+        except json.JSONDecodeError:
+            logger.debug(f"Could not decode streamed JSON member {key!r}")
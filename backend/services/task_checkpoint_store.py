@@ -0,0 +1,240 @@
+"""
+Task Checkpoint Store
+
+Step-level checkpoints of agent TaskState (``agent_task_checkpoints``).
+
+After each completed step BaseAgent saves one row holding only what the
+step changed: the Step record, new or changed artifacts, LLM token/cost
+records (without prompt and response text), decision reasoning, and the
+counters and loop-detector window needed to continue. Rows are
+zlib-compressed JSON.
+
+When a task starts, its rows are replayed onto the fresh TaskState and the
+loop resumes at the step after the last checkpoint, so a crash or a retry
+after a timeout does not repeat finished steps and their LLM calls.
+Checkpoints are deleted when the task finishes.
+
+Example:
+    store = TaskCheckpointStore(engine)
+    agent = BackendDevAgent(..., checkpoint_store=store)
+
+Reference: Section 1.4 - Failure Handling & Recovery
+"""
+import json
+import logging
+import threading
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from backend.models.agent_state import Action, LLMCall, Result, Step, TaskState, ValidationResult
+
+logger = logging.getLogger(__name__)
+
+ERROR_TAIL = 10  # last_errors kept in a checkpoint (loop detection reads only the tail)
+
+
+def _action_to_dict(action: Action) -> Dict[str, Any]:
+    return {
+        "description": action.description,
+        "tool_name": action.tool_name,
+        "operation": action.operation,
+        "parameters": action.parameters,
+        "reasoning": action.reasoning,
+        "metadata": action.metadata,
+        "batch": [_action_to_dict(sub) for sub in action.batch],
+    }
+
+
+def _action_from_dict(data: Dict[str, Any]) -> Action:
+    return Action(
+        description=data["description"],
+        tool_name=data["tool_name"],
+        operation=data["operation"],
+        parameters=data["parameters"],
+        reasoning=data["reasoning"],
+        metadata=data["metadata"],
+        batch=[_action_from_dict(sub) for sub in data["batch"]],
+    )
+
+
+def step_to_dict(step: Step) -> Dict[str, Any]:
+    result = step.result
+    return {
+        "step_number": step.step_number,
+        "timestamp": step.timestamp.isoformat(),
+        "reasoning": step.reasoning,
+        "action": _action_to_dict(step.action),
+        "result": {
+            "success": result.success,
+            "output": result.output,
+            "error": result.error,
+            "metadata": result.metadata,
+            "attempt": result.attempt,
+            "duration_ms": result.duration_ms,
+        },
+        "validation": {
+            "success": step.validation.success,
+            "issues": list(step.validation.issues),
+            "metrics": step.validation.metrics,
+        },
+        "tokens_used": step.tokens_used,
+        "cost_usd": step.cost_usd,
+    }
+
+
+def step_from_dict(data: Dict[str, Any]) -> Step:
+    return Step(
+        step_number=data["step_number"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        reasoning=data["reasoning"],
+        action=_action_from_dict(data["action"]),
+        result=Result(**data["result"]),
+        validation=ValidationResult(**data["validation"]),
+        tokens_used=data["tokens_used"],
+        cost_usd=data["cost_usd"],
+    )
+
+
+@dataclass
+class _Saved:
+    """How much of a task's state is already checkpointed."""
+    llm_calls: int = 0
+    token_usage: int = 0
+    decision_reasoning: int = 0
+    artifacts: Dict[str, str] = field(default_factory=dict)  # key -> serialized value
+
+
+class TaskCheckpointStore:
+    """Incremental per-step TaskState checkpoints in the database."""
+
+    def __init__(self, engine: Engine):
+        """
+        Initialize store.
+
+        Args:
+            engine: SQLAlchemy engine for the database with agent_task_checkpoints
+        """
+        self.engine = engine
+        self._saved: Dict[str, _Saved] = {}
+        self._lock = threading.Lock()
+
+    def save_step(self, state: TaskState, loop_window: Optional[List[str]] = None) -> None:
+        """
+        Checkpoint the most recently completed step of ``state``.
+
+        Args:
+            state: Task state after the step (current_step is the next step)
+            loop_window: Loop detector failure signatures for the task
+        """
+        if not state.steps_history:
+            return
+        with self._lock:
+            saved = self._saved.setdefault(state.task_id, _Saved())
+            artifacts = {}
+            for key, value in state.artifacts.items():
+                encoded = json.dumps(value, default=str, sort_keys=True)
+                if saved.artifacts.get(key) != encoded:
+                    artifacts[key] = encoded
+            delta = {
+                "step": step_to_dict(state.steps_history[-1]),
+                "artifacts": artifacts,
+                "llm_calls": [
+                    [call.tokens_used, call.cost_usd, call.timestamp.isoformat()]
+                    for call in state.llm_calls[saved.llm_calls:]
+                ],
+                "token_usage": state.token_usage[saved.token_usage:],
+                "decision_reasoning": state.decision_reasoning[saved.decision_reasoning:],
+                "counters": {
+                    "current_step": state.current_step,
+                    "failure_count": state.failure_count,
+                    "last_errors": state.last_errors[-ERROR_TAIL:],
+                    "consecutive_failures": state.consecutive_failures,
+                    "progress_score": state.progress_score,
+                    "progress_metrics": state.progress_metrics,
+                    "total_cost_usd": state.total_cost_usd,
+                    "last_confidence_check_step": state.last_confidence_check_step,
+                    "last_confidence_score": state.last_confidence_score,
+                },
+                "loop_window": list(loop_window or []),
+            }
+            payload = zlib.compress(json.dumps(delta, default=str).encode("utf-8"))
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("""
+                    INSERT INTO agent_task_checkpoints (task_id, step_number, agent_id, state_delta)
+                    VALUES (:task_id, :step_number, :agent_id, :state_delta)
+                    ON CONFLICT (task_id, step_number) DO UPDATE SET
+                        agent_id = EXCLUDED.agent_id,
+                        state_delta = EXCLUDED.state_delta
+                """),
+                {
+                    "task_id": state.task_id,
+                    "step_number": delta["step"]["step_number"],
+                    "agent_id": state.agent_id,
+                    "state_delta": payload,
+                },
+            )
+
+        with self._lock:
+            saved.llm_calls = len(state.llm_calls)
+            saved.token_usage = len(state.token_usage)
+            saved.decision_reasoning = len(state.decision_reasoning)
+            saved.artifacts.update(artifacts)
+
+    def restore(self, state: TaskState) -> Optional[List[str]]:
+        """
+        Replay checkpoints of ``state.task_id`` onto a freshly initialized state.
+
+        Returns:
+            Loop detector window to restore, or None if there is no checkpoint
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("""
+                    SELECT state_delta FROM agent_task_checkpoints
+                    WHERE task_id = :task_id
+                    ORDER BY step_number
+                """),
+                {"task_id": state.task_id},
+            ).all()
+        if not rows:
+            return None
+
+        saved = _Saved()
+        state.decision_reasoning = []
+        delta: Dict[str, Any] = {}
+        for row in rows:
+            delta = json.loads(zlib.decompress(bytes(row.state_delta)))
+            state.steps_history.append(step_from_dict(delta["step"]))
+            for key, encoded in delta["artifacts"].items():
+                state.artifacts[key] = json.loads(encoded)
+                saved.artifacts[key] = encoded
+            state.llm_calls.extend(
+                LLMCall(prompt="", response="", tokens_used=tokens, cost_usd=cost, timestamp=datetime.fromisoformat(ts))
+                for tokens, cost, ts in delta["llm_calls"]
+            )
+            state.token_usage.extend(delta["token_usage"])
+            state.decision_reasoning.extend(delta["decision_reasoning"])
+        for name, value in delta["counters"].items():
+            setattr(state, name, value)
+
+        saved.llm_calls = len(state.llm_calls)
+        saved.token_usage = len(state.token_usage)
+        saved.decision_reasoning = len(state.decision_reasoning)
+        with self._lock:
+            self._saved[state.task_id] = saved
+        logger.info(f"Restored task {state.task_id} from {len(rows)} checkpoints; resuming at step {state.current_step}")
+        return delta["loop_window"]
+
+    def clear(self, task_id: str) -> None:
+        """Delete a finished task's checkpoints."""
+        with self._lock:
+            self._saved.pop(task_id, None)
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM agent_task_checkpoints WHERE task_id = :task_id"), {"task_id": task_id})
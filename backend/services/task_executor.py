@@ -6,11 +6,15 @@ executes them, handles results, and tracks progress.
 """
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, UTC
 
-from backend.services.orchestrator import Orchestrator, Task, TaskStatus, AgentType
+from backend.services.orchestrator import Orchestrator, Task, TaskStatus, AgentType, Agent
 from backend.services.event_bus import EventBus, Event, EventType
+from backend.services.agent_pool import AgentFactoryFn, AgentPool, PoolConfig
+from backend.services.durable_task_queue import DurableTaskQueue
+from backend.services.task_timeout_policy import TaskTimeoutPolicy, get_task_timeout_policy
 from backend.agents.base_agent import BaseAgent, TaskResult
 
 logger = logging.getLogger(__name__)
@@ -22,19 +26,28 @@ class TaskExecutor:
     
     Features:
     - Worker loop that processes tasks from queue
-    - Task assignment to appropriate agents
+    - Task assignment to the least loaded agent of each type's pool
+    - Pool scaling on queue depth and idle agent reaping
+    - Adaptive soft / hard task timeouts from historical durations
+    - Lease ack / fail and heartbeats when the orchestrator uses a durable queue
     - Result handling and progress tracking
     - Error handling and retry logic
     - Deliverable completion tracking
     """
     
+    IDLE_POLL_INTERVAL = 0.5  # Seconds between polls of an empty queue
+    POOL_MAINTENANCE_INTERVAL = 5.0  # Seconds between pool scaling / reaping passes
+    
     def __init__(
         self,
         orchestrator: Orchestrator,
         event_bus: EventBus,
         max_workers: int = 3,
         max_retries: int = 2,
-        phase_manager: Optional[Any] = None
+        phase_manager: Optional[Any] = None,
+        agent_factory: Optional[AgentFactoryFn] = None,
+        pool_config: Optional[PoolConfig] = None,
+        timeout_policy: Optional[TaskTimeoutPolicy] = None
     ):
         """
         Initialize task executor.
@@ -44,6 +57,11 @@ class TaskExecutor:
             event_bus: Event bus for publishing progress
             max_workers: Maximum concurrent task executions
             max_retries: Maximum retry attempts per task
+            phase_manager: Phase manager for deliverable tracking
+            agent_factory: Coroutine creating an agent for an agent type;
+                lets pools grow past the registered instances
+            pool_config: Agent pool size limits (default: 1-max_workers)
+            timeout_policy: Per-task timeouts (default: persisted global policy)
         """
         self.orchestrator = orchestrator
         self.event_bus = event_bus
@@ -60,16 +78,37 @@ class TaskExecutor:
         self.deliverable_verification_failures: Dict[str, int] = {}
         self.max_verification_failures = 3
         
-        # Track agent instances by agent_id
+        # Track agent instances by agent_id, and pooled by agent type
         self.agent_instances: Dict[str, BaseAgent] = {}
+        self.agent_factory = agent_factory
+        self.pool_config = pool_config or PoolConfig(max_size=max(max_workers, 1))
+        self.agent_pools: Dict[str, AgentPool] = {}
+        self._pool_maintenance: Optional[asyncio.Task] = None
+        self.timeout_policy = timeout_policy or get_task_timeout_policy()
         
         logger.info(f"TaskExecutor initialized with {max_workers} workers, phase_manager={phase_manager is not None}")
     
     def register_agent_instance(self, agent_id: str, agent: BaseAgent) -> None:
         """Register an agent instance for task execution."""
         self.agent_instances[agent_id] = agent
+        self._get_pool(agent.agent_type).add(agent)
         logger.debug(f"Registered agent instance: {agent_id}")
     
+    def _durable_queue(self) -> Optional[DurableTaskQueue]:
+        queue = getattr(self.orchestrator, "durable_queue", None)
+        return queue if isinstance(queue, DurableTaskQueue) else None
+    
+    def _get_pool(self, agent_type: Any) -> AgentPool:
+        key = self._agent_type_key(agent_type)
+        pool = self.agent_pools.get(key)
+        if pool is None:
+            pool = self.agent_pools[key] = AgentPool(key, self.agent_factory, self.pool_config)
+        return pool
+    
+    @staticmethod
+    def _agent_type_key(agent_type: Any) -> str:
+        return agent_type.value if hasattr(agent_type, 'value') else str(agent_type)
+    
     async def start(self) -> None:
         """Start the worker loops."""
         if self.running:
@@ -83,6 +122,12 @@ class TaskExecutor:
         for i in range(self.max_workers):
             worker = asyncio.create_task(self._worker_loop(worker_id=i))
             self.workers.append(worker)
+        
+        self._pool_maintenance = asyncio.create_task(self._pool_maintenance_loop())
+        
+        queue = self._durable_queue()
+        if queue:
+            await queue.start()
     
     async def stop(self) -> None:
         """Stop all worker loops gracefully."""
@@ -92,10 +137,19 @@ class TaskExecutor:
         # Cancel all workers
         for worker in self.workers:
             worker.cancel()
+        if self._pool_maintenance:
+            self._pool_maintenance.cancel()
+            await asyncio.gather(self._pool_maintenance, return_exceptions=True)
+            self._pool_maintenance = None
         
         # Wait for workers to complete
         await asyncio.gather(*self.workers, return_exceptions=True)
         self.workers.clear()
+        self.timeout_policy.save()
+        
+        queue = self._durable_queue()
+        if queue:
+            await queue.stop()
         
         logger.info("TaskExecutor stopped")
     
@@ -110,12 +164,16 @@ class TaskExecutor:
         
         while self.running:
             try:
-                # Try to get a task from queue (non-blocking with timeout)
-                task = await self._get_next_task(timeout=1.0)
+                # Try to get a task from queue (non-blocking)
+                task = await self._get_next_task()
                 
                 if task is None:
-                    # No tasks available, brief pause
-                    await asyncio.sleep(0.5)
+                    # No tasks available: wait for a queue notification or a brief pause
+                    queue = self._durable_queue()
+                    if queue:
+                        await queue.wait_for_task()
+                    else:
+                        await asyncio.sleep(self.IDLE_POLL_INTERVAL)
                     continue
                 
                 logger.info(f"Worker {worker_id} processing task: {task.task_id}")
@@ -132,26 +190,23 @@ class TaskExecutor:
         
         logger.info(f"Worker {worker_id} stopped")
     
-    async def _get_next_task(self, timeout: float = 1.0) -> Optional[Task]:
+    async def _get_next_task(self) -> Optional[Task]:
         """
         Get next task from orchestrator queue.
         
-        Args:
-            timeout: Timeout in seconds
-            
+        The in-process dequeue_task() never blocks, so it is called directly.
+        Running it in a thread under a timeout lost tasks: a timed-out thread
+        still popped the task after the caller had given up on it. A durable
+        queue dequeue is a database round trip and runs in a thread without a
+        timeout; a lease abandoned by cancellation expires and is reclaimed.
+        
         Returns:
             Task or None if no tasks available
         """
         try:
-            # Orchestrator queue is a PriorityQueue, need to get with timeout
-            # Since it's sync queue, wrap in executor
-            task = await asyncio.wait_for(
-                asyncio.to_thread(self.orchestrator.dequeue_task),
-                timeout=timeout
-            )
-            return task
-        except asyncio.TimeoutError:
-            return None
+            if self._durable_queue():
+                return await asyncio.to_thread(self.orchestrator.dequeue_task)
+            return self.orchestrator.dequeue_task()
         except Exception as e:
             logger.error(f"Error getting task from queue: {e}")
             return None
@@ -174,33 +229,28 @@ class TaskExecutor:
             if not agent:
                 raise RuntimeError(f"No agent available for task type: {task.agent_type}")
             
-            # Publish task assigned event (now that we have the agent)
-            await self.event_bus.publish(Event(
-                event_type=EventType.TASK_ASSIGNED,
-                project_id=self.orchestrator.project_id,
-                data={
-                    "task_id": task.task_id,
-                    "task_type": task.task_type,
-                    "agent_type": task.agent_type.value if hasattr(task.agent_type, 'value') else str(task.agent_type),
-                    "agent": agent.agent_id if agent else None,
-                    "agent_id": agent.agent_id if agent else None,
-                    "worker_id": worker_id
-                }
-            ))
-            
-            # Execute task with agent (with timeout)
-            logger.info(f"Executing task {task.task_id} with agent {agent.agent_id}")
-            
             try:
-                # Add 60 second timeout to prevent infinite hangs
-                result = await asyncio.wait_for(
-                    agent.run_task(task),
-                    timeout=60.0
-                )
+                # Publish task assigned event (now that we have the agent)
+                await self.event_bus.publish(Event(
+                    event_type=EventType.TASK_ASSIGNED,
+                    project_id=self.orchestrator.project_id,
+                    data={
+                        "task_id": task.task_id,
+                        "task_type": task.task_type,
+                        "agent_type": task.agent_type.value if hasattr(task.agent_type, 'value') else str(task.agent_type),
+                        "agent": agent.agent_id if agent else None,
+                        "agent_id": agent.agent_id if agent else None,
+                        "worker_id": worker_id
+                    }
+                ))
+                
+                # Execute task with agent (with adaptive timeout)
+                logger.info(f"Executing task {task.task_id} with agent {agent.agent_id}")
+                result = await self._run_with_deadlines(task, agent)
                 logger.info(f"Task {task.task_id} completed successfully")
-            except asyncio.TimeoutError:
-                logger.error(f"Task {task.task_id} timed out after 60 seconds")
-                raise RuntimeError(f"Task execution timeout: {task.task_id}")
+            finally:
+                # Free the agent before result handling (orchestrator decision)
+                self._get_pool(agent.agent_type).release(agent)
             
             # Handle result
             await self._handle_task_result(task, result)
@@ -209,9 +259,58 @@ class TaskExecutor:
             logger.error(f"Task execution error: {task.task_id} - {e}", exc_info=True)
             await self._handle_task_error(task, e)
     
+    async def _run_with_deadlines(self, task: Task, agent: BaseAgent) -> TaskResult:
+        """
+        Run a task under the timeout policy's soft and hard deadlines.
+        
+        Passing the soft deadline logs and publishes a warning; the hard
+        deadline cancels the run. Durations of successful runs feed back
+        into the policy.
+        
+        Raises:
+            RuntimeError: If the hard deadline passes
+        """
+        agent_type = self._agent_type_key(task.agent_type)
+        timeouts = self.timeout_policy.timeouts_for(agent_type, task.task_type)
+        started = time.monotonic()
+        run = asyncio.create_task(agent.run_task(task))
+        try:
+            done, _ = await asyncio.wait({run}, timeout=timeouts.soft)
+            if not done:
+                logger.warning(
+                    f"Task {task.task_id} still running after soft deadline of {timeouts.soft:.0f}s "
+                    f"(hard timeout {timeouts.hard:.0f}s, {timeouts.source})"
+                )
+                await self.event_bus.publish(Event(
+                    event_type=EventType.WARNING_ISSUED,
+                    project_id=self.orchestrator.project_id,
+                    data={
+                        "warning": "task_soft_deadline",
+                        "task_id": task.task_id,
+                        "agent_type": agent_type,
+                        "agent_id": agent.agent_id,
+                        "soft_deadline": timeouts.soft,
+                        "hard_timeout": timeouts.hard
+                    }
+                ))
+            result = await asyncio.wait_for(run, timeout=max(timeouts.hard - (time.monotonic() - started), 0))
+        except asyncio.TimeoutError:
+            logger.error(f"Task {task.task_id} timed out after {timeouts.hard:.0f} seconds ({timeouts.source})")
+            raise RuntimeError(f"Task execution timeout: {task.task_id}")
+        finally:
+            if not run.done():
+                run.cancel()
+        
+        if result.success:
+            self.timeout_policy.record(agent_type, task.task_type, time.monotonic() - started)
+        return result
+    
     async def _get_agent_for_task(self, task: Task) -> Optional[BaseAgent]:
         """
-        Get appropriate agent instance for a task.
+        Acquire the least loaded agent of the task's type.
+        
+        Grows the pool first when every member is busy. The caller must
+        release the agent back to its pool.
         
         Args:
             task: Task to assign
@@ -219,20 +318,50 @@ class TaskExecutor:
         Returns:
             BaseAgent instance or None
         """
-        # Get agents of matching type from orchestrator
-        agents = self.orchestrator.get_agents_by_type(task.agent_type)
+        key = self._agent_type_key(task.agent_type)
+        pool = self.agent_pools.get(key)
         
-        if not agents:
+        if pool is None:
             logger.warning(f"No agents available for type: {task.agent_type}")
             return None
         
-        # Get first available agent
-        # TODO: Implement load balancing
-        agent_meta = agents[0]
-        agent_id = agent_meta.agent_id
+        if pool.outstanding >= len(pool):
+            await self._scale_pool(pool, (await self._queued_by_type()).get(key, 0) + 1)
         
-        # Return registered agent instance
-        return self.agent_instances.get(agent_id)
+        return pool.acquire()
+    
+    async def _scale_pool(self, pool: AgentPool, queued: int) -> None:
+        """Grow a pool for ``queued`` waiting tasks and register new agents."""
+        for agent in await pool.scale(queued):
+            self.agent_instances[agent.agent_id] = agent
+            try:
+                self.orchestrator.register_agent(Agent(
+                    agent_id=agent.agent_id,
+                    agent_type=AgentType(pool.agent_type),
+                    status="idle"
+                ))
+            except ValueError:
+                logger.debug(f"Pooled agent {agent.agent_id} has no orchestrator agent type")
+    
+    async def _queued_by_type(self) -> Dict[str, int]:
+        """Number of queued tasks per agent type."""
+        if self._durable_queue():
+            return await asyncio.to_thread(self.orchestrator.get_pending_counts_by_agent_type)
+        return self.orchestrator.get_pending_counts_by_agent_type()
+    
+    async def _pool_maintenance_loop(self) -> None:
+        """Periodically scale pools to queue depth and reap idle agents."""
+        while self.running:
+            await asyncio.sleep(self.POOL_MAINTENANCE_INTERVAL)
+            try:
+                queued = await self._queued_by_type()
+                for key, pool in list(self.agent_pools.items()):
+                    await self._scale_pool(pool, queued.get(key, 0))
+                    for agent in pool.reap_idle():
+                        self.agent_instances.pop(agent.agent_id, None)
+                        self.orchestrator.unregister_agent(agent.agent_id)
+            except Exception as e:
+                logger.error(f"Agent pool maintenance error: {e}", exc_info=True)
     
     async def _handle_task_result(self, task: Task, result: TaskResult) -> None:
         """
@@ -247,6 +376,14 @@ class TaskExecutor:
         task.status = TaskStatus.COMPLETED
         self.task_results[task.task_id] = result
         
+        queue = self._durable_queue()
+        if queue:
+            await asyncio.to_thread(queue.ack, task.task_id, {
+                "success": result.success,
+                "confidence": result.confidence,
+                "errors": list(result.errors)
+            })
+        
         logger.info(f"Task completed: {task.task_id} - success={result.success}")
         
         # ORCHESTRATOR VERIFICATION: Disabled for now - trust agent self-assessment
@@ -463,12 +600,19 @@ class TaskExecutor:
             
             # Re-queue task
             task.status = TaskStatus.PENDING
-            self.orchestrator.enqueue_task(task)
+            if self._durable_queue():
+                await asyncio.to_thread(self.orchestrator.enqueue_task, task)
+            else:
+                self.orchestrator.enqueue_task(task)
         else:
             # Max retries exceeded, mark as failed
             task.status = TaskStatus.FAILED
             logger.error(f"Task failed after {self.max_retries} retries: {task.task_id}")
             
+            queue = self._durable_queue()
+            if queue:
+                await asyncio.to_thread(queue.fail, task.task_id, str(error))
+            
             # Publish failure event
             await self.event_bus.publish(Event(
                 event_type=EventType.ERROR_OCCURRED,
@@ -529,5 +673,9 @@ class TaskExecutor:
             "total_workers": len(self.workers),
             "tasks_completed": len(self.task_results),
             "registered_agents": len(self.agent_instances),
-            "queue_size": self.orchestrator.task_queue.qsize()
+            "agent_pools": {
+                agent_type: {"size": len(pool), "outstanding": pool.outstanding}
+                for agent_type, pool in self.agent_pools.items()
+            },
+            "queue_size": self.orchestrator.get_pending_count()
         }
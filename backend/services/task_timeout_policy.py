@@ -0,0 +1,183 @@
+"""
+Task Timeout Policy
+
+Per agent type and task kind timeouts derived from how long tasks actually
+take. Each (agent_type, task_kind) keeps a rolling window of recent
+successful durations. Once a key has ``min_samples`` durations its hard
+timeout is ``p99 * factor``, clamped to [min_timeout, max_timeout]. A
+task kind without enough history falls back to the agent type's combined
+history, then to TimeoutMonitor.DEFAULT_TIMEOUTS.
+
+The soft deadline (``soft_fraction`` of the hard timeout) is when the
+executor warns that a task is running long, before it cancels it.
+
+Durations are persisted as JSON and reloaded on start, so learned
+timeouts survive restarts.
+
+Configuration (environment):
+    TASK_DURATION_STATS_PATH: Persisted durations (default:
+        data/task_durations.json)
+
+Reference: Section 1.4 - Failure Handling & Recovery
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+from backend.services.timeout_monitor import TimeoutMonitor
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 1
+ANY_KIND = "*"
+FALLBACK_TIMEOUT = 600.0
+DEFAULT_STATS_PATH = "data/task_durations.json"
+
+
+@dataclass(frozen=True)
+class TaskTimeouts:
+    """Deadlines for one task, in seconds from its start."""
+    soft: float
+    hard: float
+    source: str  # "history", "agent_history" or "default"
+
+
+class TaskTimeoutPolicy:
+    """
+    Adaptive timeouts from rolling per-(agent type, task kind) durations.
+
+    Example:
+        policy = get_task_timeout_policy()
+        timeouts = policy.timeouts_for("backend_developer", "deliverable")
+        ...
+        policy.record("backend_developer", "deliverable", elapsed)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        window: int = 200,
+        min_samples: int = 20,
+        quantile: float = 0.99,
+        factor: float = 3.0,
+        soft_fraction: float = 0.75,
+        min_timeout: float = 30.0,
+        max_timeout: float = 7200.0,
+        save_interval: float = 60.0
+    ):
+        """
+        Initialize policy.
+
+        Args:
+            path: JSON file for persisted durations (None keeps them in memory)
+            window: Recent durations kept per key
+            min_samples: Durations needed before history replaces the default
+            quantile: Duration quantile the hard timeout is based on
+            factor: Multiplier applied to the quantile
+            soft_fraction: Soft deadline as a fraction of the hard timeout
+            min_timeout: Lower bound for history-based timeouts
+            max_timeout: Upper bound for history-based timeouts
+            save_interval: Minimum seconds between automatic saves
+        """
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self.factor = factor
+        self.soft_fraction = soft_fraction
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.save_interval = save_interval
+        self._durations: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        if path:
+            self._load()
+
+    def timeouts_for(self, agent_type: str, task_kind: Optional[str] = None) -> TaskTimeouts:
+        """Soft and hard deadlines for a task of this agent type and kind."""
+        for key, source in (((agent_type, task_kind or ANY_KIND), "history"), ((agent_type, ANY_KIND), "agent_history")):
+            hard = self._history_timeout(key)
+            if hard is not None:
+                return TaskTimeouts(soft=hard * self.soft_fraction, hard=hard, source=source)
+        hard = float(TimeoutMonitor.DEFAULT_TIMEOUTS.get(agent_type, FALLBACK_TIMEOUT))
+        return TaskTimeouts(soft=hard * self.soft_fraction, hard=hard, source="default")
+
+    def record(self, agent_type: str, task_kind: Optional[str], duration: float) -> None:
+        """Add the duration of a successfully completed task."""
+        with self._lock:
+            for key in {(agent_type, task_kind or ANY_KIND), (agent_type, ANY_KIND)}:
+                samples = self._durations.get(key)
+                if samples is None:
+                    samples = self._durations[key] = deque(maxlen=self.window)
+                samples.append(duration)
+            self._dirty = True
+        if self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def _history_timeout(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            samples = self._durations.get(key)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.quantile * len(ordered)))
+        return min(self.max_timeout, max(self.min_timeout, ordered[index] * self.factor))
+
+    def save(self) -> None:
+        """Persist durations if they changed since the last save."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {
+                "version": STATS_VERSION,
+                "durations": [
+                    {"agent_type": agent_type, "task_kind": kind, "seconds": list(samples)}
+                    for (agent_type, kind), samples in self._durations.items()
+                ],
+            }
+            self._dirty = False
+        self._last_save = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist task durations: {e}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATS_VERSION:
+                return
+            for entry in data["durations"]:
+                key = (entry["agent_type"], entry["task_kind"])
+                self._durations[key] = deque((float(s) for s in entry["seconds"]), maxlen=self.window)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable task duration stats {self.path}: {e}")
+            self._durations.clear()
+
+
+_task_timeout_policy: Optional[TaskTimeoutPolicy] = None
+
+
+def get_task_timeout_policy() -> TaskTimeoutPolicy:
+    """Get global task timeout policy (persisted)."""
+    global _task_timeout_policy
+    if _task_timeout_policy is None:
+        _task_timeout_policy = TaskTimeoutPolicy(
+            os.getenv("TASK_DURATION_STATS_PATH", DEFAULT_STATS_PATH)
+        )
+    return _task_timeout_policy
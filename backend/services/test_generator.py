@@ -11,6 +11,8 @@ import ast
 from typing import List, Optional, Any
 from dataclasses import dataclass
 
+from backend.services.code_parse_cache import CodeParseCache, get_code_parse_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,14 +51,20 @@ class TestGenerator:
         edge_cases = await generator.generate_edge_cases(function_signature)
     """
     
-    def __init__(self, llm_client: Optional[Any] = None):
+    def __init__(
+        self,
+        llm_client: Optional[Any] = None,
+        parse_cache: Optional[CodeParseCache] = None
+    ):
         """
         Initialize test generator.
         
         Args:
             llm_client: Optional LLM client for intelligent generation
+            parse_cache: Shared AST cache (defaults to the process-wide instance)
         """
         self.llm_client = llm_client
+        self.parse_cache = parse_cache or get_code_parse_cache()
         logger.info("TestGenerator initialized")
     
     async def generate_unit_tests(
@@ -166,27 +174,22 @@ class TestGenerator:
     
     def _extract_functions(self, code: str) -> List[dict]:
         """Extract function definitions from code."""
-        functions = []
-        
-        try:
-            tree = ast.parse(code)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Get function signature
-                    args = [arg.arg for arg in node.args.args]
-                    
-                    functions.append({
-                        'name': node.name,
-                        'args': args,
-                        'lineno': node.lineno,
-                        'is_async': isinstance(node, ast.AsyncFunctionDef),
-                        'docstring': ast.get_docstring(node)
-                    })
-        except SyntaxError as e:
-            logger.error(f"Syntax error parsing code: {e}")
-        
-        return functions
+        module = self.parse_cache.parse(code)
+        if module.syntax_error:
+            logger.error(f"Syntax error parsing code: {module.syntax_error}")
+        
+        # Sync functions only - generated test templates are not async
+        return [
+            {
+                'name': symbol.name,
+                'args': symbol.args,
+                'lineno': symbol.lineno,
+                'is_async': symbol.is_async,
+                'docstring': ast.get_docstring(symbol.node)
+            }
+            for symbol in module.function_list
+            if not symbol.is_async
+        ]
     
     async def _generate_tests_with_llm(
         self,
@@ -7,10 +7,11 @@ Detects code changes and suggests corresponding test updates.
 Reference: Phase 3.2 - Testing Framework Integration
 """
 import logging
-import ast
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 
+from backend.services.code_parse_cache import CodeParseCache, get_code_parse_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,14 +54,20 @@ class TestMaintainer:
         comment = await maintainer.generate_pr_comment(updates)
     """
     
-    def __init__(self, llm_client: Optional[Any] = None):
+    def __init__(
+        self,
+        llm_client: Optional[Any] = None,
+        parse_cache: Optional[CodeParseCache] = None
+    ):
         """
         Initialize test maintainer.
         
         Args:
             llm_client: Optional LLM client for intelligent suggestions
+            parse_cache: Shared AST cache (defaults to the process-wide instance)
         """
         self.llm_client = llm_client
+        self.parse_cache = parse_cache or get_code_parse_cache()
         logger.info("TestMaintainer initialized")
     
     async def detect_changes(
@@ -84,47 +91,47 @@ class TestMaintainer:
         
         changes = []
         
-        # Parse both versions
-        old_functions = self._extract_functions(old_code)
-        new_functions = self._extract_functions(new_code)
-        
-        old_names = {f['name'] for f in old_functions}
-        new_names = {f['name'] for f in new_functions}
+        # Parse both versions (cached by content) and diff the symbol tables
+        old_module = self.parse_cache.parse(old_code)
+        new_module = self.parse_cache.parse(new_code)
+        for module in (old_module, new_module):
+            if module.syntax_error:
+                logger.error("Syntax error parsing code")
+        old_functions = old_module.functions
+        new_functions = new_module.functions
         
         # Deleted functions
-        for name in old_names - new_names:
-            old_func = next(f for f in old_functions if f['name'] == name)
-            changes.append(CodeChange(
-                file_path=file_path,
-                change_type='deleted',
-                old_code=old_func['code'],
-                new_code=None,
-                affected_functions=[name]
-            ))
+        for qualname, old_func in old_functions.items():
+            if qualname not in new_functions:
+                changes.append(CodeChange(
+                    file_path=file_path,
+                    change_type='deleted',
+                    old_code=old_module.source_segment(old_func),
+                    new_code=None,
+                    affected_functions=[old_func.name]
+                ))
         
         # Added functions
-        for name in new_names - old_names:
-            new_func = next(f for f in new_functions if f['name'] == name)
-            changes.append(CodeChange(
-                file_path=file_path,
-                change_type='added',
-                old_code=None,
-                new_code=new_func['code'],
-                affected_functions=[name]
-            ))
-        
-        # Modified functions
-        for name in old_names & new_names:
-            old_func = next(f for f in old_functions if f['name'] == name)
-            new_func = next(f for f in new_functions if f['name'] == name)
-            
-            if old_func['code'] != new_func['code']:
+        for qualname, new_func in new_functions.items():
+            if qualname not in old_functions:
+                changes.append(CodeChange(
+                    file_path=file_path,
+                    change_type='added',
+                    old_code=None,
+                    new_code=new_module.source_segment(new_func),
+                    affected_functions=[new_func.name]
+                ))
+        
+        # Modified functions (structural change; formatting/comments ignored)
+        for qualname, old_func in old_functions.items():
+            new_func = new_functions.get(qualname)
+            if new_func is not None and new_func.structural_hash != old_func.structural_hash:
                 changes.append(CodeChange(
                     file_path=file_path,
                     change_type='modified',
-                    old_code=old_func['code'],
-                    new_code=new_func['code'],
-                    affected_functions=[name]
+                    old_code=old_module.source_segment(old_func),
+                    new_code=new_module.source_segment(new_func),
+                    affected_functions=[new_func.name]
                 ))
         
         logger.info(f"Detected {len(changes)} changes")
@@ -158,28 +165,6 @@ class TestMaintainer:
         logger.info(f"Generated {len(updates)} update suggestions")
         return updates
     
-    def _extract_functions(self, code: str) -> List[Dict]:
-        """Extract function definitions from code."""
-        functions = []
-        
-        try:
-            tree = ast.parse(code)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    func_code = ast.get_source_segment(code, node) or ""
-                    
-                    functions.append({
-                        'name': node.name,
-                        'args': [arg.arg for arg in node.args.args],
-                        'code': func_code,
-                        'lineno': node.lineno
-                    })
-        except SyntaxError:
-            logger.error("Syntax error parsing code")
-        
-        return functions
-    
     async def _suggest_with_llm(
         self,
         change: CodeChange
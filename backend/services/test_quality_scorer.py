@@ -11,6 +11,8 @@ import ast
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from backend.services.code_parse_cache import CodeParseCache, get_code_parse_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,14 +48,20 @@ class TestQualityScorer:
             print(f"- {improvement}")
     """
     
-    def __init__(self, llm_client: Optional[Any] = None):
+    def __init__(
+        self,
+        llm_client: Optional[Any] = None,
+        parse_cache: Optional[CodeParseCache] = None
+    ):
         """
         Initialize test quality scorer.
         
         Args:
             llm_client: Optional LLM client for intelligent analysis
+            parse_cache: Shared AST cache (defaults to the process-wide instance)
         """
         self.llm_client = llm_client
+        self.parse_cache = parse_cache or get_code_parse_cache()
         logger.info("TestQualityScorer initialized")
     
     async def score_test(
@@ -164,40 +172,39 @@ class TestQualityScorer:
             'has_setup_teardown': False
         }
         
-        try:
-            tree = ast.parse(test_code)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    if node.name.startswith('test_'):
-                        # Extract test function info
-                        func_info = {
-                            'name': node.name,
-                            'docstring': ast.get_docstring(node),
-                            'assertions': self._count_assertions(node),
-                            'branches': self._count_branches(node)
-                        }
-                        info['test_functions'].append(func_info)
-                        
-                        if func_info['docstring']:
-                            info['has_docstrings'] = True
-                    
-                    if node.name in ['setUp', 'tearDown', 'setup', 'teardown']:
-                        info['has_setup_teardown'] = True
-                
-                # Count decorators
-                if isinstance(node, ast.FunctionDef):
-                    for decorator in node.decorator_list:
-                        if isinstance(decorator, ast.Name):
-                            if decorator.id == 'fixture':
-                                info['fixtures'].append(node.name)
-                        elif isinstance(decorator, ast.Attribute):
-                            if decorator.attr == 'parametrize':
-                                info['parametrize'].append(node.name)
-        
-        except SyntaxError:
+        module = self.parse_cache.parse(test_code)
+        if module.syntax_error:
             logger.error("Syntax error parsing test code")
         
+        for symbol in module.function_list:
+            if symbol.is_async:
+                continue
+            node = symbol.node
+            if node.name.startswith('test_'):
+                # Extract test function info
+                func_info = {
+                    'name': node.name,
+                    'docstring': ast.get_docstring(node),
+                    'assertions': self._count_assertions(node),
+                    'branches': self._count_branches(node)
+                }
+                info['test_functions'].append(func_info)
+                
+                if func_info['docstring']:
+                    info['has_docstrings'] = True
+            
+            if node.name in ['setUp', 'tearDown', 'setup', 'teardown']:
+                info['has_setup_teardown'] = True
+            
+            # Count decorators
+            for decorator in node.decorator_list:
+                if isinstance(decorator, ast.Name):
+                    if decorator.id == 'fixture':
+                        info['fixtures'].append(node.name)
+                elif isinstance(decorator, ast.Attribute):
+                    if decorator.attr == 'parametrize':
+                        info['parametrize'].append(node.name)
+        
         return info
     
     def _count_assertions(self, node: ast.FunctionDef) -> int:
@@ -4,12 +4,20 @@ Timeout Monitor Service
 Monitors agent tasks for timeouts and triggers gates when tasks exceed time limits.
 Prevents agents from running indefinitely on stuck tasks.
 
+Deadlines are kept in a min-heap and the monitor loop sleeps until the
+earliest one, so timeouts fire on time and an idle monitor does no work.
+Register, extend and cancel are O(log n): extending or cancelling leaves
+the old heap entry behind, and stale entries are skipped when they reach
+the top (or compacted once they outnumber live ones).
+
 Reference: Section 1.4 - Failure Handling & Recovery
 """
+import heapq
 import logging
 import asyncio
+import time
 from datetime import datetime, UTC
-from typing import Dict, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Set, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -24,6 +32,7 @@ class TaskMonitor:
     timeout_seconds: int
     on_timeout: Optional[Callable] = None
     metadata: Dict[str, Any] = None
+    deadline: float = 0.0  # time.monotonic() when the task times out
 
 
 class TimeoutMonitor:
@@ -33,8 +42,8 @@ class TimeoutMonitor:
     Features:
     - Configurable timeouts per agent type
     - Automatic gate creation on timeout
-    - Non-blocking monitoring
-    - Task cancellation support
+    - Non-blocking monitoring that wakes only at the next deadline
+    - Task cancellation and deadline extension support
     
     Example:
         monitor = TimeoutMonitor(gate_manager)
@@ -47,6 +56,9 @@ class TimeoutMonitor:
             on_timeout=lambda: create_gate("Task timeout")
         )
         
+        # Task needs longer
+        monitor.extend_task("task-123", 300)
+        
         # Task completes
         monitor.complete_task("task-123")
     """
@@ -70,9 +82,14 @@ class TimeoutMonitor:
         """Initialize timeout monitor."""
         self.gate_manager = gate_manager
         self._active_monitors: Dict[str, TaskMonitor] = {}
-        self._check_interval = 10  # Check every 10 seconds
+        # (deadline, task_id); an entry is live only while it matches the monitor's deadline
+        self._deadlines: List[Tuple[float, str]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._handlers: Set[asyncio.Task] = set()
         self._monitoring_task: Optional[asyncio.Task] = None
         self._running = False
+        self._total_monitored = 0
+        self._total_timeouts = 0
         logger.info("TimeoutMonitor initialized")
     
     async def start(self):
@@ -82,11 +99,12 @@ class TimeoutMonitor:
             return
         
         self._running = True
+        self._wakeup = asyncio.Event()
         self._monitoring_task = asyncio.create_task(self._monitor_loop())
         logger.info("TimeoutMonitor started")
     
     async def stop(self):
-        """Stop the monitoring loop."""
+        """Stop the monitoring loop and drop all monitored tasks."""
         self._running = False
         if self._monitoring_task:
             self._monitoring_task.cancel()
@@ -94,8 +112,17 @@ class TimeoutMonitor:
                 await self._monitoring_task
             except asyncio.CancelledError:
                 pass
+            self._monitoring_task = None
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        self._active_monitors.clear()
+        self._deadlines.clear()
         logger.info("TimeoutMonitor stopped")
     
+    def is_running(self) -> bool:
+        """Whether the monitoring loop is running."""
+        return self._running
+    
     async def monitor_task(
         self,
         task_id: str,
@@ -108,6 +135,8 @@ class TimeoutMonitor:
         """
         Start monitoring a task for timeout.
         
+        Monitoring a task_id that is already monitored replaces it.
+        
         Args:
             task_id: Unique task identifier
             agent_id: Agent executing the task
@@ -115,10 +144,15 @@ class TimeoutMonitor:
             timeout_seconds: Override timeout (uses default if None)
             on_timeout: Optional callback when timeout occurs
             metadata: Additional context about the task
+            
+        Raises:
+            ValueError: If timeout_seconds is not positive
         """
         # Determine timeout
         if timeout_seconds is None:
             timeout_seconds = self.DEFAULT_TIMEOUTS.get(agent_type, 600)  # 10 min default
+        if timeout_seconds <= 0:
+            raise ValueError(f"timeout_seconds must be positive, got {timeout_seconds}")
         
         monitor = TaskMonitor(
             task_id=task_id,
@@ -126,10 +160,13 @@ class TimeoutMonitor:
             started_at=datetime.now(UTC),
             timeout_seconds=timeout_seconds,
             on_timeout=on_timeout,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            deadline=time.monotonic() + timeout_seconds
         )
         
         self._active_monitors[task_id] = monitor
+        self._total_monitored += 1
+        self._schedule(monitor)
         
         logger.info(
             "Monitoring task | task_id=%s | agent=%s | timeout=%ds",
@@ -142,6 +179,26 @@ class TimeoutMonitor:
         if not self._running:
             await self.start()
     
+    def extend_task(self, task_id: str, extra_seconds: float) -> bool:
+        """
+        Push a monitored task's deadline back.
+        
+        Args:
+            task_id: Monitored task
+            extra_seconds: Seconds added to its timeout
+            
+        Returns:
+            False if the task is not monitored
+        """
+        monitor = self._active_monitors.get(task_id)
+        if monitor is None:
+            return False
+        monitor.timeout_seconds += extra_seconds
+        monitor.deadline += extra_seconds
+        self._schedule(monitor)
+        logger.info("Extended task timeout | task_id=%s | timeout=%ds", task_id, monitor.timeout_seconds)
+        return True
+    
     def complete_task(self, task_id: str) -> None:
         """
         Mark a task as completed and stop monitoring.
@@ -152,6 +209,7 @@ class TimeoutMonitor:
         if task_id in self._active_monitors:
             monitor = self._active_monitors.pop(task_id)
             elapsed = (datetime.now(UTC) - monitor.started_at).total_seconds()
+            self._compact()
             
             logger.info(
                 "Task completed | task_id=%s | elapsed=%.1fs | timeout=%ds",
@@ -160,6 +218,16 @@ class TimeoutMonitor:
                 monitor.timeout_seconds
             )
     
+    def stop_monitoring(self, task_id: str) -> None:
+        """Stop monitoring a task without treating it as completed."""
+        if self._active_monitors.pop(task_id, None) is not None:
+            self._compact()
+            logger.info("Stopped monitoring task | task_id=%s", task_id)
+    
+    def is_monitoring(self, task_id: str) -> bool:
+        """Whether a task is currently monitored."""
+        return task_id in self._active_monitors
+    
     def get_active_count(self) -> int:
         """Get count of actively monitored tasks."""
         return len(self._active_monitors)
@@ -171,32 +239,63 @@ class TimeoutMonitor:
             return (datetime.now(UTC) - monitor.started_at).total_seconds()
         return None
     
+    def _schedule(self, monitor: TaskMonitor) -> None:
+        """Push the monitor's deadline and wake the loop if it is now the earliest."""
+        earliest = self._deadlines[0][0] if self._deadlines else None
+        heapq.heappush(self._deadlines, (monitor.deadline, monitor.task_id))
+        if self._wakeup is not None and (earliest is None or monitor.deadline < earliest):
+            self._wakeup.set()
+    
+    def _is_live(self, entry: Tuple[float, str]) -> bool:
+        monitor = self._active_monitors.get(entry[1])
+        return monitor is not None and monitor.deadline == entry[0]
+    
+    def _compact(self) -> None:
+        """Rebuild the heap once stale entries outnumber live ones."""
+        if len(self._deadlines) > 2 * len(self._active_monitors) + 64:
+            self._deadlines = [entry for entry in self._deadlines if self._is_live(entry)]
+            heapq.heapify(self._deadlines)
+    
     async def _monitor_loop(self):
-        """Main monitoring loop that checks for timeouts."""
+        """Main monitoring loop that sleeps until the next deadline."""
         while self._running:
             try:
-                await self._check_timeouts()
-                await asyncio.sleep(self._check_interval)
+                self._wakeup.clear()
+                delay = self._fire_expired()
+                if delay is None:
+                    await self._wakeup.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("Error in monitoring loop: %s", e)
-                await asyncio.sleep(self._check_interval)
     
-    async def _check_timeouts(self):
-        """Check all monitored tasks for timeouts."""
-        now = datetime.now(UTC)
-        timed_out = []
-        
-        for task_id, monitor in self._active_monitors.items():
-            elapsed = (now - monitor.started_at).total_seconds()
-            
-            if elapsed >= monitor.timeout_seconds:
-                timed_out.append((task_id, monitor, elapsed))
+    def _fire_expired(self) -> Optional[float]:
+        """
+        Start timeout handling for every task past its deadline.
         
-        # Handle timeouts
-        for task_id, monitor, elapsed in timed_out:
-            await self._handle_timeout(task_id, monitor, elapsed)
+        Returns:
+            Seconds until the next deadline, or None when nothing is monitored
+        """
+        now = time.monotonic()
+        while self._deadlines:
+            entry = self._deadlines[0]
+            if not self._is_live(entry):
+                heapq.heappop(self._deadlines)
+                continue
+            if entry[0] > now:
+                return entry[0] - now
+            heapq.heappop(self._deadlines)
+            monitor = self._active_monitors.pop(entry[1])
+            elapsed = (datetime.now(UTC) - monitor.started_at).total_seconds()
+            handler = asyncio.create_task(self._handle_timeout(monitor.task_id, monitor, elapsed))
+            self._handlers.add(handler)
+            handler.add_done_callback(self._handlers.discard)
+        return None
     
     async def _handle_timeout(
         self,
@@ -213,8 +312,7 @@ class TimeoutMonitor:
             monitor.timeout_seconds
         )
         
-        # Remove from active monitors
-        self._active_monitors.pop(task_id, None)
+        self._total_timeouts += 1
         
         # Call custom timeout handler if provided
         if monitor.on_timeout:
@@ -277,19 +375,29 @@ class TimeoutMonitor:
     
     def get_monitor_stats(self) -> Dict[str, Any]:
         """Get statistics about monitored tasks."""
-        now = datetime.now(UTC)
-        
-        stats = {
+        stats = self.get_stats()
+        stats["tasks"] = self.get_monitored_tasks()
+        return stats
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitor counters."""
+        return {
             "active_count": len(self._active_monitors),
-            "running": self._running,
-            "tasks": []
+            "total_monitored": self._total_monitored,
+            "total_timeouts": self._total_timeouts,
+            "running": self._running
         }
+    
+    def get_monitored_tasks(self) -> List[Dict[str, Any]]:
+        """Get elapsed and remaining time of each monitored task."""
+        now = datetime.now(UTC)
+        tasks = []
         
         for task_id, monitor in self._active_monitors.items():
             elapsed = (now - monitor.started_at).total_seconds()
             remaining = monitor.timeout_seconds - elapsed
             
-            stats["tasks"].append({
+            tasks.append({
                 "task_id": task_id,
                 "agent_id": monitor.agent_id,
                 "elapsed_seconds": elapsed,
@@ -298,4 +406,4 @@ class TimeoutMonitor:
                 "progress_pct": min(100, (elapsed / monitor.timeout_seconds) * 100)
             })
         
-        return stats
+        return tasks
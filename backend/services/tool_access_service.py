@@ -21,6 +21,13 @@ from pydantic import BaseModel, Field
 from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
+from backend.services.workspace_file_cache import (
+    WorkspaceFileCache,
+    get_workspace_file_cache,
+    parse_stat_output,
+    stat_command,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -172,7 +179,8 @@ class ToolAccessService:
         test_generator: Optional[Any] = None,
         edge_case_finder: Optional[Any] = None,
         test_quality_scorer: Optional[Any] = None,
-        test_maintainer: Optional[Any] = None
+        test_maintainer: Optional[Any] = None,
+        file_cache: Optional[WorkspaceFileCache] = None
     ):
         """Initialize Tool Access Service.
         
@@ -188,6 +196,7 @@ class ToolAccessService:
             edge_case_finder: EdgeCaseFinder instance
             test_quality_scorer: TestQualityScorer instance
             test_maintainer: TestMaintainer instance
+            file_cache: Workspace file cache (default: shared instance)
         """
         self.db_session = db_session
         self.use_db = use_db and db_session is not None
@@ -204,12 +213,18 @@ class ToolAccessService:
         self._edge_case_finder = edge_case_finder
         self._test_quality_scorer = test_quality_scorer
         self._test_maintainer = test_maintainer
+        self._workspace_file_cache = file_cache
         
         self.tool_registry = self._initialize_tool_registry()
         self._permission_cache: Dict[str, Tuple[bool, str, datetime]] = {}  # Cache with timestamp
         self._cache_ttl = timedelta(minutes=5)  # 5-minute cache
         logger.info(f"Tool Access Service initialized (use_db={self.use_db})")
     
+    @property
+    def _file_cache(self) -> WorkspaceFileCache:
+        """Workspace file cache (the shared one unless injected)."""
+        return self._workspace_file_cache or get_workspace_file_cache()
+    
     def _initialize_tool_registry(self) -> Dict[str, Any]:
         """
         Initialize registry of available tools with actual handlers.
@@ -272,6 +287,11 @@ class ToolAccessService:
                 "category": ToolCategory.TESTING,
                 "operations": ["detect_changes", "suggest_updates", "generate_pr_comment"],
                 "handler": self._test_maintainer
+            },
+            "deliverable": {
+                "category": ToolCategory.COMMUNICATION,
+                "operations": ["mark_complete", "get_status"],
+                "handler": None  # Handled inline by _execute_deliverable_tool
             }
         }
         return registry
@@ -806,10 +826,21 @@ class ToolAccessService:
             result = await manager.destroy_container(parameters.get("task_id"))
             return result
         elif operation == "execute":
-            result = await manager.exec_command(
-                task_id=parameters.get("task_id"),
-                command=parameters.get("command")
-            )
+            # Agent tool calls may pass the limits as strings
+            timeout = parameters.get("timeout")
+            max_output_bytes = parameters.get("max_output_bytes")
+            try:
+                result = await manager.exec_command(
+                    task_id=parameters.get("task_id"),
+                    command=parameters.get("command"),
+                    stream_events=True,
+                    stop_pattern=parameters.get("stop_pattern"),
+                    max_stream_bytes=int(max_output_bytes) if max_output_bytes not in (None, "") else None,
+                    timeout=float(timeout) if timeout not in (None, "") else None
+                )
+            finally:
+                # The command may have changed workspace files behind the cache
+                self._file_cache.mark_dirty(parameters.get("project_id"))
             return result.to_dict()
         elif operation == "list":
             return {
@@ -862,6 +893,9 @@ class ToolAccessService:
         """
         Execute file system operations via container exec commands.
         Files are written to Docker volumes that containers mount at /workspace.
+        
+        Writes go through to the container and into the workspace file cache;
+        reads are served from the cache while its entry is valid.
         """
         import base64
         import json
@@ -918,10 +952,16 @@ class ToolAccessService:
             if result.exit_code != 0:
                 raise RuntimeError(f"Failed to write file: {result.stderr}")
             
-            # Verify file exists
-            verify = await container_mgr.exec_command(container_id, f"python -c \"import os; print('OK' if os.path.exists('{container_path}') else 'FAIL')\"")
-            if "OK" not in verify.stdout:
+            # Verify file exists; its stat stamps the cache entry
+            verify = await container_mgr.exec_command(container_id, stat_command([(container_path, False)]))
+            try:
+                found = parse_stat_output(verify.stdout).get(container_path) if verify.exit_code == 0 else None
+            except (ValueError, IndexError):
+                found = None
+            if not found:
+                self._file_cache.discard(project_id, file_path)
                 raise RuntimeError(f"File write verification failed for {container_path}")
+            self._file_cache.put(project_id, file_path, content, stamp=(found[0], found[1]))
             
             return {
                 "status": "success",
@@ -931,19 +971,26 @@ class ToolAccessService:
             }
         
         elif operation == "read":
-            result = await container_mgr.exec_command(container_id, f"cat {container_path}")
-            
-            if result.exit_code != 0:
-                raise ValueError(f"File not found: {file_path}")
+            content = await self._read_cached_file(container_mgr, container_id, project_id, file_path)
+            if content is None:
+                result = await container_mgr.exec_command(container_id, f"cat {container_path}")
+                
+                if result.exit_code != 0:
+                    self._file_cache.discard(project_id, file_path)
+                    raise ValueError(f"File not found: {file_path}")
+                
+                content = result.stdout
+                self._file_cache.put(project_id, file_path, content)
             
             return {
                 "status": "success",
                 "path": file_path,
-                "content": result.stdout,
-                "bytes_read": len(result.stdout.encode('utf-8'))
+                "content": content,
+                "bytes_read": len(content.encode('utf-8'))
             }
         
         elif operation == "delete":
+            self._file_cache.discard(project_id, file_path)
             result = await container_mgr.exec_command(container_id, f"rm {container_path}")
             
             if result.exit_code != 0:
@@ -992,6 +1039,48 @@ class ToolAccessService:
         else:
             raise ValueError(f"Unknown file system operation: {operation}")
     
+    async def _read_cached_file(
+        self,
+        container_mgr: Any,
+        container_id: str,
+        project_id: str,
+        file_path: str
+    ) -> Optional[str]:
+        """
+        Return cached file content, or None if the container must be read.
+        
+        Stale entries of the project (marked dirty or past the cache TTL) are
+        all revalidated with one stat exec, so the reads following an
+        out-of-band change cost one exec in total.
+        """
+        entry = self._file_cache.get(project_id, file_path)
+        if entry is not None:
+            return entry.content
+        
+        stale = self._file_cache.stale_entries(project_id)
+        if file_path not in stale:
+            return None
+        
+        generation = self._file_cache.generation(project_id)
+        paths = {f"/workspace/{path}": path for path in stale}
+        check = await container_mgr.exec_command(
+            container_id,
+            stat_command([(container_path, stale[path].stamp is None) for container_path, path in paths.items()])
+        )
+        try:
+            results = parse_stat_output(check.stdout) if check.exit_code == 0 else {}
+        except (ValueError, IndexError):
+            results = {}
+        self._file_cache.apply_revalidation(
+            project_id,
+            generation,
+            stale,
+            {paths[container_path]: found for container_path, found in results.items() if container_path in paths}
+        )
+        
+        entry = self._file_cache.get(project_id, file_path)
+        return entry.content if entry is not None else None
+    
     async def _execute_deliverable_tool(self, operation: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute deliverable tracking operations.
@@ -0,0 +1,236 @@
+"""
+Workspace File Cache
+
+Per-project, content-hashed overlay of workspace files for the TAS
+file_system tool. Writes go through to the container and leave the written
+content here; reads are answered from memory while the entry is known to
+match the container, so read-after-write traffic (agents re-reading their
+own files, deliverable verification) never execs ``cat``.
+
+Consistency:
+- Every entry carries the container file's (size, mtime_ns) stamp when it
+  is known (writes stat the file as part of their verification exec).
+- Commands that may change files behind the cache (container ``execute``)
+  mark the project dirty. The next read revalidates all of the project's
+  cached entries in one exec: stamps are compared, and entries without a
+  stamp are compared by size and content hash.
+- Dirty marks only cover this process. Files can also change through
+  another backend process sharing the build (durable task queue), so an
+  entry is also revalidated once it was last checked more than
+  ``ttl`` seconds ago; again all expired entries share one exec.
+- Entries are evicted least-recently-used once the cached content exceeds
+  the byte budget.
+
+Configuration:
+    WORKSPACE_FILE_CACHE_MB: Byte budget for cached content (default 64)
+    WORKSPACE_FILE_CACHE_TTL: Seconds an entry is served without a
+        container check (default 2)
+
+Reference: Section 1.5 - Tool Access Service
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MB = 64
+DEFAULT_TTL_SECONDS = 2.0
+
+# Runs in the container: argv[1] is base64 JSON [[path, want_hash], ...];
+# prints JSON {path: [size, mtime_ns, sha256 or null] or null}
+_STAT_SCRIPT = """
+import base64, hashlib, json, os, sys
+out = {}
+for path, want_hash in json.loads(base64.b64decode(sys.argv[1])):
+    try:
+        st = os.stat(path)
+    except OSError:
+        out[path] = None
+        continue
+    digest = None
+    if want_hash:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    out[path] = [st.st_size, st.st_mtime_ns, digest]
+print(json.dumps(out))
+"""
+_STAT_SCRIPT_B64 = base64.b64encode(_STAT_SCRIPT.encode("utf-8")).decode("ascii")
+
+Stamp = Tuple[int, int]  # size, mtime_ns
+
+
+def stat_command(paths: List[Tuple[str, bool]]) -> str:
+    """Container command that stats (and optionally hashes) ``paths``."""
+    payload = base64.b64encode(json.dumps(paths).encode("utf-8")).decode("ascii")
+    return f"python -c \"import base64; exec(base64.b64decode('{_STAT_SCRIPT_B64}'))\" {payload}"
+
+
+def parse_stat_output(stdout: str) -> Dict[str, Optional[List[Any]]]:
+    """Parse the output of a stat_command exec."""
+    return json.loads(stdout.strip().splitlines()[-1])
+
+
+@dataclass
+class CachedFile:
+    """One cached workspace file."""
+    content: str
+    sha256: str
+    size: int  # Encoded length in bytes
+    stamp: Optional[Stamp]  # Container (size, mtime_ns) when known
+    generation: int  # Project generation the entry was last validated in
+    validated_at: float  # Clock time of the last write or container check
+
+
+class WorkspaceFileCache:
+    """LRU overlay of workspace file contents keyed by (project_id, path)."""
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Budget for cached content (default:
+                WORKSPACE_FILE_CACHE_MB env or 64 MB)
+            ttl: Seconds an entry is served without a container check
+                (default: WORKSPACE_FILE_CACHE_TTL env or 2)
+            clock: Monotonic time source
+        """
+        if max_bytes is None:
+            max_bytes = int(os.getenv("WORKSPACE_FILE_CACHE_MB", str(DEFAULT_CACHE_MB))) * 1024 * 1024
+        if ttl is None:
+            ttl = float(os.getenv("WORKSPACE_FILE_CACHE_TTL", str(DEFAULT_TTL_SECONDS)))
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], CachedFile]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "invalidated": 0, "evicted": 0}
+
+    def generation(self, project_id: str) -> int:
+        return self._generations.get(project_id, 0)
+
+    def _is_fresh(self, project_id: str, entry: CachedFile, now: float) -> bool:
+        return entry.generation == self.generation(project_id) and now - entry.validated_at <= self.ttl
+
+    def get(self, project_id: str, path: str) -> Optional[CachedFile]:
+        """Return the entry if it is valid in the current generation and within the TTL."""
+        with self._lock:
+            entry = self._entries.get((project_id, path))
+            if entry is None or not self._is_fresh(project_id, entry, self._clock()):
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end((project_id, path))
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, project_id: str, path: str, content: str, stamp: Optional[Stamp] = None) -> None:
+        """Record file content known to match the container."""
+        data = content.encode("utf-8")
+        if len(data) > self.max_bytes:
+            self.discard(project_id, path)
+            return
+        entry = CachedFile(
+            content=content,
+            sha256=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+            stamp=stamp,
+            generation=self.generation(project_id),
+            validated_at=self._clock(),
+        )
+        with self._lock:
+            self._remove((project_id, path))
+            self._entries[(project_id, path)] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                key, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.stats["evicted"] += 1
+
+    def discard(self, project_id: str, path: str) -> None:
+        with self._lock:
+            self._remove((project_id, path))
+
+    def mark_dirty(self, project_id: Optional[str] = None) -> None:
+        """Files of ``project_id`` (all projects if None) may have changed out of band."""
+        with self._lock:
+            projects = [project_id] if project_id else {pid for pid, _ in self._entries}
+            for pid in projects:
+                self._generations[pid] = self.generation(pid) + 1
+
+    def stale_entries(self, project_id: str) -> Dict[str, CachedFile]:
+        """Entries of a project that need revalidation before use."""
+        with self._lock:
+            now = self._clock()
+            return {
+                path: entry for (pid, path), entry in self._entries.items()
+                if pid == project_id and not self._is_fresh(project_id, entry, now)
+            }
+
+    def apply_revalidation(
+        self,
+        project_id: str,
+        generation: int,
+        checked: Dict[str, CachedFile],
+        results: Dict[str, Optional[List[Any]]]
+    ) -> None:
+        """
+        Confirm or drop entries from a stat_command result.
+
+        Args:
+            project_id: Project the entries belong to
+            generation: Project generation when the check started
+            checked: Entries that were checked, by path
+            results: Parsed stat output keyed by path
+        """
+        with self._lock:
+            now = self._clock()
+            for path, entry in checked.items():
+                key = (project_id, path)
+                if self._entries.get(key) is not entry:
+                    continue  # Rewritten or evicted meanwhile
+                found = results.get(path)
+                if found is not None:
+                    size, mtime_ns, digest = found
+                    if entry.stamp is not None:
+                        valid = entry.stamp == (size, mtime_ns)
+                    else:
+                        valid = size == entry.size and digest == entry.sha256
+                    if valid:
+                        entry.stamp = (size, mtime_ns)
+                        entry.generation = generation
+                        entry.validated_at = now
+                        self.stats["revalidated"] += 1
+                        continue
+                self._remove(key)
+                self.stats["invalidated"] += 1
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+_workspace_file_cache: Optional[WorkspaceFileCache] = None
+
+
+def get_workspace_file_cache() -> WorkspaceFileCache:
+    """Get global workspace file cache instance."""
+    global _workspace_file_cache
+    if _workspace_file_cache is None:
+        _workspace_file_cache = WorkspaceFileCache()
+    return _workspace_file_cache
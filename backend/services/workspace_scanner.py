@@ -0,0 +1,324 @@
+"""
+Workspace Scanner
+
+Single-pass, incremental scanner for agent project workspaces. One pruned
+``os.scandir`` walk gathers every metric ProgressEvaluator needs (source
+and test file counts, test presence, line totals) and produces a manifest
+of (path, size, mtime, hash) entries.
+
+The manifest is kept per project in memory and persisted as JSON, so later
+scans only re-list directories whose mtime changed and only re-hash files
+whose size or mtime changed. Dependency and build directories
+(``node_modules``, virtualenvs, hidden directories, ...) are never entered.
+
+Reference: Section 1.4.1 - Loop Detection Algorithm
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+PRUNED_DIRS = frozenset({
+    "node_modules", "__pycache__", "venv", "env", "dist", "build",
+    "coverage", "target", "bower_components",
+})
+SOURCE_EXTENSIONS = (".py", ".ts", ".tsx", ".js", ".jsx")
+TEST_DIR_NAMES = frozenset({"tests", "test", "__tests__", "spec"})
+# Files that mark a project as having tests
+TEST_FILE_RE = re.compile(r".*(?:test.*\.(?:py|tsx?)|spec.*\.(?:ts|js))")
+# Files counted as test files
+TEST_COUNT_RE = re.compile(r".*(?:test.*\.(?:py|ts)|spec.*\.ts)")
+# Larger files are tracked by size/mtime only
+MAX_HASH_BYTES = 1024 * 1024
+HASH_CHUNK_BYTES = 64 * 1024
+# Timestamps this close to the previous scan may hide a same-tick change
+# (the "racy git" problem), so such entries are always re-checked
+RACY_WINDOW_NS = 1_000_000_000
+
+
+@dataclass
+class ManifestEntry:
+    """One tracked file."""
+    size: int
+    mtime_ns: int
+    sha256: Optional[str]
+    lines: int = 0
+
+
+@dataclass
+class _DirListing:
+    mtime_ns: int
+    dirs: List[str]
+    files: List[str]
+
+
+@dataclass
+class WorkspaceSnapshot:
+    """Result of one scan: metrics plus the file manifest."""
+    root: str
+    files: Dict[str, ManifestEntry]
+    source_file_count: int = 0
+    test_file_count: int = 0
+    total_lines: int = 0
+    has_tests: bool = False
+    dirs_listed: int = 0
+    files_hashed: int = 0
+
+    def diff(self, previous: Optional["WorkspaceSnapshot"]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compare against an earlier snapshot of the same workspace.
+
+        Returns:
+            (added, modified, deleted) relative paths
+        """
+        if previous is None:
+            return sorted(self.files), [], []
+        added, modified = [], []
+        for path, entry in self.files.items():
+            old = previous.files.get(path)
+            if old is None:
+                added.append(path)
+            elif (old.sha256, old.size) != (entry.sha256, entry.size) or (
+                entry.sha256 is None and old.mtime_ns != entry.mtime_ns
+            ):
+                modified.append(path)
+        deleted = [path for path in previous.files if path not in self.files]
+        return sorted(added), sorted(modified), sorted(deleted)
+
+
+@dataclass
+class _ProjectManifest:
+    scanned_at_ns: int = 0
+    dirs: Dict[str, _DirListing] = field(default_factory=dict)
+    files: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+
+class WorkspaceScanner:
+    """
+    Incremental workspace scanner with a persisted per-project manifest.
+
+    Example:
+        scanner = get_workspace_scanner()
+        before = scanner.scan("/projects/abc")
+        ...
+        after = scanner.scan("/projects/abc")
+        added, modified, deleted = after.diff(before)
+    """
+
+    def __init__(self, manifest_dir: Optional[str] = None):
+        """
+        Initialize workspace scanner.
+
+        Args:
+            manifest_dir: Where manifests are persisted (default:
+                WORKSPACE_MANIFEST_DIR env or a temp directory). Kept outside
+                the workspace so agents never see or commit it.
+        """
+        self.manifest_dir = manifest_dir or os.getenv(
+            "WORKSPACE_MANIFEST_DIR",
+            os.path.join(tempfile.gettempdir(), "theappapp", "workspace_manifests"),
+        )
+        self._manifests: Dict[str, _ProjectManifest] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, project_path: str) -> WorkspaceSnapshot:
+        """
+        Scan a workspace, reusing the manifest from previous scans.
+
+        Args:
+            project_path: Project root directory
+
+        Returns:
+            WorkspaceSnapshot with metrics and the current manifest
+
+        Raises:
+            FileNotFoundError: If project_path does not exist
+        """
+        root = os.path.abspath(project_path)
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"Project path not found: {project_path}")
+
+        with self._lock:
+            previous = self._manifests.get(root) or self._load_manifest(root)
+            current = _ProjectManifest(scanned_at_ns=time.time_ns())
+            trusted_before_ns = previous.scanned_at_ns - RACY_WINDOW_NS
+            snapshot = WorkspaceSnapshot(root=root, files=current.files)
+
+            stack = [""]
+            while stack:
+                rel_dir = stack.pop()
+                listing = self._list_dir(
+                    root, rel_dir, previous.dirs.get(rel_dir), trusted_before_ns, snapshot
+                )
+                if listing is None:
+                    continue
+                current.dirs[rel_dir] = listing
+
+                for name in listing.dirs:
+                    if name in TEST_DIR_NAMES:
+                        snapshot.has_tests = True
+                    stack.append(f"{rel_dir}/{name}" if rel_dir else name)
+
+                for name in listing.files:
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    entry = self._stat_file(
+                        root, rel_path, previous.files.get(rel_path), trusted_before_ns, snapshot
+                    )
+                    if entry is None:
+                        continue
+                    current.files[rel_path] = entry
+                    if name.endswith(SOURCE_EXTENSIONS):
+                        snapshot.source_file_count += 1
+                        snapshot.total_lines += entry.lines
+                    if TEST_FILE_RE.match(name):
+                        snapshot.has_tests = True
+                    if TEST_COUNT_RE.match(name):
+                        snapshot.test_file_count += 1
+
+            self._manifests[root] = current
+            if snapshot.dirs_listed or snapshot.files_hashed or len(current.files) != len(previous.files):
+                self._save_manifest(root, current)
+
+        logger.debug(
+            "Workspace scanned | root=%s | files=%d | dirs_listed=%d | files_hashed=%d",
+            root, len(current.files), snapshot.dirs_listed, snapshot.files_hashed,
+        )
+        return snapshot
+
+    def forget(self, project_path: str) -> None:
+        """Drop the cached and persisted manifest for a project."""
+        root = os.path.abspath(project_path)
+        with self._lock:
+            self._manifests.pop(root, None)
+        try:
+            os.remove(self._manifest_path(root))
+        except FileNotFoundError:
+            pass
+
+    def _list_dir(
+        self,
+        root: str,
+        rel_dir: str,
+        cached: Optional[_DirListing],
+        trusted_before_ns: int,
+        snapshot: WorkspaceSnapshot
+    ) -> Optional[_DirListing]:
+        """Return directory contents, re-listing only if its mtime changed."""
+        path = os.path.join(root, rel_dir) if rel_dir else root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        if cached is not None and cached.mtime_ns == mtime_ns and mtime_ns < trusted_before_ns:
+            return cached
+
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if not name.startswith(".") and name not in PRUNED_DIRS:
+                            dirs.append(name)
+                    elif entry.is_file():
+                        files.append(name)
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {path}: {e}")
+            return None
+        snapshot.dirs_listed += 1
+        return _DirListing(mtime_ns=mtime_ns, dirs=dirs, files=files)
+
+    def _stat_file(
+        self,
+        root: str,
+        rel_path: str,
+        cached: Optional[ManifestEntry],
+        trusted_before_ns: int,
+        snapshot: WorkspaceSnapshot
+    ) -> Optional[ManifestEntry]:
+        """Stat a file; hash it only when size or mtime changed."""
+        path = os.path.join(root, rel_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if (
+            cached is not None
+            and cached.size == stat.st_size
+            and cached.mtime_ns == stat.st_mtime_ns
+            and stat.st_mtime_ns < trusted_before_ns
+        ):
+            return cached
+
+        sha256, lines = None, 0
+        if stat.st_size <= MAX_HASH_BYTES:
+            digest = hashlib.sha256()
+            try:
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+                        digest.update(chunk)
+                        lines += chunk.count(b"\n")
+            except OSError:
+                return None
+            sha256 = digest.hexdigest()
+            snapshot.files_hashed += 1
+        return ManifestEntry(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256, lines=lines)
+
+    def _manifest_path(self, root: str) -> str:
+        key = hashlib.sha256(root.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.manifest_dir, f"{key}.json")
+
+    def _load_manifest(self, root: str) -> _ProjectManifest:
+        try:
+            with open(self._manifest_path(root), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION or data.get("root") != root:
+                return _ProjectManifest()
+            return _ProjectManifest(
+                scanned_at_ns=data["scanned_at_ns"],
+                dirs={path: _DirListing(**listing) for path, listing in data["dirs"].items()},
+                files={path: ManifestEntry(**entry) for path, entry in data["files"].items()},
+            )
+        except FileNotFoundError:
+            return _ProjectManifest()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable workspace manifest for {root}: {e}")
+            return _ProjectManifest()
+
+    def _save_manifest(self, root: str, manifest: _ProjectManifest) -> None:
+        path = self._manifest_path(root)
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": root,
+            "scanned_at_ns": manifest.scanned_at_ns,
+            "dirs": {rel: asdict(listing) for rel, listing in manifest.dirs.items()},
+            "files": {rel: asdict(entry) for rel, entry in manifest.files.items()},
+        }
+        try:
+            os.makedirs(self.manifest_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to persist workspace manifest for {root}: {e}")
+
+
+_workspace_scanner: Optional[WorkspaceScanner] = None
+
+
+def get_workspace_scanner() -> WorkspaceScanner:
+    """Get global workspace scanner instance."""
+    global _workspace_scanner
+    if _workspace_scanner is None:
+        _workspace_scanner = WorkspaceScanner()
+    return _workspace_scanner
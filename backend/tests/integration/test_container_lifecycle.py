@@ -287,6 +287,57 @@ class TestContainerExecution:
         assert len(result.stderr) > 0 or "Error" in result.stdout
         
         await container_manager.destroy_container("test-error-exec")
+    
+    @pytest.mark.asyncio
+    async def test_execute_streams_and_stops_on_pattern(self, container_manager):
+        """Test that output streams as it arrives and a stop pattern ends the command."""
+        await container_manager.create_container(
+            task_id="test-stream-exec",
+            project_id="test-project-1",
+            language="python"
+        )
+        
+        chunks = []
+        started = asyncio.get_running_loop().time()
+        result = await container_manager.exec_command(
+            task_id="test-stream-exec",
+            command="python -u -c \"import time; print('collecting'); print('FAILED test_a'); time.sleep(30)\"",
+            on_output=lambda stream, text: chunks.append(text),
+            stop_pattern=r"FAILED"
+        )
+        
+        assert asyncio.get_running_loop().time() - started < 10
+        assert result.cancelled == "pattern"
+        assert result.success is False
+        assert "FAILED test_a" in "".join(chunks)
+        
+        await container_manager.destroy_container("test-stream-exec")
+    
+    @pytest.mark.asyncio
+    async def test_timeout_stops_whole_pipeline(self, container_manager):
+        """Test that a timeout kills every process of a shell pipeline, not just its leader."""
+        await container_manager.create_container(
+            task_id="test-timeout-exec",
+            project_id="test-project-1",
+            language="python"
+        )
+        
+        started = asyncio.get_running_loop().time()
+        result = await container_manager.exec_command(
+            task_id="test-timeout-exec",
+            command="sh -c 'sleep 30 | cat & sleep 30'",
+            timeout=1.0
+        )
+        leftover = await container_manager.exec_command(
+            task_id="test-timeout-exec",
+            command="sh -c 'cat /proc/[0-9]*/cmdline | tr \"\\\\000\" \"\\\\n\" | grep -c \"^30$\" || true'"
+        )
+        
+        assert asyncio.get_running_loop().time() - started < 5
+        assert result.cancelled == "timeout"
+        assert leftover.stdout.strip() == "0"
+        
+        await container_manager.destroy_container("test-timeout-exec")
 
 
 class TestVolumeMounting:
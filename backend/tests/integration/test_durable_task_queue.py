@@ -0,0 +1,172 @@
+"""Integration tests for the Postgres-backed DurableTaskQueue."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import sqlalchemy as sa
+
+from backend.models.agent_state import TaskResult
+from backend.services.durable_task_queue import DurableTaskQueue
+from backend.services.event_bus import EventBus, EventType
+from backend.services.orchestrator import AgentType, Orchestrator, Task
+from backend.services.project_build_service import ProjectBuildService
+from backend.services.task_executor import TaskExecutor
+from backend.services.task_timeout_policy import TaskTimeoutPolicy
+
+
+@pytest.fixture()
+def project_id(postgres_engine: sa.Engine):
+    project_id = f"proj-{uuid.uuid4().hex[:8]}"
+    yield project_id
+    with postgres_engine.begin() as connection:
+        connection.execute(sa.text("DELETE FROM task_queue WHERE project_id = :p"), {"p": project_id})
+
+
+def make_task(task_id: str, priority: int = 0) -> Task:
+    return Task(task_id=task_id, task_type="deliverable", agent_type=AgentType.BACKEND_DEVELOPER, priority=priority)
+
+
+def test_dequeue_in_priority_then_fifo_order(postgres_engine, project_id):
+    queue = DurableTaskQueue(postgres_engine, project_id)
+    for task_id, priority in (("low", 1), ("high-1", 5), ("high-2", 5)):
+        queue.enqueue(make_task(f"{project_id}-{task_id}", priority))
+
+    assert queue.pending_by_agent_type() == {"backend_developer": 3}
+    order = [queue.dequeue().task_id for _ in range(3)]
+
+    assert order == [f"{project_id}-high-1", f"{project_id}-high-2", f"{project_id}-low"]
+    assert queue.dequeue() is None
+    assert queue.ack(order[0], {"success": True})
+
+
+def test_concurrent_workers_never_share_a_task(postgres_engine, project_id):
+    queues = [DurableTaskQueue(postgres_engine, project_id) for _ in range(4)]
+    for i in range(40):
+        queues[0].enqueue(make_task(f"{project_id}-{i}"))
+
+    def drain(queue):
+        leased = []
+        while (task := queue.dequeue()) is not None:
+            leased.append(task.task_id)
+        return leased
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leased = [task_id for batch in pool.map(drain, queues) for task_id in batch]
+
+    assert len(leased) == 40 and len(set(leased)) == 40
+
+
+def test_expired_lease_is_reclaimed_and_stale_holder_loses_ack(postgres_engine, project_id):
+    crashed = DurableTaskQueue(postgres_engine, project_id, visibility_timeout=0.2, max_attempts=2)
+    survivor = DurableTaskQueue(postgres_engine, project_id, visibility_timeout=30)
+    crashed.enqueue(make_task(f"{project_id}-t"))
+    crashed.dequeue()
+
+    time.sleep(0.3)
+    assert survivor.reclaim_expired() == 1
+    task = survivor.dequeue()
+
+    assert task.task_id == f"{project_id}-t"
+    assert not crashed.ack(task.task_id)
+    assert crashed.heartbeat() == 0
+    assert survivor.heartbeat() == 1
+    assert survivor.ack(task.task_id)
+
+
+def test_orchestrator_queue_survives_restart(postgres_engine, project_id):
+    Orchestrator(project_id, durable_queue=DurableTaskQueue(postgres_engine, project_id)).enqueue_task(
+        make_task(f"{project_id}-persisted", priority=3)
+    )
+
+    restarted = Orchestrator(project_id, durable_queue=DurableTaskQueue(postgres_engine, project_id))
+
+    assert restarted.get_pending_count() == 1
+    task = restarted.dequeue_task()
+    assert (task.task_id, task.priority, task.agent_type) == (f"{project_id}-persisted", 3, AgentType.BACKEND_DEVELOPER)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_notifies_waiting_workers(postgres_engine, project_id):
+    queue = DurableTaskQueue(postgres_engine, project_id, poll_interval=10.0)
+    await queue.start()
+    try:
+        await asyncio.sleep(0.3)  # Listener connected
+        waiter = asyncio.create_task(queue.wait_for_task())
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        await asyncio.to_thread(DurableTaskQueue(postgres_engine, project_id).enqueue, make_task(f"{project_id}-n"))
+        await waiter
+        assert time.monotonic() - started < 2.0
+    finally:
+        await queue.stop()
+
+
+class OneDeliverablePhases:
+    """Phase manager stand-in with a single pending deliverable."""
+
+    current_phase = "workshopping"
+
+    def __init__(self, deliverable):
+        self.pending = [deliverable]
+        self.deliverable_tracker = self
+
+    def is_complete(self):
+        return not self.pending
+
+    async def get_pending_deliverables(self):
+        return list(self.pending)
+
+    async def try_phase_transition(self):
+        return False
+
+    async def mark_completed(self, deliverable_id):
+        self.pending = [d for d in self.pending if d["id"] != deliverable_id]
+
+
+class StubAgent:
+    def __init__(self, agent_type):
+        self.agent_id = f"{agent_type}-1"
+        self.agent_type = agent_type
+
+    async def run_task(self, task):
+        return TaskResult(task.task_id, True, [], {}, [], 1.0)
+
+
+@pytest.mark.asyncio
+async def test_build_loop_finishes_a_deliverable_through_the_durable_queue(postgres_engine, project_id):
+    deliverable = {"id": f"deliv-{project_id}", "title": "requirements.md", "type": "document"}
+    event_bus = EventBus()
+    service = ProjectBuildService(postgres_engine, llm_client=object(), event_bus=event_bus, durable_task_queue=True)
+    service.TASK_POLL_INTERVAL = service.COMMIT_SETTLE_DELAY = service.LOOP_INTERVAL = 0.05
+    orchestrator = Orchestrator(project_id, durable_queue=DurableTaskQueue(postgres_engine, project_id, poll_interval=0.1))
+
+    async def decide(task, result):
+        return None
+
+    orchestrator.on_task_completed = decide
+    executor = TaskExecutor(
+        orchestrator, event_bus, max_workers=1,
+        phase_manager=OneDeliverablePhases(deliverable), timeout_policy=TaskTimeoutPolicy()
+    )
+    for agent_type in AgentType:
+        agent = StubAgent(agent_type.value)
+        executor.register_agent_instance(agent.agent_id, agent)
+    completed = asyncio.Event()
+
+    async def on_complete(event):
+        completed.set()
+
+    event_bus.subscribe(EventType.PROJECT_COMPLETED, on_complete)
+    await executor.start()
+    service.active_builds[project_id] = (orchestrator, executor.phase_manager, executor)
+
+    await asyncio.wait_for(service._run_build_loop(project_id), timeout=10)
+
+    assert completed.is_set()
+    assert orchestrator.durable_queue.status(deliverable["id"]) == "done"
+    assert project_id not in service.active_builds
@@ -0,0 +1,565 @@
+"""
+Deterministic build simulator.
+
+Runs the real build pipeline offline:
+
+    ProjectBuildService -> Orchestrator -> TaskExecutor -> BaseAgent -> ToolAccessService
+
+Only the edges are replaced:
+- LLM: ScriptedLLM answers every call the pipeline makes (planning,
+  progress evaluation, self-assessment, orchestrator decisions) with
+  scripted output. Latency and token counts come from seeded lognormal
+  distributions.
+- Containers and files: InMemoryContainerManager is installed as the
+  ContainerManager singleton. It keeps project files in memory and
+  interprets the commands the file_system tool sends.
+- Database: SQLite in memory (schema created here), or Postgres when a
+  database_url with migrations applied is given.
+
+Every sleep in the pipeline (LLM latency, build loop pacing, executor
+polling and timeouts) is multiplied by time_scale, and reported durations
+are divided by it. Builds therefore run in simulated time. CPU work is not
+scaled, so it weighs 1/time_scale more than in production. That makes CPU
+regressions easier to see, but numbers are only comparable between runs at
+the same scale.
+
+Usage:
+    report = asyncio.run(BuildSimulator(SimulationConfig(builds=2)).run())
+    print(report.format())
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from backend.agents.base_agent import BaseAgent
+from backend.models.agent_types import BUILT_IN_AGENTS
+from backend.services import container_manager as container_manager_module
+from backend.services.container_manager import ContainerExecutionResult
+from backend.services.event_bus import Event, EventBus, EventType
+from backend.services import task_timeout_policy as task_timeout_policy_module
+from backend.services import workspace_file_cache as workspace_file_cache_module
+from backend.services.project_build_service import ProjectBuildService
+from backend.services.task_executor import TaskExecutor
+
+logger = logging.getLogger(__name__)
+
+# Pipeline sleeps (class attribute -> seconds) scaled by SimulationConfig.time_scale
+PACED_ATTRIBUTES = {
+    ProjectBuildService: (
+        "TASK_POLL_INTERVAL",
+        "COMMIT_SETTLE_DELAY",
+        "LOOP_INTERVAL",
+        "PHASE_WAIT_INTERVAL",
+    ),
+    TaskExecutor: ("IDLE_POLL_INTERVAL",),
+}
+
+
+@dataclass
+class Distribution:
+    """Lognormal distribution given by its median and log-space sigma."""
+    median: float
+    sigma: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.sigma <= 0:
+            return self.median
+        return self.median * math.exp(rng.gauss(0.0, self.sigma))
+
+
+@dataclass
+class SimulationConfig:
+    """Simulation parameters. Durations are in simulated seconds."""
+    builds: int = 1
+    concurrency: int = 1  # Builds running at the same time
+    seed: int = 7
+    time_scale: float = 0.01  # Real seconds per simulated second
+    files_per_deliverable: int = 2
+    llm_latency: Distribution = field(default_factory=lambda: Distribution(1.5, 0.5))
+    prompt_tokens: Distribution = field(default_factory=lambda: Distribution(1800, 0.3))
+    completion_tokens: Distribution = field(default_factory=lambda: Distribution(300, 0.6))
+    file_bytes: Distribution = field(default_factory=lambda: Distribution(2400, 0.7))
+    database_url: Optional[str] = None  # Postgres with migrations applied; default SQLite
+    build_timeout: float = 3600.0
+    loop_lag_interval: float = 0.005  # Real seconds between event loop samples
+
+
+@dataclass
+class SimulationReport:
+    """Benchmark results. Latencies and rates are in simulated time."""
+    builds_completed: int
+    builds_failed: int
+    deliverables_completed: int
+    simulated_seconds: float
+    wall_seconds: float
+    builds_per_hour: float
+    step_latency_p50_ms: float
+    step_latency_p95_ms: float
+    llm_calls: Dict[str, int]
+    llm_calls_per_deliverable: float
+    tokens_per_deliverable: float
+    tool_execs: int
+    loop_blocked_ms: float  # Real time the event loop was stalled
+    loop_max_stall_ms: float
+
+    def format(self) -> str:
+        calls = ", ".join(f"{kind}={count}" for kind, count in sorted(self.llm_calls.items()))
+        return (
+            f"builds: {self.builds_completed} ok / {self.builds_failed} failed  "
+            f"deliverables={self.deliverables_completed}\n"
+            f"throughput: {self.builds_per_hour:.2f} builds/hour "
+            f"({self.simulated_seconds:.0f}s simulated, {self.wall_seconds:.2f}s wall)\n"
+            f"step latency: p50={self.step_latency_p50_ms:.0f}ms  p95={self.step_latency_p95_ms:.0f}ms\n"
+            f"llm: {self.llm_calls_per_deliverable:.2f} calls/deliverable  "
+            f"{self.tokens_per_deliverable:.0f} tokens/deliverable  ({calls})\n"
+            f"tools: {self.tool_execs} container execs\n"
+            f"event loop: blocked={self.loop_blocked_ms:.1f}ms  max stall={self.loop_max_stall_ms:.1f}ms"
+        )
+
+
+class ScriptedLLM:
+    """
+    LLM client with scripted answers and sampled latency and token usage.
+
+    Each deliverable task writes files_per_deliverable files, then marks
+    the deliverable complete; self-assessment answers YES only after that.
+    """
+
+    MARK_COMPLETE = "Mark deliverable complete"
+
+    def __init__(self, config: SimulationConfig, rng: random.Random):
+        self.config = config
+        self.rng = rng
+        self.calls: Counter = Counter()
+        self.tokens = 0
+
+    async def _respond(self, kind: str) -> None:
+        self.calls[kind] += 1
+        self.tokens += int(self.config.prompt_tokens.sample(self.rng))
+        self.tokens += int(self.config.completion_tokens.sample(self.rng))
+        await asyncio.sleep(self.config.llm_latency.sample(self.rng) * self.config.time_scale)
+
+    async def plan_next_action(self, task_state: Any, **_: Any) -> Dict[str, Any]:
+        await self._respond("plan")
+        step = len(task_state.steps_history)
+        if step < self.config.files_per_deliverable:
+            size = max(int(self.config.file_bytes.sample(self.rng)), 1)
+            return {
+                "description": f"Write part {step + 1} of {self.config.files_per_deliverable}",
+                "tool_name": "file_system",
+                "operation": "write",
+                "parameters": {
+                    "project_id": task_state.project_id,
+                    "task_id": task_state.task_id,
+                    "path": f"docs/{task_state.task_id}/part_{step + 1}.md",
+                    "content": ("x" * 79 + "\n") * (size // 80) + "x" * (size % 80),
+                },
+                "reasoning": "Write the next section of the deliverable",
+            }
+        return {
+            "description": self.MARK_COMPLETE,
+            "tool_name": "deliverable",
+            "operation": "mark_complete",
+            "parameters": {"deliverable_id": task_state.task_id},
+            "reasoning": "All sections written",
+        }
+
+    async def evaluate_progress(self, **_: Any) -> Dict[str, Any]:
+        await self._respond("evaluate_progress")
+        return {"success": True, "issues": [], "metrics": {"progress_score": 0.5}}
+
+    async def simple_completion(self, prompt: str, max_tokens: int = 3) -> str:
+        await self._respond("self_assess")
+        return "YES" if self.MARK_COMPLETE in prompt else "NO"
+
+    async def evaluate_confidence(self, request: Dict[str, Any]) -> float:
+        await self._respond("confidence")
+        return 0.9
+
+    async def query(self, prompt: str) -> str:
+        await self._respond("orchestrator")
+        return json.dumps({"action": "wait_for_more_tasks", "reasoning": "Build loop schedules deliverables"})
+
+
+class InMemoryContainerManager:
+    """
+    ContainerManager stand-in with per-project in-memory workspaces.
+
+    Understands the commands ToolAccessService's file_system tool issues
+    (mkdir, base64 write, stat/hash check, cat, rm, directory listing);
+    anything else succeeds with empty output.
+    """
+
+    _WRITE_RE = re.compile(r"open\('(?P<path>[^']+)', 'wb'\)\.write\(base64\.b64decode\('(?P<data>[^']*)'\)\)")
+    _STAT_RE = re.compile(r"exec\(base64\.b64decode\('[^']*'\)\)\" (?P<payload>\S+)")
+    _LIST_RE = re.compile(r"os\.listdir\('(?P<path>[^']+)'\)")
+    _MKDIR_RE = re.compile(r"os\.makedirs\(")
+
+    def __init__(self):
+        self.active_containers: Dict[str, str] = {}  # container id -> project_id
+        self.workspaces: Dict[str, Dict[str, bytes]] = {}
+        self.mtimes: Dict[str, int] = {}  # container path -> write sequence as mtime
+        self.exec_count = 0
+
+    async def create_container(self, task_id: str, project_id: str, language: str = "python") -> Dict[str, Any]:
+        self.active_containers[task_id] = project_id
+        self.workspaces.setdefault(project_id, {})
+        return {"success": True, "container_id": f"sim-{task_id}", "message": "Container created"}
+
+    async def destroy_container(self, task_id: str) -> Dict[str, Any]:
+        self.active_containers.pop(task_id, None)
+        return {"success": True, "message": "Container destroyed"}
+
+    async def exec_command(self, task_id: str, command: str, **_: Any) -> ContainerExecutionResult:
+        if task_id not in self.active_containers:
+            raise ValueError(f"No container found for task {task_id}")
+        self.exec_count += 1
+        files = self.workspaces[self.active_containers[task_id]]
+
+        if match := self._WRITE_RE.search(command):
+            files[match["path"]] = base64.b64decode(match["data"])
+            self.mtimes[match["path"]] = self.exec_count
+            return ContainerExecutionResult(0, "", "")
+        if match := self._STAT_RE.search(command):
+            stats = {}
+            for path, want_hash in json.loads(base64.b64decode(match["payload"])):
+                content = files.get(path)
+                stats[path] = None if content is None else [
+                    len(content), self.mtimes.get(path, 0),
+                    hashlib.sha256(content).hexdigest() if want_hash else None,
+                ]
+            return ContainerExecutionResult(0, json.dumps(stats) + "\n", "")
+        if match := self._LIST_RE.search(command):
+            prefix = match["path"].rstrip("/") + "/"
+            names = sorted({p[len(prefix):].split("/", 1)[0] for p in files if p.startswith(prefix)})
+            if not names:
+                return ContainerExecutionResult(1, "", f"No such directory: {match['path']}")
+            listing = [
+                {"name": name, "type": "file" if prefix + name in files else "directory",
+                 "size": len(files[prefix + name]) if prefix + name in files else None}
+                for name in names
+            ]
+            return ContainerExecutionResult(0, json.dumps(listing), "")
+        if self._MKDIR_RE.search(command):
+            return ContainerExecutionResult(0, "", "")
+        if command.startswith("cat "):
+            content = files.get(command[4:].strip())
+            if content is None:
+                return ContainerExecutionResult(1, "", "No such file")
+            return ContainerExecutionResult(0, content.decode("utf-8"), "")
+        if command.startswith("rm "):
+            removed = files.pop(command[3:].strip(), None)
+            return ContainerExecutionResult(0 if removed is not None else 1, "", "")
+        return ContainerExecutionResult(0, "", "")
+
+    async def cleanup_orphaned_containers(self) -> Dict[str, Any]:
+        return {"cleaned": 0, "errors": []}
+
+    def get_active_container_count(self) -> int:
+        return len(self.active_containers)
+
+
+class ReadyStartupChecker:
+    """Startup checker reporting the simulated services as available."""
+
+    def __init__(self):
+        self.results = {
+            name: {"available": True, "message": "Simulated", "required": True}
+            for name in ("Docker", "Database", "SearXNG", "Qdrant")
+        }
+
+    async def run_all_checks(self) -> bool:
+        return True
+
+
+class LoopLagSampler:
+    """Measures event loop stalls by timing short sleeps."""
+
+    def __init__(self, interval: float, threshold: float = 0.002):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked = 0.0
+        self.max_stall = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            if lag > self.threshold:
+                self.blocked += lag
+                self.max_stall = max(self.max_stall, lag)
+
+
+SQLITE_SCHEMA = [
+    """CREATE TABLE project_plans (
+        project_id TEXT PRIMARY KEY, project_description TEXT, total_estimated_days INTEGER,
+        complexity_score REAL, generated_at TEXT, created_at TIMESTAMP, updated_at TIMESTAMP)""",
+    """CREATE TABLE milestones (
+        id TEXT PRIMARY KEY, project_id TEXT, phase_name TEXT, name TEXT, description TEXT,
+        tasks TEXT, estimated_days INTEGER, dependencies TEXT, deliverables TEXT,
+        created_at TIMESTAMP, updated_at TIMESTAMP)""",
+    """CREATE TABLE phases (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, project_id TEXT, phase_name TEXT, status TEXT,
+        assigned_agents TEXT, started_at TIMESTAMP, completed_at TIMESTAMP,
+        created_at TIMESTAMP, updated_at TIMESTAMP)""",
+    """CREATE TABLE deliverables (
+        id TEXT PRIMARY KEY, phase_id TEXT, project_id TEXT, deliverable_type TEXT, title TEXT,
+        name TEXT, description TEXT, status TEXT, artifact_path TEXT, validation_result TEXT,
+        created_at TIMESTAMP, updated_at TIMESTAMP)""",
+    "CREATE INDEX idx_deliverables_phase ON deliverables (phase_id)",
+    """CREATE TABLE prompts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, agent_type TEXT, version TEXT,
+        prompt_text TEXT, is_active BOOLEAN)""",
+    """CREATE TABLE agent_task_checkpoints (
+        task_id TEXT, step_number INTEGER, agent_id TEXT, state_delta BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (task_id, step_number))""",
+]
+
+
+class _BufferedReturningCursor(sqlite3.Cursor):
+    """
+    Cursor that reads RETURNING rows eagerly.
+
+    The pipeline commits before reading RETURNING results, which Postgres
+    drivers allow (rows are already buffered) but SQLite rejects while the
+    statement is still in progress.
+    """
+
+    _buffer: Optional[List[Any]] = None
+
+    def execute(self, sql, parameters=()):
+        self._buffer = None
+        super().execute(sql, parameters)
+        if "RETURNING" in sql.upper() and self.description:
+            self._buffer = super().fetchall()
+        return self
+
+    def fetchone(self):
+        if self._buffer is None:
+            return super().fetchone()
+        return self._buffer.pop(0) if self._buffer else None
+
+    def fetchmany(self, size=None):
+        if self._buffer is None:
+            return super().fetchmany(size or self.arraysize)
+        rows, self._buffer = self._buffer[:size or self.arraysize], self._buffer[size or self.arraysize:]
+        return rows
+
+    def fetchall(self):
+        if self._buffer is None:
+            return super().fetchall()
+        rows, self._buffer = self._buffer, []
+        return rows
+
+
+class _SimulationConnection(sqlite3.Connection):
+    def cursor(self, factory=_BufferedReturningCursor):
+        return super().cursor(factory)
+
+
+def create_simulation_engine(database_url: Optional[str] = None) -> Engine:
+    """Postgres engine for ``database_url``, or a seeded in-memory SQLite engine."""
+    if database_url:
+        return create_engine(database_url)
+
+    # The pipeline formats timestamps with isoformat(), so return datetimes
+    sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.fromisoformat(raw.decode()))
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={
+            "check_same_thread": False,
+            "detect_types": sqlite3.PARSE_DECLTYPES,
+            "factory": _SimulationConnection,
+        },
+    )
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(dbapi_connection, _record):
+        dbapi_connection.create_function("NOW", 0, lambda: datetime.now().isoformat(" "))
+
+    with engine.begin() as conn:
+        for statement in SQLITE_SCHEMA:
+            conn.execute(text(statement))
+        for agent_type in BUILT_IN_AGENTS:
+            conn.execute(
+                text("INSERT INTO prompts (agent_type, version, prompt_text, is_active) VALUES (:t, '1.0.0', :p, 1)"),
+                {"t": agent_type, "p": f"You are the {agent_type} agent."},
+            )
+    return engine
+
+
+@contextmanager
+def scaled_pacing(time_scale: float) -> Iterator[None]:
+    """Scale pipeline sleeps and agent retry backoff for the duration."""
+    saved = {
+        (cls, name): cls.__dict__[name]
+        for cls, names in PACED_ATTRIBUTES.items()
+        for name in names
+    }
+    original_backoff = BaseAgent._backoff_seconds
+    try:
+        for (cls, name), value in saved.items():
+            setattr(cls, name, value * time_scale)
+        BaseAgent._backoff_seconds = lambda agent, attempt: original_backoff(agent, attempt) * time_scale
+        yield
+    finally:
+        for (cls, name), value in saved.items():
+            setattr(cls, name, value)
+        BaseAgent._backoff_seconds = original_backoff
+
+
+@contextmanager
+def installed_container_manager(manager: InMemoryContainerManager) -> Iterator[None]:
+    """Make ``manager`` the ContainerManager singleton (with its own file cache) for the duration."""
+    saved = container_manager_module._container_manager, workspace_file_cache_module._workspace_file_cache
+    container_manager_module._container_manager = manager
+    workspace_file_cache_module._workspace_file_cache = workspace_file_cache_module.WorkspaceFileCache()
+    try:
+        yield
+    finally:
+        container_manager_module._container_manager, workspace_file_cache_module._workspace_file_cache = saved
+
+
+@contextmanager
+def in_memory_timeout_policy() -> Iterator[None]:
+    """Keep simulated task durations out of the persisted timeout history."""
+    saved = task_timeout_policy_module._task_timeout_policy
+    task_timeout_policy_module._task_timeout_policy = task_timeout_policy_module.TaskTimeoutPolicy()
+    try:
+        yield
+    finally:
+        task_timeout_policy_module._task_timeout_policy = saved
+
+
+class BuildSimulator:
+    """Runs simulated builds through ProjectBuildService and reports metrics."""
+
+    DESCRIPTION = "Build a task tracker with a FastAPI backend, React frontend and Postgres database"
+    TECH_STACK = {"frontend": "react", "backend": "fastapi", "database": "postgres"}
+
+    def __init__(self, config: Optional[SimulationConfig] = None):
+        self.config = config or SimulationConfig()
+
+    async def run(self) -> SimulationReport:
+        config = self.config
+        llm = ScriptedLLM(config, random.Random(config.seed))
+        containers = InMemoryContainerManager()
+        engine = create_simulation_engine(config.database_url)
+        event_bus = EventBus()
+        service = ProjectBuildService(
+            engine, llm, event_bus=event_bus, startup_checker=ReadyStartupChecker()
+        )
+        sampler = LoopLagSampler(config.loop_lag_interval)
+        executors: List[TaskExecutor] = []
+        outcomes: List[bool] = []
+        limit = asyncio.Semaphore(config.concurrency)
+
+        async def one_build() -> None:
+            async with limit:
+                outcomes.append(await self._run_build(service, event_bus, executors))
+
+        with scaled_pacing(config.time_scale), installed_container_manager(containers), in_memory_timeout_policy():
+            sampler.start()
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(*(one_build() for _ in range(config.builds)))
+            finally:
+                wall = time.perf_counter() - started
+                await sampler.stop()
+                for executor in executors:
+                    await executor.stop()
+                engine.dispose()
+
+        return self._report(llm, containers, sampler, executors, outcomes, wall)
+
+    async def _run_build(self, service: ProjectBuildService, event_bus: EventBus, executors: List[TaskExecutor]) -> bool:
+        finished: asyncio.Future = asyncio.get_running_loop().create_future()
+        project_ids: List[str] = []
+
+        async def on_finish(event: Event) -> None:
+            if event.project_id in project_ids and not finished.done():
+                finished.set_result(event.event_type == EventType.PROJECT_COMPLETED)
+
+        event_bus.subscribe(EventType.PROJECT_COMPLETED, on_finish)
+        event_bus.subscribe(EventType.PROJECT_FAILED, on_finish)
+        try:
+            project_ids.append(await service.start_build(self.DESCRIPTION, self.TECH_STACK))
+            executors.append(service.active_builds[project_ids[0]][2])
+            return await asyncio.wait_for(finished, self.config.build_timeout * self.config.time_scale)
+        except Exception:
+            logger.exception("Simulated build failed")
+            return False
+        finally:
+            event_bus.unsubscribe(EventType.PROJECT_COMPLETED, on_finish)
+            event_bus.unsubscribe(EventType.PROJECT_FAILED, on_finish)
+
+    def _report(
+        self,
+        llm: ScriptedLLM,
+        containers: InMemoryContainerManager,
+        sampler: LoopLagSampler,
+        executors: List[TaskExecutor],
+        outcomes: List[bool],
+        wall: float
+    ) -> SimulationReport:
+        scale = self.config.time_scale
+        step_latencies: List[float] = []
+        deliverables = 0
+        for executor in executors:
+            for result in executor.task_results.values():
+                deliverables += bool(result.success)
+                previous = datetime.fromisoformat(result.metadata["started_at"])
+                if previous.tzinfo is None:
+                    previous = previous.replace(tzinfo=UTC)  # TaskState uses naive utcnow()
+                for step in result.steps:
+                    step_latencies.append((step.timestamp - previous).total_seconds() / scale * 1000)
+                    previous = step.timestamp
+
+        p50, p95 = np.percentile(step_latencies, [50, 95]) if step_latencies else (0.0, 0.0)
+        simulated = wall / scale
+        completed = sum(outcomes)
+        calls = sum(llm.calls.values())
+        return SimulationReport(
+            builds_completed=completed,
+            builds_failed=len(outcomes) - completed,
+            deliverables_completed=deliverables,
+            simulated_seconds=simulated,
+            wall_seconds=wall,
+            builds_per_hour=completed * 3600 / simulated if simulated else 0.0,
+            step_latency_p50_ms=float(p50),
+            step_latency_p95_ms=float(p95),
+            llm_calls=dict(llm.calls),
+            llm_calls_per_deliverable=calls / deliverables if deliverables else 0.0,
+            tokens_per_deliverable=llm.tokens / deliverables if deliverables else 0.0,
+            tool_execs=containers.exec_count,
+            loop_blocked_ms=sampler.blocked * 1000,
+            loop_max_stall_ms=sampler.max_stall * 1000,
+        )
@@ -0,0 +1,67 @@
+"""
+End-to-end build throughput benchmark.
+
+Runs full builds (ProjectBuildService -> Orchestrator -> TaskExecutor ->
+BaseAgent -> ToolAccessService) in the deterministic build simulator:
+scripted LLM, in-memory containers, SQLite. Needs no Docker, network or
+API key.
+
+Set BUILD_SIM_DATABASE_URL to run against Postgres with migrations
+applied instead of SQLite.
+
+Run:
+    pytest backend/tests/performance/test_build_throughput.py -m performance -s
+"""
+import asyncio
+import os
+
+import pytest
+
+from backend.tests.performance.build_simulator import BuildSimulator, Distribution, SimulationConfig
+
+pytestmark = pytest.mark.performance
+
+# Plan calls per deliverable: one per file plus mark_complete; one
+# self-assessment per plan; one progress evaluation; one orchestrator query
+FILES_PER_DELIVERABLE = 2
+MAX_LLM_CALLS_PER_DELIVERABLE = 2 * (FILES_PER_DELIVERABLE + 1) + 2
+
+
+def run(**overrides) -> dict:
+    config = SimulationConfig(
+        files_per_deliverable=FILES_PER_DELIVERABLE,
+        database_url=os.environ.get("BUILD_SIM_DATABASE_URL"),
+        **overrides
+    )
+    report = asyncio.run(BuildSimulator(config).run())
+    print(f"\n--- builds={config.builds} concurrency={config.concurrency} ---\n{report.format()}")
+    return report
+
+
+def test_single_build_completes_within_llm_budget():
+    report = run(builds=1)
+
+    assert report.builds_completed == 1 and report.builds_failed == 0
+    assert report.deliverables_completed > 0
+    assert report.llm_calls_per_deliverable <= MAX_LLM_CALLS_PER_DELIVERABLE
+    assert report.step_latency_p95_ms >= report.step_latency_p50_ms > 0
+
+
+def test_concurrent_builds_scale_throughput():
+    serial = run(builds=2, concurrency=1)
+    concurrent = run(builds=2, concurrency=2)
+
+    assert concurrent.builds_completed == serial.builds_completed == 2
+    # Builds only wait on the (simulated) LLM, so overlapping them should
+    # come close to doubling throughput
+    assert concurrent.builds_per_hour > 1.5 * serial.builds_per_hour
+
+
+def test_results_are_reproducible():
+    config = dict(builds=1, llm_latency=Distribution(0.5, 0.3))
+
+    first = run(**config)
+    second = run(**config)
+
+    assert first.llm_calls == second.llm_calls
+    assert first.deliverables_completed == second.deliverables_completed
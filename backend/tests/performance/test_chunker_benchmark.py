@@ -0,0 +1,134 @@
+"""
+Chunking benchmark: chunks per MB and retrieval recall on a fixed corpus.
+
+Compares the previous RAGService chunking (500-character windows with 50
+characters of overlap) against DocumentChunker at the RAGService budget.
+
+The corpus is generated from a fixed seed: markdown documents with
+headings, paragraphs, code blocks and a repeated license footer. Each
+query is a subset of one corpus sentence; a hit means a top-k chunk
+contains that whole sentence. Retrieval uses hashed bag-of-words vectors,
+so the benchmark needs no network and is fully reproducible.
+
+Run:
+    pytest backend/tests/performance/test_chunker_benchmark.py -m performance -s
+"""
+import random
+import re
+import zlib
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pytest
+
+from backend.services.document_chunker import DocumentChunker
+from backend.services.rag_service import RAGService
+
+pytestmark = pytest.mark.performance
+
+SEED = 7
+DOCUMENTS = 60
+QUERIES = 300
+TOP_K = 3
+DIM = 4096
+
+LICENSE = (
+    "## License\n\n"
+    "Copyright the authors. Licensed under the Apache License, Version 2.0. "
+    "You may not use this file except in compliance with the License. "
+    "Distributed on an AS IS basis, without warranties or conditions of any kind."
+)
+
+
+def chars_per_token(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def build_corpus(rng: random.Random):
+    vocab = [f"{rng.choice('bcdfgklmnprstvz')}{rng.choice('aeiou')}{rng.choice('lmnrst')}{i}" for i in range(3000)]
+    documents: List[str] = []
+    sentences: List[str] = []
+    for d in range(DOCUMENTS):
+        parts = [f"# Document {d}"]
+        for s in range(rng.randint(4, 7)):
+            parts.append(f"## Section {d}.{s}")
+            for _ in range(rng.randint(1, 3)):
+                paragraph = []
+                for _ in range(rng.randint(3, 6)):
+                    sentence = " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 16))).capitalize() + "."
+                    paragraph.append(sentence)
+                    sentences.append(sentence)
+                parts.append(" ".join(paragraph))
+            if rng.random() < 0.5:
+                body = "\n".join(
+                    f"    value_{i} = compute({rng.choice(vocab)}, {rng.choice(vocab)})"
+                    for i in range(rng.randint(4, 20))
+                )
+                parts.append(f"```python\ndef handler_{d}_{s}():\n{body}\n```")
+        parts.append(LICENSE)
+        documents.append("\n\n".join(parts) + "\n")
+    return documents, sentences
+
+
+def fixed_chunks(text: str, size: int = 500, overlap: int = 50) -> List[str]:
+    """Previous RAGService.chunk_text behaviour."""
+    if len(text) <= size:
+        return [text]
+    chunks, start = [], 0
+    while start < len(text):
+        chunks.append(text[start:start + size])
+        start += size - overlap
+    return chunks
+
+
+def embed(texts: List[str]) -> np.ndarray:
+    matrix = np.zeros((len(texts), DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"\w+", text.lower()):
+            matrix[row, zlib.crc32(word.encode()) % DIM] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+def evaluate(name: str, chunk_fn: Callable[[str], List[str]], documents, queries) -> Dict[str, float]:
+    started = time.perf_counter()
+    chunks = [chunk for doc in documents for chunk in chunk_fn(doc)]
+    elapsed = time.perf_counter() - started
+
+    scores = embed([q for q, _ in queries]) @ embed(chunks).T
+    top = np.argsort(-scores, axis=1)[:, :TOP_K]
+    hits = sum(
+        any(sentence in chunks[idx] for idx in top[row])
+        for row, (_, sentence) in enumerate(queries)
+    )
+
+    megabytes = sum(len(doc.encode("utf-8")) for doc in documents) / 1_000_000
+    result = {
+        "chunks": len(chunks),
+        "chunks_per_mb": len(chunks) / megabytes,
+        "recall": hits / len(queries),
+        "mb_per_s": megabytes / elapsed,
+    }
+    print(
+        f"{name:>10}: chunks={result['chunks']:5d}  chunks/MB={result['chunks_per_mb']:8.1f}  "
+        f"recall@{TOP_K}={result['recall']:.3f}  throughput={result['mb_per_s']:.2f} MB/s"
+    )
+    return result
+
+
+def test_structure_aware_chunking_beats_fixed_windows():
+    rng = random.Random(SEED)
+    documents, sentences = build_corpus(rng)
+    queries = []
+    for sentence in rng.sample(sentences, QUERIES):
+        words = sentence.rstrip(".").split()
+        queries.append((" ".join(rng.sample(words, min(6, len(words)))), sentence))
+
+    chunker = DocumentChunker(max_tokens=RAGService.CHUNK_MAX_TOKENS, count_tokens=chars_per_token)
+
+    fixed = evaluate("fixed", fixed_chunks, documents, queries)
+    semantic = evaluate("semantic", lambda doc: [c.text for c in chunker.iter_chunks(doc)], documents, queries)
+
+    assert semantic["chunks_per_mb"] < fixed["chunks_per_mb"]
+    assert semantic["recall"] >= fixed["recall"]
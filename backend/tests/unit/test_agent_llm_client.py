@@ -0,0 +1,147 @@
+"""
+Unit tests for AgentLLMClient planning modes.
+
+Covers JSON mode, streamed plans with early action dispatch, and the
+incremental JSON parser the streaming path relies on.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.models.agent_state import TaskState
+from backend.services.agent_llm_client import AgentLLMClient
+from backend.services.streaming_json_parser import IncrementalJSONObjectParser
+
+
+PLAN = {
+    "description": "Create app.py",
+    "tool_name": "file_system",
+    "operation": "write",
+    "parameters": {"path": "app.py", "content": "print('hi')\n"},
+    "reasoning": "The goal requires an entry point " * 10,
+}
+
+
+def _chunk(text: str = None, usage: int = None) -> SimpleNamespace:
+    choices = [] if text is None else [SimpleNamespace(delta=SimpleNamespace(content=text))]
+    return SimpleNamespace(
+        choices=choices,
+        usage=SimpleNamespace(total_tokens=usage) if usage is not None else None,
+    )
+
+
+class FakeAdapter:
+    """Adapter stub that streams a plan in small pieces with a gate mid-reasoning."""
+
+    def __init__(self, content: str, piece: int = 8):
+        self.content = content
+        self.piece = piece
+        self.calls: List[Dict[str, Any]] = []
+        self.release_tail = asyncio.Event()
+        self.streamed_chars = 0
+
+    async def chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(total_tokens=42),
+        )
+
+    async def stream_chat_completion(self, **kwargs):
+        self.calls.append(kwargs)
+        reasoning_at = self.content.index('"reasoning"')
+        for start in range(0, len(self.content), self.piece):
+            if start > reasoning_at + 20:
+                await self.release_tail.wait()
+            self.streamed_chars = start + self.piece
+            yield _chunk(self.content[start:start + self.piece])
+        yield _chunk(usage=99)
+
+
+def _state() -> TaskState:
+    return TaskState(
+        task_id="task-1",
+        agent_id="backend-1",
+        project_id="project-1",
+        goal="Write app.py",
+        acceptance_criteria=[],
+        constraints={},
+    )
+
+
+class TestIncrementalJSONObjectParser:
+    """Test top-level field decoding while streaming."""
+
+    @pytest.mark.parametrize("piece", [1, 3, 64])
+    def test_fields_match_full_parse(self, piece):
+        document = "```json\n" + json.dumps({**PLAN, "n": 1.5, "ok": True, "none": None}) + "\n```"
+        parser = IncrementalJSONObjectParser()
+        for start in range(0, len(document), piece):
+            parser.feed(document[start:start + piece])
+
+        assert parser.complete
+        assert parser.fields == {**PLAN, "n": 1.5, "ok": True, "none": None}
+
+    def test_early_fields_available_before_object_closes(self):
+        document = json.dumps(PLAN)
+        cut = document.index('"reasoning"') + 15
+        parser = IncrementalJSONObjectParser()
+        parser.feed(document[:cut])
+
+        assert parser.has_fields(["description", "tool_name", "operation", "parameters"])
+        assert "reasoning" not in parser.fields
+        assert not parser.complete
+
+    def test_braces_inside_strings_are_ignored(self):
+        parser = IncrementalJSONObjectParser()
+        parser.feed('{"a": "}{\\"", "b": {"c": "]"}}')
+
+        assert parser.fields == {"a": '}{"', "b": {"c": "]"}}
+
+
+class TestPlanNextAction:
+    """Test buffered and streamed planning."""
+
+    @pytest.mark.asyncio
+    async def test_json_mode_requested_by_default(self):
+        adapter = FakeAdapter(json.dumps(PLAN))
+        client = AgentLLMClient(adapter)
+
+        action = await client.plan_next_action(task_state=_state())
+
+        assert action == PLAN
+        assert adapter.calls[0]["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_streaming_returns_action_before_reasoning_finishes(self):
+        adapter = FakeAdapter(json.dumps(PLAN))
+        client = AgentLLMClient(adapter, streaming=True)
+        state = _state()
+
+        action = await client.plan_next_action(task_state=state)
+
+        assert action["tool_name"] == "file_system"
+        assert action["parameters"] == PLAN["parameters"]
+        assert adapter.streamed_chars < len(adapter.content)
+        assert state.llm_calls == []
+
+        pending = action["metadata"]["pending_reasoning"]
+        assert not pending.done()
+        adapter.release_tail.set()
+
+        assert await pending == PLAN["reasoning"]
+        assert state.llm_calls[0].tokens_used == 99
+
+    @pytest.mark.asyncio
+    async def test_streaming_falls_back_when_output_is_not_json(self):
+        adapter = FakeAdapter('plain text "reasoning" answer without JSON')
+        adapter.release_tail.set()
+        client = AgentLLMClient(adapter, streaming=True)
+
+        action = await client.plan_next_action(task_state=_state())
+
+        assert action["tool_name"] is None
+        assert action["reasoning"] == adapter.content
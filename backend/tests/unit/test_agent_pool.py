@@ -0,0 +1,137 @@
+"""
+Unit tests for agent pools and least-loaded dispatch in TaskExecutor.
+"""
+import asyncio
+import time
+from itertools import count
+
+import pytest
+
+from backend.models.agent_state import TaskResult
+from backend.services.agent_pool import AgentPool, PoolConfig
+from backend.services.event_bus import EventBus
+from backend.services.orchestrator import AgentType, Orchestrator, Task
+from backend.services.task_executor import TaskExecutor
+
+_ids = count()
+
+
+class SleepyAgent:
+    """Agent that takes ``duration`` seconds per task and records its tasks."""
+
+    def __init__(self, agent_type="backend_developer", duration=0.0):
+        self.agent_id = f"{agent_type}-{next(_ids)}"
+        self.agent_type = agent_type
+        self.duration = duration
+        self.tasks = []
+
+    async def run_task(self, task):
+        self.tasks.append(task.task_id)
+        await asyncio.sleep(self.duration)
+        return TaskResult(task.task_id, True, [], {}, [], 1.0)
+
+
+def test_acquire_prefers_least_outstanding_then_least_recent():
+    pool = AgentPool("backend_developer")
+    first, second = SleepyAgent(), SleepyAgent()
+    pool.add(first)
+    pool.add(second)
+
+    assert pool.acquire() is first
+    assert pool.acquire() is second
+    assert pool.acquire() is first  # Both busy: older last use wins
+    pool.release(second)
+    assert pool.acquire() is second
+    assert pool.outstanding == 3
+
+
+@pytest.mark.asyncio
+async def test_scale_is_bounded_and_idle_members_are_reaped():
+    async def factory(agent_type):
+        return SleepyAgent(agent_type)
+
+    pool = AgentPool("qa_engineer", factory, PoolConfig(min_size=1, max_size=3, idle_timeout=10.0))
+
+    assert len(await pool.scale(queued=0)) == 1
+    assert len(await pool.scale(queued=10)) == 2
+    assert len(pool) == 3
+
+    busy = pool.acquire()
+    reaped = pool.reap_idle(now=time.monotonic() + 60)
+
+    assert len(reaped) == 2 and busy not in reaped
+    pool.release(busy)
+    assert pool.reap_idle(now=time.monotonic() + 60) == []  # min_size kept
+
+
+def make_executor(workers, agent_factory=None):
+    orchestrator = Orchestrator(project_id="proj-pool")
+
+    async def decide(task, result):
+        return None
+
+    orchestrator.on_task_completed = decide
+    return orchestrator, TaskExecutor(
+        orchestrator=orchestrator,
+        event_bus=EventBus(),
+        max_workers=workers,
+        agent_factory=agent_factory,
+    )
+
+
+def enqueue(orchestrator, n):
+    for i in range(n):
+        orchestrator.enqueue_task(Task(
+            task_id=f"task-{i}",
+            task_type="implement",
+            agent_type=AgentType.BACKEND_DEVELOPER,
+        ))
+
+
+async def drain(executor, n, timeout=5.0):
+    await executor.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while len(executor.task_results) < n and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+    finally:
+        await executor.stop()
+
+
+@pytest.mark.asyncio
+async def test_executor_grows_pool_and_runs_tasks_in_parallel():
+    created = []
+
+    async def factory(agent_type):
+        agent = SleepyAgent(agent_type, duration=0.3)
+        created.append(agent)
+        return agent
+
+    orchestrator, executor = make_executor(workers=4, agent_factory=factory)
+    seed = SleepyAgent(duration=0.3)
+    executor.register_agent_instance(seed.agent_id, seed)
+    enqueue(orchestrator, 4)
+
+    started = time.monotonic()
+    await drain(executor, 4)
+    elapsed = time.monotonic() - started
+
+    assert len(executor.task_results) == 4
+    assert len(created) == 3
+    assert all(len(agent.tasks) == 1 for agent in [seed] + created)
+    assert elapsed < 1.0  # Serial execution would take 1.2s
+    assert executor.get_stats()["agent_pools"]["backend_developer"] == {"size": 4, "outstanding": 0}
+    assert len(orchestrator.get_agents_by_type(AgentType.BACKEND_DEVELOPER)) == 3
+
+
+@pytest.mark.asyncio
+async def test_executor_spreads_tasks_over_registered_agents_without_factory():
+    orchestrator, executor = make_executor(workers=2)
+    agents = [SleepyAgent(duration=0.05), SleepyAgent(duration=0.05)]
+    for agent in agents:
+        executor.register_agent_instance(agent.agent_id, agent)
+    enqueue(orchestrator, 4)
+
+    await drain(executor, 4)
+
+    assert [len(agent.tasks) for agent in agents] == [2, 2]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, Iterable, List, Optional
 
 import pytest
@@ -212,3 +213,107 @@ async def test_progress_hierarchy_prefers_tests_then_artifacts_then_llm(monkeypa
     validation = await agent._evaluate_progress(state, Result(success=False, metadata={}))
     assert validation.success is True
     assert validation.metrics["progress_score"] == 0.5
+
+
+class ConcurrencyTrackingOrchestrator(StubOrchestrator):
+    """Orchestrator stub that records how many tool calls overlap."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def execute_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().execute_tool(request)
+
+
+def _write(path: str) -> Dict[str, Any]:
+    return {
+        "description": f"write {path}",
+        "tool_name": "file_system",
+        "operation": "write",
+        "parameters": {"path": path, "content": "x"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_plan_executes_independent_actions_concurrently() -> None:
+    orchestrator = ConcurrencyTrackingOrchestrator()
+    llm = StubLLMClient(plans=[{
+        "description": "scaffold",
+        "actions": [_write("a.py"), _write("b.py"), _write("c.py")],
+        "reasoning": "write all files at once",
+    }])
+    agent = TestAgent(orchestrator, llm, results=[])
+
+    task = {"task_id": "task-batch", "project_id": "project-1", "payload": {"goal": "", "acceptance_criteria": [], "max_steps": 1}}
+    outcome = await agent.run_task(task)
+
+    assert llm._plan_calls == 1
+    assert orchestrator.peak_in_flight == 3
+    assert [req["parameters"]["path"] for req in orchestrator.tool_requests] == ["a.py", "b.py", "c.py"]
+    assert len(outcome.steps) == 1
+    assert outcome.steps[0].result.metadata["batch_size"] == 3
+
+
+def test_batch_grouping_serializes_conflicts_and_barriers() -> None:
+    agent = TestAgent(StubOrchestrator(), StubLLMClient(), results=[])
+    mark_complete = {"description": "done", "tool_name": "deliverable", "operation": "mark_complete", "parameters": {}}
+    action = agent._parse_llm_action({
+        "actions": [_write("a.py"), _write("b.py"), _write("a.py"), mark_complete, _write("c.py")],
+    })
+
+    groups = agent._group_independent_actions(action.batch)
+
+    assert [[a.parameters.get("path", a.tool_name) for a in group] for group in groups] == [
+        ["a.py", "b.py"],
+        ["a.py"],
+        ["deliverable"],
+        ["c.py"],
+    ]
+
+
+def test_single_entry_batch_collapses_to_plain_action() -> None:
+    agent = TestAgent(StubOrchestrator(), StubLLMClient(), results=[])
+
+    action = agent._parse_llm_action({"actions": [_write("a.py")], "reasoning": "only one"})
+
+    assert action.batch == []
+    assert action.tool_name == "file_system"
+    assert action.reasoning == "only one"
+
+
+
+class FailingWriteOrchestrator(StubOrchestrator):
+    """Orchestrator stub whose writes to ``bad.py`` fail."""
+
+    async def execute_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request["parameters"].get("path") == "bad.py":
+            self.tool_requests.append(request)
+            return {"status": "error", "result": None, "error": "disk full"}
+        return await super().execute_tool(request)
+
+
+@pytest.mark.asyncio
+async def test_batch_stops_at_first_failed_group() -> None:
+    orchestrator = FailingWriteOrchestrator()
+    mark_complete = {"description": "done", "tool_name": "deliverable", "operation": "mark_complete", "parameters": {}}
+    llm = StubLLMClient(plans=[{
+        "description": "write then finish",
+        "actions": [_write("a.py"), _write("bad.py"), mark_complete, _write("c.py")],
+    }])
+    agent = TestAgent(orchestrator, llm, results=[], max_retries=1)
+
+    task = {"task_id": "task-batch-fail", "project_id": "project-1", "payload": {"goal": "", "acceptance_criteria": [], "max_steps": 1}}
+    outcome = await agent.run_task(task)
+
+    first = outcome.steps[0].result
+    assert [req["parameters"]["path"] for req in orchestrator.tool_requests[:2]] == ["a.py", "bad.py"]
+    assert all(req["tool"] != "deliverable" for req in orchestrator.tool_requests)
+    assert first.success is False
+    assert (first.metadata["batch_failed"], first.metadata["batch_skipped"]) == (1, 2)
+    assert "deliverable.mark_complete: not run" in first.error
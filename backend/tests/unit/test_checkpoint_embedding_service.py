@@ -0,0 +1,184 @@
+"""
+Unit tests for CheckpointEmbeddingService batch pipeline.
+
+Uses an in-memory Qdrant, a fake embeddings client and a fake engine that
+emulates FOR UPDATE SKIP LOCKED row claims across connections.
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, VectorParams
+
+from backend.services.checkpoint_embedding_service import CheckpointEmbeddingService
+from backend.services.llm_request_scheduler import LLMRequestScheduler, RequestPriority
+
+
+class FakeConnection:
+    """Connection holding row locks until commit or rollback."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.locked = set()
+        self.pending_updates = set()
+
+    def execute(self, query, params=None):
+        sql = str(query)
+        self.engine.statements.append(sql)
+        if "FOR UPDATE SKIP LOCKED" in sql:
+            rows = [
+                row for row in self.engine.rows
+                if not row["embedded"] and row["id"] not in self.engine.locked
+            ][:params["limit"]]
+            for row in rows:
+                self.engine.locked.add(row["id"])
+                self.locked.add(row["id"])
+            return SimpleNamespace(fetchall=lambda: [
+                (r["id"], r["knowledge_type"], r["content"], r["metadata"]) for r in rows
+            ])
+        if "WHERE id = ANY(:ids)" in sql:
+            assert set(params["ids"]) <= self.locked
+            self.pending_updates.update(params["ids"])
+        return SimpleNamespace(fetchall=lambda: [], scalar=lambda: 0)
+
+    def commit(self):
+        for row in self.engine.rows:
+            if row["id"] in self.pending_updates:
+                row["embedded"] = True
+        self._unlock()
+
+    def rollback(self):
+        self._unlock()
+
+    def close(self):
+        self._unlock()
+
+    def _unlock(self):
+        self.engine.locked -= self.locked
+        self.locked = set()
+        self.pending_updates = set()
+
+
+class FakeEngine:
+    def __init__(self, count):
+        self.rows = [
+            {
+                "id": uuid.uuid4(),
+                "knowledge_type": "failure_solution",
+                "content": f"entry {i}",
+                "metadata": {"project_id": "proj-1"},
+                "embedded": False,
+            }
+            for i in range(count)
+        ]
+        self.locked = set()
+        self.statements = []
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeEmbeddings:
+    """Async embeddings API returning items out of order."""
+
+    def __init__(self, fail=False):
+        self.requests = []
+        self.fail = fail
+
+    async def create(self, model, input):
+        self.requests.append(list(input))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("rate limited")
+        data = [
+            SimpleNamespace(index=i, embedding=[1.0, float(i), 0.5])
+            for i in range(len(input))
+        ]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+def make_service(engine, embeddings):
+    qdrant = QdrantClient(":memory:")
+    qdrant.create_collection(
+        "helix_knowledge",
+        vectors_config=VectorParams(size=3, distance=Distance.COSINE),
+    )
+    service = CheckpointEmbeddingService(engine, qdrant, SimpleNamespace(embeddings=embeddings))
+    service.BATCH_SIZE = 4
+    return service, qdrant
+
+
+@pytest.mark.asyncio
+async def test_drains_backlog_in_batches():
+    engine = FakeEngine(10)
+    embeddings = FakeEmbeddings()
+    service, qdrant = make_service(engine, embeddings)
+
+    result = await service.process_checkpoint("phase_completion")
+
+    assert result["processed_count"] == 10
+    assert result["embedded_count"] == 10
+    assert result["failed_count"] == 0
+    assert [len(batch) for batch in embeddings.requests] == [4, 4, 2]
+    assert all(row["embedded"] for row in engine.rows)
+    assert qdrant.count("helix_knowledge").count == 10
+    assert sum("WHERE id = ANY(:ids)" in sql for sql in engine.statements) == 3
+
+    point = qdrant.retrieve("helix_knowledge", [str(engine.rows[5]["id"])], with_vectors=True)[0]
+    assert point.payload["content"] == "entry 5"
+    assert point.payload["project_id"] == "proj-1"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_claim_disjoint_batches():
+    engine = FakeEngine(23)
+    embeddings = FakeEmbeddings()
+    service, qdrant = make_service(engine, embeddings)
+
+    result = await service.process_checkpoint("project_completion", workers=3)
+
+    embedded_texts = [text for batch in embeddings.requests for text in batch]
+    assert sorted(embedded_texts) == sorted(row["content"] for row in engine.rows)
+    assert result["embedded_count"] == 23
+    assert qdrant.count("helix_knowledge").count == 23
+    assert not engine.locked
+
+
+@pytest.mark.asyncio
+async def test_batch_limit_and_failures_release_rows():
+    engine = FakeEngine(10)
+    service, _ = make_service(engine, FakeEmbeddings())
+
+    limited = await service.process_checkpoint("manual_trigger", batch_limit=1)
+    assert limited["embedded_count"] == 4
+
+    service.openai_client = SimpleNamespace(embeddings=FakeEmbeddings(fail=True))
+    failed = await service.process_checkpoint("manual_trigger")
+
+    assert failed["failed_count"] == 4
+    assert failed["embedded_count"] == 0
+    assert not engine.locked
+    assert sum(not row["embedded"] for row in engine.rows) == 6
+
+
+class RecordingScheduler(LLMRequestScheduler):
+    def __init__(self):
+        super().__init__(max_concurrency=4)
+        self.admitted = []
+
+    async def acquire(self, model, estimated_tokens, priority=RequestPriority.AGENT):
+        self.admitted.append((model, priority))
+        return await super().acquire(model, estimated_tokens, priority)
+
+
+@pytest.mark.asyncio
+async def test_embedding_requests_are_admitted_at_background_priority():
+    engine = FakeEngine(6)
+    service, _ = make_service(engine, FakeEmbeddings())
+    service.scheduler = RecordingScheduler()
+
+    await service.process_checkpoint("phase_completion")
+
+    assert service.scheduler.admitted == [("text-embedding-3-small", RequestPriority.BACKGROUND)] * 2
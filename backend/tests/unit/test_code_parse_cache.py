@@ -0,0 +1,115 @@
+"""
+Unit tests for the shared code parse cache.
+
+Tests content-keyed reuse, structural hashing and TestMaintainer change
+detection built on the symbol table.
+"""
+import ast
+
+import pytest
+
+from backend.services.code_parse_cache import CodeParseCache
+from backend.services.edge_case_finder import EdgeCaseFinder
+from backend.services.test_generator import TestGenerator as UnitTestGenerator
+from backend.services.test_maintainer import TestMaintainer as UnitTestMaintainer
+
+
+SOURCE = '''
+class Greeter:
+    def greet(self, name):
+        return f"hi {name}"
+
+def add(a, b):
+    return a + b
+
+async def fetch(url):
+    return url
+'''
+
+
+class TestCodeParseCache:
+    """Test CodeParseCache behaviour."""
+
+    def test_identical_source_is_parsed_once(self):
+        cache = CodeParseCache()
+
+        first = cache.parse(SOURCE)
+        second = cache.parse(str(SOURCE))
+
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_symbol_table_uses_qualified_names(self):
+        module = CodeParseCache().parse(SOURCE)
+
+        assert set(module.functions) == {"Greeter.greet", "add", "fetch"}
+        assert module.functions["fetch"].is_async is True
+        assert module.functions["add"].args == ["a", "b"]
+
+    def test_source_segment_matches_ast(self):
+        source = "def f(x):\n    return 'é' + x\r\n\ndef g(): pass\n"
+        module = CodeParseCache().parse(source)
+
+        for symbol in module.function_list:
+            assert module.source_segment(symbol) == ast.get_source_segment(source, symbol.node)
+
+    def test_structural_hash_ignores_formatting_and_comments(self):
+        cache = CodeParseCache()
+        plain = cache.parse("def add(a, b):\n    return a + b\n").functions["add"]
+        reformatted = cache.parse("def add(a,b):\n    # sum\n    return (a + b)\n").functions["add"]
+        changed = cache.parse("def add(a, b):\n    return a - b\n").functions["add"]
+
+        assert plain.structural_hash == reformatted.structural_hash
+        assert plain.structural_hash != changed.structural_hash
+
+    def test_syntax_errors_are_cached(self):
+        cache = CodeParseCache()
+
+        module = cache.parse("def broken(:\n")
+
+        assert module.tree is None
+        assert module.syntax_error
+        assert cache.parse("def broken(:\n") is module
+
+    def test_lru_eviction(self):
+        cache = CodeParseCache(max_entries=2)
+        cache.parse("a = 1")
+        cache.parse("b = 2")
+        cache.parse("a = 1")
+        cache.parse("c = 3")
+
+        cache.parse("a = 1")
+        cache.parse("b = 2")
+
+        assert cache.misses == 4
+
+
+class TestSharedParse:
+    """Test that test tooling services share one parse per version."""
+
+    @pytest.mark.asyncio
+    async def test_detect_changes_is_a_symbol_diff(self):
+        cache = CodeParseCache()
+        maintainer = UnitTestMaintainer(parse_cache=cache)
+        new_source = SOURCE.replace("a + b", "a - b").replace("async def fetch", "def fetch_all")
+        new_source = new_source.replace('f"hi {name}"', 'f"hi {name}"  # friendly')
+
+        changes = await maintainer.detect_changes(SOURCE, new_source, "backend/services/util.py")
+
+        summary = sorted((c.change_type, c.affected_functions[0]) for c in changes)
+        assert summary == [("added", "fetch_all"), ("deleted", "fetch"), ("modified", "add")]
+        modified = next(c for c in changes if c.change_type == "modified")
+        assert modified.new_code == "def add(a, b):\n    return a - b"
+
+    @pytest.mark.asyncio
+    async def test_services_reuse_cached_parse(self):
+        cache = CodeParseCache()
+        generator = UnitTestGenerator(parse_cache=cache)
+        finder = EdgeCaseFinder(parse_cache=cache)
+
+        functions = generator._extract_functions(SOURCE)
+        info = finder._parse_function(SOURCE)
+
+        assert [f["name"] for f in functions] == ["add", "greet"]
+        assert info["name"] == "add"
+        assert (cache.hits, cache.misses) == (1, 1)
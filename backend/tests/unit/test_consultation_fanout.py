@@ -0,0 +1,135 @@
+"""
+Unit tests for concurrent specialist consultation.
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.services.consultation_fanout import fan_out
+from backend.services.orchestrator import AgentType, Orchestrator
+
+
+def answer_after(delay, response, cancelled=None):
+    async def consult():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(response)
+            raise
+        return response
+    return consult
+
+
+@pytest.mark.asyncio
+async def test_consults_run_concurrently_and_keep_input_order():
+    started = time.monotonic()
+
+    outcomes = await fan_out([
+        ("slow", answer_after(0.2, "a")),
+        ("fast", answer_after(0.05, "b")),
+        ("sync", lambda: "c"),
+        ("none", lambda: None),
+    ])
+
+    assert time.monotonic() - started < 0.35  # Sequential would take 0.25s+ per round
+    assert [(o.key, o.status, o.response) for o in outcomes] == [
+        ("slow", "answered", "a"),
+        ("fast", "answered", "b"),
+        ("sync", "answered", "c"),
+        ("none", "empty", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_quorum_and_sufficient_answer_cancel_stragglers():
+    cancelled = []
+
+    by_quorum = await fan_out(
+        [(str(i), answer_after(delay, f"r{i}", cancelled)) for i, delay in enumerate((0.01, 0.02, 5.0))],
+        quorum=2,
+    )
+    by_answer = await fan_out(
+        [("weak", answer_after(0.01, {"ok": False})), ("strong", answer_after(0.02, {"ok": True})),
+         ("late", answer_after(5.0, "late", cancelled))],
+        sufficient=lambda response: response["ok"],
+    )
+
+    assert [o.status for o in by_quorum] == ["answered", "answered", "cancelled"]
+    assert [o.status for o in by_answer] == ["answered", "answered", "cancelled"]
+    assert cancelled == ["r2", "late"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_slow_consults_and_errors_are_isolated():
+    def broken():
+        raise RuntimeError("specialist offline")
+
+    started = time.monotonic()
+    outcomes = await fan_out(
+        [("slow", answer_after(5.0, "x")), ("broken", broken), ("ok", answer_after(0.01, "y"))],
+        timeout=0.1,
+    )
+
+    assert time.monotonic() - started < 0.5
+    assert [(o.status, o.error) for o in outcomes] == [
+        ("timed_out", None), ("error", "specialist offline"), ("answered", None)
+    ]
+
+
+class SlowConsultOrchestrator(Orchestrator):
+    """Orchestrator whose specialists take time to answer."""
+
+    DELAYS = {AgentType.SECURITY_EXPERT: 0.15, AgentType.DEVOPS_ENGINEER: 0.05, AgentType.BACKEND_DEVELOPER: 5.0}
+
+    async def consult_specialist(self, requesting_agent_id, specialist_type, question, context):
+        await asyncio.sleep(self.DELAYS[specialist_type])
+        return {"specialist_type": specialist_type.value, "concern": question}
+
+
+@pytest.mark.asyncio
+async def test_vet_pm_decision_consults_in_parallel_with_deadline():
+    decisions = []
+    orchestrator = SlowConsultOrchestrator("project-1", decision_logger=decisions.append)
+
+    started = time.monotonic()
+    summary = await orchestrator.vet_pm_decision(
+        {"has_security_implications": True, "has_performance_requirements": True, "requires_backend_changes": True},
+        consult_timeout=0.3,
+    )
+
+    assert time.monotonic() - started < 0.5
+    assert [f["specialist_type"] for f in summary["feedback"]] == ["security_expert", "devops_engineer"]
+    assert summary["timed_out"] == ["backend_developer"]
+    assert summary["approved"] is False
+    assert decisions[0]["decision_type"] == "pm_vetting"
+
+
+@pytest.mark.asyncio
+async def test_vet_pm_decision_without_concerns_is_approved():
+    summary = await Orchestrator("project-1").vet_pm_decision({"has_security_implications": True})
+
+    assert summary == {"approved": True, "feedback": []}
+
+
+class CrashingConsultOrchestrator(Orchestrator):
+    """Orchestrator whose security review raises."""
+
+    async def consult_specialist(self, requesting_agent_id, specialist_type, question, context):
+        if specialist_type == AgentType.SECURITY_EXPERT:
+            raise RuntimeError("specialist offline")
+        return None
+
+
+@pytest.mark.asyncio
+async def test_vet_pm_decision_with_failed_consultation_is_not_approved():
+    decisions = []
+    orchestrator = CrashingConsultOrchestrator("project-1", decision_logger=decisions.append)
+
+    summary = await orchestrator.vet_pm_decision(
+        {"has_security_implications": True, "requires_backend_changes": True}
+    )
+
+    assert summary == {"approved": False, "feedback": [], "failed": {"security_expert": "specialist offline"}}
+    assert decisions[0]["confidence"] == 0.6
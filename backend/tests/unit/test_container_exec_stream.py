@@ -0,0 +1,167 @@
+"""
+Unit tests for streaming ContainerManager.exec_command on a fake Docker client.
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import container_manager as container_manager_module
+from backend.services.container_manager import BoundedOutput, ContainerManager
+from backend.services.event_bus import EventBus, EventType
+
+
+class FakeOutputStream:
+    """Exec output stream that ends when the command is killed or the stream is closed."""
+
+    def __init__(self, api):
+        self.api = api
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        api = self.api
+        for chunk in api.chunks:
+            if self.closed.wait(api.delay):
+                return
+            if api.killed.is_set():
+                if api.survives_kill:
+                    self.closed.wait()  # Silent child keeps the stream open
+                return
+            yield chunk
+        api.finished = True
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeDockerAPI:
+    """Low-level exec API that emits scripted (stdout, stderr) chunks with delays."""
+
+    def __init__(self, chunks, delay=0.01, exit_code=0, survives_kill=False):
+        self.chunks = chunks
+        self.delay = delay
+        self.exit_code = exit_code
+        self.survives_kill = survives_kill  # Children outlive the kill and hold the stream open
+        self.commands = []
+        self.killed = threading.Event()
+        self.finished = False
+        self.stream = None
+
+    def exec_create(self, container_id, cmd, **kwargs):
+        self.commands.append(cmd)
+        return "exec-1"
+
+    def exec_start(self, exec_id, stream, demux):
+        self.stream = FakeOutputStream(self)
+        return self.stream
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": 143 if self.killed.is_set() else self.exit_code}
+
+
+def make_manager(api):
+    manager = ContainerManager.__new__(ContainerManager)
+    manager.client = SimpleNamespace(api=api)
+    manager.active_containers = {
+        "task-1": SimpleNamespace(
+            id="c1",
+            labels={"project_id": "proj"},
+            exec_run=lambda cmd, **kwargs: api.killed.set()
+        )
+    }
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_chunks_reach_caller_before_command_finishes():
+    api = FakeDockerAPI([(b"line 1\n", None), (None, b"warn\n"), (b"line 2\n", None)], delay=0.05)
+    manager = make_manager(api)
+    seen = []
+
+    def on_output(stream, text):
+        seen.append((stream, text, api.finished))
+
+    result = await manager.exec_command("task-1", "pytest -q", on_output=on_output)
+
+    assert seen == [("stdout", "line 1\n", False), ("stderr", "warn\n", False), ("stdout", "line 2\n", False)]
+    assert (result.exit_code, result.stdout, result.stderr, result.cancelled) == (0, "line 1\nline 2\n", "warn\n", None)
+    assert api.commands[0][:2] == ["sh", "-c"] and api.commands[0][-2:] == ["pytest", "-q"]
+
+
+@pytest.mark.asyncio
+async def test_plain_exec_is_not_wrapped_and_retains_head_and_tail():
+    api = FakeDockerAPI([(b"H" * 600, None)] + [(b"x" * 100, None)] * 50 + [(b"TAIL", None)], delay=0)
+    manager = make_manager(api)
+
+    result = await manager.exec_command("task-1", "make build", max_output_bytes=1000)
+
+    assert api.commands == ["make build"]
+    assert result.truncated is True
+    assert result.stdout.startswith("H" * 500) and result.stdout.endswith("TAIL")
+    assert "[4604 bytes omitted]" in result.stdout
+
+
+@pytest.mark.asyncio
+async def test_stop_pattern_and_size_limit_cancel_early():
+    endless = [(b"ok\n", None), (b"FAIL", None), (b"ED: test_login\n", None)] + [(b"." * 100, None)] * 1000
+
+    by_pattern = await make_manager(api := FakeDockerAPI(endless)).exec_command(
+        "task-1", "pytest", stop_pattern=r"FAILED: \w+"
+    )
+    by_size = await make_manager(FakeDockerAPI(endless, delay=0.001)).exec_command(
+        "task-1", "pytest", max_stream_bytes=1000
+    )
+    started = time.monotonic()
+    by_timeout = await make_manager(FakeDockerAPI(endless, delay=0.05)).exec_command(
+        "task-1", "pytest", timeout=0.2
+    )
+
+    assert by_pattern.cancelled == "pattern" and by_pattern.success is False
+    assert by_pattern.stdout == "ok\nFAILED: test_login\n"  # Matched across a chunk boundary
+    assert api.killed.is_set()
+    assert by_size.cancelled == "output_limit" and len(by_size.stdout) < 1200
+    assert by_timeout.cancelled == "timeout" and time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_stream_held_open_after_kill_is_closed(monkeypatch):
+    monkeypatch.setattr(container_manager_module, "EXEC_STOP_GRACE", 0.2)
+    endless = [(b"." * 10, None)] * 10_000
+    api = FakeDockerAPI(endless, delay=0.01, survives_kill=True)
+
+    started = time.monotonic()
+    result = await make_manager(api).exec_command("task-1", "sh -c 'tail -f log | grep x'", timeout=0.2)
+
+    assert result.cancelled == "timeout"
+    assert time.monotonic() - started < 1.0
+    assert api.killed.is_set() and api.stream.closed.is_set()
+    assert api.finished is False
+
+
+@pytest.mark.asyncio
+async def test_output_is_published_to_event_bus(monkeypatch):
+    bus = EventBus()
+    events = []
+    bus.subscribe(EventType.COMMAND_OUTPUT, events.append)
+    monkeypatch.setattr(container_manager_module, "get_event_bus", lambda: bus)
+    manager = make_manager(FakeDockerAPI([(b"building\n", None), (None, "é".encode("utf-8"))]))
+
+    await manager.exec_command("task-1", "npm run build", stream_events=True)
+    await asyncio.sleep(0)
+
+    assert [(e.project_id, e.task_id, e.data) for e in events] == [
+        ("proj", "task-1", {"stream": "stdout", "text": "building\n"}),
+        ("proj", "task-1", {"stream": "stderr", "text": "é"}),
+    ]
+
+
+def test_bounded_output_keeps_multibyte_text_intact_when_not_truncated():
+    output = BoundedOutput(max_bytes=64)
+    data = "héllo wörld ".encode("utf-8") * 2
+    for i in range(0, len(data), 5):
+        output.append(data[i:i + 5])
+
+    assert output.truncated is False
+    assert output.text() == "héllo wörld " * 2
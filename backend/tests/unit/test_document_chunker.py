@@ -0,0 +1,122 @@
+"""
+Unit tests for the structure-aware document chunker.
+
+Token counts use whitespace-separated words so budgets are exact.
+"""
+from itertools import islice
+
+from backend.services.document_chunker import DocumentChunker, MinHashDeduplicator
+
+
+def words(text):
+    return len(text.split())
+
+
+def make_chunker(max_tokens=40, **kwargs):
+    return DocumentChunker(max_tokens=max_tokens, count_tokens=words, **kwargs)
+
+
+DOC = """# Guide
+
+Short intro.
+
+## Install
+
+Run the installer. Then restart.
+
+```python
+def main():
+    return 1
+```
+
+## Usage
+
+Call main.
+"""
+
+
+def test_headings_start_chunks_and_code_stays_whole():
+    chunks = list(make_chunker().iter_chunks(DOC))
+
+    assert [c.section for c in chunks] == ["Guide", "Guide > Install", "Guide > Usage"]
+    install = chunks[1]
+    assert install.kind == "code"
+    assert "```python\ndef main():\n    return 1\n```" in install.text
+    assert install.text.startswith("## Install")
+
+
+def test_oversized_paragraph_splits_at_sentences():
+    sentences = [f"Sentence {i} has exactly six words." for i in range(12)]
+    chunks = list(make_chunker(max_tokens=20).iter_chunks(" ".join(sentences)))
+
+    assert all(c.token_count <= 20 for c in chunks)
+    assert all(c.text.endswith(".") for c in chunks)
+    assert " ".join(c.text for c in chunks) == " ".join(sentences)
+
+
+def test_oversized_code_block_is_refenced():
+    body = "\n".join(f"x{i} = {i}  # line" for i in range(30))
+    chunks = list(make_chunker(max_tokens=25).iter_chunks(f"```python\n{body}\n```\n"))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.text.startswith("```python\n") and chunk.text.endswith("\n```")
+        assert chunk.kind == "code"
+    rejoined = "\n".join(line for c in chunks for line in c.text.split("\n")[1:-1])
+    assert rejoined == body
+
+
+def test_unbroken_text_is_cut_at_token_boundaries():
+    chunker = DocumentChunker(max_tokens=400)
+    blob = "QUJD" * 50_000
+    line = "var a=" + "x" * 100_000 + ";"
+
+    for source in (blob, f"```js\n{line}\n```\n"):
+        chunks = list(chunker.iter_chunks(source))
+        assert len(chunks) > 1
+        assert all(chunker.count_tokens(c.text) <= 400 for c in chunks)
+
+    by_chars = DocumentChunker(max_tokens=50, dedup_threshold=None, count_tokens=len)
+    pieces = [c.text for c in by_chars.iter_chunks(blob[:1000])]
+    assert max(map(len, pieces)) == 50 and "".join(pieces) == blob[:1000]
+
+
+def test_streamed_pieces_match_whole_text_and_stay_lazy():
+    chunker = make_chunker()
+    pieces = [DOC[i:i + 7] for i in range(0, len(DOC), 7)]
+
+    assert [c.text for c in chunker.iter_chunks(pieces)] == [c.text for c in chunker.iter_chunks(DOC)]
+
+    def endless():
+        n = 0
+        while True:
+            n += 1
+            yield f"## Section {n}\n\nParagraph number {n} with some text.\n\n"
+
+    first = list(islice(chunker.iter_chunks(endless()), 3))
+    assert [c.section for c in first] == ["Section 1", "Section 2", "Section 3"]
+
+
+def test_near_duplicate_chunks_are_dropped():
+    notice = "This file is distributed under the project license. Redistribution requires attribution and this notice."
+    doc = "\n\n".join([
+        f"# A\n\n{notice}",
+        "# B\n\nUnique content about databases and indexes.",
+        f"# A\n\n{notice}",
+    ])
+
+    deduped = [c.text for c in make_chunker().iter_chunks(doc)]
+    kept = [c.text for c in make_chunker(dedup_threshold=None).iter_chunks(doc)]
+
+    assert len(kept) == 3
+    assert len(deduped) == 2
+    assert [c.index for c in make_chunker().iter_chunks(doc)] == [0, 1]
+
+
+def test_minhash_similarity():
+    dedup = MinHashDeduplicator(threshold=0.8)
+    base = " ".join(f"word{i}" for i in range(200))
+
+    assert dedup.is_duplicate(base) is False
+    assert dedup.is_duplicate(base.replace("word100", "changed")) is True
+    assert dedup.is_duplicate(" ".join(f"other{i}" for i in range(200))) is False
@@ -0,0 +1,91 @@
+"""
+Unit tests for FeedbackCollector rollup-based analysis.
+
+The database is replaced by a fake engine that answers the rollup queries,
+so these tests cover how analyze_patterns and collect_feedback use SQL.
+"""
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services.feedback_collector import FeedbackCollector
+
+
+class FakeEngine:
+    """Engine stub returning canned rows per rollup table."""
+
+    def __init__(self, rows_by_table):
+        self.rows_by_table = rows_by_table
+        self.statements = []
+
+    @contextmanager
+    def connect(self):
+        conn = MagicMock()
+
+        def execute(query, params=None):
+            sql = str(query)
+            self.statements.append((sql, params))
+            for table, rows in self.rows_by_table.items():
+                if f"FROM {table}" in sql:
+                    return rows
+            result = MagicMock()
+            result.scalar.return_value = 7
+            return result
+
+        conn.execute.side_effect = execute
+        yield conn
+
+
+@pytest.mark.asyncio
+async def test_analyze_patterns_reads_only_rollups():
+    engine = FakeEngine({
+        "feedback_daily_type_rollup": [("approval", 6), ("rejection", 4)],
+        "feedback_daily_tag_rollup": [("error_handling", 5), ("security", 1)],
+        "feedback_daily_reason_rollup": [("Missing error handling", 3)],
+    })
+    collector = FeedbackCollector(engine)
+
+    analysis = await collector.analyze_patterns(agent_type="backend_dev", days=30)
+
+    assert analysis["total_feedback"] == 10
+    assert analysis["approval_rate"] == 60.0
+    assert analysis["rejection_rate"] == 40.0
+    assert analysis["most_common_tags"] == [("error_handling", 5), ("security", 1)]
+    assert analysis["common_rejection_reasons"] == [("Missing error handling", 3)]
+    assert any("error_handling" in insight for insight in analysis["actionable_insights"])
+
+    assert len(engine.statements) == 3
+    assert all("feedback_logs" not in sql for sql, _ in engine.statements)
+    assert all(params["agent_type"] == "backend_dev" for _, params in engine.statements)
+
+
+@pytest.mark.asyncio
+async def test_analyze_patterns_without_feedback():
+    engine = FakeEngine({"feedback_daily_type_rollup": []})
+    collector = FeedbackCollector(engine)
+
+    analysis = await collector.analyze_patterns(days=90)
+
+    assert analysis["total_feedback"] == 0
+    assert len(engine.statements) == 1
+    assert "agent_type" not in engine.statements[0][1]
+
+
+@pytest.mark.asyncio
+async def test_collect_feedback_updates_rollups_in_same_statement():
+    engine = FakeEngine({})
+    collector = FeedbackCollector(engine)
+
+    feedback_id = await collector.collect_feedback(
+        gate_id="gate-1",
+        feedback_type="rejection",
+        feedback_text="Missing error handling. Add retries.",
+        tags=["error_handling"],
+    )
+
+    assert feedback_id == "7"
+    [(sql, params)] = engine.statements
+    for table in ("feedback_logs", "feedback_daily_type_rollup", "feedback_daily_tag_rollup", "feedback_daily_reason_rollup"):
+        assert f"INSERT INTO {table}" in sql
+    assert params["tags"] == '["error_handling"]'
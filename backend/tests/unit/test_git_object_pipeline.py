@@ -0,0 +1,147 @@
+"""
+Unit tests for the git object pipeline and GitHubSpecialistAgent pushes.
+"""
+import os
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from backend.agents.github_specialist_agent import GitHubSpecialistAgent
+from backend.services.git_object_pipeline import GitObjectPipeline
+
+
+def write(root, rel_path, content):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "--git-dir", repo, *args], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def age(root, seconds=10):
+    """Push file mtimes out of the racy window, as if edits happened earlier."""
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return GitObjectPipeline(repos_dir=str(tmp_path / "repos"))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "workspace"
+    write(root, "README.md", "# App\n")
+    write(root, "backend/app.py", "print('hi')\n")
+    write(root, "backend/tests/test_app.py", "def test(): pass\n")
+    write(root, ".github/workflows/ci.yml", "on: push\n")
+    write(root, "node_modules/lib/index.js", "ignored\n")
+    write(root, ".git/HEAD", "ignored\n")
+    age(root)
+    return str(root)
+
+
+def test_first_commit_builds_tree_from_workspace(pipeline, workspace):
+    result = pipeline.commit("proj", workspace, "Initial commit")
+    repo = pipeline.repo_path("proj")
+
+    assert result.created and result.parent is None
+    assert result.added == [".github/workflows/ci.yml", "README.md", "backend/app.py", "backend/tests/test_app.py"]
+    assert git(repo, "rev-parse", "refs/heads/main") == result.commit
+    assert git(repo, "show", "main:backend/app.py") == "print('hi')"
+    assert git(repo, "log", "--format=%s", "main") == "Initial commit"
+
+
+def test_later_commits_hash_only_changed_files(pipeline, workspace):
+    first = pipeline.commit("proj", workspace, "Initial commit")
+    write(workspace, "backend/app.py", "print('hello')\n")
+    os.remove(os.path.join(workspace, "README.md"))
+    write(workspace, "docs/guide.md", "guide\n")
+
+    second = pipeline.commit("proj", workspace, "Update")
+    unchanged = pipeline.commit("proj", workspace, "Nothing")
+
+    assert (second.added, second.modified, second.deleted) == (["docs/guide.md"], ["backend/app.py"], ["README.md"])
+    assert second.blobs_written == 2
+    assert second.parent == first.commit
+    assert unchanged.created is False and unchanged.commit == second.commit
+    assert git(pipeline.repo_path("proj"), "ls-tree", "-r", "--name-only", "main").split() == [
+        ".github/workflows/ci.yml", "backend/app.py", "backend/tests/test_app.py", "docs/guide.md"
+    ]
+
+
+def test_branch_from_base_and_pack_push(pipeline, workspace, tmp_path):
+    base = pipeline.commit("proj", workspace, "Initial commit")
+    write(workspace, "backend/api.py", "routes = []\n")
+
+    feature = pipeline.commit("proj", workspace, "Add API", branch="agent/task-1", base="main")
+    files = pipeline.changed_files("proj", "main", "agent/task-1")
+
+    remote = str(tmp_path / "remote.git")
+    subprocess.run(["git", "init", "--bare", "--quiet", remote], check=True)
+    pushed = pipeline.push("proj", remote, branch="agent/task-1")
+
+    assert feature.parent == base.commit and feature.added == ["backend/api.py"]
+    assert files == [{"filename": "backend/api.py", "additions": 1, "deletions": 0}]
+    assert pushed["commit"] == feature.commit
+    assert git(remote, "rev-parse", "refs/heads/agent/task-1") == feature.commit
+    assert git(remote, "show", "agent/task-1:backend/api.py") == "routes = []"
+
+
+class StubOrchestrator:
+    def __init__(self):
+        self.tool_requests = []
+
+    async def execute_tool(self, request):
+        self.tool_requests.append(request)
+        return {"status": "success"}
+
+
+@pytest.mark.asyncio
+async def test_agent_push_commits_workspace_without_tool_calls(pipeline, workspace, tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJECT_WORKSPACES_DIR", str(tmp_path))
+    os.rename(workspace, str(tmp_path / "proj"))
+    orchestrator = StubOrchestrator()
+    agent = GitHubSpecialistAgent("github-1", orchestrator, llm_client=None, git_pipeline=pipeline)
+    state = SimpleNamespace(project_id="proj", task_id="task-1")
+
+    pushed = await agent._push_code_action(
+        SimpleNamespace(parameters={"message": "Ship it"}, description=None), state
+    )
+    pr = await agent._create_pr_action(
+        SimpleNamespace(parameters={"title": "Feature"}, description=None), state
+    )
+    missing = await agent._push_code_action(
+        SimpleNamespace(parameters={}, description="Push"), SimpleNamespace(project_id="nope", task_id="t")
+    )
+
+    assert pushed.success and len(pushed.output["added"]) == 4
+    assert pr.success and pr.output["head"] == "agent/task-1" and pr.output["files"] == []
+    assert missing.success is False
+    assert orchestrator.tool_requests == []
+
+
+@pytest.mark.asyncio
+async def test_agent_push_to_https_remote_without_credentials_fails_fast(pipeline, workspace, tmp_path, monkeypatch):
+    monkeypatch.setenv("PROJECT_WORKSPACES_DIR", str(tmp_path))
+    os.rename(workspace, str(tmp_path / "proj"))
+    agent = GitHubSpecialistAgent("github-1", StubOrchestrator(), llm_client=None, git_pipeline=pipeline)
+
+    result = await agent._push_code_action(
+        SimpleNamespace(parameters={"remote_url": "https://github.com/o/r.git"}, description="Push"),
+        SimpleNamespace(project_id="proj", task_id="task-1"),
+    )
+
+    assert result.success is False
+    assert "no GitHub credentials" in result.error and "db_session" in result.error
+    assert not os.path.exists(pipeline.repo_path("proj"))
@@ -0,0 +1,140 @@
+"""
+Unit tests for GitHubPRIntegration against a local fake GitHub server.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from backend.services.github_api_client import GitHubAPIClient
+from backend.services.github_pr_integration import GitHubPRIntegration
+
+LATENCY = 0.1
+FILES = [{"filename": f"src/module_{i}.py", "patch": "+x\n" * 50} for i in range(250)]
+COMMITS = [{"commit": {"message": f"Commit {i}"}} for i in range(3)]
+DIFF = "diff --git a/src/module_0.py b/src/module_0.py\n+x\n"
+
+
+def fake_github():
+    """Minimal GitHub API: ETags, 304s, Link pagination and request counting."""
+    app = FastAPI()
+    app.state.requests = []
+
+    def conditional(request: Request, body: str, media_type: str, headers=None) -> Response:
+        etag = '"' + hashlib.sha1(body.encode()).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type=media_type, headers={"ETag": etag, **(headers or {})})
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}")
+    async def pull(request: Request, number: int):
+        app.state.requests.append(("pull", request.headers.get("accept")))
+        await asyncio.sleep(LATENCY)
+        if "diff" in request.headers.get("accept", ""):
+            return conditional(request, DIFF, "text/plain")
+        return conditional(request, json.dumps({"number": number, "head": {"ref": "feature/x"}}), "application/json")
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}/{kind}")
+    async def pull_list(request: Request, kind: str, page: int = 1, per_page: int = 30):
+        app.state.requests.append((kind, page))
+        await asyncio.sleep(LATENCY)
+        items = FILES if kind == "files" else COMMITS
+        chunk = items[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(items):
+            headers["Link"] = f'<{request.url.include_query_params(page=page + 1)}>; rel="next"'
+        return conditional(request, json.dumps(chunk), "application/json", headers)
+
+    return app
+
+
+@pytest.fixture
+def server():
+    return fake_github()
+
+
+@pytest.fixture
+def client(server):
+    return GitHubAPIClient(token="t", base_url="http://github.test", transport=httpx.ASGITransport(app=server))
+
+
+def make_integration(client):
+    review = SimpleNamespace(issues=["issue"], overall_quality=0.8)
+    reviewer = SimpleNamespace(
+        review_code=lambda diff: asyncio.sleep(0, review),
+        generate_pr_comment=lambda result: asyncio.sleep(0, "comment")
+    )
+    generator = SimpleNamespace(
+        generate=lambda **kwargs: asyncio.sleep(0, SimpleNamespace(full_description=kwargs))
+    )
+    return GitHubPRIntegration(reviewer, generator, SimpleNamespace(), client)
+
+
+@pytest.mark.asyncio
+async def test_description_fetches_run_concurrently_and_stream_pages(server, client):
+    integration = make_integration(client)
+
+    started = time.monotonic()
+    description = await integration.generate_pr_description("o", "r", 7)
+    elapsed = time.monotonic() - started
+
+    # details | diff | commits | files page 1 -> 2 -> 3: the longest chain is three pages
+    assert elapsed < 6 * LATENCY
+    assert description["files_changed"] == [f["filename"] for f in FILES]
+    assert description["commit_messages"] == ["Commit 0", "Commit 1", "Commit 2"]
+    assert description["diff"] == DIFF
+    assert description["branch_name"] == "feature/x"
+    assert [r for r in server.state.requests if r[0] == "files"] == [("files", 1), ("files", 2), ("files", 3)]
+
+
+@pytest.mark.asyncio
+async def test_repeat_fetches_are_revalidated_with_etags(server, client):
+    integration = make_integration(client)
+
+    first = await integration.generate_pr_description("o", "r", 7)
+    received = client.stats["bytes_received"]
+    second = await integration.generate_pr_description("o", "r", 7)
+
+    assert second == first
+    assert client.stats["not_modified"] == 6  # details, diff, commits, 3 file pages
+    assert client.stats["bytes_received"] - received < received / 20
+
+
+@pytest.mark.asyncio
+async def test_review_pr_fetches_details_and_diff_together(server, client):
+    posted = []
+
+    async def post(url, json):
+        posted.append((url, json))
+        return httpx.Response(201, json={"html_url": "https://github.test/c/1"})
+
+    client.post = post
+    integration = make_integration(client)
+
+    started = time.monotonic()
+    result = await integration.review_pr("o", "r", 7)
+
+    assert time.monotonic() - started < 2 * LATENCY
+    assert result.review_posted is True
+    assert result.comment_url == "https://github.test/c/1"
+    assert posted == [("/repos/o/r/issues/7/comments", {"body": "comment"})]
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_bodies(server):
+    client = GitHubAPIClient(
+        base_url="http://github.test", transport=httpx.ASGITransport(app=server), cache_bytes=len(DIFF) + 10
+    )
+    diff_headers = {"Accept": "application/vnd.github.v3.diff"}
+
+    await client.get("/repos/o/r/pulls/1", headers=diff_headers)
+    await client.get("/repos/o/r/pulls/2", headers=diff_headers)
+    await client.get("/repos/o/r/pulls/2", headers=diff_headers)
+    await client.get("/repos/o/r/pulls/1", headers=diff_headers)
+
+    assert client.stats["not_modified"] == 1
@@ -0,0 +1,163 @@
+"""
+Unit tests for the BM25 lexical index and hybrid retrieval.
+"""
+import asyncio
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from backend.services.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+from backend.services.rag_service import RAGService, SearchMode
+
+pytestmark = pytest.mark.filterwarnings("ignore:.*(local Qdrant|Local mode).*:UserWarning")
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    terms = list(tokenize("ConnectionResetError in get_user_by_id (E1102)"))
+
+    assert "connectionreseterror" in terms
+    assert {"connection", "reset", "error"} <= set(terms)
+    assert "get_user_by_id" in terms and "user" in terms
+    assert "e1102" in terms
+    assert "in" not in terms
+
+
+def test_exact_identifier_ranks_first():
+    index = BM25Index()
+    index.add(1, "Timeout while connecting to the database pool")
+    index.add(2, "psycopg2.OperationalError: could not connect to server")
+    index.add(3, "Database connection settings and pool sizing")
+
+    hits = index.search("OperationalError connecting", limit=3)
+
+    assert hits[0].doc_id == "2"
+    assert {hit.doc_id for hit in hits} == {"1", "2"}
+
+
+def test_filters_readd_and_remove_where():
+    index = BM25Index()
+    index.add("a", "docker compose volumes", {"specialist_id": "ops"})
+    index.add("b", "docker build cache", {"specialist_id": "dev"})
+
+    assert [h.doc_id for h in index.search("docker", filters={"specialist_id": "dev"})] == ["b"]
+
+    index.add("b", "react hooks", {"specialist_id": "dev"})
+    assert [h.doc_id for h in index.search("docker")] == ["a"]
+
+    assert index.remove_where(specialist_id="ops") == 1
+    assert index.search("docker") == [] and len(index) == 1
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]])
+
+    assert [doc_id for doc_id, _ in fused] == ["y", "x", "w", "z"]
+
+
+class KeywordAdapter:
+    """Embeds everything onto one axis; optionally slow or failing."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def embed_text(self, text):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        await asyncio.sleep(self.delay)
+        return [1.0] + [0.0] * (RAGService.EMBEDDING_DIM - 1)
+
+    async def embed_texts(self, texts):
+        return [[1.0] + [0.0] * (RAGService.EMBEDDING_DIM - 1) for _ in texts]
+
+
+async def make_service(adapter, **kwargs):
+    service = RAGService(
+        adapter,
+        qdrant_client=AsyncQdrantClient(":memory:"),
+        lexical_index=BM25Index(),
+        **kwargs
+    )
+    await service.index_document("Generic advice about retries", specialist_id="s")
+    await service.index_document("Fix for ERR_SSL_PROTOCOL_ERROR behind proxies", specialist_id="s")
+    return service
+
+
+@pytest.mark.asyncio
+async def test_default_search_is_dense_with_cosine_scores():
+    service = await make_service(KeywordAdapter())
+
+    results = await service.search("ERR_SSL_PROTOCOL_ERROR", specialist_id="s")
+
+    assert [r.score for r in results] == [pytest.approx(1.0)] * 2
+    assert all(r.lexical_score is None for r in results)
+    assert service._lexical_load is None
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_promotes_lexical_match():
+    service = await make_service(KeywordAdapter())
+    await service._ensure_lexical_index()
+
+    results = await service.search("ERR_SSL_PROTOCOL_ERROR", specialist_id="s", mode=SearchMode.HYBRID)
+
+    assert results[0].text.startswith("Fix for ERR_SSL_PROTOCOL_ERROR")
+    assert results[0].score == pytest.approx(1.0) and results[0].lexical_score is not None
+    assert results[0].fused_score == pytest.approx(1.0)
+    assert results[1].lexical_score is None
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_does_not_wait_for_lexical_warm_up():
+    service = await make_service(KeywordAdapter())
+    release = asyncio.Event()
+    scroll = service.qdrant.scroll
+
+    async def slow_scroll(**kwargs):
+        await release.wait()
+        return await scroll(**kwargs)
+
+    service.qdrant.scroll = slow_scroll
+
+    results = await service.search("ERR_SSL_PROTOCOL_ERROR", specialist_id="s", mode=SearchMode.HYBRID)
+
+    assert len(results) == 2 and all(r.lexical_score is None for r in results)
+    assert not service.lexical_index.loaded
+
+    release.set()
+    await service._ensure_lexical_index()
+    results = await service.search("ERR_SSL_PROTOCOL_ERROR", specialist_id="s", mode=SearchMode.HYBRID)
+    assert results[0].lexical_score is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("adapter", [KeywordAdapter(delay=1.0), KeywordAdapter(error=RuntimeError("down"))])
+async def test_hybrid_search_falls_back_to_lexical(adapter):
+    service = await make_service(adapter, embedding_timeout=0.05)
+
+    results = await service.search("ERR_SSL_PROTOCOL_ERROR", mode=SearchMode.HYBRID)
+
+    assert [r.score for r in results] == [None]
+    assert results[0].fused_score == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_lexical_mode_skips_embedding_and_dense_mode_raises():
+    adapter = KeywordAdapter(error=RuntimeError("down"))
+    service = await make_service(adapter)
+
+    results = await service.search("retries", mode=SearchMode.LEXICAL)
+    assert [r.text for r in results] == ["Generic advice about retries"]
+    assert adapter.calls == 0
+
+    with pytest.raises(RuntimeError):
+        await service.search("retries", mode=SearchMode.DENSE)
+
+
+@pytest.mark.asyncio
+async def test_lexical_hits_below_floor_are_dropped():
+    service = await make_service(KeywordAdapter(), min_lexical_score=5.0)
+
+    assert await service.search("retries", mode=SearchMode.LEXICAL) == []
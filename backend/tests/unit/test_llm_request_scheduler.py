@@ -0,0 +1,153 @@
+"""
+Unit tests for LLMRequestScheduler.
+
+Covers token bucket admission, priority ordering, concurrency caps,
+Retry-After handling and metrics.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.llm_request_scheduler import (
+    LLMRequestScheduler,
+    ModelRateLimit,
+    RequestPriority,
+    TokenBucket,
+    estimate_tokens,
+    parse_retry_after,
+)
+
+
+class TestTokenBucket:
+    """Test token bucket refill and clamping."""
+
+    def test_full_bucket_admits_immediately(self):
+        bucket = TokenBucket(capacity=60, period=60.0)
+        assert bucket.delay(10) == 0.0
+
+    def test_empty_bucket_reports_refill_delay(self):
+        bucket = TokenBucket(capacity=60, period=60.0)
+        bucket.consume(60)
+        # 1 unit per second refill rate
+        assert bucket.delay(5) == pytest.approx(5.0, abs=0.1)
+
+    def test_oversized_request_is_clamped_to_capacity(self):
+        bucket = TokenBucket(capacity=100, period=60.0)
+        assert bucket.delay(1_000) == 0.0
+
+    def test_adjust_returns_unused_tokens(self):
+        bucket = TokenBucket(capacity=100, period=60.0)
+        bucket.consume(80)
+        bucket.adjust(50)
+        assert bucket.level == pytest.approx(70, abs=1)
+
+
+class TestEstimateTokens:
+    """Test request token estimation."""
+
+    def test_includes_completion_budget(self):
+        messages = [{"role": "user", "content": "x" * 400}]
+        assert estimate_tokens(messages, max_tokens=100) == 100 + 4 + 100
+
+    def test_default_completion_budget(self):
+        assert estimate_tokens([], None) == 512
+
+
+class TestAdmission:
+    """Test scheduler admission control."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_enforced(self):
+        scheduler = LLMRequestScheduler(max_concurrency=2)
+        peak = 0
+        running = 0
+
+        async def call():
+            nonlocal peak, running
+            async with scheduler.slot("gpt-4o-mini", 10):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.get_metrics()["requests_total"] == 6
+        assert scheduler.get_metrics()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_priority_admitted_first(self):
+        scheduler = LLMRequestScheduler(max_concurrency=1)
+        order = []
+
+        blocker = await scheduler.acquire("gpt-4o-mini", 10)
+
+        async def call(name, priority):
+            async with scheduler.slot("gpt-4o-mini", 10, priority):
+                order.append(name)
+
+        background = asyncio.create_task(call("background", RequestPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        orchestrator = asyncio.create_task(call("orchestrator", RequestPriority.ORCHESTRATOR))
+        await asyncio.sleep(0)
+
+        assert scheduler.get_metrics()["queue_depth"] == 2
+
+        await scheduler.release(blocker)
+        await asyncio.gather(background, orchestrator)
+
+        assert order == ["orchestrator", "background"]
+
+    @pytest.mark.asyncio
+    async def test_rpm_budget_delays_excess_requests(self):
+        # 600 RPM -> one request refilled every 0.1s
+        scheduler = LLMRequestScheduler(
+            max_concurrency=10,
+            model_limits={"tiny": ModelRateLimit(requests_per_minute=600, tokens_per_minute=1_000_000)},
+        )
+        state = scheduler._model_state("tiny")
+        state.requests.consume(600)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with scheduler.slot("tiny", 10):
+            pass
+
+        assert loop.time() - started >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_model_does_not_block_other_models(self):
+        scheduler = LLMRequestScheduler(max_concurrency=4)
+        scheduler.penalize("gpt-4o", 30.0)
+
+        blocked = asyncio.create_task(
+            scheduler.acquire("gpt-4o", 10, RequestPriority.ORCHESTRATOR)
+        )
+        await asyncio.sleep(0)
+
+        lease = await asyncio.wait_for(scheduler.acquire("gpt-4o-mini", 10), timeout=1.0)
+        await scheduler.release(lease)
+
+        assert not blocked.done()
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        assert scheduler.get_metrics()["queue_depth"] == 0
+        assert scheduler.get_metrics()["rate_limited_total"] == 1
+
+
+class TestRetryAfter:
+    """Test Retry-After parsing."""
+
+    def test_parses_retry_after_ms(self):
+        error = SimpleNamespace(status_code=429, response=SimpleNamespace(headers={"retry-after-ms": "1500"}))
+        assert parse_retry_after(error) == 1.5
+
+    def test_parses_retry_after_seconds(self):
+        error = SimpleNamespace(status_code=429, response=SimpleNamespace(headers={"retry-after": "2"}))
+        assert parse_retry_after(error) == 2.0
+
+    def test_ignores_non_rate_limit_errors(self):
+        assert parse_retry_after(Exception("boom")) is None
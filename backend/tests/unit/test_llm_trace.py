@@ -0,0 +1,68 @@
+"""
+Unit tests for the LLM trace channel.
+
+Tests disabled/sampled behaviour and reference-based file output.
+"""
+import json
+
+from backend.services.llm_trace import LLMTraceConfig, LLMTracer, content_ref
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are an agent."},
+    {"role": "user", "content": "Write app.py"},
+]
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestLLMTracer:
+    """Test LLMTracer behaviour."""
+
+    def test_disabled_by_default_and_writes_nothing(self, tmp_path):
+        tracer = LLMTracer(LLMTraceConfig(path=str(tmp_path / "trace.jsonl")))
+
+        assert tracer.sample() is False
+        tracer.record("agent.plan", messages=MESSAGES, response="{}")
+        tracer.flush()
+
+        assert not (tmp_path / "trace.jsonl").exists()
+
+    def test_zero_sample_rate_disables(self, tmp_path):
+        tracer = LLMTracer(LLMTraceConfig(level="summary", sample_rate=0.0, path=str(tmp_path / "t.jsonl")))
+
+        assert tracer.enabled is False
+
+    def test_summary_records_references_not_bodies(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = LLMTracer(LLMTraceConfig(level="summary", path=str(path)))
+
+        assert tracer.sample() is True
+        tracer.record("agent.plan", messages=MESSAGES, response='{"tool_name": null}', agent_id="backend-1", tokens=42)
+        tracer.flush()
+
+        [event] = _read_lines(path)
+        assert event["event"] == "agent.plan"
+        assert event["agent_id"] == "backend-1"
+        assert event["tokens"] == 42
+        assert event["prompt_refs"][1] == {"role": "user", "ref": content_ref("Write app.py")}
+        assert event["response_ref"] == content_ref('{"tool_name": null}')
+        assert "Write app.py" not in path.read_text()
+        assert not (tmp_path / "trace_blobs").exists()
+
+    def test_full_stores_each_body_once(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        tracer = LLMTracer(LLMTraceConfig(level="full", path=str(path)))
+
+        tracer.record("agent.plan", messages=MESSAGES, response="one")
+        tracer.record("agent.plan", messages=MESSAGES, response="two")
+        tracer.flush()
+
+        events = _read_lines(path)
+        assert len(events) == 2
+        assert events[0]["prompt_refs"] == events[1]["prompt_refs"]
+
+        blobs = sorted(p.read_text() for p in (tmp_path / "trace_blobs").iterdir())
+        assert blobs == sorted(["You are an agent.", "Write app.py", "one", "two"])
@@ -10,6 +10,7 @@ from openai.types.chat import ChatCompletion, ChatCompletionMessage
 from openai.types.chat.chat_completion import Choice
 from openai.types.completion_usage import CompletionUsage
 
+from backend.services.llm_request_scheduler import LLMRequestScheduler, RequestPriority
 from backend.services.openai_adapter import OpenAIAdapter
 
 
@@ -186,6 +187,68 @@ class TestErrorHandling:
             assert mock_create.call_count == 3
 
 
+    @pytest.mark.asyncio
+    async def test_rate_limit_honours_retry_after(self, mock_chat_completion):
+        """Test 429 responses pause the model for Retry-After instead of backing off."""
+        class RateLimited(Exception):
+            status_code = 429
+            response = Mock(headers={"retry-after-ms": "50"})
+        
+        scheduler = LLMRequestScheduler()
+        adapter = OpenAIAdapter(api_key="test-key", scheduler=scheduler)
+        mock_create = AsyncMock(side_effect=[RateLimited("429"), mock_chat_completion])
+        
+        with patch.object(adapter.client.chat.completions, 'create', mock_create), \
+                patch("backend.services.openai_adapter.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            response = await adapter.chat_completion(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": "Hello"}],
+                temperature=0.7,
+                priority=RequestPriority.ORCHESTRATOR
+            )
+        
+        assert response == mock_chat_completion
+        assert mock_create.call_count == 2
+        mock_sleep.assert_not_called()
+        assert "priority" not in mock_create.call_args[1]
+        metrics = scheduler.get_metrics()
+        assert metrics["rate_limited_total"] == 1
+        assert metrics["requests_total"] == 2
+        assert metrics["wait_seconds_max"] >= 0.04
+
+
+class TestStreamChatCompletion:
+    """Test streamed chat completions."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_and_logs_usage(self, adapter, mock_token_logger):
+        """Test stream requests usage and logs tokens from the final chunk."""
+        chunks = [
+            Mock(choices=[Mock()], usage=None),
+            Mock(choices=[], usage=CompletionUsage(prompt_tokens=5, completion_tokens=7, total_tokens=12), model="gpt-4o-mini"),
+        ]
+        
+        async def fake_stream():
+            for chunk in chunks:
+                yield chunk
+        
+        with patch.object(adapter.client.chat.completions, 'create', new=AsyncMock(return_value=fake_stream())) as mock_create:
+            received = [
+                chunk async for chunk in adapter.stream_chat_completion(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": "Hello"}],
+                    temperature=0.7
+                )
+            ]
+        
+        assert received == chunks
+        call_kwargs = mock_create.call_args[1]
+        assert call_kwargs['stream'] is True
+        assert call_kwargs['stream_options'] == {"include_usage": True}
+        mock_token_logger.log_tokens.assert_called_once()
+        assert mock_token_logger.log_tokens.call_args[1]['completion_tokens'] == 7
+
+
 class TestEmbedText:
     """Test text embedding functionality."""
     
@@ -227,6 +290,19 @@ class TestEmbedText:
             mock_create.assert_called_once()
             call_kwargs = mock_create.call_args[1]
             assert call_kwargs['model'] == "text-embedding-3-small"
+    
+    @pytest.mark.asyncio
+    async def test_embed_texts_single_request_in_input_order(self, adapter):
+        """Test batch embedding sends one request and restores input order."""
+        mock_embedding = Mock()
+        mock_embedding.data = [Mock(index=1, embedding=[0.2]), Mock(index=0, embedding=[0.1])]
+        
+        with patch.object(adapter.client.embeddings, 'create', new=AsyncMock(return_value=mock_embedding)) as mock_create:
+            result = await adapter.embed_texts(["first", "second"])
+            
+            assert result == [[0.1], [0.2]]
+            mock_create.assert_called_once()
+            assert mock_create.call_args[1]['input'] == ["first", "second"]
 
 
 class TestTokenLogging:
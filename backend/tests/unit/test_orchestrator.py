@@ -18,6 +18,7 @@ from backend.services.orchestrator import (
     MessageType,
     _awaitable,
 )
+from backend.services.durable_task_queue import task_from_json, task_to_json
 
 
 class TestOrchestratorInitialization:
@@ -296,6 +297,55 @@ class TestTaskQueue:
         assert orchestrator.dequeue_task().task_id == "task-2"
         assert orchestrator.dequeue_task().task_id == "task-3"
     
+    def test_pending_counts_by_agent_type(self):
+        """Test queued tasks are counted per agent type."""
+        orchestrator = Orchestrator("project-1")
+        for i, agent_type in enumerate([AgentType.QA_ENGINEER, AgentType.QA_ENGINEER, AgentType.BACKEND_DEVELOPER]):
+            orchestrator.enqueue_task(Task(task_id=f"task-{i}", task_type="test", agent_type=agent_type))
+        
+        assert orchestrator.get_pending_counts_by_agent_type() == {"qa_engineer": 2, "backend_developer": 1}
+    
+    def test_durable_queue_replaces_in_process_queue(self):
+        """Test queue operations are delegated to a durable queue."""
+        class RecordingQueue:
+            def __init__(self):
+                self.tasks = []
+            
+            def enqueue(self, task):
+                self.tasks.append(task_from_json(task.task_id, task_to_json(task)))
+            
+            def dequeue(self):
+                return self.tasks.pop(0) if self.tasks else None
+            
+            def peek(self):
+                return self.tasks[0] if self.tasks else None
+            
+            def get_pending_count(self):
+                return len(self.tasks)
+        
+        durable = RecordingQueue()
+        orchestrator = Orchestrator("project-1", durable_queue=durable)
+        task = Task(
+            task_id="task-1",
+            task_type="test",
+            agent_type=AgentType.QA_ENGINEER,
+            priority=4,
+            payload={"id": "deliv-1"},
+            metadata={"attempt": 2}
+        )
+        
+        orchestrator.enqueue_task(task)
+        
+        assert orchestrator.task_queue.empty()
+        assert orchestrator.get_pending_count() == 1
+        assert orchestrator.peek_task().task_id == "task-1"
+        restored = orchestrator.dequeue_task()
+        assert restored is not task
+        assert (restored.agent_type, restored.priority, restored.payload, restored.metadata, restored.created_at) == (
+            task.agent_type, 4, {"id": "deliv-1"}, {"attempt": 2}, task.created_at
+        )
+        assert orchestrator.dequeue_task() is None
+    
     def test_prioritize_task_not_implemented(self):
         """Test that prioritize_task returns False (not yet implemented)."""
         orchestrator = Orchestrator("project-1")
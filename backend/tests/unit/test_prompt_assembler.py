@@ -0,0 +1,91 @@
+"""
+Unit tests for PromptAssembler.
+
+Tests stable prefix construction, budget enforcement and savings stats.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services.prompt_assembler import PromptAssembler, PromptSection, TRUNCATION_MARKER
+
+
+@pytest.fixture
+def assembler():
+    """Assembler with a small budget so truncation is easy to trigger."""
+    return PromptAssembler(model="gpt-4o-mini", max_prompt_tokens=400)
+
+
+class TestPrefix:
+    """Test cache-friendly prefix handling."""
+
+    def test_prefix_is_system_message_and_reused(self, assembler):
+        first = assembler.assemble(["system", "tools"], [PromptSection("goal", "step 1")])
+        second = assembler.assemble(["system", "tools"], [PromptSection("goal", "step 2")])
+
+        assert first.messages[0] == {"role": "system", "content": "system\n\ntools"}
+        assert first.messages[0] == second.messages[0]
+        assert first.prefix_reused is False
+        assert second.prefix_reused is True
+
+    def test_none_prefix_parts_are_skipped(self, assembler):
+        prompt = assembler.assemble([None, "tools"], [PromptSection("goal", "do it")])
+
+        assert prompt.messages[0]["content"] == "tools"
+        assert prompt.messages[1] == {"role": "user", "content": "do it"}
+
+
+class TestBudget:
+    """Test token budget enforcement."""
+
+    def test_within_budget_is_untouched(self, assembler):
+        prompt = assembler.assemble(["sys"], [PromptSection("a", "short"), PromptSection("b", "also short")])
+
+        assert prompt.truncated_sections == []
+        assert prompt.messages[1]["content"] == "short\n\nalso short"
+
+    def test_lowest_priority_section_trimmed_first(self, assembler):
+        important = "goal " * 50
+        history = "old step\n" * 400
+        prompt = assembler.assemble(
+            ["sys"],
+            [
+                PromptSection("goal", important, priority=10),
+                PromptSection("history", history, priority=1, keep="tail"),
+            ],
+        )
+
+        body = prompt.messages[1]["content"]
+        assert prompt.truncated_sections == ["history"]
+        assert important in body
+        assert TRUNCATION_MARKER.strip() in body
+        assert prompt.prompt_tokens <= 400
+        assert prompt.tokens_trimmed > 0
+
+    def test_min_tokens_is_respected(self, assembler):
+        prompt = assembler.assemble(
+            ["sys"],
+            [
+                PromptSection("goal", "g " * 1000, priority=10, min_tokens=300),
+                PromptSection("history", "h " * 1000, priority=1),
+            ],
+        )
+
+        assert assembler.count_tokens(prompt.messages[1]["content"]) >= 300
+        assert prompt.truncated_sections == ["history", "goal"]
+
+
+class TestStats:
+    """Test savings reporting."""
+
+    def test_stats_report_reuse_trimming_and_provider_cache(self, assembler):
+        assembler.assemble(["sys"], [PromptSection("a", "x")])
+        reused = assembler.assemble(["sys"], [PromptSection("a", "y " * 2000)])
+        assembler.record_usage(SimpleNamespace(prompt_tokens_details=SimpleNamespace(cached_tokens=1024)))
+
+        stats = assembler.get_stats()
+        assert stats["calls"] == 2
+        assert stats["prefix_reuses"] == 1
+        assert stats["prefix_reused_tokens"] == reused.prefix_tokens
+        assert stats["tokens_trimmed"] == reused.tokens_trimmed > 0
+        assert stats["provider_cached_tokens"] == 1024
@@ -0,0 +1,150 @@
+"""
+Unit tests for embedding-based collaboration loop detection.
+
+Tests QuestionSimilarityIndex windows and caching, and the orchestrator's
+semantic loop path with a fake embedder and a fake engine.
+"""
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from backend.services.collaboration_orchestrator import CollaborationOrchestrator
+from backend.services.question_similarity import QuestionSimilarityIndex, pair_key
+
+
+class FakeEmbedder:
+    """Embeds questions by topic keyword and counts calls."""
+
+    TOPICS = {"cors": [1.0, 0.1, 0.0], "database": [0.0, 1.0, 0.1]}
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, text):
+        self.calls.append(text)
+        for keyword, vector in self.TOPICS.items():
+            if keyword in text.lower():
+                return vector
+        return [0.1, 0.0, 1.0]
+
+
+class FakeEngine:
+    """Engine stub serving pair history and recording statements."""
+
+    def __init__(self, history_rows):
+        self.history_rows = history_rows
+        self.statements = []
+
+    @contextmanager
+    def connect(self):
+        conn = MagicMock()
+
+        def execute(query, params=None):
+            sql = str(query)
+            self.statements.append((sql, params))
+            result = MagicMock()
+            if "FROM collaboration_exchanges" in sql:
+                result.fetchall.return_value = self.history_rows
+            return result
+
+        conn.execute.side_effect = execute
+        yield conn
+
+
+class TestQuestionSimilarityIndex:
+    """Test QuestionSimilarityIndex behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_find_similar_newest_first(self):
+        embedder = FakeEmbedder()
+        index = QuestionSimilarityIndex(embedder)
+        pair = pair_key("security-1", "backend-1")
+        now = time.time()
+
+        await index.warm(pair, [
+            ("CORS headers again?", now - 10),
+            ("Which database index?", now - 20),
+            ("How do I set up CORS?", now - 30),
+        ])
+        matches = index.find_similar(pair, await index.embed("CORS preflight fails"), threshold=0.9)
+
+        assert [text for text, _ in matches] == ["CORS headers again?", "How do I set up CORS?"]
+        assert all(score == pytest.approx(1.0) for _, score in matches)
+        assert pair == ("backend-1", "security-1")
+
+    @pytest.mark.asyncio
+    async def test_embeddings_are_cached_by_text(self):
+        embedder = FakeEmbedder()
+        index = QuestionSimilarityIndex(embedder)
+
+        first = await index.embed("How do I set up CORS?")
+        second = await index.embed("How do I set up CORS?")
+
+        assert first is second
+        assert len(embedder.calls) == 1
+        assert first.dtype == np.float32
+        assert np.linalg.norm(first) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_window_evicts_oldest(self):
+        index = QuestionSimilarityIndex(FakeEmbedder(), window=2)
+        pair = pair_key("a", "b")
+        await index.warm(pair, [])
+
+        for text in ("CORS one", "CORS two", "CORS three"):
+            index.add(pair, text, await index.embed(text))
+
+        matches = index.find_similar(pair, await index.embed("CORS"), threshold=0.9)
+        assert [text for text, _ in matches] == ["CORS three", "CORS two"]
+        assert index.history_size(pair) == 2
+
+    @pytest.mark.asyncio
+    async def test_max_age_and_cold_pairs(self):
+        index = QuestionSimilarityIndex(FakeEmbedder())
+        pair = pair_key("a", "b")
+        vector = await index.embed("CORS")
+
+        index.add(pair, "ignored until warm", vector)
+        assert index.history_size(pair) == 0
+
+        await index.warm(pair, [("CORS recent", time.time()), ("CORS stale", time.time() - 7200)])
+        matches = index.find_similar(pair, vector, threshold=0.9, max_age_seconds=3600)
+        assert [text for text, _ in matches] == ["CORS recent"]
+
+
+class TestSemanticLoopDetection:
+    """Test CollaborationOrchestrator with an embedder."""
+
+    @pytest.mark.asyncio
+    async def test_semantic_loop_loads_history_once(self):
+        embedder = FakeEmbedder()
+        engine = FakeEngine([("How should CORS be configured?",), ("What database pool size?",)])
+        orchestrator = CollaborationOrchestrator(engine, embedder=embedder)
+
+        first = await orchestrator.detect_semantic_loop("backend-1", "security-1", "CORS blocked again")
+        await orchestrator._track_exchange("c-1", "backend-1", "security-1", "request", "CORS blocked again")
+        second = await orchestrator.detect_semantic_loop("security-1", "backend-1", "CORS blocked again")
+
+        assert first is None
+        assert second["loop_detected"] is True
+        assert second["similar_questions"] == ["CORS blocked again", "How should CORS be configured?"]
+
+        history_reads = [sql for sql, _ in engine.statements if "FROM collaboration_exchanges" in sql]
+        assert len(history_reads) == 1
+        assert "UNION ALL" in history_reads[0]
+        assert embedder.calls.count("CORS blocked again") == 1
+
+    @pytest.mark.asyncio
+    async def test_keyword_fallback_without_embedder(self):
+        engine = FakeEngine([("how do i set up cors",), ("how do i set up cors",), ("other",)])
+        orchestrator = CollaborationOrchestrator(engine)
+
+        loop = await orchestrator.detect_collaboration_loop("a", "b", "how do i set up cors")
+
+        assert loop["loop_detected"] is True
+        assert loop["cycle_count"] == 3
+        [(_, params)] = [(sql, p) for sql, p in engine.statements if "FROM collaboration_exchanges" in sql]
+        assert params == {"agent_a": "a", "agent_b": "b", "limit": 10}
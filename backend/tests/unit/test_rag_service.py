@@ -0,0 +1,101 @@
+"""
+Unit tests for RAGService search against an in-memory Qdrant.
+
+Embeddings come from a fake adapter that maps topic keywords to fixed
+directions, so filter, batch and tuning behaviour can be checked exactly.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import KeywordIndexParams
+
+from backend.services.lexical_index import BM25Index
+from backend.services.qdrant_pool import resolve_qdrant_url
+from backend.services.rag_service import PAYLOAD_INDEXES, RAGService, SearchQuery
+
+# Local mode ignores payload indexes and search params, and says so
+pytestmark = pytest.mark.filterwarnings("ignore:.*(local Qdrant|Local mode).*:UserWarning")
+
+
+class FakeAdapter:
+    """Embeds text onto one axis per topic keyword."""
+
+    TOPICS = ["postgres", "react", "docker"]
+
+    async def embed_text(self, text):
+        vector = [0.0] * RAGService.EMBEDDING_DIM
+        for axis, topic in enumerate(self.TOPICS):
+            if topic in text.lower():
+                vector[axis] = 1.0
+        vector[-1] = 0.01
+        return vector
+
+    async def embed_texts(self, texts):
+        return [await self.embed_text(text) for text in texts]
+
+
+@pytest.fixture
+async def rag():
+    client = AsyncQdrantClient(":memory:")
+    service = RAGService(FakeAdapter(), qdrant_client=client, hnsw_ef=64, lexical_index=BM25Index())
+    await service.index_document("Postgres vacuum tuning", specialist_id="db-1", metadata={"agent_type": "backend"})
+    await service.index_document("Postgres indexes", specialist_id="db-2")
+    await service.index_document("React hooks", specialist_id="db-1", metadata={"agent_type": "frontend"})
+    yield service
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_specialist(rag):
+    results = await rag.search("postgres question", specialist_id="db-1")
+
+    assert [r.text for r in results] == ["Postgres vacuum tuning"]
+    assert results[0].metadata["specialist_id"] == "db-1"
+
+
+@pytest.mark.asyncio
+async def test_search_batch_keeps_query_order(rag):
+    results = await rag.search_batch([
+        SearchQuery("react", specialist_id="db-1"),
+        SearchQuery("postgres", agent_type="backend"),
+        SearchQuery("docker"),
+    ])
+
+    assert [[r.text for r in batch] for batch in results] == [
+        ["React hooks"],
+        ["Postgres vacuum tuning"],
+        [],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_params_and_collection_setup():
+    client = MagicMock()
+    client.collection_exists = AsyncMock(return_value=False)
+    client.create_collection = AsyncMock()
+    client.get_collection = AsyncMock(return_value=MagicMock(payload_schema={"agent_type": object()}))
+    client.create_payload_index = AsyncMock()
+    client.scroll = AsyncMock(return_value=([], None))
+    client.query_batch_points = AsyncMock(return_value=[MagicMock(points=[])])
+    service = RAGService(FakeAdapter(), qdrant_client=client, hnsw_ef=64, lexical_index=BM25Index())
+
+    await service.search("postgres", specialist_id="db-1", hnsw_ef=256)
+    await service.search("postgres", specialist_id="db-1")
+
+    client.create_collection.assert_awaited_once()
+    assert client.create_collection.call_args.kwargs["quantization_config"] is not None
+    indexed = {c.kwargs["field_name"]: c.kwargs["field_schema"] for c in client.create_payload_index.call_args_list}
+    assert set(indexed) == set(PAYLOAD_INDEXES) - {"agent_type"}
+    assert isinstance(indexed["specialist_id"], KeywordIndexParams) and indexed["specialist_id"].is_tenant
+
+    first, second = (c.kwargs["requests"][0].params for c in client.query_batch_points.call_args_list)
+    assert (first.hnsw_ef, second.hnsw_ef) == (256, 64)
+    assert first.quantization.rescore is True
+
+
+def test_resolve_qdrant_url(monkeypatch):
+    monkeypatch.setenv("QDRANT_PORT", "7333")
+
+    assert resolve_qdrant_url("qdrant") == "http://qdrant:7333"
+    assert resolve_qdrant_url("https://vectors.example.com:443") == "https://vectors.example.com:443"
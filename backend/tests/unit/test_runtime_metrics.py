@@ -0,0 +1,98 @@
+"""
+Unit tests for stage timers, Prometheus rendering and the event loop monitor.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import create_app
+from backend.services.event_bus import Event, EventBus, EventType
+from backend.services.runtime_metrics import (
+    EventLoopMonitor,
+    MetricsRegistry,
+    STAGE_METRIC,
+    stage_histogram,
+    time_stage,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, 'say "hi"')
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP demo_seconds Demo", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 4' in lines
+    assert 'demo_seconds_sum{stage="say \\"hi\\""} 4.05' in lines
+    assert 'demo_seconds_count{stage="say \\"hi\\""} 4' in lines
+
+
+@pytest.mark.asyncio
+async def test_time_stage_records_awaited_time_and_errors():
+    registry = MetricsRegistry()
+
+    with time_stage("plan_llm", "backend_developer", registry=registry):
+        await asyncio.sleep(0.02)
+    with pytest.raises(ValueError):
+        with time_stage("tool_exec", "backend_developer", registry=registry):
+            raise ValueError("boom")
+
+    histogram = stage_histogram(registry)
+    assert histogram.count("plan_llm", "backend_developer") == 1
+    assert histogram.count("tool_exec", "backend_developer") == 1
+    assert 'stage="plan_llm",component="backend_developer",le="0.025"} 1' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_event_publish_is_timed():
+    bus = EventBus()
+    bus.subscribe(EventType.PHASE_STARTED, lambda event: None)
+
+    before = stage_histogram().count("event_publish", "phase_started")
+    await bus.publish(Event(event_type=EventType.PHASE_STARTED, project_id="proj-1"))
+
+    assert stage_histogram().count("event_publish", "phase_started") == before + 1
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_reports_stall_with_stack():
+    registry = MetricsRegistry()
+    monitor = EventLoopMonitor(interval=0.02, stall_threshold=0.1, registry=registry)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    reports = monitor.reports()
+    assert len(reports) == 1
+    assert reports[0].duration >= 0.2
+    assert "blocking_call" in reports[0].stack
+    rendered = registry.render()
+    assert "theappapp_event_loop_stalls_total 1.0" in rendered
+    assert "theappapp_event_loop_lag_seconds_count" in rendered
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    with time_stage("validation", "qa_engineer"):
+        pass
+    client = TestClient(create_app())
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert f'{STAGE_METRIC}_count{{stage="validation",component="qa_engineer"}}' in response.text
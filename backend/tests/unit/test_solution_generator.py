@@ -0,0 +1,24 @@
+"""Unit tests for SolutionGenerator knowledge-base lookups."""
+
+from unittest.mock import create_autospec
+
+import pytest
+
+from backend.services.rag_service import RAGService, SearchResult
+from backend.services.solution_generator import SolutionGenerator
+
+
+@pytest.mark.asyncio
+async def test_similar_issues_use_rag_search_signature() -> None:
+    rag_service = create_autospec(RAGService, instance=True)
+    rag_service.search.return_value = [SearchResult(text="pool exhausted", score=0.9, metadata={})]
+    generator = SolutionGenerator(rag_service=rag_service)
+
+    similar = await generator._find_similar_issues("Database connection timeout")
+
+    assert similar == ["pool exhausted"]
+    rag_service.search.assert_awaited_once_with(
+        query="Database connection timeout",
+        specialist_id="failure_patterns",
+        limit=3,
+    )
@@ -0,0 +1,134 @@
+"""Unit tests for step-level task checkpoints and agent resume."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.models.agent_state import Action, Result, Step, TaskState, ValidationResult
+from backend.services.task_checkpoint_store import TaskCheckpointStore
+from backend.tests.unit.test_base_agent import StubLLMClient, StubOrchestrator
+from backend.tests.unit.test_base_agent import TestAgent as StepAgent
+
+
+@pytest.fixture
+def store() -> TaskCheckpointStore:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE agent_task_checkpoints (
+                task_id TEXT, step_number INTEGER, agent_id TEXT, state_delta BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (task_id, step_number))
+        """))
+    return TaskCheckpointStore(engine)
+
+
+def _rows(store: TaskCheckpointStore, task_id: str) -> int:
+    with store.engine.connect() as conn:
+        return conn.execute(
+            text("SELECT COUNT(*) FROM agent_task_checkpoints WHERE task_id = :task_id"), {"task_id": task_id}
+        ).scalar_one()
+
+
+def _state() -> TaskState:
+    return TaskState(
+        task_id="task-1", agent_id="agent-1", project_id="project-1",
+        goal="Build it", acceptance_criteria=[], constraints={},
+    )
+
+
+def _complete_step(state: TaskState, number: int, artifacts: Dict[str, Any]) -> None:
+    state.steps_history.append(Step(
+        step_number=number,
+        timestamp=datetime(2025, 11, 3, 12, number),
+        reasoning=f"reason-{number}",
+        action=Action(
+            description=f"step-{number}", tool_name=None, operation=None,
+            batch=[Action(description="sub", tool_name="file_system", operation="write")],
+        ),
+        result=Result(success=True, output={"n": number}),
+        validation=ValidationResult(success=True, metrics={"progress_score": 0.3 * (number + 1)}),
+    ))
+    state.artifacts.update(artifacts)
+    state.decision_reasoning.append(f"reason-{number}")
+    state.progress_score = 0.3 * (number + 1)
+    state.current_step = number + 1
+
+
+def test_restore_replays_incremental_deltas(store: TaskCheckpointStore) -> None:
+    state = _state()
+    _complete_step(state, 0, {"step_0": {"code": "a"}, "plan": "v1"})
+    store.save_step(state, ["sig-a"])
+    _complete_step(state, 1, {"step_1": {"code": "b"}, "plan": "v2"})
+    store.save_step(state, ["sig-a", "sig-b"])
+
+    restored = _state()
+    restored.decision_reasoning = ["from-initialize"]
+    loop_window = store.restore(restored)
+
+    assert loop_window == ["sig-a", "sig-b"]
+    assert restored.current_step == 2
+    assert restored.progress_score == pytest.approx(0.6)
+    assert restored.artifacts == {"step_0": {"code": "a"}, "step_1": {"code": "b"}, "plan": "v2"}
+    assert restored.decision_reasoning == ["reason-0", "reason-1"]
+    assert [step.action.batch[0].tool_name for step in restored.steps_history] == ["file_system"] * 2
+    assert restored.steps_history[1].result.output == {"n": 1}
+
+
+def test_restore_without_checkpoints_and_clear(store: TaskCheckpointStore) -> None:
+    assert store.restore(_state()) is None
+
+    state = _state()
+    _complete_step(state, 0, {})
+    store.save_step(state)
+    store.clear("task-1")
+
+    assert _rows(store, "task-1") == 0
+    assert store.restore(_state()) is None
+
+
+class CrashingLLMClient(StubLLMClient):
+    """Planner that dies once after a number of plans, like a process crash."""
+
+    def __init__(self, crash_after: int) -> None:
+        super().__init__()
+        self.crash_after = crash_after
+
+    async def plan_next_action(self, **kwargs: Any) -> Dict[str, Any]:
+        if self._plan_calls == self.crash_after:
+            self.crash_after = -1
+            raise SystemExit("worker killed")
+        return await super().plan_next_action(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_agent_resumes_after_last_checkpoint(store: TaskCheckpointStore) -> None:
+    task = {
+        "task_id": "task-9",
+        "project_id": "project-1",
+        "payload": {"goal": "Do the thing", "acceptance_criteria": [], "max_steps": 4},
+    }
+    validations = [
+        ValidationResult(success=True, metrics={"progress_score": score}) for score in (0.25, 0.5, 0.75, 1.0)
+    ]
+    llm = CrashingLLMClient(crash_after=2)
+    agent = StepAgent(StubOrchestrator(), llm, [], validations=validations)
+    agent.checkpoint_store = store
+
+    with pytest.raises(SystemExit):
+        await agent.run_task(task)
+    assert _rows(store, "task-9") == 2
+
+    resumed_llm = StubLLMClient()
+    resumed = StepAgent(StubOrchestrator(), resumed_llm, [], validations=validations[2:])
+    resumed.checkpoint_store = store
+    outcome = await resumed.run_task(task)
+
+    assert outcome.success is True
+    assert [step.step_number for step in outcome.steps] == [0, 1, 2, 3]
+    assert resumed_llm._plan_calls == 2  # Steps 0 and 1 were not planned again
+    assert _rows(store, "task-9") == 0
@@ -0,0 +1,109 @@
+"""
+Unit tests for adaptive task timeouts and their use in TaskExecutor.
+"""
+import asyncio
+
+import pytest
+
+from backend.models.agent_state import TaskResult
+from backend.services.event_bus import EventBus, EventType
+from backend.services.orchestrator import AgentType, Orchestrator, Task
+from backend.services.task_executor import TaskExecutor
+from backend.services.task_timeout_policy import TaskTimeoutPolicy
+from backend.services.timeout_monitor import TimeoutMonitor
+
+
+def test_defaults_until_enough_history_then_p99_times_factor():
+    policy = TaskTimeoutPolicy(min_samples=20, factor=3.0, soft_fraction=0.5, min_timeout=1.0)
+
+    seeded = policy.timeouts_for("backend_developer", "deliverable")
+    assert seeded.hard == TimeoutMonitor.DEFAULT_TIMEOUTS["backend_developer"]
+    assert seeded.source == "default"
+
+    for seconds in range(1, 21):
+        policy.record("backend_developer", "deliverable", float(seconds))
+
+    learned = policy.timeouts_for("backend_developer", "deliverable")
+    assert (learned.hard, learned.soft, learned.source) == (60.0, 30.0, "history")
+    # Kinds without history use the agent type's combined durations
+    assert policy.timeouts_for("backend_developer", "review").source == "agent_history"
+    assert policy.timeouts_for("qa_engineer", "deliverable").source == "default"
+
+
+def test_timeouts_are_clamped():
+    policy = TaskTimeoutPolicy(min_samples=1, min_timeout=30.0, max_timeout=100.0)
+
+    policy.record("frontend_developer", "tiny", 0.1)
+    policy.record("frontend_developer", "huge", 500.0)
+
+    assert policy.timeouts_for("frontend_developer", "tiny").hard == 30.0
+    assert policy.timeouts_for("frontend_developer", "huge").hard == 100.0
+
+
+def test_durations_persist_across_restarts(tmp_path):
+    path = str(tmp_path / "stats" / "durations.json")
+    policy = TaskTimeoutPolicy(path, min_samples=2, min_timeout=1.0, window=3)
+    for seconds in (100.0, 10.0, 20.0, 30.0):
+        policy.record("devops_engineer", "deliverable", seconds)
+    policy.save()
+
+    restored = TaskTimeoutPolicy(path, min_samples=2, min_timeout=1.0, window=3)
+
+    assert restored.timeouts_for("devops_engineer", "deliverable").hard == 90.0  # 100s rolled out
+    (tmp_path / "stats" / "durations.json").write_text("{not json")
+    assert TaskTimeoutPolicy(path).timeouts_for("devops_engineer").source == "default"
+
+
+class SlowAgent:
+    agent_id = "backend_developer-slow"
+    agent_type = "backend_developer"
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.cancelled = False
+
+    async def run_task(self, task):
+        try:
+            await asyncio.sleep(self.duration)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return TaskResult(task.task_id, True, [], {}, [], 1.0)
+
+
+async def run_one(duration, policy):
+    orchestrator = Orchestrator(project_id="proj-timeouts")
+    bus = EventBus()
+    warnings = []
+    bus.subscribe(EventType.WARNING_ISSUED, warnings.append)
+    executor = TaskExecutor(orchestrator=orchestrator, event_bus=bus, timeout_policy=policy)
+    agent = SlowAgent(duration)
+    task = Task(task_id="task-1", task_type="deliverable", agent_type=AgentType.BACKEND_DEVELOPER)
+    return executor, agent, warnings, await asyncio.gather(
+        executor._run_with_deadlines(task, agent), return_exceptions=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_executor_warns_at_soft_deadline_and_records_success():
+    policy = TaskTimeoutPolicy(min_samples=1, min_timeout=0.0, factor=1.0, soft_fraction=0.25)
+    policy.record("backend_developer", "deliverable", 0.4)
+
+    _, agent, warnings, (result,) = await run_one(0.2, policy)
+
+    assert result.success
+    assert [w.data["warning"] for w in warnings] == ["task_soft_deadline"]
+    assert len(policy._durations[("backend_developer", "deliverable")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_executor_cancels_at_hard_deadline():
+    policy = TaskTimeoutPolicy(min_samples=1, min_timeout=0.0, factor=1.0, soft_fraction=0.5)
+    policy.record("backend_developer", "deliverable", 0.1)
+
+    _, agent, warnings, (error,) = await run_one(5.0, policy)
+
+    assert isinstance(error, RuntimeError) and "timeout" in str(error)
+    assert agent.cancelled
+    assert len(warnings) == 1
+    assert len(policy._durations[("backend_developer", "deliverable")]) == 1
@@ -371,6 +371,83 @@ class TestAgentTypeTimeouts:
         await monitor.stop()
 
 
+@pytest.mark.unit
+class TestDeadlineScheduling:
+    """Test deadline-ordered firing, extension and scale."""
+    
+    @pytest.mark.asyncio
+    async def test_timeouts_fire_on_time_in_deadline_order(self):
+        """Test callbacks fire at their deadlines, not on a polling interval."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        fired = []
+        monitor = TimeoutMonitor(None)
+        await monitor.start()
+        
+        for task_id, timeout in (("slow", 0.3), ("fast", 0.1)):
+            await monitor.monitor_task(
+                task_id=task_id,
+                agent_id="agent-1",
+                timeout_seconds=timeout,
+                on_timeout=lambda task_id=task_id: fired.append((task_id, loop.time() - started))
+            )
+        
+        await asyncio.sleep(0.45)
+        
+        assert [task_id for task_id, _ in fired] == ["fast", "slow"]
+        assert fired[0][1] == pytest.approx(0.1, abs=0.05)
+        assert fired[1][1] == pytest.approx(0.3, abs=0.05)
+        assert monitor.get_stats()["total_timeouts"] == 2
+        
+        await monitor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_extend_task_pushes_deadline_back(self):
+        """Test extending a task delays its timeout."""
+        fired = []
+        monitor = TimeoutMonitor(None)
+        await monitor.monitor_task(
+            task_id="task-1",
+            agent_id="agent-1",
+            timeout_seconds=0.1,
+            on_timeout=lambda: fired.append("task-1")
+        )
+        
+        assert monitor.extend_task("task-1", 0.2)
+        assert not monitor.extend_task("missing", 1)
+        await asyncio.sleep(0.15)
+        assert fired == [] and monitor.is_monitoring("task-1")
+        await asyncio.sleep(0.25)
+        assert fired == ["task-1"]
+        
+        await monitor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_many_cancelled_tasks_are_compacted(self):
+        """Test cancelling tens of thousands of tasks keeps the heap small."""
+        fired = []
+        monitor = TimeoutMonitor(None)
+        await monitor.start()
+        
+        for i in range(20000):
+            await monitor.monitor_task(
+                task_id=f"task-{i}",
+                agent_id="agent-1",
+                timeout_seconds=60 + i,
+                on_timeout=lambda: fired.append(True)
+            )
+        for i in range(19999):
+            monitor.complete_task(f"task-{i}")
+        
+        assert monitor.get_active_count() == 1
+        assert len(monitor._deadlines) <= 2 * 1 + 64
+        assert monitor.extend_task("task-19999", -20058.9)
+        await asyncio.sleep(0.3)
+        assert fired == [True]
+        
+        await monitor.stop()
+
+
 # Run tests
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,118 @@
+"""
+Unit tests for the workspace file cache behind the TAS file_system tool.
+"""
+import pytest
+
+from backend.services.tool_access_service import ToolAccessService
+from backend.services.workspace_file_cache import WorkspaceFileCache
+from backend.tests.performance.build_simulator import InMemoryContainerManager, installed_container_manager
+
+
+@pytest.fixture
+def containers():
+    manager = InMemoryContainerManager()
+    with installed_container_manager(manager):
+        yield manager
+
+
+@pytest.fixture
+def cache():
+    return WorkspaceFileCache(max_bytes=1024)
+
+
+@pytest.fixture
+def tas(containers, cache):
+    return ToolAccessService(db_session=None, use_db=False, file_cache=cache)
+
+
+def fs(tas, operation, path, **params):
+    return tas._execute_file_system_tool(
+        operation, {"project_id": "proj", "task_id": "task-1", "path": path, **params}
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_is_served_from_memory(tas, containers, cache):
+    await fs(tas, "write", "src/app.py", content="print('hi')\n")
+    execs = containers.exec_count
+
+    reads = [await fs(tas, "read", "src/app.py") for _ in range(3)]
+
+    assert [r["content"] for r in reads] == ["print('hi')\n"] * 3
+    assert containers.exec_count == execs
+    assert cache.stats["hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_execute_command_triggers_one_revalidation_exec(tas, containers, cache):
+    await fs(tas, "write", "a.py", content="a = 1\n")
+    await fs(tas, "write", "b.py", content="b = 1\n")
+    await tas._execute_container_tool("execute", {"task_id": "proj", "project_id": "proj", "command": "pytest"})
+
+    # Out-of-band edit by the command: same size, new mtime
+    containers.workspaces["proj"]["/workspace/b.py"] = b"b = 2\n"
+    containers.mtimes["/workspace/b.py"] = 10_000
+    execs = containers.exec_count
+
+    a = await fs(tas, "read", "a.py")
+    b = await fs(tas, "read", "b.py")
+    again = await fs(tas, "read", "a.py")
+
+    assert (a["content"], b["content"], again["content"]) == ("a = 1\n", "b = 2\n", "a = 1\n")
+    assert containers.exec_count - execs == 2  # One stat of both entries, one cat of b.py
+    assert (cache.stats["revalidated"], cache.stats["invalidated"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_read_misses_are_validated_by_content_hash(tas, containers, cache):
+    containers.workspaces.setdefault("proj", {})["/workspace/notes.md"] = b"notes\n"
+    await containers.create_container("proj", "proj")
+
+    first = await fs(tas, "read", "notes.md")
+    cache.mark_dirty("proj")
+    execs = containers.exec_count
+    second = await fs(tas, "read", "notes.md")
+    revalidation_execs = containers.exec_count - execs
+    await fs(tas, "delete", "notes.md")
+
+    assert first["content"] == second["content"] == "notes\n"
+    assert revalidation_execs == 1  # Hash matched: no cat
+    assert cache.get("proj", "notes.md") is None
+    with pytest.raises(ValueError):
+        await fs(tas, "read", "notes.md")
+
+
+@pytest.mark.asyncio
+async def test_entries_past_ttl_see_changes_from_other_processes(containers):
+    now = [0.0]
+    cache = WorkspaceFileCache(max_bytes=1024, ttl=2.0, clock=lambda: now[0])
+    tas = ToolAccessService(db_session=None, use_db=False, file_cache=cache)
+    await fs(tas, "write", "a.py", content="a = 1\n")
+    await fs(tas, "write", "b.py", content="b = 1\n")
+
+    # Another backend process rewrites b.py through its own TAS
+    containers.workspaces["proj"]["/workspace/b.py"] = b"b = 2\n"
+    containers.mtimes["/workspace/b.py"] = 10_000
+    within_ttl = await fs(tas, "read", "b.py")
+    now[0] = 5.0
+    execs = containers.exec_count
+    a = await fs(tas, "read", "a.py")
+    b = await fs(tas, "read", "b.py")
+
+    assert within_ttl["content"] == "b = 1\n"
+    assert (a["content"], b["content"]) == ("a = 1\n", "b = 2\n")
+    assert containers.exec_count - execs == 2  # One stat of both entries, one cat of b.py
+
+
+def test_lru_budget_evicts_least_recently_used(cache):
+    cache.put("proj", "a", "x" * 400)
+    cache.put("proj", "b", "y" * 400)
+    cache.get("proj", "a")
+    cache.put("proj", "c", "z" * 400)
+    cache.put("proj", "huge", "h" * 2048)
+
+    assert cache.get("proj", "a") is not None
+    assert cache.get("proj", "b") is None
+    assert cache.get("proj", "c") is not None
+    assert cache.get("proj", "huge") is None
+    assert cache.stats["evicted"] == 1
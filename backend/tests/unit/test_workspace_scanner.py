@@ -0,0 +1,100 @@
+"""
+Unit tests for WorkspaceScanner.
+
+Tests pruned single-pass metrics, manifest diffs and incremental rescans.
+"""
+import os
+import time
+
+import pytest
+
+from backend.services.workspace_scanner import WorkspaceScanner
+
+
+def _write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _age(root, seconds=60):
+    """Push every mtime into the past so cached entries are trusted."""
+    past = time.time() - seconds
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames + dirnames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+    os.utime(root, (past, past))
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "project"
+    _write(root / "app.py", "a\nb\n")
+    _write(root / "src" / "util.ts", "x\n")
+    _write(root / "tests" / "test_app.py", "assert True\n")
+    _write(root / "node_modules" / "lib" / "index.js", "ignored\n")
+    _write(root / ".git" / "HEAD", "ref\n")
+    return root
+
+
+@pytest.fixture
+def scanner(tmp_path):
+    return WorkspaceScanner(manifest_dir=str(tmp_path / "manifests"))
+
+
+class TestWorkspaceScanner:
+    """Test WorkspaceScanner behaviour."""
+
+    def test_single_pass_metrics_skip_pruned_dirs(self, scanner, workspace):
+        snapshot = scanner.scan(str(workspace))
+
+        assert sorted(snapshot.files) == ["app.py", "src/util.ts", "tests/test_app.py"]
+        assert snapshot.source_file_count == 3
+        assert snapshot.test_file_count == 1
+        assert snapshot.total_lines == 4
+        assert snapshot.has_tests is True
+
+    def test_missing_path_raises(self, scanner, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            scanner.scan(str(tmp_path / "missing"))
+
+    def test_diff_reports_added_modified_deleted(self, scanner, workspace):
+        before = scanner.scan(str(workspace))
+        (workspace / "app.py").write_text("a\nb\nc\n")
+        (workspace / "src" / "util.ts").unlink()
+        _write(workspace / "src" / "new.ts", "y\n")
+
+        after = scanner.scan(str(workspace))
+
+        assert after.diff(before) == (["src/new.ts"], ["app.py"], ["src/util.ts"])
+
+    def test_unchanged_workspace_is_not_relisted_or_rehashed(self, scanner, workspace):
+        scanner.scan(str(workspace))
+        _age(workspace)
+        scanner.scan(str(workspace))
+
+        again = scanner.scan(str(workspace))
+
+        assert again.dirs_listed == 0
+        assert again.files_hashed == 0
+        assert again.source_file_count == 3
+
+    def test_only_changed_directory_is_relisted(self, scanner, workspace):
+        _age(workspace)
+        scanner.scan(str(workspace))
+        _write(workspace / "src" / "extra.ts", "z\n")
+
+        snapshot = scanner.scan(str(workspace))
+
+        assert snapshot.dirs_listed == 1
+        assert snapshot.files_hashed == 1
+        assert "src/extra.ts" in snapshot.files
+
+    def test_manifest_persists_across_instances(self, tmp_path, workspace):
+        _age(workspace)
+        WorkspaceScanner(manifest_dir=str(tmp_path / "m")).scan(str(workspace))
+
+        snapshot = WorkspaceScanner(manifest_dir=str(tmp_path / "m")).scan(str(workspace))
+
+        assert snapshot.dirs_listed == 0
+        assert snapshot.files_hashed == 0
+        assert snapshot.total_lines == 4